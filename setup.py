@@ -28,6 +28,11 @@ setup(
             ["src/pymatgen/optimization/neighbors.pyx"],
             extra_link_args=extra_link_args,
         ),
+        Extension(
+            "pymatgen.optimization.ewald_minimizer",
+            ["src/pymatgen/optimization/ewald_minimizer.pyx"],
+            extra_link_args=extra_link_args,
+        ),
     ],
     include_dirs=[np.get_include()],
 )
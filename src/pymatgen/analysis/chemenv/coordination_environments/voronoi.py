@@ -16,9 +16,9 @@ from pymatgen.analysis.chemenv.utils.coordination_geometry_utils import (
 )
 from pymatgen.analysis.chemenv.utils.defs_utils import AdditionalConditions
 from pymatgen.analysis.chemenv.utils.math_utils import normal_cdf_step
+from pymatgen.analysis.local_env import get_voronoi_tessellation
 from pymatgen.core.sites import PeriodicSite
-from pymatgen.core.structure import Structure
-from scipy.spatial import Voronoi
+from pymatgen.core.structure import PeriodicNeighbor, Structure
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -136,53 +136,57 @@ class DetailedVoronoiContainer(MSONable):
         """
         self.voronoi_list2 = [None] * len(self.structure)
         self.voronoi_list_coords = [None] * len(self.structure)
-        logging.debug("Getting all neighbors in structure")
-        struct_neighbors = self.structure.get_all_neighbors(voronoi_cutoff, include_index=True)
-        size_neighbors = [(not len(neigh) > 3) for neigh in struct_neighbors]
-        if np.any(size_neighbors):
+        logging.debug("Getting the Voronoi tessellation of the structure")
+        # The tessellation of all sites is shared with other analyses, a few sites are tessellated on their own
+        subset = None if set(indices) == set(range(len(self.structure))) else indices
+        points, coords, root_points, voro = get_voronoi_tessellation(self.structure, voronoi_cutoff, indices=subset)
+        sites = [self.structure[isite] for isite in indices]
+        center_indices, *_ = self.structure.get_neighbor_list(voronoi_cutoff, sites)
+        if np.any(np.bincount(center_indices, minlength=len(indices)) <= 3):
             logging.debug("Please consider increasing voronoi_distance_cutoff")
         t1 = time.process_time()
         logging.debug("Setting up Voronoi list :")
         for jj, isite in enumerate(indices, start=1):
             logging.debug(f"  - Voronoi analysis for site #{isite} ({jj}/{len(indices)})")
             site = self.structure[isite]
-            neighbors1 = [(site, 0.0, isite)]
-            neighbors1.extend(struct_neighbors[isite])
-            distances = [i[1] for i in sorted(neighbors1, key=lambda s: s[1])]
-            neighbors = [i[0] for i in sorted(neighbors1, key=lambda s: s[1])]
-            qvoronoi_input = [s.coords for s in neighbors]
-            voro = Voronoi(points=qvoronoi_input, qhull_options="o Fv")
+            center = root_points[isite]
             all_vertices = voro.vertices
 
             results2 = []
             max_angle = 0.0
             min_dist = 10000.0
-            for idx, ridge_points in enumerate(voro.ridge_points):
-                if 0 in ridge_points:
-                    ridge_vertices_indices = voro.ridge_vertices[idx]
-                    if -1 in ridge_vertices_indices:
-                        raise RuntimeError(
-                            "This structure is pathological, infinite vertex in the voronoi construction"
-                        )
-
-                    ridge_point2 = max(ridge_points)
-                    facets = [all_vertices[i] for i in ridge_vertices_indices]
-                    sa = solid_angle(site.coords, facets)
-                    max_angle = max([sa, max_angle])
-
-                    min_dist = min([min_dist, distances[ridge_point2]])
-                    for iii, sss in enumerate(self.structure):
-                        if neighbors[ridge_point2].is_periodic_image(sss, tolerance=1.0e-6):
-                            idx = iii
-                            break
-                    results2.append(
-                        {
-                            "site": neighbors[ridge_point2],
-                            "angle": sa,
-                            "distance": distances[ridge_point2],
-                            "index": idx,
-                        }
-                    )
+            for idx in np.flatnonzero((voro.ridge_points == center).any(axis=1)):
+                ridge_points = voro.ridge_points[idx]
+                ridge_vertices_indices = voro.ridge_vertices[idx]
+                if -1 in ridge_vertices_indices:
+                    raise RuntimeError("This structure is pathological, infinite vertex in the voronoi construction")
+
+                ridge_point2 = ridge_points[0] if ridge_points[1] == center else ridge_points[1]
+                facets = [all_vertices[i] for i in ridge_vertices_indices]
+                sa = solid_angle(site.coords, facets)
+                max_angle = max([sa, max_angle])
+
+                distance = np.linalg.norm(coords[ridge_point2] - coords[center])
+                min_dist = min([min_dist, distance])
+                index, *image = points[ridge_point2].tolist()
+                nb_site = self.structure[index]
+                results2.append(
+                    {
+                        "site": PeriodicNeighbor(
+                            nb_site.species,
+                            nb_site.frac_coords + image,
+                            nb_site.lattice,
+                            properties=nb_site.properties,
+                            nn_distance=distance,
+                            index=index,
+                            image=tuple(image),
+                            label=nb_site.label,
+                        ),
+                        "angle": sa,
+                        "distance": distance,
+                        "index": index,
+                    }
+                )
             for dd in results2:
                 dd["normalized_angle"] = dd["angle"] / max_angle
                 dd["normalized_distance"] = dd["distance"] / min_dist
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import abc
 from collections import defaultdict
+from math import pi, radians, sin
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
@@ -12,7 +13,7 @@ from pymatgen.core.spectrum import Spectrum
 from pymatgen.util.plotting import add_fig_kwargs, pretty_plot
 
 if TYPE_CHECKING:
-    from pymatgen.core import Structure
+    from pymatgen.core import Lattice, Structure
 
 
 class DiffractionPattern(Spectrum):
@@ -71,6 +72,150 @@ class AbstractDiffractionPatternCalculator(abc.ABC):
         """
         raise NotImplementedError
 
+    @staticmethod
+    def _get_reflections(
+        lattice: Lattice, wavelength: float, two_theta_range: tuple[float, float] | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get all reciprocal lattice points satisfying the Bragg condition
+        within a two theta range.
+
+        Args:
+            lattice (Lattice): Real space lattice of the structure.
+            wavelength (float): Wavelength in angstroms.
+            two_theta_range ([float of length 2]): Range of two_thetas in
+                degrees. None for all diffracted beams within the limiting
+                sphere of radius 2 / wavelength.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Integer Miller indices of shape
+                (n_hkl, 3) and reciprocal lattice vector lengths 1 / d_hkl of
+                shape (n_hkl,), sorted by increasing length. (0, 0, 0) is
+                excluded.
+        """
+        # Obtained from Bragg condition. Note that reciprocal lattice
+        # vector length is 1 / d_hkl.
+        min_r, max_r = (
+            (0, 2 / wavelength)
+            if two_theta_range is None
+            else [2 * sin(radians(t / 2)) / wavelength for t in two_theta_range]
+        )
+
+        # Obtain crystallographic reciprocal lattice points within range
+        recip_lattice = lattice.reciprocal_lattice_crystallographic
+        recip_pts = recip_lattice.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], max_r)
+        recip_pts = sorted(recip_pts, key=lambda i: (i[1], -i[0][0], -i[0][1], -i[0][2]))
+
+        # Force miller indices to be integers
+        miller_indices = np.rint([pt[0] for pt in recip_pts]).astype(int).reshape(-1, 3)
+        g_hkls = np.array([pt[1] for pt in recip_pts])
+        mask = (g_hkls != 0) & (g_hkls >= min_r)
+        return miller_indices[mask], g_hkls[mask]
+
+    @staticmethod
+    def _get_position_factors(structure: Structure, miller_indices: np.ndarray) -> tuple[list[str], np.ndarray]:
+        """Get the sum of the position factors exp(2j * pi * g.r) over all
+        sites, weighted by the occupancy of each element on the sites.
+
+        Atomic scattering factors only depend on the element, so the structure
+        factors of all reflections are then the product of these position
+        factors with the scattering factors of the elements, summed over the
+        elements.
+
+        Args:
+            structure (Structure): Input structure.
+            miller_indices (np.ndarray): Miller indices of shape (n_hkl, 3).
+
+        Returns:
+            tuple[list[str], np.ndarray]: Symbols of the elements in the
+                structure and the complex position factors of shape
+                (n_hkl, n_elements).
+        """
+        symbols = list(dict.fromkeys(sp.symbol for sp in structure.composition))
+        occus = np.zeros((len(structure), len(symbols)))
+        for idx, site in enumerate(structure):
+            for sp, occu in site.species.items():
+                occus[idx, symbols.index(sp.symbol)] += occu
+
+        # exp(2j * pi * g.r) factorizes into exp(2j * pi * h * x) * exp(2j * pi * k * y) *
+        # exp(2j * pi * l * z), so only these 1D tables of shape (n_indices, n_sites) need
+        # complex exponentials. The (n_hkl, n_sites) products are formed in blocks of
+        # reflections to keep the temporary arrays in cache for large cells.
+        min_indices = miller_indices.min(axis=0, initial=0)
+        tables = [
+            np.exp(2j * pi * np.outer(np.arange(min_idx, max_idx + 1), frac_coords))
+            for min_idx, max_idx, frac_coords in zip(
+                min_indices, miller_indices.max(axis=0, initial=0), structure.frac_coords.T
+            )
+        ]
+        position_factors = np.empty((len(miller_indices), len(symbols)), dtype=complex)
+        block_size = max(1, 2**18 // max(1, len(structure)))
+        for start in range(0, len(miller_indices), block_size):
+            h, k, l = (miller_indices[start : start + block_size] - min_indices).T  # noqa: E741
+            position_factors[start : start + block_size] = (tables[0][h] * tables[1][k] * tables[2][l]) @ occus
+        return symbols, position_factors
+
+    def _get_diffraction_pattern(
+        self,
+        two_thetas: np.ndarray,
+        intensities: np.ndarray,
+        miller_indices: np.ndarray,
+        g_hkls: np.ndarray,
+        *,
+        is_hex: bool = False,
+        scaled: bool = True,
+    ) -> DiffractionPattern:
+        """Merge reflections with the same two theta into peaks.
+
+        Args:
+            two_thetas (np.ndarray): Two theta of each reflection in degrees,
+                sorted in increasing order.
+            intensities (np.ndarray): Intensity of each reflection.
+            miller_indices (np.ndarray): Miller indices of each reflection.
+            g_hkls (np.ndarray): Reciprocal lattice vector length of each
+                reflection.
+            is_hex (bool): Whether to use Miller-Bravais indices for the
+                peaks of a hexagonal lattice.
+            scaled (bool): Whether to scale the maximum intensity to 100.
+
+        Returns:
+            DiffractionPattern
+        """
+        # Deal with floating point precision issues by merging hkls with the
+        # same two theta into one peak. As the hkls are sorted by two theta,
+        # an hkl can only ever be merged into the last peak.
+        peak_starts: list[int] = []
+        peak_two_theta = -np.inf
+        for idx, two_theta in enumerate(two_thetas.tolist()):
+            if two_theta - peak_two_theta >= self.TWO_THETA_TOL:
+                peak_starts.append(idx)
+                peak_two_theta = two_theta
+        peak_ends = [*peak_starts[1:], len(two_thetas)]
+        peak_intensities = np.add.reduceat(intensities, peak_starts) if peak_starts else intensities
+
+        if is_hex:
+            # Use Miller-Bravais indices for hexagonal lattices
+            h, k, l = miller_indices.T  # noqa: E741
+            miller_indices = np.column_stack([h, k, -h - k, l])
+        hkl_tuples = list(map(tuple, miller_indices.tolist()))
+
+        # Scale intensities so that the max intensity is 100
+        max_intensity = max(peak_intensities)
+        x = []
+        y = []
+        hkls = []
+        d_hkls = []
+        for start, end, intensity in zip(peak_starts, peak_ends, peak_intensities):
+            if intensity / max_intensity * 100 > self.SCALED_INTENSITY_TOL:
+                fam = get_unique_families(hkl_tuples[start:end])
+                x.append(two_thetas[start])
+                y.append(intensity)
+                hkls.append([{"hkl": hkl, "multiplicity": mult} for hkl, mult in fam.items()])
+                d_hkls.append(1 / g_hkls[start])
+        pattern = DiffractionPattern(x, y, hkls, d_hkls)
+        if scaled:
+            pattern.normalize(mode="max", value=100)
+        return pattern
+
     def get_plot(
         self,
         structure: Structure,
@@ -4,15 +4,10 @@ from __future__ import annotations
 
 import json
 import os
-from math import asin, cos, degrees, pi, radians, sin
 from typing import TYPE_CHECKING
 
 import numpy as np
-from pymatgen.analysis.diffraction.core import (
-    AbstractDiffractionPatternCalculator,
-    DiffractionPattern,
-    get_unique_families,
-)
+from pymatgen.analysis.diffraction.core import AbstractDiffractionPatternCalculator
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 if TYPE_CHECKING:
@@ -84,113 +79,48 @@ class NDCalculator(AbstractDiffractionPatternCalculator):
             structure = finder.get_refined_structure()
 
         wavelength = self.wavelength
-        lattice = structure.lattice
-        is_hex = lattice.is_hexagonal()
-
-        # Obtained from Bragg condition. Note that reciprocal lattice
-        # vector length is 1 / d_hkl.
-        min_r, max_r = (
-            (0, 2 / wavelength)
-            if two_theta_range is None
-            else [2 * sin(radians(t / 2)) / wavelength for t in two_theta_range]
-        )
+        miller_indices, g_hkls = self._get_reflections(structure.lattice, wavelength, two_theta_range)
 
-        # Obtain crystallographic reciprocal lattice points within range
-        recip_lattice = lattice.reciprocal_lattice_crystallographic
-        recip_pts = recip_lattice.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], max_r)
-        if min_r:
-            recip_pts = [pt for pt in recip_pts if pt[1] >= min_r]
-
-        # Create a flattened array of coeffs, frac_coords and occus. This is
-        # used to perform vectorized computation of atomic scattering factors
-        # later. Note that these are not necessarily the same size as the
-        # structure as each partially occupied specie occupies its own
-        # position in the flattened array.
+        # The scattering lengths and Debye-Waller corrections only depend on
+        # the element, so they are computed once per element present.
+        symbols, position_factors = self._get_position_factors(structure, miller_indices)
         _coeffs = []
-        _frac_coords = []
-        _occus = []
         _dwfactors = []
-
-        for site in structure:
-            for sp, occu in site.species.items():
-                try:
-                    c = ATOMIC_SCATTERING_LEN[sp.symbol]
-                except KeyError:
-                    raise ValueError(
-                        f"Unable to calculate ND pattern as there is no scattering coefficients for {sp.symbol}."
-                    )
-                _coeffs.append(c)
-                _dwfactors.append(self.debye_waller_factors.get(sp.symbol, 0))
-                _frac_coords.append(site.frac_coords)
-                _occus.append(occu)
+        for symbol in symbols:
+            try:
+                _coeffs.append(ATOMIC_SCATTERING_LEN[symbol])
+            except KeyError:
+                raise ValueError(f"Unable to calculate ND pattern as there is no scattering coefficients for {symbol}.")
+            _dwfactors.append(self.debye_waller_factors.get(symbol, 0))
 
         coeffs = np.array(_coeffs)
-        frac_coords = np.array(_frac_coords)
-        occus = np.array(_occus)
         dw_factors = np.array(_dwfactors)
-        peaks: dict[float, list[float | list[tuple[int, ...]]]] = {}
-        two_thetas: list[float] = []
-
-        for hkl, g_hkl, ind, _ in sorted(recip_pts, key=lambda i: (i[1], -i[0][0], -i[0][1], -i[0][2])):
-            # Force miller indices to be integers
-            hkl = [int(round(i)) for i in hkl]
-            if g_hkl != 0:
-                d_hkl = 1 / g_hkl
-
-                # Bragg condition
-                theta = asin(wavelength * g_hkl / 2)
-
-                # s = sin(theta) / wavelength = 1 / 2d = |ghkl| / 2 (d =
-                # 1/|ghkl|)
-                s = g_hkl / 2
-
-                # Calculate Debye-Waller factor
-                dw_correction = np.exp(-dw_factors * (s**2))
-
-                # Vectorized computation of g.r for all fractional coords and
-                # hkl
-                g_dot_r = np.dot(frac_coords, np.transpose([hkl])).T[0]
-
-                # Structure factor = sum of atomic scattering factors (with
-                # position factor exp(2j * pi * g.r and occupancies).
-                # Vectorized computation.
-                f_hkl = np.sum(coeffs * occus * np.exp(2j * pi * g_dot_r) * dw_correction)
-
-                # Lorentz polarization correction for hkl
-                lorentz_factor = 1 / (sin(theta) ** 2 * cos(theta))
-
-                # Intensity for hkl is modulus square of structure factor
-                i_hkl = (f_hkl * f_hkl.conjugate()).real
-
-                two_theta = degrees(2 * theta)
-
-                if is_hex:
-                    # Use Miller-Bravais indices for hexagonal lattices
-                    hkl = (hkl[0], hkl[1], -hkl[0] - hkl[1], hkl[2])
-                # Deal with floating point precision issues
-                ind = np.where(np.abs(np.subtract(two_thetas, two_theta)) < self.TWO_THETA_TOL)
-                if len(ind[0]) > 0:
-                    peaks[two_thetas[ind[0][0]]][0] += i_hkl * lorentz_factor
-                    peaks[two_thetas[ind[0][0]]][1].append(tuple(hkl))  # type: ignore[union-attr]
-                else:
-                    peaks[two_theta] = [i_hkl * lorentz_factor, [tuple(hkl)], d_hkl]
-                    two_thetas.append(two_theta)
-
-        # Scale intensities so that the max intensity is 100
-        max_intensity = max(v[0] for v in peaks.values())
-        x = []
-        y = []
-        hkls = []
-        d_hkls = []
-        for key in sorted(peaks):
-            v = peaks[key]
-            fam = get_unique_families(v[1])
-            if v[0] / max_intensity * 100 > self.SCALED_INTENSITY_TOL:  # type: ignore[operator]
-                x.append(key)
-                y.append(v[0])
-                hkls.append([{"hkl": hkl, "multiplicity": mult} for hkl, mult in fam.items()])
-                d_hkls.append(v[2])
-        nd = DiffractionPattern(x, y, hkls, d_hkls)
-        if scaled:
-            nd.normalize(mode="max", value=100)
-        return nd
+
+        # Bragg condition
+        thetas = np.arcsin(wavelength * g_hkls / 2)
+
+        # s = sin(theta) / wavelength = 1 / 2d = |ghkl| / 2 (d = 1/|ghkl|)
+        s = g_hkls[:, None] / 2
+
+        # Calculate Debye-Waller factor
+        dw_correction = np.exp(-dw_factors * (s**2))
+
+        # Structure factor = sum of atomic scattering factors (with
+        # position factor exp(2j * pi * g.r and occupancies).
+        # Vectorized computation.
+        f_hkls = np.sum(coeffs * dw_correction * position_factors, axis=1)
+
+        # Lorentz polarization correction for hkl
+        lorentz_factors = 1 / (np.sin(thetas) ** 2 * np.cos(thetas))
+
+        # Intensity for hkl is modulus square of structure factor
+        intensities = (f_hkls * f_hkls.conjugate()).real * lorentz_factors
+
+        return self._get_diffraction_pattern(
+            np.degrees(2 * thetas),
+            intensities,
+            miller_indices,
+            g_hkls,
+            is_hex=structure.lattice.is_hexagonal(),
+            scaled=scaled,
+        )
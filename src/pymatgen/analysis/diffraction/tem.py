@@ -136,7 +136,9 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
         points_filtered = self.zone_axis_filter(points)
         if (0, 0, 0) in points_filtered:
             points_filtered.remove((0, 0, 0))
-        interplanar_spacings_val = np.array([structure.lattice.d_hkl(x) for x in points_filtered])
+        hkls = np.reshape(points_filtered, (-1, 3))
+        g_star = structure.lattice.reciprocal_lattice_crystallographic.metric_tensor
+        interplanar_spacings_val = 1 / np.sqrt(np.einsum("ij,jk,ik->i", hkls, g_star, hkls))
         return dict(zip(points_filtered, interplanar_spacings_val))
 
     def bragg_angles(self, interplanar_spacings: dict[Tuple3Ints, float]) -> dict[Tuple3Ints, float]:
@@ -184,19 +186,14 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
             dict of atomic symbol to another dict of hkl plane to x-ray factor (in angstroms).
         """
         x_ray_factors = {}
-        s2 = self.get_s2(bragg_angles)
-        atoms = structure.elements
-        scattering_factors_for_atom = {}
-        for atom in atoms:
+        s2 = np.array(list(self.get_s2(bragg_angles).values()))[:, None]
+        for atom in structure.elements:
             coeffs = np.array(ATOMIC_SCATTERING_PARAMS[atom.symbol])
-            for plane in bragg_angles:
-                scattering_factor_curr = atom.Z - 41.78214 * s2[plane] * np.sum(
-                    coeffs[:, 0] * np.exp(-coeffs[:, 1] * s2[plane]),
-                    axis=None,
-                )
-                scattering_factors_for_atom[plane] = scattering_factor_curr
-            x_ray_factors[atom.symbol] = scattering_factors_for_atom
-            scattering_factors_for_atom = {}
+            scattering_factors = atom.Z - 41.78214 * s2[:, 0] * np.sum(
+                coeffs[:, 0] * np.exp(-coeffs[:, 1] * s2),
+                axis=1,
+            )
+            x_ray_factors[atom.symbol] = dict(zip(bragg_angles, scattering_factors))
         return x_ray_factors
 
     def electron_scattering_factors(
@@ -214,16 +211,12 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
         """
         electron_scattering_factors = {}
         x_ray_factors = self.x_ray_factors(structure, bragg_angles)
-        s2 = self.get_s2(bragg_angles)
-        atoms = structure.elements
+        s2 = np.array(list(self.get_s2(bragg_angles).values()))
         prefactor = 0.023934
-        scattering_factors_for_atom = {}
-        for atom in atoms:
-            for plane in bragg_angles:
-                scattering_factor_curr = prefactor * (atom.Z - x_ray_factors[atom.symbol][plane]) / s2[plane]
-                scattering_factors_for_atom[plane] = scattering_factor_curr
-            electron_scattering_factors[atom.symbol] = scattering_factors_for_atom
-            scattering_factors_for_atom = {}
+        for atom in structure.elements:
+            x_ray_factors_val = np.array(list(x_ray_factors[atom.symbol].values()))
+            scattering_factors = prefactor * (atom.Z - x_ray_factors_val) / s2
+            electron_scattering_factors[atom.symbol] = dict(zip(bragg_angles, scattering_factors))
         return electron_scattering_factors
 
     def cell_scattering_factors(
@@ -239,19 +232,18 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
         Returns:
             dict of hkl plane (3-tuple) to scattering factor (in angstroms).
         """
-        cell_scattering_factors = {}
         electron_scattering_factors = self.electron_scattering_factors(structure, bragg_angles)
-        scattering_factor_curr = 0
-        for plane in bragg_angles:
-            for site in structure:
-                for sp in site.species:
-                    g_dot_r = np.dot(np.array(plane), np.transpose(site.frac_coords))
-                    scattering_factor_curr += electron_scattering_factors[sp.symbol][plane] * np.exp(
-                        2j * np.pi * g_dot_r
-                    )
-            cell_scattering_factors[plane] = scattering_factor_curr
-            scattering_factor_curr = 0
-        return cell_scattering_factors
+        symbols = list(electron_scattering_factors)
+        # Number of times each element occurs on each site, with shape (n_sites, n_elements)
+        counts = np.zeros((len(structure), len(symbols)))
+        for idx, site in enumerate(structure):
+            for sp in site.species:
+                counts[idx, symbols.index(sp.symbol)] += 1
+        planes = np.reshape(list(bragg_angles), (-1, 3))
+        # Sum of exp(2j * pi * g.r) over the sites of each element, with shape (n_planes, n_elements)
+        position_factors = np.exp(2j * np.pi * (planes @ structure.frac_coords.T)) @ counts
+        factors = np.array([list(electron_scattering_factors[symbol].values()) for symbol in symbols]).T
+        return dict(zip(bragg_angles, np.sum(factors * position_factors, axis=1)))
 
     def cell_intensity(self, structure: Structure, bragg_angles: dict[Tuple3Ints, float]) -> dict[Tuple3Ints, float]:
         """
@@ -322,13 +314,9 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
         Returns:
             dict of hkl plane to normalized cell intensity
         """
-        normalized_cell_intensity = {}
         cell_intensity = self.cell_intensity(structure, bragg_angles)
-        max_intensity = max(cell_intensity.values())
-        norm_factor = 1 / max_intensity
-        for plane in cell_intensity:
-            normalized_cell_intensity[plane] = cell_intensity[plane] * norm_factor
-        return normalized_cell_intensity
+        cell_intensity_val = np.array(list(cell_intensity.values()))
+        return dict(zip(cell_intensity, cell_intensity_val / cell_intensity_val.max()))
 
     def is_parallel(
         self,
@@ -489,15 +477,11 @@ class TEMCalculator(AbstractDiffractionPatternCalculator):
         r2 = self.wavelength_rel() * self.camera_length / second_d
         phi = np.deg2rad(self.get_interplanar_angle(structure, first_point, second_point))
         positions[second_point] = np.array([r2 * np.cos(phi), r2 * np.sin(phi)])
-        for plane in points:
-            coeffs = self.get_plot_coeffs(p1, p2, plane)
-            pos = np.array(
-                [
-                    coeffs[0] * positions[first_point][0] + coeffs[1] * positions[second_point][0],
-                    coeffs[0] * positions[first_point][1] + coeffs[1] * positions[second_point][1],
-                ]
-            )
-            positions[plane] = pos
+        # Coefficients of the vector addition of p1 and p2 for all remaining points at
+        # once, equivalent to calling get_plot_coeffs(p1, p2, plane) for every plane
+        coeffs = np.reshape(points, (-1, 3)) @ np.linalg.pinv(np.array([p1, p2]).T).T
+        basis = np.array([positions[first_point], positions[second_point]])
+        positions.update(zip(points, coeffs @ basis))
         points.append((0, 0, 0))
         points.append(first_point)
         points.append(second_point)
@@ -4,18 +4,18 @@ from __future__ import annotations
 
 import json
 import os
-from math import asin, cos, degrees, pi, radians, sin
+from functools import partial
+from multiprocessing import Pool
 from typing import TYPE_CHECKING
 
 import numpy as np
-from pymatgen.analysis.diffraction.core import (
-    AbstractDiffractionPatternCalculator,
-    DiffractionPattern,
-    get_unique_families,
-)
+from pymatgen.analysis.diffraction.core import AbstractDiffractionPatternCalculator
+from pymatgen.core import Element
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from pymatgen.core import Structure
 
 # XRD wavelengths in angstroms
@@ -145,131 +145,117 @@ class XRDCalculator(AbstractDiffractionPatternCalculator):
             structure = finder.get_refined_structure()
 
         wavelength = self.wavelength
-        lattice = structure.lattice
-        is_hex = lattice.is_hexagonal()
-
-        # Obtained from Bragg condition. Note that reciprocal lattice
-        # vector length is 1 / d_hkl.
-        min_r, max_r = (
-            (0, 2 / wavelength)
-            if two_theta_range is None
-            else [2 * sin(radians(t / 2)) / wavelength for t in two_theta_range]
-        )
+        miller_indices, g_hkls = self._get_reflections(structure.lattice, wavelength, two_theta_range)
 
-        # Obtain crystallographic reciprocal lattice points within range
-        recip_lattice = lattice.reciprocal_lattice_crystallographic
-        recip_pts = recip_lattice.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], max_r)
-        if min_r:
-            recip_pts = [pt for pt in recip_pts if pt[1] >= min_r]
-
-        # Create a flattened array of zs, coeffs, frac_coords and occus. This is used to perform
-        # vectorized computation of atomic scattering factors later. Note that these are not
-        # necessarily the same size as the structure as each partially occupied specie occupies its
-        # own position in the flattened array.
+        # The atomic scattering factors and Debye-Waller corrections only depend
+        # on the element, so they are computed once per element present.
+        symbols, position_factors = self._get_position_factors(structure, miller_indices)
         _zs = []
         _coeffs = []
-        _frac_coords = []
-        _occus = []
         _dw_factors = []
-
-        for site in structure:
-            for sp, occu in site.species.items():
-                _zs.append(sp.Z)
-                try:
-                    c = ATOMIC_SCATTERING_PARAMS[sp.symbol]
-                except KeyError:
-                    raise ValueError(
-                        f"Unable to calculate XRD pattern as there is no scattering coefficients for {sp.symbol}."
-                    )
-                _coeffs.append(c)
-                _dw_factors.append(self.debye_waller_factors.get(sp.symbol, 0))
-                _frac_coords.append(site.frac_coords)
-                _occus.append(occu)
+        for symbol in symbols:
+            try:
+                _coeffs.append(ATOMIC_SCATTERING_PARAMS[symbol])
+            except KeyError:
+                raise ValueError(
+                    f"Unable to calculate XRD pattern as there is no scattering coefficients for {symbol}."
+                )
+            _zs.append(Element(symbol).Z)
+            _dw_factors.append(self.debye_waller_factors.get(symbol, 0))
 
         zs = np.array(_zs)
         coeffs = np.array(_coeffs)
-        frac_coords = np.array(_frac_coords)
-        occus = np.array(_occus)
         dw_factors = np.array(_dw_factors)
-        peaks: dict[float, list[float | list[tuple[int, ...]]]] = {}
-        two_thetas: list[float] = []
-
-        for hkl, g_hkl, ind, _ in sorted(recip_pts, key=lambda i: (i[1], -i[0][0], -i[0][1], -i[0][2])):
-            # Force miller indices to be integers
-            hkl = [int(round(i)) for i in hkl]
-            if g_hkl != 0:
-                # Bragg condition
-                theta = asin(wavelength * g_hkl / 2)
-
-                # s = sin(theta) / wavelength = 1 / 2d = |ghkl| / 2 (d =
-                # 1/|ghkl|)
-                s = g_hkl / 2
-
-                # Store s^2 since we are using it a few times
-                s2 = s**2
-
-                # Vectorized computation of g.r for all fractional coords and
-                # hkl
-                g_dot_r = np.dot(frac_coords, np.transpose([hkl])).T[0]
-
-                # Highly vectorized computation of atomic scattering factors.
-                # Equivalent non-vectorized code is:
-                #
-                #   for site in structure:
-                #      el = site.specie
-                #      coeff = ATOMIC_SCATTERING_PARAMS[el.symbol]
-                #      fs = el.Z - 41.78214 * s2 * sum(
-                #          [d[0] * exp(-d[1] * s2) for d in coeff])
-                fs = zs - 41.78214 * s2 * np.sum(
-                    coeffs[:, :, 0] * np.exp(-coeffs[:, :, 1] * s2),
-                    axis=1,
-                )
 
-                dw_correction = np.exp(-dw_factors * s2)
+        # Bragg condition
+        thetas = np.arcsin(wavelength * g_hkls / 2)
+
+        # s = sin(theta) / wavelength = 1 / 2d = |ghkl| / 2 (d = 1/|ghkl|).
+        # Store s^2 as a column since it is broadcast over all elements.
+        s2 = (g_hkls[:, None] / 2) ** 2
+
+        # Highly vectorized computation of atomic scattering factors for all
+        # hkl and elements. Equivalent non-vectorized code is:
+        #
+        #   for hkl in miller_indices:
+        #      for el in elements:
+        #         coeff = ATOMIC_SCATTERING_PARAMS[el.symbol]
+        #         fs = el.Z - 41.78214 * s2 * sum(
+        #             [d[0] * exp(-d[1] * s2) for d in coeff])
+        fs = zs - 41.78214 * s2 * np.sum(coeffs[:, :, 0] * np.exp(-coeffs[:, :, 1] * s2[:, :, None]), axis=2)
+
+        dw_correction = np.exp(-dw_factors * s2)
+
+        # Structure factor = sum of atomic scattering factors (with
+        # position factor exp(2j * pi * g.r and occupancies).
+        f_hkls = np.sum(fs * dw_correction * position_factors, axis=1)
+
+        # Lorentz polarization correction for hkl
+        lorentz_factors = (1 + np.cos(2 * thetas) ** 2) / (np.sin(thetas) ** 2 * np.cos(thetas))
+
+        # Intensity for hkl is modulus square of structure factor
+        intensities = (f_hkls * f_hkls.conjugate()).real * lorentz_factors
+
+        return self._get_diffraction_pattern(
+            np.degrees(2 * thetas),
+            intensities,
+            miller_indices,
+            g_hkls,
+            is_hex=structure.lattice.is_hexagonal(),
+            scaled=scaled,
+        )
 
-                # Structure factor = sum of atomic scattering factors (with
-                # position factor exp(2j * pi * g.r and occupancies).
-                # Vectorized computation.
-                f_hkl = np.sum(fs * occus * np.exp(2j * pi * g_dot_r) * dw_correction)
+    def get_patterns(
+        self,
+        structures: Sequence[Structure],
+        two_theta_range: tuple[float, float] = (0, 90),
+        step: float = 0.02,
+        scaled: bool = True,
+        n_jobs: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the diffraction patterns of many structures on a common
+        two theta grid, e.g. to index an experimental pattern against a
+        database of structures.
 
-                # Lorentz polarization correction for hkl
-                lorentz_factor = (1 + cos(2 * theta) ** 2) / (sin(theta) ** 2 * cos(theta))
+        Args:
+            structures ([Structure]): Input structures.
+            two_theta_range ([float of length 2]): Tuple for range of
+                two_thetas to calculate in degrees. Defaults to (0, 90).
+            step (float): Spacing of the two theta grid in degrees. The
+                intensity of each peak is added to the closest grid point.
+                Defaults to 0.02.
+            scaled (bool): Whether to scale the intensities of each pattern
+                so that the maximum is 100. Defaults to True.
+            n_jobs (int): Number of processes to calculate the patterns
+                with. Defaults to 1.
 
-                # Intensity for hkl is modulus square of structure factor
-                i_hkl = (f_hkl * f_hkl.conjugate()).real
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The two theta grid of shape
+                (n_points,) and the intensities of all patterns of shape
+                (len(structures), n_points).
+        """
+        n_points = round((two_theta_range[1] - two_theta_range[0]) / step) + 1
+        two_thetas = np.linspace(two_theta_range[0], two_theta_range[0] + (n_points - 1) * step, n_points)
+        get_intensities = partial(self._get_intensities_on_grid, two_thetas=two_thetas, scaled=scaled)
+
+        if n_jobs > 1:
+            chunksize = max(1, len(structures) // (4 * n_jobs))
+            with Pool(n_jobs) as pool:
+                intensities = list(pool.imap(get_intensities, structures, chunksize=chunksize))
+        else:
+            intensities = list(map(get_intensities, structures))
 
-                two_theta = degrees(2 * theta)
+        return two_thetas, np.array(intensities).reshape(len(structures), n_points)
 
-                if is_hex:
-                    # Use Miller-Bravais indices for hexagonal lattices
-                    hkl = (hkl[0], hkl[1], -hkl[0] - hkl[1], hkl[2])
-                # Deal with floating point precision issues
-                ind = np.where(
-                    np.abs(np.subtract(two_thetas, two_theta)) < AbstractDiffractionPatternCalculator.TWO_THETA_TOL
-                )
-                if len(ind[0]) > 0:
-                    peaks[two_thetas[ind[0][0]]][0] += i_hkl * lorentz_factor
-                    peaks[two_thetas[ind[0][0]]][1].append(tuple(hkl))  # type: ignore[union-attr]
-                else:
-                    d_hkl = 1 / g_hkl
-                    peaks[two_theta] = [i_hkl * lorentz_factor, [tuple(hkl)], d_hkl]
-                    two_thetas.append(two_theta)
-
-        # Scale intensities so that the max intensity is 100
-        max_intensity = max(v[0] for v in peaks.values())
-        x = []
-        y = []
-        hkls = []
-        d_hkls = []
-        for k in sorted(peaks):
-            v = peaks[k]
-            fam = get_unique_families(v[1])
-            if v[0] / max_intensity * 100 > AbstractDiffractionPatternCalculator.SCALED_INTENSITY_TOL:  # type: ignore[operator]
-                x.append(k)
-                y.append(v[0])
-                hkls.append([{"hkl": hkl, "multiplicity": mult} for hkl, mult in fam.items()])
-                d_hkls.append(v[2])
-        xrd = DiffractionPattern(x, y, hkls, d_hkls)
+    def _get_intensities_on_grid(self, structure: Structure, two_thetas: np.ndarray, scaled: bool) -> np.ndarray:
+        """Bin the peaks of the diffraction pattern of a structure onto an
+        evenly spaced two theta grid.
+        """
+        step = two_thetas[1] - two_thetas[0] if len(two_thetas) > 1 else 1
+        xrd = self.get_pattern(structure, scaled=False, two_theta_range=(two_thetas[0], two_thetas[-1]))
+        indices = np.clip(np.rint((xrd.x - two_thetas[0]) / step).astype(int), 0, len(two_thetas) - 1)
+        intensities = np.zeros(len(two_thetas))
+        np.add.at(intensities, indices, xrd.y)
         if scaled:
-            xrd.normalize(mode="max", value=100)
-        return xrd
+            intensities *= 100 / intensities.max()
+        return intensities
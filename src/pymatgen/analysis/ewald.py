@@ -4,21 +4,27 @@ from __future__ import annotations
 
 import bisect
 import math
-from copy import copy, deepcopy
-from datetime import datetime
+import time
+from multiprocessing import Pool
+from multiprocessing.sharedctypes import RawArray
 from typing import TYPE_CHECKING
 from warnings import warn
 
 import numpy as np
+from monty.dev import deprecated
 from monty.json import MSONable
 from pymatgen.core.structure import Structure
+from pymatgen.optimization.ewald_minimizer import BranchAndBound
 from pymatgen.util.due import Doi, due
 from scipy import constants
 from scipy.special import comb, erfc
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
     from typing import Any
 
+    from numpy.typing import ArrayLike
+    from pymatgen.core.lattice import Lattice
     from typing_extensions import Self
 
 __author__ = "Shyue Ping Ong, William Davidson Richard"
@@ -48,7 +54,11 @@ class EwaldSummation(MSONable):
         URL: http://www.ee.duke.edu/~ayt/ewaldpaper/ewaldpaper.html
 
     This matrix can be used to do fast calculations of Ewald sums after species
-    removal.
+    removal. The interactions between sites only depend on the lattice and the
+    site positions, so they are computed once as a charge independent
+    interaction_matrix. The energies of other charge assignments, e.g. many orderings
+    of a disordered structure, are then quadratic forms of that matrix, see
+    compute_energies and compute_energy_change.
 
     E = E_recip + E_real + E_point
 
@@ -124,19 +134,75 @@ class EwaldSummation(MSONable):
         # space terms.
         self._initialized = False
         self._recip = self._real = self._point = self._forces = None
+        self._interaction: np.ndarray | None = None
+        self._interaction_matrices: tuple[np.ndarray, np.ndarray, float] | None = None
 
         # Compute the correction for a charged cell
         self._charged_cell_energy = (
             -EwaldSummation.CONV_FACT / 2 * np.pi / structure.volume / self._eta * structure.charge**2
         )
 
+    @property
+    def interaction_matrix(self) -> np.ndarray:
+        """The charge independent interaction matrix M, such that the Ewald
+        energy of a charge vector q is q^T M q. Element (i, j) is the sum of the
+        real and reciprocal space interaction energies between unit charges on
+        sites i and j, and the point energies of unit charges are on the
+        diagonal.
+
+        Note that this does not include the charged-cell energy, which is only important
+        when the simulation cell is not charge balanced.
+        """
+        if self._interaction is None:
+            recip, real, point = self._get_interaction_matrices()
+            self._interaction = recip + real
+            self._interaction[np.diag_indices_from(self._interaction)] += point
+        return self._interaction
+
+    def compute_energies(self, charges: ArrayLike) -> float | np.ndarray:
+        """Get total Ewald energies of the structure with different charges on
+        the sites, e.g. for many orderings of a disordered structure. This is
+        equivalent to summing total_energy_matrix for each charge vector, but
+        the interactions between the sites are only computed once.
+
+        Args:
+            charges (ArrayLike): Charges on the sites with shape (n_sites,),
+                or a batch of charge vectors with shape (n, n_sites). Use 0
+                for removed sites.
+
+        Returns:
+            float | np.ndarray: Ewald energy of each charge vector, excluding
+                the charged-cell energy.
+        """
+        charges = np.asarray(charges, dtype=np.float64)
+        energies = np.sum((charges @ self.interaction_matrix) * charges, axis=-1)
+        return float(energies) if energies.ndim == 0 else energies
+
+    def compute_energy_change(self, charges: ArrayLike, indices: ArrayLike, new_charges: ArrayLike) -> float:
+        """Get the change in Ewald energy when the charges on a few sites are
+        changed, e.g. by swapping the species on two sites. This takes
+        O(n_sites * len(indices)) operations.
+
+        Args:
+            charges (ArrayLike): Current charges on all sites.
+            indices (ArrayLike): Indices of the sites whose charge changes.
+            new_charges (ArrayLike): New charges on these sites.
+
+        Returns:
+            float: Energy after the change minus the energy before.
+        """
+        charges = np.asarray(charges, dtype=np.float64)
+        indices = np.asarray(indices, dtype=int)
+        delta = np.asarray(new_charges, dtype=np.float64) - charges[indices]
+        matrix = self.interaction_matrix
+        change = delta @ (matrix[indices] @ charges + charges @ matrix[:, indices])
+        return float(change + delta @ matrix[np.ix_(indices, indices)] @ delta)
+
     def compute_partial_energy(self, removed_indices):
         """Get total Ewald energy for certain sites being removed, i.e. zeroed out."""
-        total_energy_matrix = self.total_energy_matrix.copy()
-        for idx in removed_indices:
-            total_energy_matrix[idx, :] = 0
-            total_energy_matrix[:, idx] = 0
-        return sum(sum(total_energy_matrix))
+        charges = np.array(self._oxi_states, dtype=np.float64)
+        charges[list(removed_indices)] = 0
+        return self.compute_energies(charges)
 
     def compute_sub_structure(self, sub_structure, tol: float = 1e-3):
         """Get total Ewald energy for an sub structure in the same
@@ -150,37 +216,27 @@ class EwaldSummation(MSONable):
         Returns:
             Ewald sum of substructure.
         """
-        total_energy_matrix = self.total_energy_matrix.copy()
-
-        def find_match(site):
-            for test_site in sub_structure:
-                frac_diff = abs(np.array(site.frac_coords) - np.array(test_site.frac_coords)) % 1
-                frac_diff = [abs(a) < tol or abs(a) > 1 - tol for a in frac_diff]
-                if all(frac_diff):
-                    return test_site
-            return None
-
-        matches = []
-        for idx, site in enumerate(self._struct):
-            matching_site = find_match(site)
-            if matching_site:
-                new_charge = compute_average_oxidation_state(matching_site)
-                old_charge = self._oxi_states[idx]
-                scaling_factor = new_charge / old_charge
-                matches.append(matching_site)
-            else:
-                scaling_factor = 0
-            total_energy_matrix[idx, :] *= scaling_factor
-            total_energy_matrix[:, idx] *= scaling_factor
-
-        if len(matches) != len(sub_structure):
+        # Each site is matched to the first site of the sub_structure at the same
+        # fractional coordinates (modulo periodic images)
+        frac_diff = np.abs(self._struct.frac_coords[:, None] - sub_structure.frac_coords[None, :]) % 1
+        is_match = np.all((frac_diff < tol) | (frac_diff > 1 - tol), axis=2)
+        has_match = is_match.any(axis=1)
+        match_indices = is_match.argmax(axis=1)
+
+        charges = np.zeros(len(self._struct))
+        sub_oxi_states = [compute_average_oxidation_state(site) for site in sub_structure]
+        for idx in np.flatnonzero(has_match):
+            charges[idx] = sub_oxi_states[match_indices[idx]]
+
+        if np.count_nonzero(has_match) != len(sub_structure):
             output = ["Missing sites."]
-            for site in sub_structure:
-                if site not in matches:
+            matched = set(match_indices[has_match].tolist())
+            for idx, site in enumerate(sub_structure):
+                if idx not in matched:
                     output.append(f"unmatched = {site}")
             raise ValueError("\n".join(output))
 
-        return sum(sum(total_energy_matrix))
+        return self.compute_energies(charges)
 
     @property
     def reciprocal_space_energy(self):
@@ -305,85 +361,60 @@ class EwaldSummation(MSONable):
         S(G) = sum_{k=1,N} q_k exp(-i G.r_k)
         S(G)S(-G) = |S(G)|**2.
 
-        This method is heavily vectorized to utilize numpy's C backend for speed.
+        The charge independent part is computed (and cached) by
+        _get_interaction_matrices. The forces are computed here since they
+        are only needed for the charges of this structure.
         """
-        n_sites = len(self._struct)
-        prefactor = 2 * math.pi / self._vol
-        e_recip = np.zeros((n_sites, n_sites), dtype=np.float64)
-        forces = np.zeros((n_sites, 3), dtype=np.float64)
-        coords = self._coords
-        rcp_latt = self._struct.lattice.reciprocal_lattice
-        recip_nn = rcp_latt.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], self._gmax)
-
-        frac_coords = [frac_coords for (frac_coords, dist, _idx, _img) in recip_nn if dist != 0]
-
-        gs = rcp_latt.get_cartesian_coords(frac_coords)
-        g2s = np.sum(gs**2, 1)
-        exp_vals = np.exp(-g2s / (4 * self._eta))
-        grs = np.sum(gs[:, None] * coords[None, :], 2)
-
         oxi_states = np.array(self._oxi_states)
 
         # create array where q_2[i,j] is qi * qj
         qi_qj = oxi_states[None, :] * oxi_states[:, None]
+        e_recip = self._get_interaction_matrices()[0] * qi_qj
 
-        # calculate the structure factor
-        s_reals = np.sum(oxi_states[None, :] * np.cos(grs), 1)
-        s_imags = np.sum(oxi_states[None, :] * np.sin(grs), 1)
-
-        for g, g2, gr, exp_val, s_real, s_imag in zip(gs, g2s, grs, exp_vals, s_reals, s_imags):
-            # Uses the identity sin(x)+cos(x) = 2**0.5 sin(x + pi/4)
-            m = np.sin((gr[None, :] + math.pi / 4) - gr[:, None])
-            m *= exp_val / g2
-
-            e_recip += m
+        forces = np.zeros((len(self._struct), 3), dtype=np.float64)
+        if self._compute_forces:
+            prefactor = 2 * math.pi / self._vol
+            gs, g2s, grs = _get_recip_vectors(self._struct.lattice, self._coords, self._gmax)
+            exp_vals = np.exp(-g2s / (4 * self._eta))
 
-            if self._compute_forces:
-                pref = 2 * exp_val / g2 * oxi_states
-                factor = prefactor * pref * (s_real * np.sin(gr) - s_imag * np.cos(gr))
+            # calculate the structure factor
+            s_reals = np.sum(oxi_states[None, :] * np.cos(grs), 1)
+            s_imags = np.sum(oxi_states[None, :] * np.sin(grs), 1)
 
-                forces += factor[:, None] * g[None, :]
+            pref = 2 * (exp_vals / g2s)[:, None] * oxi_states[None, :]
+            factor = prefactor * pref * (s_reals[:, None] * np.sin(grs) - s_imags[:, None] * np.cos(grs))
+            forces = factor.T @ gs
 
         forces *= EwaldSummation.CONV_FACT
-        e_recip *= prefactor * EwaldSummation.CONV_FACT * qi_qj * 2**0.5
         return e_recip, forces
 
     def _calc_real_and_point(self):
         """Determine the self energy -(eta/pi)**(1/2) * sum_{i=1}^{N} q_i**2."""
-        frac_coords = self._struct.frac_coords
-        force_pf = 2 * self._sqrt_eta / math.sqrt(math.pi)
-        coords = self._coords
-        n_sites = len(self._struct)
-        e_real = np.empty((n_sites, n_sites), dtype=np.float64)
-
-        forces = np.zeros((n_sites, 3), dtype=np.float64)
-
         qs = np.array(self._oxi_states)
+        _, e_real, point = self._get_interaction_matrices()
+        e_real = e_real * qs[None, :] * qs[:, None]
+        e_point = qs**2 * point
 
-        e_point = -(qs**2) * math.sqrt(self._eta / math.pi)
-
-        for idx in range(n_sites):
-            nf_coords, rij, js, _ = self._struct.lattice.get_points_in_sphere(
-                frac_coords, coords[idx], self._rmax, zip_results=False
-            )
-
-            # remove the rii term
-            inds = rij > 1e-8
-            js = js[inds]
-            rij = rij[inds]
-            nf_coords = nf_coords[inds]
-
-            qi = qs[idx]
-            qj = qs[js]
+        forces = np.zeros((len(self._struct), 3), dtype=np.float64)
+        if self._compute_forces:
+            frac_coords = self._struct.frac_coords
+            force_pf = 2 * self._sqrt_eta / math.sqrt(math.pi)
+            coords = self._coords
+            for idx in range(len(self._struct)):
+                nf_coords, rij, js, _ = self._struct.lattice.get_points_in_sphere(
+                    frac_coords, coords[idx], self._rmax, zip_results=False
+                )
 
-            erfc_val = erfc(self._sqrt_eta * rij)
-            new_ereals = erfc_val * qi * qj / rij
+                # remove the rii term
+                inds = rij > 1e-8
+                js = js[inds]
+                rij = rij[inds]
+                nf_coords = nf_coords[inds]
 
-            # insert new_ereals
-            for key in range(n_sites):
-                e_real[key, idx] = np.sum(new_ereals[js == key])
+                qi = qs[idx]
+                qj = qs[js]
 
-            if self._compute_forces:
+                erfc_val = erfc(self._sqrt_eta * rij)
                 nc_coords = self._struct.lattice.get_cartesian_coords(nf_coords)
 
                 fijpf = qj / rij**3 * (erfc_val + force_pf * rij * np.exp(-self._eta * rij**2))
@@ -392,10 +423,19 @@ class EwaldSummation(MSONable):
                     axis=0,
                 )
 
-        e_real *= 0.5 * EwaldSummation.CONV_FACT
-        e_point *= EwaldSummation.CONV_FACT
         return e_real, e_point, forces
 
+    def _get_interaction_matrices(self) -> tuple[np.ndarray, np.ndarray, float]:
+        """Get the charge independent reciprocal space and real space matrices,
+        and the point energy of a unit charge. These are computed on first use
+        and kept for the lifetime of the EwaldSummation.
+        """
+        if self._interaction_matrices is None:
+            self._interaction_matrices = _get_interaction_matrices(
+                self._struct.lattice, self._struct.frac_coords, self._eta, self._rmax, self._gmax
+            )
+        return self._interaction_matrices
+
     @property
     def eta(self):
         """Eta value used in Ewald summation."""
@@ -486,12 +526,21 @@ class EwaldMinimizer:
     ALGO_FAST = 0
     ALGO_COMPLETE = 1
     ALGO_BEST_FIRST = 2
-    # ALGO_TIME_LIMIT: Slowly increases the speed (with the cost of decreasing
-    # accuracy) as the minimizer runs. Attempts to limit the run time to
-    # approximately 30 minutes.
+    # ALGO_TIME_LIMIT: Limits the run time of the search to 30 minutes, unless
+    # another time_limit is given, and returns the best orderings found.
     ALGO_TIME_LIMIT = 3
 
-    def __init__(self, matrix, m_list, num_to_return=1, algo=ALGO_FAST):
+    def __init__(
+        self,
+        matrix,
+        m_list,
+        num_to_return=1,
+        algo=ALGO_FAST,
+        *,
+        n_jobs: int = 1,
+        time_limit: float | None = None,
+        callback: Callable[[float, list], Any] | None = None,
+    ):
         """
         Args:
             matrix: A matrix of the Ewald sum interaction energies. This is stored
@@ -501,62 +550,140 @@ class EwaldMinimizer:
                 (multiplication fraction, number_of_indices, indices, species)
                 These are sorted such that the first manipulation contains the
                 most permutations. this is actually evaluated last in the
-                recursion since I'm using pop.
+                search.
             num_to_return: The minimizer will find the number_returned lowest
                 energy structures. This is likely to return a number of duplicate
                 structures so it may be necessary to overestimate and then
                 remove the duplicates later. (duplicate checking in this
                 process is extremely expensive).
+            algo: ALGO_FAST and ALGO_COMPLETE search until the lowest energy
+                orderings are proven, using lower bounds that never discard a
+                better ordering. ALGO_BEST_FIRST stops as soon as num_to_return
+                orderings are found. ALGO_TIME_LIMIT stops after time_limit,
+                30 minutes by default.
+            n_jobs (int): Number of processes exploring the top level branches
+                of the search in parallel. Defaults to 1.
+            time_limit (float | None): Wall-clock budget of the search in
+                seconds. The best orderings found when it runs out are
+                returned. Defaults to None, i.e. no limit.
+            callback (Callable | None): Called as callback(matrix_sum, m_list)
+                whenever an ordering enters the num_to_return lowest found so
+                far, so results can be used while the search runs. With
+                n_jobs > 1, orderings are reported as each branch finishes.
         """
         # Setup and checking of inputs
-        self._matrix = copy(matrix)
+        self._matrix = np.array(matrix, dtype=np.float64)
         # Make the matrix diagonally symmetric (so matrix[i,:] == matrix[:,j])
-        for ii in range(len(self._matrix)):
-            for jj in range(ii, len(self._matrix)):
-                value = (self._matrix[ii, jj] + self._matrix[jj, ii]) / 2
-                self._matrix[ii, jj] = value
-                self._matrix[jj, ii] = value
+        self._matrix = (self._matrix + self._matrix.T) / 2
 
         # sort the m_list based on number of permutations
         self._m_list = sorted(m_list, key=lambda x: comb(len(x[2]), x[1]), reverse=True)
 
         for mlist in self._m_list:
-            if mlist[0] > 1:
+            if not mlist[0] <= 1:
                 raise ValueError("multiplication fractions must be <= 1")
-        self._current_minimum = float("inf")
         self._num_to_return = num_to_return
         self._algo = algo
-        if algo == EwaldMinimizer.ALGO_COMPLETE:
-            raise NotImplementedError("Complete algo not yet implemented for EwaldMinimizer")
+        self._n_jobs = n_jobs
+        if time_limit is None and algo == EwaldMinimizer.ALGO_TIME_LIMIT:
+            time_limit = 1800
+        self._time_limit = time_limit
+        self._callback = callback
 
         self._output_lists: list = []
-        # Tag that the recurse function looks at each level. If a method
-        # sets this to true it breaks the recursion and stops the search.
-        self._finished = False
-
-        self._start_time = datetime.utcnow()
+        # Whether the search ran to the end, rather than being stopped early
+        self._completed = False
+        # Only used by the deprecated best_case
+        self._start_time = time.time()
 
         self.minimize_matrix()
 
+        if not self._output_lists:
+            if self._completed:
+                raise RuntimeError("No ordering satisfies the manipulations")
+            raise RuntimeError("No ordering was found within the time limit")
         self._best_m_list = self._output_lists[0][1]
         self._minimized_sum = self._output_lists[0][0]
 
     def minimize_matrix(self):
-        """Get the permutations that produce the lowest
-        Ewald sum calls recursive function to iterate through permutations.
+        """Get the permutations that produce the lowest Ewald sums with a
+        branch and bound search over the manipulations.
         """
-        if self._algo in (EwaldMinimizer.ALGO_FAST, EwaldMinimizer.ALGO_BEST_FIRST):
-            return self._recurse(self._matrix, self._m_list, set(range(len(self._matrix))))
-        return None
+        # The search is done on the sites that can be manipulated, applying the
+        # manipulations with the fewest permutations first
+        m_list = self._m_list[::-1]
+        sites = sorted({idx for manipulation in m_list for idx in manipulation[2]})
+        site_indices = {site: ii for ii, site in enumerate(sites)}
+        available = np.zeros((len(m_list), len(sites)), dtype=np.uint8)
+        for ii, manipulation in enumerate(m_list):
+            available[ii, [site_indices[idx] for idx in manipulation[2]]] = 1
+
+        matrix = np.ascontiguousarray(self._matrix[np.ix_(sites, sites)])
+        fractions = np.array([manipulation[0] for manipulation in m_list], dtype=np.float64)
+        root = (
+            self._matrix[sites].sum(axis=1),
+            float(np.sum(self._matrix)),
+            np.array([manipulation[1] for manipulation in m_list], dtype=np.int_),
+            available,
+            np.full(len(sites), -1, dtype=np.int_),
+        )
+
+        def get_m_list(assignment: np.ndarray) -> list:
+            return [[sites[ii], m_list[m_idx][3]] for ii, m_idx in enumerate(assignment) if m_idx >= 0]
 
+        callback = None
+        if self._callback is not None:
+
+            def callback(matrix_sum, assignment):
+                self._callback(matrix_sum, get_m_list(assignment))
+
+        deadline = time.time() + self._time_limit if self._time_limit is not None else 0
+        stop_when_full = self._algo == EwaldMinimizer.ALGO_BEST_FIRST
+
+        if self._n_jobs == 1:
+            search = BranchAndBound(
+                matrix, fractions, self._num_to_return, np.full(1, np.inf), deadline, stop_when_full, callback
+            )
+            self._completed = search.run(*root)
+            self._output_lists = [
+                [matrix_sum, get_m_list(assignment)]
+                for matrix_sum, assignment in zip(search.energies, search.assignments)
+            ]
+            return
+
+        # Explore the branches of the first manipulation in parallel. The
+        # processes share the energy above which orderings are discarded.
+        shared_bound = RawArray("d", [np.inf])
+        energies: list[float] = []
+        assignments: list[np.ndarray] = []
+        self._completed = True
+        initargs = (matrix, fractions, self._num_to_return, shared_bound, deadline, stop_when_full)
+        with Pool(self._n_jobs, initializer=_init_minimizer_worker, initargs=initargs) as pool:
+            branches = _get_branches(matrix, fractions, *root)
+            for branch_energies, branch_assignments, completed in pool.imap_unordered(_search_branch, branches):
+                self._completed &= completed
+                for matrix_sum, assignment in zip(branch_energies, branch_assignments):
+                    if len(energies) == self._num_to_return and matrix_sum >= energies[-1]:
+                        continue
+                    idx = bisect.bisect_right(energies, matrix_sum)
+                    energies.insert(idx, matrix_sum)
+                    assignments.insert(idx, assignment)
+                    del energies[self._num_to_return :], assignments[self._num_to_return :]
+                    if callback is not None:
+                        callback(matrix_sum, assignment)
+                if stop_when_full and len(energies) == self._num_to_return:
+                    self._completed = False
+                    break
+        self._output_lists = [
+            [matrix_sum, get_m_list(assignment)] for matrix_sum, assignment in zip(energies, assignments)
+        ]
+
+    @deprecated(message="EwaldMinimizer now collects orderings in minimize_matrix.", deadline=(2027, 10, 17))
     def add_m_list(self, matrix_sum, m_list):
         """Add an m_list to the output_lists and updates the current
         minimum if the list is full.
         """
-        if self._output_lists is None:
-            self._output_lists = [[matrix_sum, m_list]]
-        else:
-            bisect.insort(self._output_lists, [matrix_sum, m_list])
+        bisect.insort(self._output_lists, [matrix_sum, m_list])
         if self._algo == EwaldMinimizer.ALGO_BEST_FIRST and len(self._output_lists) == self._num_to_return:
             self._finished = True
         if len(self._output_lists) > self._num_to_return:
@@ -564,6 +691,7 @@ class EwaldMinimizer:
         if len(self._output_lists) == self._num_to_return:
             self._current_minimum = self._output_lists[-1][0]
 
+    @deprecated(message="The lower bounds are computed by BranchAndBound.", deadline=(2027, 10, 17))
     def best_case(self, matrix, m_list, indices_left):
         """Compute a best case given a matrix and manipulation list.
 
@@ -604,8 +732,7 @@ class EwaldMinimizer:
         interaction_correction = np.sum(step3)
 
         if self._algo == self.ALGO_TIME_LIMIT:
-            elapsed_time = datetime.utcnow() - self._start_time
-            speedup_parameter = elapsed_time.total_seconds() / 1800
+            speedup_parameter = (time.time() - self._start_time) / 1800
             avg_int = np.sum(interaction_matrix, axis=None)
             avg_frac = np.mean(np.outer(1 - fractions, 1 - fractions))
             average_correction = avg_int * avg_frac
@@ -617,6 +744,7 @@ class EwaldMinimizer:
         return np.sum(matrix) + np.inner(sums[::-1], fractions - 1) + interaction_correction
 
     @classmethod
+    @deprecated(message="The search order is chosen by BranchAndBound.", deadline=(2027, 10, 17))
     def get_next_index(cls, matrix, manipulation, indices_left):
         """Get an index that should have the most negative effect on the
         matrix sum.
@@ -626,63 +754,6 @@ class EwaldMinimizer:
         sums = np.sum(matrix[indices], axis=1)
         return indices[sums.argmax(axis=0)] if f < 1 else indices[sums.argmin(axis=0)]
 
-    def _recurse(self, matrix, m_list, indices, output_m_list=None):
-        """Find the minimal permutations using a binary tree search strategy.
-
-        Args:
-            matrix: The current matrix (with some permutations already
-                performed).
-            m_list: The list of permutations still to be performed
-            indices: Set of indices which haven't had a permutation
-                performed on them.
-        """
-        # Check if we've found all the solutions that we need
-        if self._finished:
-            return
-
-        if output_m_list is None:
-            output_m_list = []
-
-        # if we're done with the current manipulation, pop it off.
-        while m_list[-1][1] == 0:
-            m_list = copy(m_list)
-            m_list.pop()
-            # if there are no more manipulations left to do check the value
-            if not m_list:
-                matrix_sum = np.sum(matrix)
-                if matrix_sum < self._current_minimum:
-                    self.add_m_list(matrix_sum, output_m_list)
-                return
-
-        # if we won't have enough indices left, return
-        if m_list[-1][1] > len(indices.intersection(m_list[-1][2])):
-            return
-
-        if (len(m_list) == 1 or m_list[-1][1] > 1) and self.best_case(matrix, m_list, indices) > self._current_minimum:
-            return
-
-        index = self.get_next_index(matrix, m_list[-1], indices)
-
-        m_list[-1][2].remove(index)
-
-        # Make the matrix and new m_list where we do the manipulation to the
-        # index that we just got
-        matrix2 = np.copy(matrix)
-        m_list2 = deepcopy(m_list)
-        output_m_list2 = copy(output_m_list)
-
-        matrix2[index, :] *= m_list[-1][0]
-        matrix2[:, index] *= m_list[-1][0]
-        output_m_list2.append([index, m_list[-1][3]])
-        indices2 = copy(indices)
-        indices2.remove(index)
-        m_list2[-1][1] -= 1
-
-        # recurse through both the modified and unmodified matrices
-
-        self._recurse(matrix2, m_list2, indices2, output_m_list2)
-        self._recurse(matrix, m_list, indices, output_m_list)
-
     @property
     def best_m_list(self):
         """The best manipulation list found."""
@@ -698,6 +769,141 @@ class EwaldMinimizer:
         """Output lists."""
         return self._output_lists
 
+    @property
+    def completed(self) -> bool:
+        """Whether the search ran to the end, rather than being stopped by the
+        time limit or by ALGO_BEST_FIRST.
+        """
+        return self._completed
+
+
+_worker_state: tuple | None = None
+
+
+def _init_minimizer_worker(
+    matrix: np.ndarray,
+    fractions: np.ndarray,
+    num_to_return: int,
+    shared_bound: Any,
+    deadline: float,
+    stop_when_full: bool,
+) -> None:
+    """Pool initializer so the matrix is sent to each worker only once."""
+    global _worker_state  # noqa: PLW0603
+    _worker_state = matrix, fractions, num_to_return, np.frombuffer(shared_bound), deadline, stop_when_full
+
+
+def _search_branch(branch: tuple) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Run the branch and bound search of EwaldMinimizer from a partially
+    manipulated state in a worker process.
+    """
+    search = BranchAndBound(*_worker_state, None)  # type: ignore[misc]
+    completed = search.run(*branch)
+    return search.energies, search.assignments, completed
+
+
+def _get_branches(
+    matrix: np.ndarray,
+    fractions: np.ndarray,
+    row_sums: np.ndarray,
+    energy: float,
+    counts: np.ndarray,
+    available: np.ndarray,
+    assigned: np.ndarray,
+) -> Iterator[tuple]:
+    """Split the search of EwaldMinimizer on the first site the first
+    manipulation is applied to, most promising sites first. The arguments are
+    the state passed to BranchAndBound.run, and so are the yielded branches.
+    """
+    if not np.any(counts):
+        yield row_sums, energy, counts, available, assigned
+        return
+    m_idx = np.flatnonzero(counts)[0]
+    delta = fractions[m_idx] - 1
+    candidates = np.flatnonzero(available[m_idx] & (assigned < 0))
+    costs = delta * (2 * row_sums[candidates] + delta * matrix[candidates, candidates])
+    candidates = candidates[np.argsort(costs, kind="stable")]
+    for ii in range(len(candidates) - counts[m_idx] + 1):
+        site = candidates[ii]
+        branch_counts, branch_available, branch_assigned = counts.copy(), available.copy(), assigned.copy()
+        branch_counts[m_idx] -= 1
+        branch_available[m_idx, candidates[:ii]] = 0
+        branch_assigned[site] = m_idx
+        yield (
+            row_sums + delta * matrix[:, site],
+            energy + delta * (2 * row_sums[site] + delta * matrix[site, site]),
+            branch_counts,
+            branch_available,
+            branch_assigned,
+        )
+
+
+def _get_recip_vectors(lattice: Lattice, coords: np.ndarray, gmax: float) -> tuple[np.ndarray, ...]:
+    """Get the non-zero reciprocal lattice vectors G within gmax, their squared
+    lengths and the products G.r with the Cartesian coords of all sites.
+    """
+    rcp_latt = lattice.reciprocal_lattice
+    recip_nn = rcp_latt.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], gmax)
+
+    frac_coords = [frac_coords for (frac_coords, dist, _idx, _img) in recip_nn if dist != 0]
+
+    gs = rcp_latt.get_cartesian_coords(frac_coords)
+    return gs, np.sum(gs**2, 1), gs @ coords.T
+
+
+def _get_interaction_matrices(
+    lattice: Lattice, frac_coords: np.ndarray, eta: float, rmax: float, gmax: float
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Compute the charge independent parts of the Ewald sum, i.e. the energies
+    between unit charges. The energy matrices of EwaldSummation are these
+    multiplied by q_i * q_j. The returned matrices are read-only as they are
+    kept by the EwaldSummation.
+
+    Args:
+        lattice (Lattice): Lattice of the structure.
+        frac_coords (np.ndarray): (n, 3) fractional coords of the sites.
+        eta (float): The screening parameter.
+        rmax (float): Real space cutoff radius.
+        gmax (float): Reciprocal space cutoff radius.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, float]: Reciprocal space and real space
+            interaction matrices of shape (n, n), and the point energy of a
+            unit charge.
+    """
+    coords = lattice.get_cartesian_coords(frac_coords)
+    n_sites = len(coords)
+
+    # Reciprocal space. For every G, the original pair term is
+    # sin(G.r_j - G.r_i + pi/4) * sqrt(2) = cos(G.r_i - G.r_j) + sin(G.r_j - G.r_i),
+    # and the sine terms cancel between G and -G. The sum over G of
+    # cos(G.r_i)cos(G.r_j) + sin(G.r_i)sin(G.r_j) weighted by exp(-G^2/(4 eta))/G^2
+    # is then evaluated as two matrix products.
+    _gs, g2s, grs = _get_recip_vectors(lattice, coords, gmax)
+    weights = np.exp(-g2s / (4 * eta)) / g2s
+    cos_grs, sin_grs = np.cos(grs), np.sin(grs)
+    recip = (cos_grs.T * weights) @ cos_grs + (sin_grs.T * weights) @ sin_grs
+    recip *= 2 * math.pi / lattice.volume * EwaldSummation.CONV_FACT
+
+    # Real space
+    real = np.empty((n_sites, n_sites), dtype=np.float64)
+    sqrt_eta = math.sqrt(eta)
+    for idx in range(n_sites):
+        _, rij, js, _ = lattice.get_points_in_sphere(frac_coords, coords[idx], rmax, zip_results=False)
+
+        # remove the rii term
+        inds = rij > 1e-8
+        js = js[inds]
+        rij = rij[inds]
+        real[:, idx] = np.bincount(js, weights=erfc(sqrt_eta * rij) / rij, minlength=n_sites)
+    real *= 0.5 * EwaldSummation.CONV_FACT
+
+    point = -math.sqrt(eta / math.pi) * EwaldSummation.CONV_FACT
+
+    recip.flags.writeable = False
+    real.flags.writeable = False
+    return recip, real, point
+
 
 def compute_average_oxidation_state(site):
     """
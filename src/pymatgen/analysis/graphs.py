@@ -7,8 +7,10 @@ import logging
 import os.path
 import subprocess
 import warnings
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import partial
 from itertools import combinations
+from multiprocessing import Pool
 from operator import itemgetter
 from shutil import which
 from typing import TYPE_CHECKING, NamedTuple, cast
@@ -23,8 +25,8 @@ from networkx.readwrite import json_graph
 from pymatgen.core import Lattice, Molecule, PeriodicSite, Structure
 from pymatgen.core.structure import FunctionalGroups
 from pymatgen.util.coord import lattice_points_in_supercell
+from pymatgen.util.graph_hashing import weisfeiler_lehman_graph_hash
 from pymatgen.vis.structure_vtk import EL_COLORS
-from scipy.spatial import KDTree
 from scipy.stats import describe
 
 try:
@@ -113,6 +115,102 @@ def _isomorphic(frag1: nx.Graph, frag2: nx.Graph) -> bool:
     return nx.is_isomorphic(frag1.to_undirected(), frag2.to_undirected(), node_match=nm)
 
 
+def _get_supercell(structure: Structure, scaling_matrix) -> tuple[Structure, np.ndarray, np.ndarray]:
+    """Helper function that replicates the sites of a structure for StructureGraph.__mul__,
+    with all the sites of one lattice point of the supercell following each other.
+
+    Returns:
+        tuple[Structure, np.ndarray, np.ndarray]: The supercell, the diagonal of the
+            scaling matrix and the (n_cells, 3) lattice point of each cell in units
+            of the original lattice.
+    """
+    # code adapted from Structure.__mul__
+    scale_matrix = np.array(scaling_matrix, int)
+    if scale_matrix.shape != (3, 3):
+        scale_matrix = np.array(scale_matrix * np.eye(3), int)
+    else:
+        # TODO: test __mul__ with full 3x3 scaling matrices
+        raise NotImplementedError("Not tested with 3x3 scaling matrices yet.")
+    new_lattice = Lattice(np.dot(scale_matrix, structure.lattice.matrix))
+
+    frac_lattice = lattice_points_in_supercell(scale_matrix)
+    cart_lattice = new_lattice.get_cartesian_coords(frac_lattice)
+
+    new_sites = []
+    for v in cart_lattice:
+        for site in structure:
+            site = PeriodicSite(
+                site.species,
+                site.coords + v,
+                new_lattice,
+                properties=site.properties,
+                coords_are_cartesian=True,
+                to_unit_cell=False,
+            )
+            new_sites.append(site)
+
+    cell_offsets = np.round(frac_lattice @ scale_matrix).astype(int)
+    return Structure.from_sites(new_sites), np.diag(scale_matrix), cell_offsets
+
+
+def _normalize_edges(edges: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function that normalizes the edges of a periodic graph as in
+    StructureGraph.add_edge: the from index is at most the to index, and the first
+    non-zero component of the image of an edge from a site to itself is positive.
+
+    Args:
+        edges: (n_edges, 5) from index, to index and to_jimage of each edge.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The normalized edges, without duplicates and
+            bonds of a site to itself, and the index in edges of each.
+    """
+    edges = np.array(edges, dtype=int).reshape(-1, 5)
+    from_indices, to_indices, images = edges[:, 0], edges[:, 1], edges[:, 2:]
+
+    self_loops = to_indices == from_indices
+    first_nonzero = images[np.arange(len(images)), np.argmax(images != 0, axis=1)]
+    flip = (to_indices < from_indices) | (self_loops & (first_nonzero < 0))
+    edges[flip] = np.column_stack([to_indices[flip], from_indices[flip], -images[flip]])
+
+    keep = ~(self_loops & (first_nonzero == 0))
+    _, first = np.unique(edges[keep], axis=0, return_index=True)
+    kept = np.flatnonzero(keep)[np.sort(first)]
+    return edges[kept], kept
+
+
+def _get_supercell_edges(
+    n_sites: int, scale: np.ndarray, cell_offsets: np.ndarray, edges: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Helper function that maps the edges of a periodic graph onto its supercell from
+    _get_supercell by index arithmetic.
+
+    Args:
+        n_sites: Number of sites in the original structure.
+        scale: Diagonal of the scaling matrix.
+        cell_offsets: (n_cells, 3) lattice point of each cell of the supercell in
+            units of the original lattice.
+        edges: (n_edges, 5) from index, to index and to_jimage of each edge.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (n_new_edges, 5) normalized edges of the
+            supercell, see _normalize_edges, and the index of the original edge of each.
+    """
+    n_cells, n_edges = len(cell_offsets), len(edges)
+    cell_index = np.empty(scale, dtype=int)
+    cell_index[tuple(cell_offsets.T)] = np.arange(n_cells)
+
+    # Lattice point of the image of the to site, split into a cell and a supercell image
+    targets = (cell_offsets[:, None, :] + edges[None, :, 2:]).reshape(-1, 3)
+    target_cells = targets % scale
+    images = (targets - target_cells) // scale
+
+    from_indices = (np.arange(n_cells)[:, None] * n_sites + edges[None, :, 0]).ravel()
+    to_indices = cell_index[tuple(target_cells.T)] * n_sites + np.tile(edges[:, 1], n_cells)
+    new_edges, kept = _normalize_edges(np.column_stack([from_indices, to_indices, images]))
+    return new_edges, np.tile(np.arange(n_edges), n_cells)[kept]
+
+
 class StructureGraph(MSONable):
     """
     This is a class for annotating a Structure with bond information, stored in the form
@@ -775,9 +873,14 @@ class StructureGraph(MSONable):
                 to_jimage = np.multiply(-1, to_jimage)
 
             to_jimage = tuple(map(int, np.add(to_jimage, jimage)))
-            site_d = self.structure[v].as_dict()
-            site_d["abc"] = np.add(site_d["abc"], to_jimage).tolist()
-            site = PeriodicSite.from_dict(site_d)
+            v_site = self.structure[v]
+            site = PeriodicSite(
+                v_site.species,
+                np.add(v_site.frac_coords, to_jimage),
+                v_site.lattice,
+                properties=copy.deepcopy(v_site.properties),
+                label=v_site.label,
+            )
 
             # from_site if jimage arg != (0, 0, 0)
             relative_jimage = np.subtract(to_jimage, jimage)
@@ -1107,166 +1210,29 @@ class StructureGraph(MSONable):
         # possible when generating the graph using critic2 from
         # charge density.
 
-        # Multiplication works by looking for the expected position
-        # of an image node, and seeing if that node exists in the
-        # supercell. If it does, the edge is updated. This is more
-        # computationally expensive than just keeping track of the
-        # which new lattice images present, but should hopefully be
-        # easier to extend to a general 3x3 scaling matrix.
-
-        # code adapted from Structure.__mul__
-        scale_matrix = np.array(scaling_matrix, int)
-        if scale_matrix.shape != (3, 3):
-            scale_matrix = np.array(scale_matrix * np.eye(3), int)
-        else:
-            # TODO: test __mul__ with full 3x3 scaling matrices
-            raise NotImplementedError("Not tested with 3x3 scaling matrices yet.")
-        new_lattice = Lattice(np.dot(scale_matrix, self.structure.lattice.matrix))
-
-        frac_lattice = lattice_points_in_supercell(scale_matrix)
-        cart_lattice = new_lattice.get_cartesian_coords(frac_lattice)
-
-        new_sites = []
-        new_graphs = []
-
-        for v in cart_lattice:
-            # create a map of nodes from original graph to its image
-            mapping = {n: n + len(new_sites) for n in range(len(self.structure))}
-
-            for site in self.structure:
-                site = PeriodicSite(
-                    site.species,
-                    site.coords + v,
-                    new_lattice,
-                    properties=site.properties,
-                    coords_are_cartesian=True,
-                    to_unit_cell=False,
-                )
-
-                new_sites.append(site)
-
-            new_graphs.append(nx.relabel_nodes(self.graph, mapping, copy=True))
-
-        new_structure = Structure.from_sites(new_sites)
-
-        # merge all graphs into one big graph
-        new_g = nx.MultiDiGraph()
-        for new_graph in new_graphs:
-            new_g = nx.union(new_g, new_graph)
-
-        edges_to_remove = []  # tuple of (u, v, k)
-        edges_to_add = []  # tuple of (u, v, attr_dict)
-
-        # list of new edges inside supercell
-        # for duplicate checking
-        edges_inside_supercell = [{u, v} for u, v, d in new_g.edges(data=True) if d["to_jimage"] == (0, 0, 0)]
-        new_periodic_images = []
-
-        orig_lattice = self.structure.lattice
-
-        # use k-d tree to match given position to an
-        # existing Site in Structure
-        kd_tree = KDTree(new_structure.cart_coords)
-
-        # tolerance in Å for sites to be considered equal
-        # this could probably be a lot smaller
-        tol = 0.05
-
-        for u, v, k, data in new_g.edges(keys=True, data=True):
-            to_jimage = data["to_jimage"]  # for node v
-
-            # reduce unnecessary checking
-            if to_jimage != (0, 0, 0):
-                # get index in original site
-                n_u = u % len(self.structure)
-                n_v = v % len(self.structure)
-
-                # get fractional coordinates of where atoms defined by edge are expected
-                # to be, relative to original lattice (keeping original lattice has
-                # significant benefits)
-                v_image_frac = np.add(self.structure[n_v].frac_coords, to_jimage)
-                u_frac = self.structure[n_u].frac_coords
-
-                # using the position of node u as a reference, get relative Cartesian
-                # coordinates of where atoms defined by edge are expected to be
-                v_image_cart = orig_lattice.get_cartesian_coords(v_image_frac)
-                u_cart = orig_lattice.get_cartesian_coords(u_frac)
-                v_rel = np.subtract(v_image_cart, u_cart)
-
-                # now retrieve position of node v in new supercell, and get absolute
-                # Cartesian coordinates of where atoms defined by edge are expected to be
-                v_expect = new_structure[u].coords + v_rel
-
-                # now search in new structure for these atoms query returns (distance, index)
-                v_present = kd_tree.query(v_expect)
-                v_present = v_present[1] if v_present[0] <= tol else None
-
-                # check if image sites now present in supercell
-                # and if so, delete old edge that went through
-                # periodic boundary
-                if v_present is not None:
-                    new_u = u
-                    new_v = v_present
-                    new_data = data.copy()
-
-                    # node now inside supercell
-                    new_data["to_jimage"] = (0, 0, 0)
-
-                    edges_to_remove.append((u, v, k))
-
-                    # make sure we don't try to add duplicate edges
-                    # will remove two edges for everyone one we add
-                    if {new_u, new_v} not in edges_inside_supercell:
-                        # normalize direction
-                        if new_v < new_u:
-                            new_u, new_v = new_v, new_u
-
-                        edges_inside_supercell.append({new_u, new_v})
-                        edges_to_add.append((new_u, new_v, new_data))
-
-                else:
-                    # want to find new_v such that we have
-                    # full periodic boundary conditions
-                    # so that nodes on one side of supercell
-                    # are connected to nodes on opposite side
-
-                    v_expec_frac = new_structure.lattice.get_fractional_coords(v_expect)
-
-                    # find new to_jimage
-                    # use np.around to fix issues with finite precision leading to incorrect image
-                    v_expec_image = np.around(v_expec_frac, decimals=3)
-                    v_expec_image = v_expec_image - v_expec_image % 1
-
-                    v_expec_frac = np.subtract(v_expec_frac, v_expec_image)
-                    v_expect = new_structure.lattice.get_cartesian_coords(v_expec_frac)
-                    v_present = kd_tree.query(v_expect)
-                    v_present = v_present[1] if v_present[0] <= tol else None
-
-                    if v_present is not None:
-                        new_u = u
-                        new_v = v_present
-                        new_data = data.copy()
-                        new_to_jimage = tuple(map(int, v_expec_image))
-
-                        # normalize direction
-                        if new_v < new_u:
-                            new_u, new_v = new_v, new_u
-                            new_to_jimage = tuple(np.multiply(-1, data["to_jimage"]).astype(int))
-
-                        new_data["to_jimage"] = new_to_jimage
-
-                        edges_to_remove.append((u, v, k))
-
-                        if (new_u, new_v, new_to_jimage) not in new_periodic_images:
-                            edges_to_add.append((new_u, new_v, new_data))
-                            new_periodic_images.append((new_u, new_v, new_to_jimage))
-
-        logger.debug(f"Removing {len(edges_to_remove)} edges, adding {len(edges_to_add)} new edges.")
-
-        # add/delete marked edges
-        for edge in edges_to_remove:
-            new_g.remove_edge(*edge)
-        for u, v, data in edges_to_add:
+        # The sites of each lattice point of the supercell follow each other, so
+        # the image of an edge is found by index arithmetic: an edge from a site
+        # in cell c to an image j of another site goes to the cell (c + j) mod
+        # scale, in the supercell image (c + j) // scale
+        new_structure, scale, cell_offsets = _get_supercell(self.structure, scaling_matrix)
+        n_sites = len(self.structure)
+
+        old_edges = list(self.graph.edges(data=True))
+        edges = np.array([(u, v, *data["to_jimage"]) for u, v, data in old_edges], dtype=int).reshape(-1, 5)
+        new_edges, edge_indices = _get_supercell_edges(n_sites, scale, cell_offsets, edges)
+
+        logger.debug(f"Replicated {len(old_edges)} edges into {len(new_edges)} edges.")
+
+        new_g = nx.MultiDiGraph(**self.graph.graph)
+        node_data = [self.graph.nodes[n] for n in range(n_sites)]
+        new_g.add_nodes_from(
+            (cell * n_sites + n, copy.copy(data))
+            for cell in range(len(cell_offsets))
+            for n, data in enumerate(node_data)
+        )
+        for (u, v, *to_jimage), edge_idx in zip(new_edges.tolist(), edge_indices.tolist()):
+            data = old_edges[edge_idx][2].copy()
+            data["to_jimage"] = tuple(to_jimage)
             new_g.add_edge(u, v, **data)
 
         # return new instance of StructureGraph with supercell
@@ -1537,6 +1503,250 @@ class StructureGraph(MSONable):
         return molecules
 
 
+class SparseStructureGraph(MSONable):
+    """
+    A lightweight alternative to StructureGraph that stores the edges as arrays
+    instead of a networkx graph, for graphs of large structures and supercells.
+    Each edge is stored once as (from_index, to_index, to_jimage), normalized as
+    in StructureGraph.add_edge, with an optional weight. Edge properties other
+    than weights are not supported.
+
+    The edges are fixed on construction. Neighbors are looked up in a compressed
+    sparse row adjacency of the edges in both directions, and a networkx graph is
+    only built when converting to a StructureGraph.
+    """
+
+    def __init__(
+        self,
+        structure: Structure,
+        edges: ArrayLike,
+        weights: ArrayLike | None = None,
+        name: str = "bonds",
+        edge_weight_name: str | None = None,
+        edge_weight_units: str | None = None,
+    ) -> None:
+        """
+        Args:
+            structure: Structure object.
+            edges: (n_edges, 5) from_index, to_index and to_jimage of each edge, the
+                from_jimage being (0, 0, 0). Duplicate edges are only added once.
+            weights: (n_edges,) weight of each edge, NaN if not defined. Defaults to
+                None for no weights.
+            name: Name of the graph, e.g. "bonds".
+            edge_weight_name: Name of the edge weights, e.g. "bond_length".
+            edge_weight_units: Name of the edge weight units, e.g. "Å" or "eV".
+        """
+        edges = np.array(edges, dtype=int).reshape(-1, 5)
+        if np.any((edges[:, 0] == edges[:, 1]) & ~edges[:, 2:].any(axis=1)):
+            warnings.warn("Tried to create a bond to itself, this doesn't make sense so was ignored.")
+        self.edges, kept = _normalize_edges(edges)
+        self.weights = None if weights is None else np.array(weights, dtype=float).reshape(-1)[kept]
+        for array in (self.edges, self.weights):
+            if array is not None:
+                array.flags.writeable = False
+
+        self.structure = structure
+        self.name = name
+        self.edge_weight_name = edge_weight_name
+        self.edge_weight_units = edge_weight_units
+        self._adjacency: tuple[np.ndarray, ...] | None = None
+
+    @classmethod
+    def from_structure_graph(cls, struct_graph: StructureGraph) -> Self:
+        """Constructor for SparseStructureGraph from the edges and weights of a StructureGraph.
+
+        Args:
+            struct_graph: StructureGraph object.
+        """
+        edges = []
+        weights = []
+        for u, v, data in struct_graph.graph.edges(data=True):
+            edges.append((u, v, *data["to_jimage"]))
+            weights.append(data.get("weight"))
+
+        return cls(
+            struct_graph.structure,
+            edges,
+            weights=np.array(weights, dtype=float) if any(weight is not None for weight in weights) else None,
+            name=struct_graph.name,
+            edge_weight_name=struct_graph.edge_weight_name,
+            edge_weight_units=struct_graph.edge_weight_unit,
+        )
+
+    @classmethod
+    def from_local_env_strategy(cls, structure: Structure, strategy: NearNeighbors, weights: bool = False) -> Self:
+        """Constructor for SparseStructureGraph, using a strategy from
+        pymatgen.analysis.local_env.
+
+        Args:
+            structure: Structure object
+            strategy: an instance of a pymatgen.analysis.local_env.NearNeighbors object
+            weights(bool): if True, use weights from local_env class (consult relevant class for their meaning)
+        """
+        if not strategy.structures_allowed:
+            raise ValueError("Chosen strategy is not designed for use with structures! Please choose another strategy.")
+
+        edges = []
+        edge_weights = []
+        for idx, neighbors in enumerate(strategy.get_all_nn_info(structure)):
+            for neighbor in neighbors:
+                edges.append((idx, neighbor["site_index"], *neighbor["image"]))
+                edge_weights.append(neighbor["weight"])
+
+        return cls(structure, edges, weights=edge_weights if weights else None)
+
+    def to_structure_graph(self) -> StructureGraph:
+        """Get a StructureGraph with the same structure and edges.
+
+        Returns:
+            StructureGraph
+        """
+        struct_graph = StructureGraph.from_empty_graph(
+            self.structure,
+            name=self.name,
+            edge_weight_name=self.edge_weight_name,
+            edge_weight_units=self.edge_weight_units,
+        )
+        weights = [np.nan] * len(self.edges) if self.weights is None else self.weights.tolist()
+        edges = []
+        for (u, v, *to_jimage), weight in zip(self.edges.tolist(), weights):
+            data = {"to_jimage": tuple(to_jimage)}
+            if not np.isnan(weight):
+                data["weight"] = weight
+            edges.append((u, v, data))
+        struct_graph.graph.add_edges_from(edges)
+        return struct_graph
+
+    def _get_adjacency(self) -> tuple[np.ndarray, ...]:
+        """Get the edges of each site in both directions in compressed sparse row format.
+
+        Returns:
+            tuple[np.ndarray, ...]: The (n_sites + 1,) offsets of the edges of each
+                site, and for each edge the index of the neighbor, its (n, 3) image
+                and the weight, as well as the number of edges from each site to itself.
+        """
+        if self._adjacency is None:
+            n_sites = len(self.structure)
+            from_indices, to_indices, images = self.edges[:, 0], self.edges[:, 1], self.edges[:, 2:]
+            weights = np.full(len(self.edges), np.nan) if self.weights is None else self.weights
+
+            rows = np.concatenate([from_indices, to_indices])
+            order = np.argsort(rows, kind="stable")
+            offsets = np.zeros(n_sites + 1, dtype=int)
+            np.cumsum(np.bincount(rows, minlength=n_sites), out=offsets[1:])
+            self._adjacency = (
+                offsets,
+                np.concatenate([to_indices, from_indices])[order],
+                np.concatenate([images, -images])[order],
+                np.concatenate([weights, weights])[order],
+                np.bincount(from_indices[from_indices == to_indices], minlength=n_sites),
+            )
+        return self._adjacency
+
+    def get_connected_sites(self, n: int, jimage: Tuple3Ints = (0, 0, 0)) -> list[ConnectedSite]:
+        """Get a named tuple of neighbors of site n:
+        periodic_site, jimage, index, weight.
+        Index is the index of the corresponding site
+        in the original structure, weight can be
+        None if not defined.
+
+        Args:
+            n: index of Site in Structure
+            jimage: lattice vector of site
+
+        Returns:
+            list of ConnectedSite tuples,
+            sorted by closest first.
+        """
+        offsets, neighbors, images, weights, _ = self._get_adjacency()
+        start, end = offsets[n], offsets[n + 1]
+        neighbors, images, weights = neighbors[start:end], images[start:end], weights[start:end]
+
+        frac_coords = self.structure.frac_coords
+        lattice = self.structure.lattice
+        dists = np.linalg.norm(lattice.get_cartesian_coords(frac_coords[neighbors] + images - frac_coords[n]), axis=1)
+
+        connected_sites = []
+        for idx in np.argsort(dists, kind="stable").tolist():
+            v = int(neighbors[idx])
+            to_jimage = tuple(map(int, images[idx] + jimage))
+            v_site = self.structure[v]
+            site = PeriodicSite(
+                v_site.species,
+                np.add(v_site.frac_coords, to_jimage),
+                lattice,
+                properties=copy.deepcopy(v_site.properties),
+                label=v_site.label,
+            )
+            weight = None if np.isnan(weights[idx]) else float(weights[idx])
+            connected_sites.append(
+                ConnectedSite(site=site, jimage=to_jimage, index=v, weight=weight, dist=float(dists[idx]))
+            )
+        return connected_sites
+
+    def get_coordination_of_site(self, n: int) -> int:
+        """Get the number of neighbors of site n, as in StructureGraph.
+
+        Args:
+            n: index of site
+
+        Returns:
+            int: number of neighbors of site n.
+        """
+        offsets, *_, n_self_loops = self._get_adjacency()
+        return int(offsets[n + 1] - offsets[n] - n_self_loops[n])
+
+    def __mul__(self, scaling_matrix):
+        """Replicate the graph, creating a supercell, see StructureGraph.__mul__.
+
+        Args:
+            scaling_matrix: same as Structure.__mul__
+        """
+        new_structure, scale, cell_offsets = _get_supercell(self.structure, scaling_matrix)
+        new_edges, edge_indices = _get_supercell_edges(len(self.structure), scale, cell_offsets, self.edges)
+        return type(self)(
+            new_structure,
+            new_edges,
+            weights=None if self.weights is None else self.weights[edge_indices],
+            name=self.name,
+            edge_weight_name=self.edge_weight_name,
+            edge_weight_units=self.edge_weight_units,
+        )
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __len__(self):
+        """Length of Structure / number of nodes in graph."""
+        return len(self.structure)
+
+    def as_dict(self) -> dict:
+        """JSON-serializable dict representation."""
+        return {
+            "@module": type(self).__module__,
+            "@class": type(self).__name__,
+            "structure": self.structure.as_dict(),
+            "edges": self.edges.tolist(),
+            "weights": None if self.weights is None else [None if np.isnan(w) else w for w in self.weights.tolist()],
+            "name": self.name,
+            "edge_weight_name": self.edge_weight_name,
+            "edge_weight_units": self.edge_weight_units,
+        }
+
+    @classmethod
+    def from_dict(cls, dct: dict) -> Self:
+        """Reconstitute a SparseStructureGraph from its dict representation."""
+        weights = dct.get("weights")
+        return cls(
+            Structure.from_dict(dct["structure"]),
+            dct["edges"],
+            weights=None if weights is None else np.array(weights, dtype=float),
+            name=dct.get("name", "bonds"),
+            edge_weight_name=dct.get("edge_weight_name"),
+            edge_weight_units=dct.get("edge_weight_units"),
+        )
+
+
 class MolGraphSplitError(Exception):
     """
     Raised when a molecule graph is failed to split into two disconnected
@@ -2132,17 +2342,16 @@ class MoleculeGraph(MSONable):
                     else:
                         frag_dict[key].append(copy.deepcopy(subgraph))
 
-        # narrow to all unique fragments using graph isomorphism
+        # narrow to all unique fragments using graph isomorphism, only comparing
+        # fragments with the same Weisfeiler-Lehman hash
         unique_frag_dict = {}
         for key, fragments in frag_dict.items():
             unique_frags = []
+            frags_by_hash = defaultdict(list)
             for frag in fragments:
-                found = False
-                for fragment in unique_frags:
-                    if _isomorphic(frag, fragment):
-                        found = True
-                        break
-                if not found:
+                same_hash = frags_by_hash[weisfeiler_lehman_graph_hash(frag, node_attr="specie")]
+                if not any(_isomorphic(frag, fragment) for fragment in same_hash):
+                    same_hash.append(frag)
                     unique_frags.append(frag)
             unique_frag_dict[key] = copy.deepcopy(unique_frags)
 
@@ -2862,3 +3071,295 @@ class MoleculeGraph(MSONable):
             "both": edges ^ edges_other,
             "dist": jaccard_dist,
         }
+
+
+class GraphHashIndex(MSONable):
+    """
+    An index of unique StructureGraphs and MoleculeGraphs, for deduplicating large
+    numbers of graphs, e.g. the fragments of a molecule.
+
+    Graphs are bucketed by a Weisfeiler-Lehman hash of their species labelled
+    sites, so the full isomorphism check is only done against the graphs in the
+    same bucket. Two graphs are considered equivalent if there is a mapping of
+    their sites that preserves the species and the bonds between each pair of
+    sites. For StructureGraphs, the periodic images of the bonds must also match
+    up to a shift of the origin of each site by a lattice vector, so e.g. a
+    layer and a 3D network with the same quotient graph are distinct. The
+    lattice vectors themselves are not changed, so the same periodic graph
+    expressed in a different cell is not recognized.
+
+    The index is MSONable and stores the hashes, so it can be saved and
+    loaded with monty's dumpfn and loadfn.
+    """
+
+    def __init__(
+        self,
+        graphs: Sequence[StructureGraph | MoleculeGraph] = (),
+        iterations: int = 3,
+        n_jobs: int = 1,
+    ) -> None:
+        """
+        Args:
+            graphs: Graphs to insert, see insert_many.
+            iterations: Number of Weisfeiler-Lehman iterations used for the hashes.
+            n_jobs: Number of processes to hash the graphs with. Defaults to 1.
+        """
+        self.iterations = iterations
+        self.graphs: list[StructureGraph | MoleculeGraph] = []
+        self.hashes: list[str] = []
+        self._labelled_graphs: list[nx.Graph | None] = []
+        self._buckets: dict[str, list[int]] = defaultdict(list)
+        if graphs:
+            self.insert_many(graphs, n_jobs=n_jobs)
+
+    def get_hash(self, graph: StructureGraph | MoleculeGraph) -> str:
+        """Get the Weisfeiler-Lehman hash used to bucket a graph.
+
+        Args:
+            graph: StructureGraph or MoleculeGraph.
+
+        Returns:
+            str: The hash, equal for equivalent graphs.
+        """
+        return _get_graph_key(graph, self.iterations)[0]
+
+    def insert(self, graph: StructureGraph | MoleculeGraph) -> int:
+        """Add a graph to the index if no equivalent graph is present.
+
+        Args:
+            graph: StructureGraph or MoleculeGraph.
+
+        Returns:
+            int: Index in self.graphs of the graph equivalent to graph.
+        """
+        return self._insert(graph, *_get_graph_key(graph, self.iterations))
+
+    def insert_many(self, graphs: Sequence[StructureGraph | MoleculeGraph], n_jobs: int = 1) -> list[int]:
+        """Add the graphs to the index, keeping the first of each set of
+        equivalent graphs. The graphs are hashed in parallel.
+
+        Args:
+            graphs: StructureGraphs or MoleculeGraphs.
+            n_jobs: Number of processes to hash the graphs with. Defaults to 1.
+
+        Returns:
+            list[int]: Index in self.graphs of the graph equivalent to each graph.
+        """
+        keys = self._get_keys(graphs, n_jobs)
+        return [self._insert(graph, graph_hash, labelled) for graph, (graph_hash, labelled) in zip(graphs, keys)]
+
+    def query(self, graph: StructureGraph | MoleculeGraph) -> int | None:
+        """Find a graph equivalent to graph in the index.
+
+        Args:
+            graph: StructureGraph or MoleculeGraph.
+
+        Returns:
+            int | None: Index in self.graphs of the equivalent graph, or None if
+                there is none.
+        """
+        return self._find(graph, *_get_graph_key(graph, self.iterations))
+
+    def query_many(self, graphs: Sequence[StructureGraph | MoleculeGraph], n_jobs: int = 1) -> list[int | None]:
+        """Find the graphs equivalent to each graph in the index. The graphs are
+        hashed in parallel.
+
+        Args:
+            graphs: StructureGraphs or MoleculeGraphs.
+            n_jobs: Number of processes to hash the graphs with. Defaults to 1.
+
+        Returns:
+            list[int | None]: Index in self.graphs of the graph equivalent to each
+                graph, or None if there is none.
+        """
+        keys = self._get_keys(graphs, n_jobs)
+        return [self._find(graph, graph_hash, labelled) for graph, (graph_hash, labelled) in zip(graphs, keys)]
+
+    def _get_keys(self, graphs: Sequence[StructureGraph | MoleculeGraph], n_jobs: int) -> list[tuple[str, nx.Graph]]:
+        """Get the hash and labelled graph of each graph, see _get_graph_key."""
+        if n_jobs > 1 and len(graphs) > 1:
+            with Pool(n_jobs) as pool:
+                return list(
+                    pool.imap(
+                        partial(_get_graph_key, iterations=self.iterations),
+                        graphs,
+                        chunksize=max(1, len(graphs) // (4 * n_jobs)),
+                    )
+                )
+        return [_get_graph_key(graph, self.iterations) for graph in graphs]
+
+    def _find(self, graph: StructureGraph | MoleculeGraph, graph_hash: str, labelled: nx.Graph) -> int | None:
+        """Find an equivalent graph in the bucket of graph_hash."""
+        for idx in self._buckets.get(graph_hash, []):
+            if type(self.graphs[idx]) is not type(graph):
+                continue
+            other = self._labelled_graphs[idx]
+            if other is None:
+                other = self._labelled_graphs[idx] = _get_labelled_graph(self.graphs[idx])
+            matcher = iso.GraphMatcher(
+                labelled,
+                other,
+                node_match=iso.categorical_node_match("label", None),
+                edge_match=iso.categorical_edge_match("label", None),
+            )
+            if isinstance(graph, MoleculeGraph):
+                if matcher.is_isomorphic():
+                    return idx
+            elif any(_images_match(labelled, other, mapping) for mapping in matcher.isomorphisms_iter()):
+                return idx
+        return None
+
+    def _insert(self, graph: StructureGraph | MoleculeGraph, graph_hash: str, labelled: nx.Graph) -> int:
+        """Insert a graph with a known hash and labelled graph if it is not present."""
+        idx = self._find(graph, graph_hash, labelled)
+        if idx is None:
+            idx = len(self.graphs)
+            self.graphs.append(graph)
+            self.hashes.append(graph_hash)
+            self._labelled_graphs.append(labelled)
+            self._buckets[graph_hash].append(idx)
+        return idx
+
+    def __len__(self) -> int:
+        """Number of unique graphs in the index."""
+        return len(self.graphs)
+
+    def __contains__(self, graph: object) -> bool:
+        if not isinstance(graph, (StructureGraph, MoleculeGraph)):
+            return False
+        return self.query(graph) is not None
+
+    def as_dict(self) -> dict:
+        """JSON-serializable dict representation."""
+        return {
+            "@module": type(self).__module__,
+            "@class": type(self).__name__,
+            "iterations": self.iterations,
+            "graphs": [graph.as_dict() for graph in self.graphs],
+            "hashes": self.hashes,
+        }
+
+    @classmethod
+    def from_dict(cls, dct: dict) -> Self:
+        """Reconstitute a GraphHashIndex from its dict representation, without
+        hashing the graphs again.
+        """
+        index = cls(iterations=dct["iterations"])
+        for graph_dct, graph_hash in zip(dct["graphs"], dct["hashes"]):
+            graph_cls = StructureGraph if graph_dct["@class"] == "StructureGraph" else MoleculeGraph
+            index._buckets[graph_hash].append(len(index.graphs))
+            index.graphs.append(graph_cls.from_dict(graph_dct))
+            index.hashes.append(graph_hash)
+            index._labelled_graphs.append(None)
+        return index
+
+
+def _get_labelled_graph(graph: StructureGraph | MoleculeGraph) -> nx.Graph:
+    """Get an undirected graph of the sites of a StructureGraph or MoleculeGraph.
+
+    Each edge has the periodic images of the bonds from its lower to its higher
+    site index as "images", with self bonds taken in the direction of their larger
+    image, and a "label" that only depends on the images up to an origin shift of
+    the sites. Each node has the species, number of bonds and dimensionality of
+    the bonded network of the site as "label".
+    """
+    periodic = isinstance(graph, StructureGraph)
+    sites = graph.structure if periodic else graph.molecule
+    images: defaultdict[tuple[int, int], list[tuple[int, ...]]] = defaultdict(list)
+    for u, v, data in graph.graph.edges(data=True):
+        image = tuple(int(x) for x in data["to_jimage"]) if periodic else (0, 0, 0)
+        neg_image = tuple(-x for x in image)
+        if u > v or (u == v and neg_image > image):
+            u, v, image = v, u, neg_image
+        images[u, v].append(image)
+
+    labelled = nx.Graph()
+    labelled.add_nodes_from(range(len(sites)))
+    degrees: Counter = Counter()
+    for (u, v), edge_images in images.items():
+        edge_images = sorted(edge_images)
+        if u == v:
+            label = edge_images
+        else:
+            # Images relative to the smallest in either direction, which do not
+            # change with the origin of the sites
+            label = min(
+                [tuple(int(x) for x in np.subtract(image, imgs[0])) for image in imgs]
+                for imgs in (edge_images, sorted(tuple(-x for x in image) for image in edge_images))
+            )
+        labelled.add_edge(u, v, images=edge_images, label=f"{len(edge_images)} {label}")
+        degrees[u] += len(edge_images)
+        degrees[v] += len(edge_images)
+
+    dims = _get_periodic_dims(labelled) if periodic else dict.fromkeys(labelled, 0)
+    for idx, site in enumerate(sites):
+        labelled.nodes[idx]["label"] = f"{site.species_string} {degrees[idx]} {dims[idx]}"
+    return labelled
+
+
+def _get_oriented_images(labelled: nx.Graph, u: int, v: int) -> list[tuple[int, ...]]:
+    """Sorted periodic images of the bonds from site u to site v of a labelled graph."""
+    images = labelled.edges[u, v]["images"]
+    if u <= v:
+        return images
+    return sorted(tuple(-x for x in image) for image in images)
+
+
+def _get_periodic_dims(labelled: nx.Graph) -> dict[int, int]:
+    """Get the number of independent lattice directions the bonded network of each
+    site extends in, from the periodic images of the cycles of a labelled graph.
+    """
+    dims: dict[int, int] = {}
+    for component in nx.connected_components(labelled):
+        root = min(component)
+        # Image of each site reached from the root along a spanning tree
+        positions = {root: np.zeros(3, dtype=int)}
+        cycles = []
+        queue = [root]
+        while queue:
+            u = queue.pop()
+            for v in labelled[u]:
+                for image in _get_oriented_images(labelled, u, v):
+                    if v not in positions:
+                        positions[v] = positions[u] + image
+                        queue.append(v)
+                    else:
+                        cycles.append(positions[u] + image - positions[v])
+        dim = int(np.linalg.matrix_rank(np.array(cycles))) if cycles else 0
+        dims.update(dict.fromkeys(component, dim))
+    return dims
+
+
+def _images_match(labelled: nx.Graph, other: nx.Graph, mapping: dict[int, int]) -> bool:
+    """Whether shifting the origin of each site of a labelled graph by a lattice
+    vector makes the periodic images of its bonds those of the bonds of another
+    labelled graph, with sites matched by mapping.
+    """
+    shifts: dict[int, np.ndarray] = {}
+    for root in labelled:
+        if root in shifts:
+            continue
+        shifts[root] = np.zeros(3, dtype=int)
+        queue = [root]
+        while queue:
+            u = queue.pop()
+            for v in labelled[u]:
+                images = _get_oriented_images(labelled, u, v)
+                other_images = _get_oriented_images(other, mapping[u], mapping[v])
+                if v not in shifts:
+                    # A common shift keeps the images in the same order
+                    shifts[v] = shifts[u] + np.subtract(other_images[0], images[0])
+                    queue.append(v)
+                shift = shifts[v] - shifts[u]
+                if [tuple(int(x) for x in np.add(image, shift)) for image in images] != other_images:
+                    return False
+    return True
+
+
+def _get_graph_key(graph: StructureGraph | MoleculeGraph, iterations: int) -> tuple[str, nx.Graph]:
+    """Get the Weisfeiler-Lehman hash and the labelled graph of a StructureGraph or
+    MoleculeGraph, as used by GraphHashIndex.
+    """
+    labelled = _get_labelled_graph(graph)
+    graph_hash = weisfeiler_lehman_graph_hash(labelled, edge_attr="label", node_attr="label", iterations=iterations)
+    return graph_hash, labelled
@@ -14,6 +14,7 @@ from bisect import bisect_left
 from collections import defaultdict
 from copy import deepcopy
 from functools import lru_cache
+from multiprocessing import Pool
 from typing import TYPE_CHECKING, Literal, NamedTuple, get_args
 
 import numpy as np
@@ -32,6 +33,7 @@ except Exception:
     openbabel = None
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from typing import Any
 
     from pymatgen.core.composition import SpeciesLike
@@ -409,6 +411,25 @@ class NearNeighbors:
         """
         return [self.get_nn_info(structure, n) for n in range(len(structure))]
 
+    def get_all_nn_info_many(self, structures: Sequence[Structure], n_jobs: int = 1) -> list[list[list[dict]]]:
+        """Get a listing of all neighbors for all sites of many structures.
+
+        Args:
+            structures (Sequence[Structure]): Input structures.
+            n_jobs (int): Number of processes the structures are split over.
+                Defaults to 1.
+
+        Returns:
+            list[list[list[dict]]]: The result of `get_all_nn_info` for each
+                structure.
+        """
+        if n_jobs == 1:
+            return [self.get_all_nn_info(structure) for structure in structures]
+
+        with Pool(n_jobs) as pool:
+            chunksize = max(1, len(structures) // (4 * n_jobs))
+            return list(pool.imap(self.get_all_nn_info, structures, chunksize=chunksize))
+
     def get_nn_shell_info(self, structure: Structure, site_idx, shell):
         """Get a certain nearest neighbor shell for a certain site.
 
@@ -740,9 +761,7 @@ class VoronoiNN(NearNeighbors):
                 - volume - Volume of Voronoi cell for this face
                 - n_verts - Number of vertices on the facet
         """
-        # Assemble the list of neighbors used in the tessellation. Gets all atoms within a certain radius
         targets = structure.elements if self.targets is None else self.targets
-        center = structure[n]
 
         # max cutoff is the longest diagonal of the cell + room for noise
         corners = [[1, 1, 1], [-1, 1, 1], [1, -1, 1], [1, 1, -1]]
@@ -751,16 +770,14 @@ class VoronoiNN(NearNeighbors):
 
         while True:
             try:
-                neighbors = structure.get_sites_in_sphere(center.coords, self.cutoff)
-                neighbors = [ngbr[0] for ngbr in sorted(neighbors, key=lambda s: s[1])]
-
-                # Run the Voronoi tessellation
-                qvoronoi_input = [site.coords for site in neighbors]
-
-                voro = Voronoi(qvoronoi_input)  # can give seg fault if cutoff is too small
+                # Only tessellate the site and its neighbors, see get_all_voronoi_polyhedra
+                # for the tessellation shared by all sites
+                tessellation = get_voronoi_tessellation(structure, self.cutoff, indices=[n])
 
                 # Extract data about the site in question
-                cell_info = self._extract_cell_info(0, neighbors, targets, voro, self.compute_adj_neighbors)
+                cell_info = self._extract_cell_info(
+                    tessellation.root_points[n], structure, tessellation, targets, self.compute_adj_neighbors
+                )
                 break
 
             except RuntimeError as exc:
@@ -789,61 +806,29 @@ class VoronoiNN(NearNeighbors):
                 - volume - Volume of Voronoi cell for this face
                 - n_verts - Number of vertices on the facet
         """
-        # Special case: For atoms with 1 site, the atom in the root image is not
-        # included in the get_all_neighbors output. Rather than creating logic to add
-        # that atom to the neighbor list, which requires detecting whether it will be
-        # translated to reside within the unit cell before neighbor detection, it is
-        # less complex to just call the one-by-one operation
+        # Special case: the tessellation of a structure with 1 site is more likely to
+        # need a larger cutoff, which get_voronoi_polyhedra increases as needed
         if len(structure) == 1:
             return [self.get_voronoi_polyhedra(structure, 0)]
 
-        # Assemble the list of neighbors used in the tessellation
+        # Run the tessellation, which is shared with get_voronoi_polyhedra
         targets = structure.elements if self.targets is None else self.targets
-
-        # Initialize the list of sites with the atoms in the origin unit cell
-        # The `get_all_neighbors` function returns neighbors for each site's image in
-        # the original unit cell. We start off with these central atoms to ensure they
-        # are included in the tessellation
-
-        sites = [x.to_unit_cell() for x in structure]
-        indices = [(idx, 0, 0, 0) for idx in range(len(structure))]
-
-        # Get all neighbors within a certain cutoff. Record both the list of these neighbors and the site indices.
-        all_neighs = structure.get_all_neighbors(self.cutoff, include_index=True, include_image=True)
-        for neighs in all_neighs:
-            sites.extend([x[0] for x in neighs])
-            indices.extend([(x[2],) + x[3] for x in neighs])
-
-        # Get the non-duplicates (using the site indices for numerical stability)
-        indices = np.array(indices, dtype=int)
-        indices, uniq_inds = np.unique(indices, return_index=True, axis=0)  # type: ignore[assignment]
-        sites = [sites[idx] for idx in uniq_inds]
-
-        # Sort array such that atoms in the root image are first
-        # Exploit the fact that the array is sorted by the unique operation such that
-        # the images associated with atom 0 are first, followed by atom 1, etc.
-        (root_images,) = np.nonzero(np.abs(indices[:, 1:]).max(axis=1) == 0)  # type: ignore[call-overload]
-
-        del indices  # Save memory (tessellations can be costly)
-
-        # Run the tessellation
-        qvoronoi_input = [s.coords for s in sites if s is not None]
-        voro = Voronoi(qvoronoi_input)
+        tessellation = get_voronoi_tessellation(structure, self.cutoff)
 
         # Get the information for each neighbor
         return [
-            self._extract_cell_info(idx, sites, targets, voro, self.compute_adj_neighbors)
-            for idx in root_images.tolist()
+            self._extract_cell_info(idx, structure, tessellation, targets, self.compute_adj_neighbors)
+            for idx in tessellation.root_points.tolist()
         ]
 
-    def _extract_cell_info(self, site_idx, sites, targets, voro, compute_adj_neighbors=False):
+    def _extract_cell_info(self, site_idx, structure, tessellation, targets, compute_adj_neighbors=False):
         """Get the information about a certain atom from the results of a tessellation.
 
         Args:
-            site_idx (int) - Index of the atom in question
-            sites ([Site]) - List of all sites in the tessellation
+            site_idx (int) - Index of the atom in question in the tessellation
+            structure (Structure) - Structure that was tessellated
+            tessellation (VoronoiTessellation) - Output of get_voronoi_tessellation
             targets ([Element]) - Target elements
-            voro - Output of qvoronoi
             compute_adj_neighbors (boolean) - Whether to compute which neighbors are adjacent
 
         Returns:
@@ -861,66 +846,68 @@ class VoronoiNN(NearNeighbors):
                 - adj_neighbors - Facet id's for the adjacent neighbors
         """
         # Get the coordinates of every vertex
+        voro = tessellation.voronoi
         all_vertices = voro.vertices
 
         # Get the coordinates of the central site
-        center_coords = sites[site_idx].coords
+        center_coords = tessellation.coords[site_idx]
 
-        # Iterate through all the faces in the tessellation
+        # Iterate through the faces of the site in question
         results = {}
-        for nn, vind in voro.ridge_dict.items():
-            # Get only those that include the site in question
-            if site_idx in nn:
-                other_site = nn[0] if nn[1] == site_idx else nn[1]
-                if -1 in vind:
-                    # -1 indices correspond to the Voronoi cell
-                    #  missing a face
-                    if self.allow_pathological:
-                        continue
+        for ridge_idx in np.flatnonzero((voro.ridge_points == site_idx).any(axis=1)).tolist():
+            nn = voro.ridge_points[ridge_idx].tolist()
+            vind = voro.ridge_vertices[ridge_idx]
+            other_site = nn[0] if nn[1] == site_idx else nn[1]
+            if -1 in vind:
+                # -1 indices correspond to the Voronoi cell
+                #  missing a face
+                if self.allow_pathological:
+                    continue
 
-                    raise RuntimeError("This structure is pathological, infinite vertex in the Voronoi construction")
-
-                # Get the solid angle of the face
-                facets = [all_vertices[idx] for idx in vind]
-                angle = solid_angle(center_coords, facets)
-
-                # Compute the volume of associated with this face
-                volume = 0
-                # qvoronoi returns vertices in CCW order, so I can break
-                # the face up in to segments (0,1,2), (0,2,3), ... to compute
-                # its area where each number is a vertex size
-                for j, k in zip(vind[1:], vind[2:]):
-                    volume += vol_tetra(
-                        center_coords,
-                        all_vertices[vind[0]],
-                        all_vertices[j],
-                        all_vertices[k],
-                    )
+                raise RuntimeError("This structure is pathological, infinite vertex in the Voronoi construction")
+
+            # Get the solid angle of the face
+            facets = [all_vertices[idx] for idx in vind]
+            angle = solid_angle(center_coords, facets)
+
+            # Compute the volume of associated with this face
+            volume = 0
+            # qvoronoi returns vertices in CCW order, so I can break
+            # the face up in to segments (0,1,2), (0,2,3), ... to compute
+            # its area where each number is a vertex size
+            for j, k in zip(vind[1:], vind[2:]):
+                volume += vol_tetra(
+                    center_coords,
+                    all_vertices[vind[0]],
+                    all_vertices[j],
+                    all_vertices[k],
+                )
 
-                # Compute the distance of the site to the face
-                face_dist = np.linalg.norm(center_coords - sites[other_site].coords) / 2
-
-                # Compute the area of the face (knowing V=Ad/3)
-                face_area = 3 * volume / face_dist
-
-                # Compute the normal of the facet
-                normal = np.subtract(sites[other_site].coords, center_coords)
-                normal /= np.linalg.norm(normal)
-
-                # Store by face index
-                results[other_site] = {
-                    "site": sites[other_site],
-                    "normal": normal,
-                    "solid_angle": angle,
-                    "volume": volume,
-                    "face_dist": face_dist,
-                    "area": face_area,
-                    "n_verts": len(vind),
-                }
+            # Compute the distance of the site to the face
+            other_coords = tessellation.coords[other_site]
+            face_dist = np.linalg.norm(center_coords - other_coords) / 2
+
+            # Compute the area of the face (knowing V=Ad/3)
+            face_area = 3 * volume / face_dist
+
+            # Compute the normal of the facet
+            normal = np.subtract(other_coords, center_coords)
+            normal /= np.linalg.norm(normal)
+
+            # Store by face index
+            results[other_site] = {
+                "site": _get_tessellation_site(structure, tessellation, other_site, 2 * face_dist),
+                "normal": normal,
+                "solid_angle": angle,
+                "volume": volume,
+                "face_dist": face_dist,
+                "area": face_area,
+                "n_verts": len(vind),
+            }
 
-                # If we are computing which neighbors are adjacent, store the vertices
-                if compute_adj_neighbors:
-                    results[other_site]["verts"] = vind
+            # If we are computing which neighbors are adjacent, store the vertices
+            if compute_adj_neighbors:
+                results[other_site]["verts"] = vind
 
         # all sites should have at least two connected ridges in periodic system
         if len(results) == 0:
@@ -1952,6 +1939,228 @@ def vol_tetra(vt1, vt2, vt3, vt4):
     return np.abs(np.dot((vt1 - vt4), np.cross((vt2 - vt4), (vt3 - vt4)))) / 6
 
 
+class VoronoiTessellation(NamedTuple):
+    """Voronoi tessellation of sites of a periodic structure and of their
+    periodic images within a cutoff of any of these sites.
+
+    Attributes:
+        points (np.ndarray): (n_points, 4) site index and image of each point.
+        coords (np.ndarray): (n_points, 3) Cartesian coords of each point.
+        root_points (np.ndarray): (n_sites,) index of the point of each site
+            in the unit cell, i.e. with a zero image, or -1 if it is not a point
+            of the tessellation.
+        voronoi (Voronoi): Tessellation of the points.
+    """
+
+    points: np.ndarray
+    coords: np.ndarray
+    root_points: np.ndarray
+    voronoi: Voronoi
+
+
+def get_voronoi_tessellation(
+    structure: Structure, cutoff: float, indices: Sequence[int] | None = None
+) -> VoronoiTessellation:
+    """Get the Voronoi tessellation of the sites of a periodic structure and
+    of their periodic images within cutoff of any site.
+
+    The tessellation of all sites only depends on the lattice and the site
+    positions. The most recently used ones are cached, so that the analyses of
+    all sites based on it, e.g. VoronoiNN.get_all_nn_info, CrystalNN and the
+    chemenv DetailedVoronoiContainer, tessellate a structure once. The returned
+    arrays must not be modified.
+
+    Args:
+        structure (Structure): Structure to be tessellated.
+        cutoff (float): Radius in Angstrom of the images included around each site.
+        indices (list[int]): Only tessellate these sites and the points within
+            cutoff of them, which is much cheaper for a few sites of a large
+            structure. Only the Voronoi cells of these sites are then complete.
+            Such tessellations are not cached. Defaults to None, i.e. all sites.
+
+    Returns:
+        VoronoiTessellation: The tessellation.
+    """
+    if indices is not None:
+        return _compute_voronoi_tessellation(
+            structure.lattice.matrix, structure.frac_coords, cutoff, np.asarray(indices, dtype=int)
+        )
+    return _get_voronoi_tessellation(
+        np.ascontiguousarray(structure.lattice.matrix, dtype=np.float64).tobytes(),
+        np.ascontiguousarray(structure.frac_coords, dtype=np.float64).tobytes(),
+        float(cutoff),
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_voronoi_tessellation(matrix: bytes, frac_coords: bytes, cutoff: float) -> VoronoiTessellation:
+    """Get the Voronoi tessellation of the sites of a lattice and their images,
+    taking advantage of caching.
+
+    Args:
+        matrix (bytes): Lattice matrix as float64 bytes.
+        frac_coords (bytes): Fractional coords of the sites as float64 bytes.
+        cutoff (float): Radius in Angstrom of the images included around each site.
+
+    Returns:
+        VoronoiTessellation: The tessellation.
+    """
+    return _compute_voronoi_tessellation(
+        np.frombuffer(matrix).reshape(3, 3), np.frombuffer(frac_coords).reshape(-1, 3), cutoff
+    )
+
+
+def _compute_voronoi_tessellation(
+    lattice_matrix: np.ndarray, frac_coords: np.ndarray, cutoff: float, indices: np.ndarray | None = None
+) -> VoronoiTessellation:
+    """Run the Voronoi tessellation of sites of a lattice and their images.
+
+    Args:
+        lattice_matrix (np.ndarray): Lattice matrix.
+        frac_coords (np.ndarray): Fractional coords of the sites.
+        cutoff (float): Radius in Angstrom of the images included around each site.
+        indices (np.ndarray): Indices of the sites to tessellate, defaults to all.
+
+    Returns:
+        VoronoiTessellation: The tessellation.
+    """
+    from pymatgen.optimization.neighbors import find_points_in_spheres
+
+    n_sites = len(frac_coords)
+    centers = np.arange(n_sites) if indices is None else indices
+    cart_coords = np.ascontiguousarray(frac_coords @ lattice_matrix, dtype=np.float64)
+    _center_indices, neighbor_indices, images, _distances = find_points_in_spheres(
+        cart_coords,
+        np.ascontiguousarray(cart_coords[centers]),
+        r=cutoff,
+        pbc=np.ones(3, dtype=int),
+        lattice=np.ascontiguousarray(lattice_matrix, dtype=np.float64),
+        tol=1e-8,
+    )
+
+    # Unique (site index, image) points, the sites in the cell being those with a zero image
+    points = np.concatenate(
+        [
+            np.column_stack([centers, np.zeros((len(centers), 3))]),
+            np.column_stack([neighbor_indices, images]),
+        ]
+    ).astype(int)
+    points = np.unique(points, axis=0)
+    is_root = ~points[:, 1:].any(axis=1)
+    root_points = np.full(n_sites, -1)
+    root_points[points[is_root, 0]] = np.flatnonzero(is_root)
+    coords = (frac_coords[points[:, 0]] + points[:, 1:]) @ lattice_matrix
+
+    voronoi = Voronoi(coords)
+    for array in (points, coords, root_points):
+        array.flags.writeable = False
+    return VoronoiTessellation(points, coords, root_points, voronoi)
+
+
+def _get_tessellation_site(
+    structure: Structure, tessellation: VoronoiTessellation, point_idx: int, nn_distance: float = 0.0
+) -> PeriodicNeighbor:
+    """Get the site of a point of a tessellation from get_voronoi_tessellation.
+
+    Args:
+        structure (Structure): Structure that was tessellated.
+        tessellation (VoronoiTessellation): The tessellation.
+        point_idx (int): Index of the point in the tessellation.
+        nn_distance (float): Distance of the point to the site it neighbors.
+
+    Returns:
+        PeriodicNeighbor: The site, with its index and image in the structure.
+    """
+    site_idx, *image = tessellation.points[point_idx].tolist()
+    site = structure[site_idx]
+    return PeriodicNeighbor(
+        species=site.species,
+        coords=site.frac_coords + image,
+        lattice=site.lattice,
+        properties=site.properties,
+        nn_distance=nn_distance,
+        index=site_idx,
+        image=tuple(image),
+        label=site.label,
+    )
+
+
+def _get_all_voronoi_facets(structure: Structure, cutoff: float) -> tuple[np.ndarray, ...]:
+    """Get the Voronoi facets of all sites in a periodic structure from the
+    tessellation of the sites and their periodic images within cutoff, see
+    get_voronoi_tessellation. The solid angles and areas are computed as in
+    VoronoiNN, for all facets at once.
+
+    Args:
+        structure (Structure): Structure to be evaluated.
+        cutoff (float): Radius in Angstrom of the images included around each site.
+
+    Returns:
+        tuple[np.ndarray, ...]: For each facet, the index of the central site, the
+            index of the neighboring site, the (n_facets, 3) image and Cartesian
+            coords of the neighbor, the solid angle and the area.
+
+    Raises:
+        RuntimeError: If a facet has an infinite vertex, e.g. because the
+            cutoff is too small.
+    """
+    points, coords, root_points, voro = get_voronoi_tessellation(structure, cutoff)
+    site_of_point = np.full(len(points), -1)
+    site_of_point[root_points] = np.arange(len(structure))
+
+    # Every ridge between a site in the cell and another point is a facet of that site
+    ridge_points = voro.ridge_points
+    facet_ridges, facet_sides = np.nonzero(site_of_point[ridge_points] >= 0)
+    centers = ridge_points[facet_ridges, facet_sides]
+    others = ridge_points[facet_ridges, 1 - facet_sides]
+    order = np.lexsort((others, site_of_point[centers]))
+    facet_ridges, centers, others = facet_ridges[order], centers[order], others[order]
+
+    ridge_vertices = [voro.ridge_vertices[idx] for idx in facet_ridges.tolist()]
+    n_verts = np.array([len(verts) for verts in ridge_vertices])
+    flat_verts = np.concatenate(ridge_vertices) if ridge_vertices else np.zeros(0, dtype=int)
+    if np.any(flat_verts == -1):
+        raise RuntimeError("This structure is pathological, infinite vertex in the Voronoi construction")
+
+    # Split each facet into the triangles (0, j, j + 1) of its vertices
+    n_triangles = n_verts - 2
+    tri_facets = np.repeat(np.arange(len(n_verts)), n_triangles)
+    vert_starts = np.cumsum(n_verts) - n_verts
+    tri_offsets = np.arange(len(tri_facets)) - np.repeat(np.cumsum(n_triangles) - n_triangles, n_triangles) + 1
+    tri_centers = coords[centers[tri_facets]]
+    disp_0 = voro.vertices[flat_verts[vert_starts[tri_facets]]] - tri_centers
+    disp_1 = voro.vertices[flat_verts[vert_starts[tri_facets] + tri_offsets]] - tri_centers
+    disp_2 = voro.vertices[flat_verts[vert_starts[tri_facets] + tri_offsets + 1]] - tri_centers
+
+    # Solid angle of each triangle, see solid_angle
+    norm_0, norm_1, norm_2 = (np.linalg.norm(disp, axis=1) for disp in (disp_0, disp_1, disp_2))
+    triple_prod = np.abs(np.einsum("ij,ij->i", disp_0, np.cross(disp_1, disp_2)))
+    denom = (
+        norm_0 * norm_1 * norm_2
+        + norm_2 * np.einsum("ij,ij->i", disp_0, disp_1)
+        + norm_1 * np.einsum("ij,ij->i", disp_0, disp_2)
+        + norm_0 * np.einsum("ij,ij->i", disp_1, disp_2)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tri_angles = np.where(
+            denom == 0, np.where(triple_prod > 0, 0.5 * math.pi, -0.5 * math.pi), np.arctan(triple_prod / denom)
+        )
+    tri_angles = 2 * np.where(tri_angles > 0, tri_angles, tri_angles + math.pi)
+
+    solid_angles = np.bincount(tri_facets, weights=tri_angles, minlength=len(n_verts))
+    volumes = np.bincount(tri_facets, weights=triple_prod / 6, minlength=len(n_verts))
+    face_dists = np.linalg.norm(coords[others] - coords[centers], axis=1) / 2
+
+    return (
+        site_of_point[centers],
+        points[others, 0],
+        points[others, 1:],
+        coords[others],
+        solid_angles,
+        3 * volumes / face_dists,
+    )
+
+
 def get_okeeffe_params(el_symbol):
     """Get the elemental parameters related to atom size and electronegativity which are
     used for estimating bond-valence parameters (bond length) of pairs of atoms on the
@@ -3845,8 +4054,24 @@ class CrystalNN(NearNeighbors):
                 to the coordination number (1 or smaller), 'site_index' gives index of
                 the corresponding site in the original structure.
         """
-        nn_data = self.get_nn_data(structure, n)
+        return self._get_nn_info_from_data(self.get_nn_data(structure, n))
 
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict]]:
+        """Get the near-neighbor information of all sites in a structure. See
+        get_all_nn_data for how this differs from calling get_nn_info for
+        each site.
+
+        Args:
+            structure: (Structure) pymatgen Structure
+
+        Returns:
+            list[list[dict]]: near-neighbor information of each site, in the
+                format of get_nn_info.
+        """
+        return [self._get_nn_info_from_data(nn_data) for nn_data in self.get_all_nn_data(structure)]
+
+    def _get_nn_info_from_data(self, nn_data: CrystalNN.NNData) -> list[dict]:
+        """Get the near-neighbor information of a site from its NNData."""
         if not self.weighted_cn:
             max_key = max(nn_data.cn_weights, key=lambda k: nn_data.cn_weights[k])
             nn = nn_data.cn_nninfo[max_key]
@@ -3854,14 +4079,14 @@ class CrystalNN(NearNeighbors):
                 entry["weight"] = 1
             return nn
 
-        for entry in nn_data.all_nninfo:
-            weight = 0
-            for cn in nn_data.cn_nninfo:
-                for cn_entry in nn_data.cn_nninfo[cn]:
-                    if entry["site"] == cn_entry["site"]:
-                        weight += nn_data.cn_weights[cn]
+        # the entries of each CN are the same dicts as in all_nninfo
+        weights = {id(entry): 0 for entry in nn_data.all_nninfo}
+        for cn in nn_data.cn_nninfo:
+            for cn_entry in nn_data.cn_nninfo[cn]:
+                weights[id(cn_entry)] += nn_data.cn_weights[cn]
 
-            entry["weight"] = weight
+        for entry in nn_data.all_nninfo:
+            entry["weight"] = weights[id(entry)]
 
         return nn_data.all_nninfo
 
@@ -3958,12 +4183,135 @@ class CrystalNN(NearNeighbors):
 
         # sort nearest neighbors from highest to lowest weight
         nn = sorted(nn, key=lambda x: x["weight"], reverse=True)
+        for entry in nn:
+            del entry["poly_info"]  # trim
+
+        return self._get_nn_data_from_weights(nn, length)
+
+    def get_all_nn_data(self, structure: Structure, length=None) -> list[CrystalNN.NNData]:
+        """Get the NNData of all sites in a structure, as returned by
+        get_nn_data for each site.
+
+        Rather than a tessellation around every site, this runs a single
+        Voronoi tessellation of the structure and computes the weights of
+        all neighbors of all sites as arrays. The sites that cannot be
+        handled this way, e.g. in disordered structures or when the search
+        cutoff is too small, fall back to get_nn_data. Neighbors whose weights
+        are equal are not necessarily in the same order as get_nn_data.
+
+        Args:
+            structure: (Structure) enclosing structure object
+            length: (int) if set, will return a fixed range of CN numbers
+
+        Returns:
+            list[NNData]: the NNData of each site.
+        """
+        length = length or self.fingerprint_length
+        if not structure.is_ordered:
+            return [self.get_nn_data(structure, n, length) for n in range(len(structure))]
+        try:
+            centers, neighbors, images, coords, solid_angles, areas = _get_all_voronoi_facets(
+                structure, self.search_cutoff
+            )
+        except RuntimeError:
+            # get_nn_data increases the cutoff until the tessellation is closed
+            return [self.get_nn_data(structure, n, length) for n in range(len(structure))]
+
+        # determine possible bond targets
+        if self.cation_anion:
+            oxi_states = np.array([getattr(site.specie, "oxi_state", None) for site in structure], dtype=float)
+            center_oxi_states = np.array([site.specie.oxi_state for site in structure], dtype=float)
+            has_targets = (center_oxi_states[:, None] * oxi_states[None, :] <= 0).any(axis=1)
+            if not has_targets.all():
+                raise ValueError("No valid targets for site within cation_anion constraint!")
+            is_target = oxi_states[neighbors] * center_oxi_states[centers] <= 0
+            centers, neighbors, images, coords, solid_angles, areas = (
+                arr[is_target] for arr in (centers, neighbors, images, coords, solid_angles, areas)
+            )
+
+        dists = np.linalg.norm(structure.cart_coords[centers] - coords, axis=1)
+
+        # solid angle weights relative to the largest facet of each site, as in VoronoiNN
+        max_angles = np.full(len(structure), -np.inf)
+        np.maximum.at(max_angles, centers, solid_angles)
+        weights = solid_angles / max_angles[centers]
+        is_nn = weights > 0
+
+        # solid angle weights can be misleading in open / porous structures
+        # adjust weights to correct for this behavior
+        if self.porous_adjustment:
+            weights = weights * solid_angles / areas
+
+        # adjust solid angle weight based on electronegativity difference
+        if self.x_diff_weight > 0:
+            x_vals = np.array([site.specie.X for site in structure], dtype=float)
+            x_diffs = np.abs(x_vals[centers] - x_vals[neighbors])
+            # note: 3.3 is max deltaX between 2 elements
+            chemical_weights = 1 + self.x_diff_weight * np.sqrt(x_diffs / 3.3)
+            weights = weights * np.where(np.isnan(x_diffs), 1, chemical_weights)
+
+        # renormalize weights so the highest weight of each site is 1.0
+        highest_weights = np.zeros(len(structure))
+        np.maximum.at(highest_weights, centers[is_nn], weights[is_nn])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(highest_weights[centers] > 0, weights / highest_weights[centers], 0)
+
+        # adjust solid angle weights based on distance
+        if self.distance_cutoffs:
+            radii = np.array([_get_radius(site) for site in structure])
+            diameters = radii[centers] + radii[neighbors]
+            no_radius = (radii[centers] <= 0) | (radii[neighbors] <= 0)
+            if np.any(no_radius & is_nn):
+                warnings.warn(
+                    "CrystalNN: cannot locate an appropriate radius, "
+                    "covalent or atomic radii will be used, this can lead "
+                    "to non-optimal results."
+                )
+                default_radii = np.array([_get_default_radius(site) for site in structure])
+                diameters = np.where(no_radius, default_radii[centers] + default_radii[neighbors], diameters)
+
+            cutoffs_low = diameters + self.distance_cutoffs[0]
+            cutoffs_high = diameters + self.distance_cutoffs[1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                smooth_weights = (np.cos((dists - cutoffs_low) / (cutoffs_high - cutoffs_low) * math.pi) + 1) * 0.5
+            weights = weights * np.where(dists <= cutoffs_low, 1, np.where(dists < cutoffs_high, smooth_weights, 0))
+
+        # sort nearest neighbors of each site from highest to lowest weight
+        order = np.lexsort((-weights, centers))
+        order = order[is_nn[order]]
+        splits = np.searchsorted(centers[order], np.arange(1, len(structure)))
+        all_nn_data = []
+        for n, site_order in enumerate(np.split(order, splits)):
+            if len(site_order) == 0:
+                all_nn_data.append(self.get_nn_data(structure, n, length))
+                continue
+            nn = []
+            for idx, weight in zip(site_order.tolist(), weights[site_order].tolist()):
+                site = structure[neighbors[idx]]
+                image = tuple(images[idx].tolist())
+                neighbor = PeriodicNeighbor(
+                    site.species,
+                    site.frac_coords + images[idx],
+                    structure.lattice,
+                    properties=site.properties,
+                    nn_distance=dists[idx],
+                    index=int(neighbors[idx]),
+                    image=image,
+                    label=site.label,
+                )
+                nn.append({"site": neighbor, "image": image, "weight": weight, "site_index": int(neighbors[idx])})
+            all_nn_data.append(self._get_nn_data_from_weights(nn, length))
+        return all_nn_data
+
+    def _get_nn_data_from_weights(self, nn: list[dict], length=None) -> CrystalNN.NNData:
+        """Get the CN probabilities of a site from its near neighbors, sorted
+        from highest to lowest weight.
+        """
         if nn[0]["weight"] == 0:
             return self.transform_to_length(self.NNData([], {0: 1.0}, {0: []}), length)
 
         for entry in nn:
             entry["weight"] = round(entry["weight"], 3)
-            del entry["poly_info"]  # trim
 
         # remove entries with no weight
         nn = [x for x in nn if x["weight"] > 0]
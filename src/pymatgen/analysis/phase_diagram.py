@@ -11,6 +11,7 @@ import re
 import warnings
 from collections import defaultdict
 from functools import lru_cache
+from multiprocessing import Pool
 from typing import TYPE_CHECKING, no_type_check
 
 import matplotlib.pyplot as plt
@@ -31,7 +32,7 @@ from pymatgen.util.plotting import pretty_plot
 from pymatgen.util.string import htmlify, latexify
 from scipy import interpolate
 from scipy.optimize import minimize
-from scipy.spatial import ConvexHull
+from scipy.spatial import ConvexHull, QhullError
 from tqdm import tqdm
 
 if TYPE_CHECKING:
@@ -368,6 +369,12 @@ class PhaseDiagram(MSONable):
             assert isinstance(computed_data, dict)
             # update keys to be Element objects in case they are strings in pre-computed data
             computed_data["el_refs"] = [(Element(el_str), entry) for el_str, entry in computed_data["el_refs"]]
+        self._set_computed_data(computed_data)
+        # Incremental convex hull, built by the first call to add_entries
+        self._qhull: ConvexHull | None = None
+
+    def _set_computed_data(self, computed_data: dict[str, Any]) -> None:
+        """Set the attributes derived from the output of _compute()."""
         self.computed_data = computed_data
         self.facets = computed_data["facets"]
         self.simplexes = computed_data["simplexes"]
@@ -380,6 +387,137 @@ class PhaseDiagram(MSONable):
         self._stable_entries = tuple({self.qhull_entries[idx] for idx in set(itertools.chain(*self.facets))})
         self._stable_spaces = tuple(frozenset(e.elements) for e in self._stable_entries)
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state for pickling and copying.
+
+        The incremental qhull cannot be pickled, so it is dropped and rebuilt by
+        the next call to add_entries.
+        """
+        state = self.__dict__.copy()
+        if state.get("_qhull") is not None:
+            state["_qhull"] = None
+        return state
+
+    def add_entries(self, entries: Sequence[PDEntry]) -> None:
+        """Add entries to the phase diagram without recomputing the convex hull
+        from scratch.
+
+        On the first call the hull of the existing qhull_data is kept as an
+        incremental qhull. New entries with negative formation energy are then
+        inserted into it, so only the facets visible from those entries are
+        touched. The facets, simplexes, qhull entries and stable entries are
+        updated in place. Entries above the hull only extend all_entries.
+
+        A full recomputation is done if a new elemental entry is lower in energy
+        than the current elemental reference, since that changes every formation
+        energy, for 1D phase diagrams, or if qhull fails to add the new points to
+        the incremental hull.
+
+        Note that an existing entry outbid by a new entry of the same reduced
+        composition stays in qhull_entries, but can no longer be a hull vertex.
+
+        Args:
+            entries (list[PDEntry]): PDEntry-like objects to add. Their elements
+                must all be in the phase diagram.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        for entry in entries:
+            if set(entry.elements) - set(self.elements):
+                raise ValueError(f"{entry} has elements not in the phase diagram {', '.join(map(str, self.elements))}")
+
+        self.entries = [*self.entries, *entries]
+        self._get_facet_and_simplex.cache_clear()
+        self._get_stable_entries_in_space.cache_clear()
+
+        new_refs = any(
+            entry.composition.is_element
+            and entry.energy_per_atom < self.el_refs[entry.composition.elements[0]].energy_per_atom
+            for entry in entries
+        )
+        if self.dim == 1 or new_refs:
+            self._set_computed_data(self._compute())
+            self._qhull = None
+            return
+
+        if self._qhull is None:
+            self._qhull = ConvexHull(self.qhull_data, qhull_options="Qt i", incremental=True)
+            # Row of qhull_data of each qhull point, -1 for the extra point
+            self._qhull_rows = np.arange(len(self.qhull_data))
+            self._qhull_rows[-1] = -1
+            self._qhull_min_energies = {}
+            for entry in self.qhull_entries:
+                comp = entry.composition.reduced_composition
+                self._qhull_min_energies[comp] = min(
+                    entry.energy_per_atom, self._qhull_min_energies.get(comp, float("inf"))
+                )
+
+        data = np.array(
+            [[e.composition.get_atomic_fraction(el) for el in self.elements] + [e.energy_per_atom] for e in entries]
+        )
+        vec = [self.el_refs[el].energy_per_atom for el in self.elements] + [-1]
+        form_e = -np.dot(data, vec)
+
+        # Only the lowest energy entry with negative formation energy at each
+        # composition can become a hull vertex
+        candidates: dict[Composition, int] = {}
+        for idx in np.argsort(data[:, -1], kind="stable"):
+            comp = entries[idx].composition.reduced_composition
+            if form_e[idx] >= -PhaseDiagram.formation_energy_tol or comp in candidates:
+                continue
+            if data[idx, -1] < self._qhull_min_energies.get(comp, float("inf")):
+                candidates[comp] = idx
+                self._qhull_min_energies[comp] = data[idx, -1]
+
+        all_entries = [*self.all_entries, *entries]
+        if not candidates:
+            self.computed_data["all_entries"] = self.all_entries = all_entries
+            return
+
+        new_idx = sorted(candidates.values())
+        n_old = len(self.qhull_entries)
+        qhull_entries = [*self.qhull_entries, *(entries[idx] for idx in new_idx)]
+        qhull_data = np.concatenate([self.qhull_data[:-1], data[new_idx, 1:], self.qhull_data[-1:]])
+        try:
+            self._qhull.add_points(data[new_idx, 1:])
+        except QhullError:
+            # Incremental updates can hit precision errors that a full rebuild avoids
+            self._qhull.close()
+            self._qhull = None
+            self._set_computed_data(self._compute())
+            return
+        self._qhull_rows = np.concatenate([self._qhull_rows, np.arange(n_old, n_old + len(new_idx))])
+
+        new_entries = [entries[idx] for idx in new_idx]
+        self.computed_data.update(all_entries=all_entries, qhull_data=qhull_data, qhull_entries=qhull_entries)
+        self.all_entries = all_entries
+        self.qhull_data = qhull_data
+        self.qhull_entries = tuple(qhull_entries)
+        self._qhull_spaces += tuple(frozenset(e.elements) for e in new_entries)
+
+        if not np.isin(self._qhull_rows[self._qhull.vertices], np.arange(n_old, len(qhull_entries))).any():
+            return
+
+        facets = self._qhull_rows[self._qhull.simplices]
+        # Skip facets that include the extra point, then degenerate ones
+        facets = facets[(facets >= 0).all(axis=1)]
+        mats = qhull_data[facets]
+        mats[:, :, -1] = 1
+        facets = facets[np.abs(np.linalg.det(mats)) > 1e-14]
+
+        old_simplexes = {tuple(sorted(facet)): simplex for facet, simplex in zip(self.facets, self.simplexes)}
+        simplexes = []
+        for facet in facets:
+            simplex = old_simplexes.get(tuple(sorted(facet)))
+            simplexes.append(Simplex(qhull_data[facet, :-1]) if simplex is None else simplex)
+
+        self.computed_data.update(facets=list(facets), simplexes=simplexes)
+        self.facets = self.computed_data["facets"]
+        self.simplexes = simplexes
+        self._stable_entries = tuple({self.qhull_entries[idx] for idx in set(itertools.chain(*self.facets))})
+        self._stable_spaces = tuple(frozenset(e.elements) for e in self._stable_entries)
+
     def as_dict(self):
         """Get MSONable dict representation of PhaseDiagram."""
         return {
@@ -704,6 +842,139 @@ class PhaseDiagram(MSONable):
         """
         return comp.num_atoms * self.get_hull_energy_per_atom(comp)
 
+    def _get_batch_facets_and_bary_coords(self, coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Locate the facets that many points fall into at once.
+
+        The barycentric coordinates are computed from the inverse matrices stored
+        on the simplexes. A uniform grid over the pd_coords space serves as the
+        facet search index: the points of each grid cell are only tested against
+        the facets whose bounding box overlaps that cell. Like _get_facet_and_simplex,
+        the first facet (in self.facets order) containing a point is returned.
+
+        Args:
+            coords (np.ndarray): (n, dim - 1) array of pd_coords.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Index into self.facets of the facet
+                containing each point, -1 if there is none, and the (n, dim)
+                barycentric coordinates of each point in that facet (NaN if none).
+        """
+        tol = PhaseDiagram.numerical_tol / 10
+        n_points, n_facets = len(coords), len(self.facets)
+        facet_indices = np.full(n_points, -1)
+        bary_coords = np.full((n_points, self.dim), np.nan)
+        if n_points == 0:
+            return facet_indices, bary_coords
+
+        aug_coords = np.concatenate([coords, np.ones((n_points, 1))], axis=1)
+        aug_invs = np.array([simplex._aug_inv for simplex in self.simplexes])
+        vertices = self.qhull_data[np.array(self.facets)][..., :-1]
+        lower, upper = vertices.min(axis=1) - tol, vertices.max(axis=1) + tol
+
+        n_grid = max(1, round(n_facets ** (1 / max(1, self.dim - 1))))
+        cells = np.clip(np.floor(coords * n_grid), 0, n_grid - 1).astype(int)
+        cell_ids = np.ravel_multi_index(cells.T, (n_grid,) * (self.dim - 1)) if self.dim > 1 else np.zeros(n_points)
+        order = np.argsort(cell_ids, kind="stable")
+        bounds = np.flatnonzero(np.diff(cell_ids[order])) + 1
+
+        for points in np.split(order, bounds):
+            cell = cells[points[0]]
+            candidates = np.flatnonzero(
+                np.logical_and(lower <= (cell + 1) / n_grid, upper >= cell / n_grid).all(axis=1)
+            )
+            if len(candidates) == 0:
+                continue
+            # (dim, n_candidates * dim) matrix so that a single matmul gives the
+            # barycentric coordinates of a chunk of points in all candidate facets
+            cand_invs = aug_invs[candidates].transpose(1, 0, 2).reshape(self.dim, -1)
+            chunk_size = max(1, 2**20 // (len(candidates) * self.dim))
+            for start in range(0, len(points), chunk_size):
+                chunk = points[start : start + chunk_size]
+                bary = np.dot(aug_coords[chunk], cand_invs).reshape(len(chunk), len(candidates), self.dim)
+                inside = (bary >= -tol).all(axis=2)
+                found = inside.any(axis=1)
+                first = inside.argmax(axis=1)[found]
+                facet_indices[chunk[found]] = candidates[first]
+                bary_coords[chunk[found]] = bary[found, first]
+
+        return facet_indices, bary_coords
+
+    def get_batch_decomp_and_hull_energy_per_atom(
+        self, comps: Sequence[Composition] | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized get_decomp_and_hull_energy_per_atom for many compositions.
+
+        Args:
+            comps (list[Composition] | np.ndarray): Compositions, or an (n, dim - 1)
+                array of their pd_coords.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (decomp_indices, decomp_amounts,
+                hull_energies). decomp_indices is an (n, dim) array of indices into
+                qhull_entries of the entries of the facet each composition falls in,
+                and decomp_amounts holds the matching fractions of the composition,
+                with amounts below numerical_tol set to zero. hull_energies holds the
+                hull energies per atom. Compositions outside the phase diagram get
+                indices of -1 and NaN amounts and energies.
+        """
+        coords = comps if isinstance(comps, np.ndarray) else np.array([self.pd_coords(comp) for comp in comps])
+        coords = coords.reshape(len(coords), self.dim - 1)
+        facet_indices, amounts = self._get_batch_facets_and_bary_coords(coords)
+        amounts[np.abs(amounts) <= PhaseDiagram.numerical_tol] = 0
+
+        found = facet_indices >= 0
+        decomp_indices = np.full((len(coords), self.dim), -1)
+        decomp_indices[found] = np.array(self.facets)[facet_indices[found]]
+        energies = np.array([entry.energy_per_atom for entry in self.qhull_entries])
+        hull_energies = np.full(len(coords), np.nan)
+        hull_energies[found] = np.sum(energies[decomp_indices[found]] * amounts[found], axis=1)
+
+        return decomp_indices, amounts, hull_energies
+
+    def _get_batch_hull_energy_per_atom(self, comps: Sequence[Composition]) -> np.ndarray:
+        """Hull energies per atom of many compositions, NaN outside the phase diagram."""
+        return self.get_batch_decomp_and_hull_energy_per_atom(comps)[2]
+
+    def get_batch_e_above_hull(
+        self,
+        entries: Sequence[PDEntry],
+        allow_negative: bool = False,
+        on_error: Literal["raise", "warn", "ignore"] = "raise",
+    ) -> np.ndarray:
+        """Vectorized get_e_above_hull for many entries.
+
+        Args:
+            entries (list[PDEntry]): PDEntry-like objects.
+            allow_negative (bool): Whether to allow negative e_above_hulls. Defaults to False.
+            on_error ('raise' | 'warn' | 'ignore'): What to do for entries without a
+                valid decomposition. 'raise' will throw ValueError, 'warn' and 'ignore'
+                set their energy above hull to NaN. Defaults to 'raise'.
+
+        Raises:
+            ValueError: If on_error is 'raise' and no valid decomposition exists in this
+                phase diagram for some entry.
+
+        Returns:
+            np.ndarray: Energies above the convex hull per atom.
+        """
+        hull_energies = self._get_batch_hull_energy_per_atom([entry.composition for entry in entries])
+        e_above_hull = np.array([entry.energy_per_atom for entry in entries]) - hull_energies
+
+        invalid = np.isnan(e_above_hull)
+        if not allow_negative:
+            invalid |= e_above_hull < -PhaseDiagram.numerical_tol
+        if invalid.any():
+            msg = (
+                f"No valid decomposition found for {entries[np.argmax(invalid)]} and {invalid.sum() - 1} other entries"
+            )
+            if on_error == "raise":
+                raise ValueError(msg)
+            if on_error == "warn":
+                warnings.warn(msg)
+            e_above_hull[invalid] = np.nan
+
+        return e_above_hull
+
     def get_decomp_and_e_above_hull(
         self,
         entry: PDEntry,
@@ -1565,6 +1836,9 @@ class PatchedPhaseDiagram(PhaseDiagram):
         elements: Sequence[Element] | None = None,
         keep_all_spaces: bool = False,
         verbose: bool = False,
+        n_jobs: int = 1,
+        *,
+        computed_data: dict[str, Any] | None = None,
     ) -> None:
         """
         Args:
@@ -1578,11 +1852,23 @@ class PatchedPhaseDiagram(PhaseDiagram):
             keep_all_spaces (bool): Boolean control on whether to keep chemical spaces
                 that are subspaces of other spaces.
             verbose (bool): Whether to show progress bar during convex hull construction.
+            n_jobs (int): Number of processes used to compute the PhaseDiagrams of the
+                chemical spaces. Defaults to 1.
+            computed_data (dict): Pre-computed hulls as returned by _get_computed_data(),
+                which refer to entries by their index in the entries argument. This
+                allows the PatchedPhaseDiagram to be reconstituted without computing
+                any convex hull and is stored by as_dict().
         """
         if elements is None:
             elements = sorted({els for entry in entries for els in entry.elements})
 
         self.dim = len(elements)
+        self.elements = elements
+        self.keep_all_spaces = keep_all_spaces
+
+        if computed_data is not None:
+            self._set_pds_from_computed_data(list(entries), computed_data)
+            return
 
         entries = sorted(entries, key=lambda e: e.composition.reduced_composition)
 
@@ -1640,19 +1926,162 @@ class PatchedPhaseDiagram(PhaseDiagram):
 
             spaces = systems
 
-        # TODO comprhys: refactor to have self._compute method to allow serialization
         self.spaces = sorted(spaces, key=len, reverse=False)  # Calculate pds for smaller dimension spaces first
-        self.pds = dict(self._get_pd_patch_for_space(s) for s in tqdm(self.spaces, disable=not verbose))
+        if n_jobs > 1:
+            space_entries = [self._get_space_entries(space) for space in self.spaces]
+            chunksize = max(1, len(self.spaces) // (4 * n_jobs))
+            with Pool(n_jobs) as pool:
+                # Workers only return entry indices so that the patches are built on
+                # the original entries rather than on pickled copies of them
+                pds_data = pool.imap(_get_pd_computed_data, space_entries, chunksize=chunksize)
+                self.pds = {
+                    space: _get_pd_from_computed_data(entries, pd_data)
+                    for space, entries, pd_data in zip(
+                        self.spaces, space_entries, tqdm(pds_data, total=len(self.spaces), disable=not verbose)
+                    )
+                }
+        else:
+            self.pds = dict(self._get_pd_patch_for_space(s) for s in tqdm(self.spaces, disable=not verbose))
         self.all_entries = all_entries
         self.el_refs = el_refs
-        self.elements = elements
+        self._set_stable_entries()
 
+    def _set_stable_entries(self) -> None:
+        """Collect the stable entries of all PD patches."""
         # Add terminal elements as we may not have PD patches including them
         # NOTE add el_refs in case no multielement entries are present for el
         _stable_entries = {se for pd in self.pds.values() for se in pd._stable_entries}
         self._stable_entries = tuple(_stable_entries | {*self.el_refs.values()})
         self._stable_spaces = tuple(frozenset(entry.elements) for entry in self._stable_entries)
 
+    def _get_computed_data(self) -> dict[str, Any]:
+        """Compact representation of the hulls of all PD patches.
+
+        Entries are given by their index in all_entries, so they are stored only
+        once however many patches they belong to. For each patch, only its
+        elements, qhull entries and facets are kept, which is all that is needed
+        to rebuild it without running qhull.
+
+        Returns:
+            dict[str, Any]: JSON-serializable computed data.
+        """
+        index = {id(entry): idx for idx, entry in enumerate(self.all_entries)}
+        return {
+            "el_refs": {el.symbol: index[id(entry)] for el, entry in self.el_refs.items()},
+            "qhull_entries": [index[id(entry)] for entry in self.qhull_entries],
+            "pds": [
+                {
+                    "elements": [el.symbol for el in pd.elements],
+                    "qhull_entries": [index[id(entry)] for entry in pd.qhull_entries],
+                    "facets": np.array(pd.facets).tolist(),
+                }
+                for pd in self.pds.values()
+            ],
+        }
+
+    def _set_pds_from_computed_data(self, all_entries: list[PDEntry], computed_data: dict[str, Any]) -> None:
+        """Rebuild the PD patches from the output of _get_computed_data()."""
+        self.all_entries = all_entries
+        self.el_refs = {Element(el): all_entries[idx] for el, idx in computed_data["el_refs"].items()}
+        self.qhull_entries = tuple(all_entries[idx] for idx in computed_data["qhull_entries"])
+        self._qhull_spaces = tuple(frozenset(entry.elements) for entry in self.qhull_entries)
+
+        self.pds = {}
+        for pd_data in computed_data["pds"]:
+            elements = [Element(el) for el in pd_data["elements"]]
+            entries = [all_entries[idx] for idx in pd_data["qhull_entries"]]
+            qhull_data = np.array(
+                [
+                    [entry.composition.get_atomic_fraction(el) for el in elements[1:]] + [entry.energy_per_atom]
+                    for entry in entries
+                ]
+            )
+            # Same extra point as in PhaseDiagram._compute
+            extra_point = np.zeros(len(elements)) + 1 / len(elements)
+            extra_point[-1] = np.max(qhull_data) + 1
+            qhull_data = np.concatenate([qhull_data, [extra_point]], axis=0)
+            facets = [np.array(facet) for facet in pd_data["facets"]]
+            pd_computed_data = {
+                "facets": facets,
+                "simplexes": [Simplex(qhull_data[facet, :-1]) for facet in facets],
+                "all_entries": entries,
+                "qhull_data": qhull_data,
+                "dim": len(elements),
+                "el_refs": [(el, self.el_refs[el]) for el in elements],
+                "qhull_entries": entries,
+            }
+            self.pds[frozenset(elements)] = PhaseDiagram(entries, elements, computed_data=pd_computed_data)
+
+        self.spaces = list(self.pds)
+        self._set_stable_entries()
+
+    def _get_space_entries(self, space: frozenset[Element]) -> list[PDEntry]:
+        """Qhull entries whose elements are all in a chemical space."""
+        return [e for e, s in zip(self.qhull_entries, self._qhull_spaces) if space.issuperset(s)]
+
+    def add_entries(self, entries: Sequence[PDEntry]) -> None:
+        """Add entries to the PatchedPhaseDiagram, only updating the PD patches
+        whose chemical space contains them.
+
+        Patches are updated with PhaseDiagram.add_entries. Entries in a chemical
+        space not covered by any patch get a new patch, which replaces the patches
+        of its subspaces unless keep_all_spaces is set. A new elemental entry lower
+        in energy than the current reference changes every formation energy, so
+        all patches are recomputed in that case.
+
+        Args:
+            entries (list[PDEntry]): PDEntry-like objects to add. Their elements
+                must all be in the phase diagram.
+        """
+        entries = list(entries)
+        for entry in entries:
+            if set(entry.elements) - set(self.elements):
+                raise ValueError(f"{entry} has elements not in the phase diagram {', '.join(map(str, self.elements))}")
+
+        self._get_stable_entries_in_space.cache_clear()
+        if any(
+            entry.composition.is_element
+            and entry.energy_per_atom < self.el_refs[entry.composition.elements[0]].energy_per_atom
+            for entry in entries
+        ):
+            self.__init__(  # type: ignore[misc]
+                [*self.all_entries, *entries], self.elements, keep_all_spaces=self.keep_all_spaces
+            )
+            return
+
+        vec = np.array([self.el_refs[el].energy_per_atom for el in self.elements])
+        qhull_entries = []
+        for entry in entries:
+            fractions = [entry.composition.get_atomic_fraction(el) for el in self.elements]
+            if entry.energy_per_atom - np.dot(fractions, vec) < -PhaseDiagram.formation_energy_tol:
+                qhull_entries.append(entry)
+
+        self.all_entries = [*self.all_entries, *entries]
+        self.qhull_entries = (*self.qhull_entries, *qhull_entries)
+        self._qhull_spaces = (*self._qhull_spaces, *(frozenset(entry.elements) for entry in qhull_entries))
+
+        # Chemical spaces without a patch get a new one, which already includes the new entries
+        new_spaces = {frozenset(entry.elements) for entry in qhull_entries}
+        created = set()
+        for space in sorted(new_spaces, key=len, reverse=True):
+            if len(space) < 2 or space in self.pds:
+                continue
+            if not self.keep_all_spaces:
+                if any(space < other for other in self.pds):
+                    continue
+                for other in [other for other in self.pds if other < space]:
+                    del self.pds[other]
+            self.pds[space] = self._get_pd_patch_for_space(space)[1]
+            created.add(space)
+
+        for space, pd in self.pds.items():
+            new_entries = [entry for entry in qhull_entries if space.issuperset(entry.elements)]
+            if new_entries and space not in created:
+                pd.add_entries(new_entries)
+
+        self.spaces = sorted(self.pds, key=len)
+        self._set_stable_entries()
+
     def __repr__(self):
         return f"{type(self).__name__} covering {len(self.spaces)} sub-spaces"
 
@@ -1684,6 +2113,8 @@ class PatchedPhaseDiagram(PhaseDiagram):
             "@class": type(self).__name__,
             "all_entries": [entry.as_dict() for entry in self.all_entries],
             "elements": [entry.as_dict() for entry in self.elements],
+            "keep_all_spaces": self.keep_all_spaces,
+            "computed_data": self._get_computed_data(),
         }
 
     @classmethod
@@ -1697,7 +2128,12 @@ class PatchedPhaseDiagram(PhaseDiagram):
         """
         entries = [MontyDecoder().process_decoded(entry) for entry in dct["all_entries"]]
         elements = [Element.from_dict(elem) for elem in dct["elements"]]
-        return cls(entries, elements)
+        return cls(
+            entries,
+            elements,
+            keep_all_spaces=dct.get("keep_all_spaces", False),
+            computed_data=dct.get("computed_data"),
+        )
 
     # NOTE following methods are inherited unchanged from PhaseDiagram:
     # __repr__,
@@ -1787,10 +2223,39 @@ class PatchedPhaseDiagram(PhaseDiagram):
             entry=entry, allow_negative=allow_negative, check_stable=check_stable, on_error=on_error
         )
 
+    def _get_batch_hull_energy_per_atom(self, comps: Sequence[Composition]) -> np.ndarray:
+        """Hull energies per atom of many compositions, batched per sub phase diagram.
+
+        Unlike get_decomposition, compositions not covered by any single sub phase
+        diagram are not stitched together with SLSQP and get NaN instead.
+        """
+        hull_energies = np.full(len(comps), np.nan)
+        by_space: dict[frozenset[Element], list[int]] = defaultdict(list)
+        for idx, comp in enumerate(comps):
+            by_space[frozenset(comp.elements)].append(idx)
+
+        # Group the compositions of all chemical spaces covered by the same patch
+        by_pd: dict[int, tuple[PhaseDiagram, list[int]]] = {}
+        for indices in by_space.values():
+            try:
+                pd = self.get_pd_for_entry(comps[indices[0]])
+            except ValueError:
+                continue
+            by_pd.setdefault(id(pd), (pd, []))[1].extend(indices)
+
+        for pd, indices in by_pd.values():
+            hull_energies[indices] = pd._get_batch_hull_energy_per_atom([comps[idx] for idx in indices])
+
+        return hull_energies
+
     def _get_facet_and_simplex(self):
         """Not Implemented - See PhaseDiagram."""
         raise NotImplementedError("_get_facet_and_simplex() not implemented for PatchedPhaseDiagram")
 
+    def get_batch_decomp_and_hull_energy_per_atom(self):
+        """Not Implemented - See PhaseDiagram."""
+        raise NotImplementedError("get_batch_decomp_and_hull_energy_per_atom() not implemented for PatchedPhaseDiagram")
+
     def _get_all_facets_and_simplexes(self):
         """Not Implemented - See PhaseDiagram."""
         raise NotImplementedError("_get_all_facets_and_simplexes() not implemented for PatchedPhaseDiagram")
@@ -1843,9 +2308,7 @@ class PatchedPhaseDiagram(PhaseDiagram):
         Returns:
             space, PhaseDiagram for the given chemical space
         """
-        space_entries = [e for e, s in zip(self.qhull_entries, self._qhull_spaces) if space.issuperset(s)]
-
-        return space, PhaseDiagram(space_entries)
+        return space, PhaseDiagram(self._get_space_entries(space))
 
 
 class ReactionDiagram:
@@ -2016,6 +2479,51 @@ def get_facets(qhull_data: ArrayLike, joggle: bool = False) -> ConvexHull:
     return ConvexHull(qhull_data, qhull_options="Qt i").simplices
 
 
+def _get_pd_computed_data(entries: list[PDEntry]) -> dict[str, Any]:
+    """Compute the PhaseDiagram of some entries, e.g. in a worker process.
+
+    Args:
+        entries (list[PDEntry]): Entries of the PhaseDiagram.
+
+    Returns:
+        dict[str, Any]: The computed data of the PhaseDiagram without simplexes,
+            with entries given by their index in entries.
+    """
+    pd = PhaseDiagram(entries)
+    index = {id(entry): idx for idx, entry in enumerate(entries)}
+    return {
+        "elements": pd.elements,
+        "facets": pd.facets,
+        "all_entries": [index[id(entry)] for entry in pd.all_entries],
+        "qhull_data": pd.qhull_data,
+        "dim": pd.dim,
+        "el_refs": [(el, index[id(entry)]) for el, entry in pd.el_refs.items()],
+        "qhull_entries": [index[id(entry)] for entry in pd.qhull_entries],
+    }
+
+
+def _get_pd_from_computed_data(entries: list[PDEntry], pd_data: dict[str, Any]) -> PhaseDiagram:
+    """Rebuild a PhaseDiagram from the output of _get_pd_computed_data().
+
+    Args:
+        entries (list[PDEntry]): The entries passed to _get_pd_computed_data().
+        pd_data (dict[str, Any]): Its output.
+
+    Returns:
+        PhaseDiagram: Phase diagram of entries.
+    """
+    computed_data = {
+        "facets": pd_data["facets"],
+        "simplexes": [Simplex(pd_data["qhull_data"][facet, :-1]) for facet in pd_data["facets"]],
+        "all_entries": [entries[idx] for idx in pd_data["all_entries"]],
+        "qhull_data": pd_data["qhull_data"],
+        "dim": pd_data["dim"],
+        "el_refs": [(el, entries[idx]) for el, idx in pd_data["el_refs"]],
+        "qhull_entries": [entries[idx] for idx in pd_data["qhull_entries"]],
+    }
+    return PhaseDiagram(entries, pd_data["elements"], computed_data=computed_data)
+
+
 def _get_slsqp_decomp(
     comp,
     competing_entries,
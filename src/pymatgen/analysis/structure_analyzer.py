@@ -10,7 +10,7 @@ from warnings import warn
 
 import matplotlib.pyplot as plt
 import numpy as np
-from pymatgen.analysis.local_env import JmolNN, VoronoiNN
+from pymatgen.analysis.local_env import JmolNN, VoronoiNN, get_voronoi_tessellation
 from pymatgen.core import Composition, Element, PeriodicSite, Species
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from scipy.spatial import Voronoi
@@ -263,36 +263,32 @@ class VoronoiConnectivity:
         must be described by both an atom index and an image index. Array data is the solid
         angle of polygon between atom_i and image_j of atom_j.
         """
-        # shape = [site, axis]
-        cart_coords = np.array(self.structure.cart_coords)
-        # shape = [site, image, axis]
-        all_sites = cart_coords[:, None, :] + self.cart_offsets[None, :, :]
-        vt = Voronoi(all_sites.reshape((-1, 3)))
-        n_images = all_sites.shape[1]
+        # The tessellation is shared with the other Voronoi based analyses of the structure
+        points, coords, root_points, vt = get_voronoi_tessellation(self.structure, self.cutoff)
+        site_of_point = np.full(len(points), -1)
+        site_of_point[root_points] = np.arange(len(self.structure))
+
+        # Index of the image of each point in self.offsets, -1 if not in self.offsets
+        min_offset = self.offsets.min(axis=0).astype(int)
+        n_offsets = self.offsets.max(axis=0).astype(int) - min_offset + 1
+        shifted = points[:, 1:] - min_offset
+        image_of_point = (shifted[:, 2] * n_offsets[1] + shifted[:, 1]) * n_offsets[0] + shifted[:, 0]
+        image_of_point[((shifted < 0) | (shifted >= n_offsets)).any(axis=1)] = -1
+
         cs = (len(self.structure), len(self.structure), len(self.cart_offsets))
         connectivity = np.zeros(cs)
         vts = np.array(vt.vertices)
-        for (ki, kj), v in vt.ridge_dict.items():
-            atom_i = ki // n_images
-            atom_j = kj // n_images
-
-            image_i = ki % n_images
-            image_j = kj % n_images
-
-            if image_i != n_images // 2 and image_j != n_images // 2:
-                continue
-
-            if image_i == n_images // 2:
-                # atom_i is in original cell
-                val = solid_angle(vt.points[ki], vts[v])
-                connectivity[atom_i, atom_j, image_j] = val
-
-            if image_j == n_images // 2:
-                # atom_j is in original cell
-                val = solid_angle(vt.points[kj], vts[v])
-                connectivity[atom_j, atom_i, image_i] = val
-
-            if -10.101 in vts[v]:
+        (ridges,) = np.nonzero((site_of_point[vt.ridge_points] >= 0).any(axis=1))
+        for ridge in ridges.tolist():
+            v = vt.ridge_vertices[ridge]
+            ki, kj = vt.ridge_points[ridge].tolist()
+            for center, other in ((ki, kj), (kj, ki)):
+                # center is in the original cell
+                if site_of_point[center] >= 0 and image_of_point[other] >= 0:
+                    val = solid_angle(coords[center], vts[v])
+                    connectivity[site_of_point[center], points[other, 0], image_of_point[other]] = val
+
+            if -1 in v:
                 warn("Found connectivity with infinite vertex. Cutoff is too low, and results may be incorrect")
         return connectivity
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import abc
 import itertools
+from multiprocessing import Pool
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -28,6 +29,11 @@ __email__ = "wrichard@mit.edu"
 __status__ = "Production"
 __date__ = "Dec 3, 2012"
 
+PREFILTER_INVARIANTS = ("num_sites", "lattice")
+# Relative slack on the lattice lengths compared by the group_structures prefilter,
+# covering the tolerance of the Niggli reduction
+LATTICE_PREFILTER_TOL = 1e-4
+
 
 class AbstractComparator(MSONable, abc.ABC):
     """
@@ -418,7 +424,7 @@ class StructureMatcher(MSONable):
 
         return int(round(fu)), True
 
-    def _get_lattices(self, target_lattice, s, supercell_size=1):
+    def _get_lattices(self, target_lattice, s, supercell_size=1, lattice_points=None):
         """
         Yields lattices for s with lengths and angles close to the lattice of target_s. If
         supercell_size is specified, the returned lattice will have that number of primitive
@@ -428,21 +434,25 @@ class StructureMatcher(MSONable):
             target_lattice (Lattice): target lattice.
             s (Structure): input structure.
             supercell_size (int): Number of primitive cells in returned lattice
+            lattice_points (np.ndarray): Precomputed candidate lattice points of s,
+                see Lattice.find_all_mappings.
         """
         lattices = s.lattice.find_all_mappings(
             target_lattice,
             ltol=self.ltol,
             atol=self.angle_tol,
             skip_rotation_matrix=True,
+            lattice_points=lattice_points,
         )
         for latt, _, scale_m in lattices:
             if abs(abs(np.linalg.det(scale_m)) - supercell_size) < 0.5:
                 yield latt, scale_m
 
-    def _get_supercells(self, struct1, struct2, fu, s1_supercell):
+    def _get_supercells(self, struct1, struct2, fu, s1_supercell, lattice_points=None):
         """Compute all supercells of one structure close to the lattice of the other
         if s1_supercell is True, it makes the supercells of struct1, otherwise
-        it makes them of s2.
+        it makes them of s2. lattice_points are precomputed candidate lattice
+        points of the structure whose supercells are made.
 
         yields: s1, s2, supercell_matrix, average_lattice, supercell_matrix
         """
@@ -455,13 +465,13 @@ class StructureMatcher(MSONable):
             s2_fc = np.array(s2.frac_coords)
             if fu == 1:
                 cc = np.array(s1.cart_coords)
-                for latt, sc_m in self._get_lattices(s2.lattice, s1, fu):
+                for latt, sc_m in self._get_lattices(s2.lattice, s1, fu, lattice_points):
                     fc = latt.get_fractional_coords(cc)
                     fc -= np.floor(fc)
                     yield fc, s2_fc, av_lat(latt, s2.lattice), sc_m
             else:
                 fc_init = np.array(s1.frac_coords)
-                for latt, sc_m in self._get_lattices(s2.lattice, s1, fu):
+                for latt, sc_m in self._get_lattices(s2.lattice, s1, fu, lattice_points):
                     fc = np.dot(fc_init, np.linalg.inv(sc_m))
                     lp = lattice_points_in_supercell(sc_m)
                     fc = (fc[:, None, :] + lp[None, :, :]).reshape((-1, 3))
@@ -630,6 +640,95 @@ class StructureMatcher(MSONable):
 
         return match[0], max(match[1])
 
+    def get_rms_dist_matrix(
+        self, structures: Sequence[Structure], n_jobs: int = 1, sparse: bool = False
+    ) -> np.ndarray | dict[tuple[int, int], tuple[float, float]]:
+        """
+        Calculate the RMS displacements between all pairs of structures.
+
+        Each structure is reduced only once, pairs whose compositions cannot match
+        are skipped and the candidate lattice points of each reference structure
+        are shared by all the structures it is compared to. Pair (i, j) is
+        computed as get_rms_dist(structures[min(i, j)], structures[max(i, j)]).
+
+        Args:
+            structures (list[Structure]): Structures to compare.
+            n_jobs (int): Number of processes to compute the pairs with. Defaults to 1.
+            sparse (bool): Whether to return only the matching pairs as a dict.
+                Defaults to False.
+
+        Returns:
+            If sparse is False, a symmetric (n, n) object array whose entries are
+            the (rms, max_dist) tuples returned by get_rms_dist, or None for pairs
+            that do not match. If sparse is True, a dict mapping (i, j) with i <= j
+            to the (rms, max_dist) tuples of the matching pairs.
+        """
+        s_list = self._process_species(structures)
+        s_list = [self._get_reduced_structure(s, self._primitive_cell, niggli=True) for s in s_list]
+
+        hashes = [None if self._subset else self._comparator.get_hash(s.composition) for s in s_list]
+        tasks = [
+            (idx, [jdx for jdx in range(idx, len(s_list)) if hashes[jdx] == hashes[idx]]) for idx in range(len(s_list))
+        ]
+
+        if n_jobs > 1:
+            with Pool(n_jobs, initializer=_init_worker, initargs=(self, s_list)) as pool:
+                rows = list(pool.imap_unordered(_rms_dist_row_in_worker, tasks))
+        else:
+            rows = [(idx, others, self._get_rms_dist_row(s_list, idx, others)) for idx, others in tasks]
+
+        dists = {(idx, jdx): dist for idx, others, row in rows for jdx, dist in zip(others, row) if dist is not None}
+        if sparse:
+            return dists
+
+        matrix = np.full((len(s_list), len(s_list)), None, dtype=object)
+        for (idx, jdx), dist in dists.items():
+            matrix[idx, jdx] = matrix[jdx, idx] = dist
+        return matrix
+
+    def _get_rms_dist_row(
+        self, structures: Sequence[Structure], ref: int, others: Sequence[int]
+    ) -> list[tuple[float, float] | None]:
+        """
+        Calculate the RMS displacements of already reduced structures with respect
+        to a reference, sharing the lattice point search of the reference.
+
+        Args:
+            structures (list[Structure]): Reduced structures.
+            ref (int): Index of the reference structure.
+            others (list[int]): Indices of the structures to compare to the reference.
+
+        Returns:
+            list: (rms, max_dist) tuples or None, one per structure in others.
+        """
+        struct = structures[ref]
+        pairs = [self._preprocess(struct, structures[idx], skip_structure_reduction=True) for idx in others]
+
+        lattice_points = None
+        if not self._supercell and pairs:
+            # Largest sphere any mapping in the row needs, in units of the unscaled
+            # reference lattice (scaling multiplies all lengths of struct1 by ratio)
+            radius = max(
+                max(struct2.lattice.abc) * (1 + self.ltol) / (struct1.volume / struct.volume) ** (1 / 3)
+                for struct1, struct2, _, _ in pairs
+            )
+            lattice_points = struct.lattice.get_points_in_sphere(
+                [[0, 0, 0]], [0, 0, 0], radius * (1 + 1e-8), zip_results=False
+            )[0]
+
+        results = []
+        for struct1, struct2, fu, s1_supercell in pairs:
+            if lattice_points is not None and len(struct1) >= len(struct2):
+                # Same call _match makes, with the lattices of struct1 enumerated
+                match = self._strict_match(
+                    struct1, struct2, fu, s1_supercell=s1_supercell, use_rms=True, lattice_points=lattice_points
+                )
+            else:
+                match = self._match(struct1, struct2, fu, s1_supercell, use_rms=True, break_on_match=False)
+            results.append(None if match is None else (match[0], max(match[1])))
+
+        return results
+
     def _process_species(self, structures):
         copied_structures = []
         for s in structures:
@@ -710,6 +809,7 @@ class StructureMatcher(MSONable):
         s1_supercell: bool = True,
         use_rms: bool = False,
         break_on_match: bool = False,
+        lattice_points: np.ndarray | None = None,
     ) -> tuple[float, float, np.ndarray, float, Mapping] | None:
         """
         Matches struct2 onto struct1 (which should contain all sites in
@@ -722,6 +822,8 @@ class StructureMatcher(MSONable):
             s1_supercell (bool): whether to create the supercell of struct1 (vs struct2)
             use_rms (bool): whether to minimize the rms of the matching
             break_on_match (bool): whether to stop search at first match
+            lattice_points (np.ndarray): precomputed candidate lattice points of the
+                structure whose supercell is created, see Lattice.find_all_mappings
 
         Returns:
             tuple[float, float, np.ndarray, float, Mapping]: (rms, max_dist, mask, cost, mapping)
@@ -744,7 +846,7 @@ class StructureMatcher(MSONable):
 
         best_match = None
         # loop over all lattices
-        for s1fc, s2fc, avg_l, sc_m in self._get_supercells(struct1, struct2, fu, s1_supercell):
+        for s1fc, s2fc, avg_l, sc_m in self._get_supercells(struct1, struct2, fu, s1_supercell, lattice_points):
             # compute fractional tolerance
             normalization = (len(s1fc) / avg_l.volume) ** (1 / 3)
             inv_abc = np.array(avg_l.reciprocal_lattice.abc)
@@ -771,7 +873,13 @@ class StructureMatcher(MSONable):
 
         return None
 
-    def group_structures(self, s_list, anonymous=False):
+    def group_structures(
+        self,
+        s_list,
+        anonymous: bool = False,
+        prefilter: bool | Sequence[str] = False,
+        n_jobs: int = 1,
+    ):
         """
         Given a list of structures, use fit to group
         them by structural equality.
@@ -779,6 +887,20 @@ class StructureMatcher(MSONable):
         Args:
             s_list ([Structure]): List of structures to be grouped
             anonymous (bool): Whether to use anonymous mode.
+            prefilter (bool | list[str]): Invariants checked before any call to fit,
+                which is skipped for pairs of structures that cannot match. Only
+                necessary conditions of fit are used, so the groups are identical
+                to the exhaustive grouping. Supported invariants are "num_sites",
+                which splits each composition group by number of sites of the
+                reduced structures, and "lattice", which requires the sorted Niggli
+                lattice lengths of the reference structure to be within ltol of
+                those of the structure it is fitted to (relative to the cube root
+                of the volumes if scale is True). Both are ignored when
+                attempt_supercell is True. True selects all of them. Defaults to
+                False, i.e. no prefiltering.
+            n_jobs (int): Number of processes used to run the fit calls of each
+                reference structure against the rest of its bucket. The grouping
+                is identical to the serial one. Defaults to 1.
 
         Returns:
             A list of lists of matched structures
@@ -788,6 +910,13 @@ class StructureMatcher(MSONable):
         if self._subset:
             raise ValueError("allow_subset cannot be used with group_structures")
 
+        invariants = PREFILTER_INVARIANTS if prefilter is True else tuple(prefilter or ())
+        if unknown := set(invariants) - set(PREFILTER_INVARIANTS):
+            raise ValueError(f"Unknown prefilter invariants {sorted(unknown)}, must be in {PREFILTER_INVARIANTS}")
+        if self._supercell:
+            # Structures of different sizes and lattices can match a supercell of each other
+            invariants = ()
+
         original_s_list = list(s_list)
         s_list = self._process_species(s_list)
         # Prepare reduced structures beforehand
@@ -802,35 +931,76 @@ class StructureMatcher(MSONable):
         else:
             c_hash = self._comparator.get_hash
 
-        def s_hash(s):
-            return c_hash(s[1].composition)
+        def s_hash(idx):
+            return c_hash(s_list[idx].composition)
 
-        sorted_s_list = sorted(enumerate(s_list), key=s_hash)
-        all_groups = []
+        log_lengths = self._get_log_lattice_lengths(s_list) if "lattice" in invariants else None
 
-        # For each pre-grouped list of structures, perform actual matching.
-        for _, g in itertools.groupby(sorted_s_list, key=s_hash):
-            unmatched = list(g)
-            while len(unmatched) > 0:
-                i, refs = unmatched.pop(0)
-                matches = [i]
-                if anonymous:
-                    inds = filter(
-                        lambda i: self.fit_anonymous(refs, unmatched[i][1], skip_structure_reduction=True),
-                        list(range(len(unmatched))),
-                    )
-                else:
-                    inds = filter(
-                        lambda i: self.fit(refs, unmatched[i][1], skip_structure_reduction=True),
-                        list(range(len(unmatched))),
-                    )
-                inds = list(inds)
-                matches.extend([unmatched[i][0] for i in inds])
-                unmatched = [unmatched[i] for i in range(len(unmatched)) if i not in inds]
-                all_groups.append([original_s_list[i] for i in matches])
+        pool = Pool(n_jobs, initializer=_init_worker, initargs=(self, s_list, anonymous)) if n_jobs > 1 else None
+        all_groups = []
+        try:
+            # For each pre-grouped list of structures, perform actual matching.
+            for _, g in itertools.groupby(sorted(range(len(s_list)), key=s_hash), key=s_hash):
+                # Structures with different numbers of sites never match
+                buckets: dict[int | None, list[int]] = {}
+                for idx in g:
+                    buckets.setdefault(len(s_list[idx]) if "num_sites" in invariants else None, []).append(idx)
+
+                groups = []
+                for unmatched in buckets.values():
+                    while unmatched:
+                        ref, *unmatched = unmatched
+                        candidates = unmatched
+                        if log_lengths is not None and unmatched:
+                            # The lattice vectors of ref that fit the Niggli lattice of the
+                            # other structure are within ltol of its lengths, which bounds
+                            # the shortest vectors of ref.
+                            diffs = log_lengths[ref] - log_lengths[unmatched]
+                            is_candidate = np.all(diffs < np.log1p(self.ltol) + LATTICE_PREFILTER_TOL, axis=1)
+                            candidates = [idx for idx, keep in zip(unmatched, is_candidate) if keep]
+                        if pool is None:
+                            fits = [self._fit_reduced(s_list[ref], s_list[idx], anonymous) for idx in candidates]
+                        else:
+                            chunksize = max(1, len(candidates) // (4 * n_jobs))
+                            fits = pool.map(_fit_in_worker, [(ref, idx) for idx in candidates], chunksize=chunksize)
+                        matched = {idx for idx, fit in zip(candidates, fits) if fit}
+                        groups.append([ref] + [idx for idx in unmatched if idx in matched])
+                        unmatched = [idx for idx in unmatched if idx not in matched]
+
+                # Buckets are processed one after the other, so restore the order
+                # in which the references would have been picked without them.
+                groups.sort(key=lambda group: group[0])
+                all_groups.extend([original_s_list[idx] for idx in group] for group in groups)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         return all_groups
 
+    def _fit_reduced(self, struct1, struct2, anonymous=False) -> bool:
+        """Fit two structures that were already reduced by group_structures."""
+        if anonymous:
+            return self.fit_anonymous(struct1, struct2, skip_structure_reduction=True)
+        return self.fit(struct1, struct2, skip_structure_reduction=True)
+
+    def _get_log_lattice_lengths(self, s_list: Sequence[Structure]) -> np.ndarray:
+        """
+        Get the logarithm of the sorted lattice lengths of Niggli reduced
+        structures, which are their shortest lattice vectors. They are relative
+        to the cube root of the volume if structures are rescaled.
+
+        Args:
+            s_list (list[Structure]): Niggli reduced structures.
+
+        Returns:
+            np.ndarray: (len(s_list), 3) log lattice lengths.
+        """
+        lengths = np.sort([struct.lattice.abc for struct in s_list], axis=1).reshape(-1, 3)
+        if self._scale:
+            lengths /= np.array([struct.volume for struct in s_list])[:, None] ** (1 / 3)
+        return np.log(lengths)
+
     def as_dict(self):
         """MSONable dict."""
         return {
@@ -1195,3 +1365,25 @@ class StructureMatcher(MSONable):
             return None
 
         return match[4]
+
+
+_worker_state: tuple[StructureMatcher, list[Structure], bool] | None = None
+
+
+def _init_worker(matcher: StructureMatcher, structures: list[Structure], anonymous: bool = False) -> None:
+    """Pool initializer so the reduced structures are sent to each worker only once."""
+    global _worker_state  # noqa: PLW0603
+    _worker_state = matcher, structures, anonymous
+
+
+def _fit_in_worker(pair: tuple[int, int]) -> bool:
+    """Fit a pair of structures, given by index, in a group_structures worker."""
+    matcher, structures, anonymous = _worker_state  # type: ignore[misc]
+    return matcher._fit_reduced(structures[pair[0]], structures[pair[1]], anonymous)
+
+
+def _rms_dist_row_in_worker(task: tuple[int, list[int]]) -> tuple[int, list[int], list]:
+    """Calculate one row of get_rms_dist_matrix in a worker."""
+    matcher, structures, _ = _worker_state  # type: ignore[misc]
+    ref, others = task
+    return ref, others, matcher._get_rms_dist_row(structures, ref, others)
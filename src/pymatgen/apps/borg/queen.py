@@ -8,14 +8,20 @@ from __future__ import annotations
 import json
 import logging
 import os
-from multiprocessing import Manager, Pool
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
 from typing import TYPE_CHECKING
 
+from monty.dev import deprecated
 from monty.io import zopen
 from monty.json import MontyDecoder, MontyEncoder
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
+    from typing import Any
 
 logger = logging.getLogger("BorgQueen")
 
@@ -52,39 +58,134 @@ class BorgQueen:
             else:
                 self.serial_assimilate(rootpath)
 
-    def parallel_assimilate(self, rootpath):
-        """Assimilate the entire subdirectory structure in rootpath."""
-        logger.info("Scanning for valid paths...")
-        valid_paths = []
-        for parent, subdirs, files in os.walk(rootpath):
-            valid_paths.extend(self._drone.get_valid_paths((parent, subdirs, files)))
-        manager = Manager()
-        data = manager.list()
-        status = manager.dict()
-        status["count"] = 0
-        status["total"] = len(valid_paths)
-        logger.info(f"{len(valid_paths)} valid paths found.")
-        with Pool(self._num_drones) as pool:
-            pool.map(
-                order_assimilation,
-                ((path, self._drone, data, status) for path in valid_paths),
-            )
-            for string in data:
-                self._data.append(json.loads(string, cls=MontyDecoder))
+    def parallel_assimilate(
+        self,
+        rootpath: str | Path,
+        checkpoint: str | Path | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Assimilate the entire subdirectory structure in rootpath.
+
+        Args:
+            rootpath (str): The root directory to assimilate.
+            checkpoint (str): Path to an append-only JSONL file recording each
+                completed path. Paths already in it are not assimilated again,
+                so an interrupted run can be resumed by calling this again
+                with the same checkpoint. Their data is read back from the file.
+            timeout (float): Maximum time in seconds for the drone to
+                assimilate a single path. Paths taking longer are recorded as
+                failed. Only supported on platforms with SIGALRM.
+        """
+        records = []
+        if checkpoint is not None and os.path.isfile(checkpoint):
+            records = list(_read_checkpoint(checkpoint))
+        decoder = MontyDecoder()
+        self._data.extend(decoder.process_decoded(record["data"]) for record in records if record["data"] is not None)
+        done = {record["path"] for record in records}
+        self._data.extend(self._iter_assimilate(rootpath, checkpoint, timeout, done))
+
+    def iter_assimilate(
+        self,
+        rootpath: str | Path,
+        checkpoint: str | Path | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[Any]:
+        """Assimilate the subdirectory structure in rootpath, yielding the
+        assimilated objects as they complete (in no particular order) instead
+        of accumulating them in memory. Uses number_of_drones processes.
+
+        A drone raising an exception (or exceeding timeout) on a path is
+        logged and recorded as failed, without affecting the other paths.
+
+        Args:
+            rootpath (str): The root directory to assimilate.
+            checkpoint (str): Path to an append-only JSONL file. Each completed
+                path is written to it as {"path": ..., "error": ..., "data": ...}
+                as soon as it is done, and paths already in the file are
+                skipped, so an interrupted run resumes where it stopped.
+                Failed paths are recorded too; remove their lines to retry them.
+            timeout (float): Maximum time in seconds for the drone to
+                assimilate a single path. Only supported on platforms with
+                SIGALRM.
+
+        Yields:
+            Assimilated objects of newly assimilated paths.
+        """
+        done = set()
+        if checkpoint is not None and os.path.isfile(checkpoint):
+            done = {record["path"] for record in _read_checkpoint(checkpoint)}
+        yield from self._iter_assimilate(rootpath, checkpoint, timeout, done)
+
+    def _iter_assimilate(
+        self,
+        rootpath: str | Path,
+        checkpoint: str | Path | None,
+        timeout: float | None,
+        done: set[str],
+    ) -> Iterator[Any]:
+        """Assimilate the valid paths in rootpath that are not in done, see iter_assimilate."""
+        valid_paths = self._get_valid_paths(rootpath)
+        todo = [path for path in valid_paths if path not in done]
+        total = len(todo)
+        logger.info(f"{len(valid_paths)} valid paths found, {total} to assimilate.")
+
+        pool = (
+            Pool(self._num_drones, initializer=_init_worker, initargs=(self._drone,)) if self._num_drones > 1 else None
+        )
+        ckpt_file = open(checkpoint, mode="a") if checkpoint is not None else None  # noqa: SIM115
+        try:
+            if pool is not None:
+                results = pool.imap_unordered(_assimilate_in_worker, ((path, timeout) for path in todo))
+            else:
+                results = (_assimilate_path(self._drone, path, timeout) for path in todo)
+
+            for count, (path, new_data, error) in enumerate(results, start=1):
+                if error is not None:
+                    logger.warning(f"Failed to assimilate {path}: {error}")
+                if ckpt_file is not None:
+                    record = {"path": str(path), "error": error, "data": new_data or None}
+                    ckpt_file.write(json.dumps(record, cls=MontyEncoder) + "\n")
+                    ckpt_file.flush()
+                logger.info(f"{count}/{total} ({count / total:.2%}) done")
+                if new_data:
+                    yield new_data
+        finally:
+            if pool is not None:
+                pool.terminate()
+            if ckpt_file is not None:
+                ckpt_file.close()
 
     def serial_assimilate(self, root: str | Path) -> None:
         """Assimilate the entire subdirectory structure in rootpath serially."""
-        valid_paths = []
-        for parent, subdirs, files in os.walk(root):
-            valid_paths.extend(self._drone.get_valid_paths((parent, subdirs, files)))
-        data: list[str] = []
+        valid_paths = self._get_valid_paths(root)
         total = len(valid_paths)
         for idx, path in enumerate(valid_paths, start=1):
             new_data = self._drone.assimilate(path)
             self._data.append(new_data)
             logger.info(f"{idx}/{total} ({idx / total:.1%}) done")
-        for json_str in data:
-            self._data.append(json.loads(json_str, cls=MontyDecoder))
+
+    def _get_valid_paths(self, rootpath: str | Path) -> list:
+        """Get the valid paths for the drone in rootpath, in os.walk order.
+        The top-level subdirectories are scanned concurrently with
+        number_of_drones threads, which helps a lot on network file systems.
+        """
+        logger.info("Scanning for valid paths...")
+        parent, subdirs, files = next(os.walk(rootpath), (rootpath, [], []))
+        valid_paths = list(self._drone.get_valid_paths((parent, subdirs, files)))
+        # os.walk does not descend into symlinked directories
+        subtrees = [os.path.join(parent, subdir) for subdir in subdirs]
+        subtrees = [path for path in subtrees if not os.path.islink(path)]
+
+        def scan(top: str) -> list:
+            paths = []
+            for walk_step in os.walk(top):
+                paths.extend(self._drone.get_valid_paths(walk_step))
+            return paths
+
+        with ThreadPoolExecutor(max_workers=max(1, self._num_drones)) as executor:
+            for paths in executor.map(scan, subtrees):
+                valid_paths.extend(paths)
+        return valid_paths
 
     def get_data(self):
         """Get an list of assimilated objects."""
@@ -107,6 +208,11 @@ class BorgQueen:
             self._data = json.load(file, cls=MontyDecoder)
 
 
+@deprecated(
+    BorgQueen.parallel_assimilate,
+    "BorgQueen no longer uses it to collect results. Deprecated on 2026-10-17.",
+    deadline=(2027, 10, 17),
+)
 def order_assimilation(args):
     """Internal helper method for BorgQueen to process assimilation."""
     path, drone, data, status = args
@@ -117,3 +223,51 @@ def order_assimilation(args):
     count = status["count"]
     total = status["total"]
     logger.info(f"{count}/{total} ({count / total:.2%}) done")
+
+
+def _read_checkpoint(checkpoint: str | Path) -> Iterator[dict]:
+    """Read the records of a BorgQueen checkpoint file, ignoring a truncated last line."""
+    with open(checkpoint) as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring malformed line in checkpoint {checkpoint}")
+
+
+def _raise_timeout(_signum, _frame):
+    raise TimeoutError("Drone timed out")
+
+
+def _assimilate_path(drone, path, timeout: float | None) -> tuple[Any, Any, str | None]:
+    """Assimilate a path, catching any exception raised by the drone.
+
+    Returns:
+        tuple: (path, assimilated object or None, error message or None)
+    """
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return path, drone.assimilate(path), None
+    except Exception as exc:
+        return path, None, f"{type(exc).__name__}: {exc}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+_worker_drone = None
+
+
+def _init_worker(drone) -> None:
+    """Pool initializer so the drone is sent to each worker only once."""
+    global _worker_drone  # noqa: PLW0603
+    _worker_drone = drone
+
+
+def _assimilate_in_worker(args):
+    path, timeout = args
+    return _assimilate_path(_worker_drone, path, timeout)
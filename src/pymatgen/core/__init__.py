@@ -14,7 +14,6 @@ from pymatgen.core.periodic_table import DummySpecie, DummySpecies, Element, Spe
 from pymatgen.core.sites import PeriodicSite, Site
 from pymatgen.core.structure import IMolecule, IStructure, Molecule, PeriodicNeighbor, SiteCollection, Structure
 from pymatgen.core.units import ArrayWithUnit, FloatWithUnit, Unit
-from ruamel.yaml import YAML
 
 __author__ = "Pymatgen Development Team"
 __email__ = "pymatgen@googlegroups.com"
@@ -38,11 +37,12 @@ def _load_pmg_settings() -> dict[str, Any]:
     settings: dict[str, Any] = {}
 
     # Load .pmgrc.yaml file
-    yaml = YAML()
     for file_path in (SETTINGS_FILE, OLD_SETTINGS_FILE):
         try:
             with open(file_path, encoding="utf-8") as yml_file:
-                settings = yaml.load(yml_file) or {}
+                from ruamel.yaml import YAML
+
+                settings = YAML().load(yml_file) or {}
             break
         except FileNotFoundError:
             continue
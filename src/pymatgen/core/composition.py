@@ -10,20 +10,29 @@ import re
 import string
 import warnings
 from collections import defaultdict
-from functools import total_ordering
+from functools import cached_property, lru_cache, total_ordering
 from itertools import combinations_with_replacement, product
 from math import isnan
 from typing import TYPE_CHECKING, cast
 
+import numpy as np
 from monty.fractions import gcd, gcd_float
 from monty.json import MSONable
 from monty.serialization import loadfn
-from pymatgen.core.periodic_table import DummySpecies, Element, ElementType, Species, get_el_sp
+from pymatgen.core.periodic_table import (
+    DummySpecies,
+    Element,
+    ElementType,
+    Species,
+    _get_property_value,
+    get_el_sp,
+    property_array,
+)
 from pymatgen.core.units import Mass
 from pymatgen.util.string import Stringify, formula_double_format
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
+    from collections.abc import Generator, Iterable, Iterator
     from typing import Any, ClassVar
 
     from pymatgen.util.typing import SpeciesLike
@@ -124,7 +133,7 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         # it's much faster to recognize a composition and use the el_map than
         # to pass the composition to {}
         if len(args) == 1 and isinstance(args[0], type(self)):
-            elem_map = args[0]
+            elem_map = args[0]._data
         elif len(args) == 1 and isinstance(args[0], str):
             elem_map = self._parse_formula(args[0])  # type: ignore[assignment]
         elif len(args) == 1 and isinstance(args[0], float) and isnan(args[0]):
@@ -140,6 +149,7 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
                 elem_amt[get_el_sp(key)] = val
                 self._n_atoms += abs(val)
         self._data = elem_amt
+        self._hash: int | None = None
         if strict and not self.valid:
             raise ValueError(f"Composition is not valid, contains: {', '.join(map(str, self.elements))}")
 
@@ -216,9 +226,8 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         if not isinstance(other, (type(self), dict)):
             return NotImplemented
 
-        new_el_map: dict[SpeciesLike, float] = defaultdict(float)
-        new_el_map.update(self)
-        for key, val in other.items():
+        new_el_map: dict[SpeciesLike, float] = defaultdict(float, self._data)
+        for key, val in _get_amounts(other):
             new_el_map[get_el_sp(key)] += val
         return type(self)(new_el_map, allow_negative=self.allow_negative)
 
@@ -234,9 +243,8 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         if not isinstance(other, (type(self), dict)):
             return NotImplemented
 
-        new_el_map: dict[SpeciesLike, float] = defaultdict(float)
-        new_el_map.update(self)
-        for key, val in other.items():
+        new_el_map: dict[SpeciesLike, float] = defaultdict(float, self._data)
+        for key, val in _get_amounts(other):
             new_el_map[get_el_sp(key)] -= val
         return type(self)(new_el_map, allow_negative=self.allow_negative)
 
@@ -246,20 +254,23 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         """
         if not isinstance(other, (int, float)):
             return NotImplemented
-        return type(self)({el: self[el] * other for el in self}, allow_negative=self.allow_negative)
+        return type(self)({el: amt * other for el, amt in self._data.items()}, allow_negative=self.allow_negative)
 
     __rmul__ = __mul__
 
     def __truediv__(self, other: object) -> Self:
         if not isinstance(other, (int, float)):
             return NotImplemented
-        return type(self)({el: self[el] / other for el in self}, allow_negative=self.allow_negative)
+        return type(self)({el: amt / other for el, amt in self._data.items()}, allow_negative=self.allow_negative)
 
     __div__ = __truediv__
 
     def __hash__(self) -> int:
         """Hash based on the chemical system."""
-        return hash(frozenset(self._data))
+        # NOTE getattr as compositions pickled before _hash was added do not have it
+        if getattr(self, "_hash", None) is None:
+            self._hash = hash(frozenset(self._data))
+        return self._hash
 
     def __repr__(self) -> str:
         formula = " ".join(f"{key}{':' if hasattr(key, 'oxi_state') else ''}{val:g}" for key, val in self.items())
@@ -299,10 +310,10 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
             rtol (float): Relative tolerance
             atol (float): Absolute tolerance
         """
-        sps = set(self.elements + other.elements)
-        for sp in sps:
-            a = self[sp]
-            b = other[sp]
+        other_amounts = dict(_get_amounts(other))
+        for sp in self._data.keys() | other_amounts.keys():
+            a = self._data.get(sp, 0)
+            b = other_amounts.get(sp, 0)
             tol = atol + rtol * (abs(a) + abs(b)) / 2
             if abs(b - a) > tol:
                 return False
@@ -354,7 +365,7 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         """The composition replacing any species by the corresponding element."""
         return type(self)(self.get_el_amt_dict(), allow_negative=self.allow_negative)
 
-    @property
+    @cached_property
     def fractional_composition(self) -> Self:
         """The normalized composition in which the amounts of each species sum to
         1.
@@ -362,7 +373,7 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         """
         return self / self._n_atoms
 
-    @property
+    @cached_property
     def reduced_composition(self) -> Self:
         """The reduced composition, i.e. amounts normalized by greatest common denominator.
         E.g. "Fe4 P4 O16".reduced_composition = "Fe P O4".
@@ -439,7 +450,7 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
             factor /= 2
         return formula, factor * _gcd
 
-    @property
+    @cached_property
     def reduced_formula(self) -> str:
         """A pretty normalized formula, i.e., LiFePO4 instead of
         Li4Fe4P4O16.
@@ -524,6 +535,21 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
         el_mass = cast(float, get_el_sp(el).atomic_mass)
         return el_mass * abs(self[el]) / self.weight
 
+    def get_property_array(self, prop: str) -> np.ndarray:
+        """Get an Element or Species property for all species in the composition at once.
+
+        Args:
+            prop (str): Name of a numerical property of the species, e.g. "X",
+                "atomic_mass" or "ionic_radius".
+
+        Returns:
+            np.ndarray: Property values without units in the order of self.elements.
+                NaN for species without data.
+        """
+        if all(isinstance(sp, Element) for sp in self._data):
+            return property_array(prop)[[el.Z for el in self._data]]
+        return np.array([_get_property_value(sp, prop) for sp in self._data], dtype=float)
+
     def contains_element_type(self, category: str) -> bool:
         """Check if Composition contains any elements matching a given category.
 
@@ -546,8 +572,11 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
 
         return any(getattr(el, f"is_{category}") for el in self.elements)
 
-    def _parse_formula(self, formula: str, strict: bool = True) -> dict[str, float]:
-        """
+    @staticmethod
+    @lru_cache(maxsize=2**14)
+    def _parse_formula(formula: str, strict: bool = True) -> dict[str, float]:
+        """Parse a formula string. Results are cached and must not be modified.
+
         Args:
             formula (str): A string formula, e.g. Fe2O3, Li3Fe2(PO4)3.
             strict (bool): Whether to throw an error if formula string is invalid (e.g. empty).
@@ -1216,6 +1245,14 @@ class Composition(collections.abc.Hashable, collections.abc.Mapping, MSONable, S
                         yield match
 
 
+def _get_amounts(comp: Composition | dict) -> Iterable[tuple[SpeciesLike, float]]:
+    """(species, amount) pairs of a Composition or dict. A Composition's own
+    mapping is read directly, which avoids looking up each key through
+    Composition.__getitem__.
+    """
+    return comp._data.items() if isinstance(comp, Composition) else comp.items()
+
+
 def reduce_formula(
     sym_amt: dict[str, float] | dict[str, int],
     iupac_ordering: bool = False,
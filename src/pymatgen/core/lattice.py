@@ -18,7 +18,6 @@ from monty.dev import deprecated
 from monty.json import MSONable
 from pymatgen.util.coord import pbc_shortest_vectors
 from pymatgen.util.due import Doi, due
-from scipy.spatial import Voronoi
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -906,6 +905,7 @@ class Lattice(MSONable):
         ltol: float = 1e-5,
         atol: float = 1,
         skip_rotation_matrix: bool = False,
+        lattice_points: np.ndarray | None = None,
     ) -> Iterator[tuple[Lattice, np.ndarray | None, np.ndarray]]:
         """Find all mappings between current lattice and another lattice.
 
@@ -915,6 +915,11 @@ class Lattice(MSONable):
             atol (float): Tolerance for matching angles. Defaults to 1.
             skip_rotation_matrix (bool): Whether to skip calculation of the
                 rotation matrix
+            lattice_points (np.ndarray): Fractional coordinates of candidate lattice
+                points, which must include all points of this lattice within
+                max(other_lattice.lengths) * (1 + ltol) of the origin. Saves the
+                sphere search when mapping the same lattice (or a scaled copy of
+                it) onto many others. Defaults to None, i.e. search the sphere.
 
         Yields:
             (aligned_lattice, rotation_matrix, scale_matrix) if a mapping is
@@ -942,10 +947,15 @@ class Lattice(MSONable):
         lengths = other_lattice.lengths
         alpha, beta, gamma = other_lattice.angles
 
-        frac, dist, _, _ = self.get_points_in_sphere(
-            [[0, 0, 0]], [0, 0, 0], max(lengths) * (1 + ltol), zip_results=False
-        )
-        cart = self.get_cartesian_coords(frac)
+        if lattice_points is None:
+            frac, dist, _, _ = self.get_points_in_sphere(
+                [[0, 0, 0]], [0, 0, 0], max(lengths) * (1 + ltol), zip_results=False
+            )
+            cart = self.get_cartesian_coords(frac)
+        else:
+            frac = lattice_points
+            cart = self.get_cartesian_coords(frac)
+            dist = np.linalg.norm(cart, axis=1)
         # This can't be broadcast because they're different lengths
         inds = [np.logical_and(dist / ln < 1 + ltol, dist / ln > 1 / (1 + ltol)) for ln in lengths]  # type: ignore[operator]
         c_a, c_b, c_c = (cart[i] for i in inds)
@@ -1261,6 +1271,8 @@ class Lattice(MSONable):
             Wigner Seitz cell. For instance, a list of four coordinates will
             represent a square facet.
         """
+        from scipy.spatial import Voronoi
+
         vec1, vec2, vec3 = self._matrix
 
         list_k_points = []
@@ -1536,6 +1536,54 @@ def get_el_sp(obj: int | SpeciesLike) -> Element | Species | DummySpecies:
         raise ValueError(f"Can't parse Element or Species from {obj!r}") from exc
 
 
+def _get_property_value(obj: Element | Species | DummySpecies, prop: str) -> float:
+    """Get a property of an Element, Species or DummySpecies as a float.
+
+    Args:
+        obj (Element/Species/DummySpecies): Element or species.
+        prop (str): Name of the property, e.g. "X", "atomic_mass" or "ionic_radius".
+
+    Raises:
+        AttributeError: if obj has no property prop.
+
+    Returns:
+        float: Value of the property without units, NaN if there is no data or
+            the data is not a number.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        val = getattr(obj, prop)
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+@functools.lru_cache
+def property_array(prop: str) -> np.ndarray:
+    """Get an Element property for all elements at once, e.g. to look up the
+    property of many atoms with property_array("X")[atomic_numbers].
+
+    Args:
+        prop (str): Name of the Element property, e.g. "X", "atomic_mass" or
+            "atomic_radius".
+
+    Raises:
+        AttributeError: if prop is not an Element property.
+
+    Returns:
+        np.ndarray: Read-only array of the property values without units,
+            indexed by atomic number. Index 0 and elements without (numerical)
+            data are NaN.
+    """
+    elements = [el for el in Element if not el._is_named_isotope]
+    values = np.full(max(el.Z for el in elements) + 1, np.nan)
+    for el in elements:
+        values[el.Z] = _get_property_value(el, prop)
+    values.flags.writeable = False
+    return values
+
+
 @unique
 class ElementType(Enum):
     """Enum for element types."""
@@ -39,13 +39,7 @@ from pymatgen.core.periodic_table import DummySpecies, Element, Species, get_el_
 from pymatgen.core.sites import PeriodicSite, Site
 from pymatgen.core.units import Length, Mass
 from pymatgen.electronic_structure.core import Magmom
-from pymatgen.symmetry.maggroups import MagneticSpaceGroup
 from pymatgen.util.coord import all_distances, get_angle, lattice_points_in_supercell
-from ruamel.yaml import YAML
-from scipy.cluster.hierarchy import fcluster, linkage
-from scipy.linalg import expm, polar
-from scipy.spatial.distance import squareform
-from tabulate import tabulate
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Sequence
@@ -58,6 +52,7 @@ if TYPE_CHECKING:
     from ase.optimize.optimize import Optimizer
     from matgl.ext.ase import TrajectoryObserver
     from numpy.typing import ArrayLike, NDArray
+    from pymatgen.symmetry.maggroups import MagneticSpaceGroup
     from pymatgen.util.typing import CompositionLike, MillerIndex, PathLike, PbcLike, SpeciesLike
     from typing_extensions import Self
 
@@ -338,6 +333,30 @@ class SiteCollection(collections.abc.Sequence, ABC):
         except AttributeError:
             raise AttributeError("atomic_numbers available only for ordered Structures")
 
+    def get_property_array(self, prop: str) -> np.ndarray:
+        """Get an Element or Species property for all sites at once, e.g. for
+        featurization. The property is only looked up once per distinct site
+        composition. Disordered sites get the occupancy-weighted average over
+        their species.
+
+        Args:
+            prop (str): Name of a numerical property of the species, e.g. "X",
+                "atomic_mass" or "ionic_radius".
+
+        Returns:
+            np.ndarray: Property values of shape (n_sites,) without units. NaN
+                for sites whose species have no data.
+        """
+        site_values: dict[Composition, float] = {}
+        values = np.empty(len(self))
+        for idx, site in enumerate(self):
+            comp = site.species
+            if comp not in site_values:
+                amounts = np.fromiter(comp.values(), dtype=float, count=len(comp))
+                site_values[comp] = comp.get_property_array(prop) @ amounts / comp.num_atoms
+            values[idx] = site_values[comp]
+        return values
+
     @property
     def site_properties(self) -> dict[str, Sequence]:
         """The site properties as a dict of sequences.
@@ -1117,23 +1136,27 @@ class IStructure(SiteCollection, MSONable):
         frac_lattice = lattice_points_in_supercell(scale_matrix)
         cart_lattice = new_lattice.get_cartesian_coords(frac_lattice)
 
-        new_sites = []
-        for site in self:
-            for vec in cart_lattice:
-                periodic_site = PeriodicSite(
-                    site.species,
-                    site.coords + vec,
-                    new_lattice,
-                    properties=site.properties,
-                    coords_are_cartesian=True,
-                    to_unit_cell=False,
-                    skip_checks=True,
-                    label=site.label,
-                )
-                new_sites.append(periodic_site)
+        if len(self) == 0:
+            raise ValueError("You need at least 1 site to construct a Structure")
+        n_images = len(cart_lattice)
+        cart_coords = self.cart_coords[:, None, :] + cart_lattice[None, :, :]
+        site_properties = {
+            key: [val for val in vals for _ in range(n_images)] for key, vals in self.site_properties.items()
+        }
+        for key, vals in site_properties.items():
+            if any(val is None for val in vals):
+                warnings.warn(f"Not all sites have property {key}. Missing values are set to None.")
 
         new_charge = self._charge * np.linalg.det(scale_matrix) if self._charge else None
-        return Structure.from_sites(new_sites, charge=new_charge, to_unit_cell=True)
+        return Structure(
+            new_lattice,
+            [site.species for site in self for _ in range(n_images)],
+            new_lattice.get_fractional_coords(cart_coords.reshape(-1, 3)),
+            charge=new_charge,
+            to_unit_cell=True,
+            site_properties=site_properties,
+            labels=[site.label for site in self for _ in range(n_images)],
+        )
 
     def __rmul__(self, scaling_matrix):
         """Similar to __mul__ to preserve commutativeness."""
@@ -1147,6 +1170,8 @@ class IStructure(SiteCollection, MSONable):
         return "\n".join(outs)
 
     def __str__(self) -> str:
+        from tabulate import tabulate
+
         def to_str(x) -> str:
             return f"{x:>10.6f}"
 
@@ -1401,6 +1426,8 @@ class IStructure(SiteCollection, MSONable):
         if "magmom" not in site_properties:
             raise ValueError("Magnetic moments have to be defined.")
 
+        from pymatgen.symmetry.maggroups import MagneticSpaceGroup
+
         magmoms = [Magmom(m) for m in site_properties["magmom"]]
 
         if not isinstance(msg, MagneticSpaceGroup):
@@ -1771,10 +1798,11 @@ class IStructure(SiteCollection, MSONable):
             return self._get_neighbor_list_py(r, list(sites), exclude_self=exclude_self)
 
         else:
-            if sites is None:
-                sites = self.sites
-            site_coords = np.ascontiguousarray([site.coords for site in sites], dtype=float)
             cart_coords = np.ascontiguousarray(self.cart_coords, dtype=float)
+            if sites is None:
+                site_coords = cart_coords
+            else:
+                site_coords = np.ascontiguousarray([site.coords for site in sites], dtype=float)
             lattice_matrix = np.ascontiguousarray(self.lattice.matrix, dtype=float)
             pbc = np.ascontiguousarray(self.pbc, dtype=int)
             center_indices, points_indices, images, distances = find_points_in_spheres(
@@ -1791,6 +1819,84 @@ class IStructure(SiteCollection, MSONable):
                 cond = ~self_pair
             return center_indices[cond], points_indices[cond], images[cond], distances[cond]
 
+    @staticmethod
+    def get_batch_neighbor_list(
+        structures: Sequence[IStructure],
+        r: float,
+        numerical_tol: float = 1e-8,
+        exclude_self: bool = True,
+        n_jobs: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get the neighbor lists of many structures at once, like calling
+        get_neighbor_list on each of them. This is much faster for many small
+        structures, as all of them are handled in a single call to the cython
+        extension, optionally split over several threads.
+
+        The sites of all structures are indexed as if they were stacked in
+        order, i.e. site j of structures[i] has index sum(len(s) for s in
+        structures[:i]) + j. The structure of each pair is therefore given by
+        batch_index[center_indices] with
+        batch_index = np.repeat(np.arange(len(structures)), [len(s) for s in structures]).
+
+        Args:
+            structures (list[Structure]): Structures to get the neighbor lists of.
+            r (float): Radius of sphere
+            numerical_tol (float): This is a numerical tolerance for distances.
+                Sites which are < numerical_tol are determined to be coincident
+                with the site. Sites which are r + numerical_tol away is deemed
+                to be within r from the site. The default of 1e-8 should be
+                ok in most instances.
+            exclude_self (bool): whether to exclude atom neighboring with itself within
+                numerical tolerance distance, default to True
+            n_jobs (int): Number of threads to split the structures over. Defaults to 1.
+
+        Returns:
+            tuple: (center_indices, points_indices, offset_vectors, distances)
+        """
+        n_sites = np.array([len(struct) for struct in structures], dtype=int)
+        try:
+            from pymatgen.optimization.neighbors import find_points_in_spheres_batch
+        except ImportError:
+            shifts = np.cumsum(n_sites) - n_sites
+            results = [
+                struct._get_neighbor_list_py(r, None, numerical_tol=numerical_tol, exclude_self=exclude_self)
+                for struct in structures
+            ]
+            if not results:
+                return np.array([], dtype=int), np.array([], dtype=int), np.zeros((0, 3)), np.array([], dtype=float)
+            return (
+                np.concatenate([res[0] + shift for res, shift in zip(results, shifts)]),
+                np.concatenate([res[1] + shift for res, shift in zip(results, shifts)]),
+                np.concatenate([res[2] for res in results]).reshape(-1, 3),
+                np.concatenate([res[3] for res in results]),
+            )
+
+        batch_index = np.repeat(np.arange(len(structures)), n_sites)
+        cart_coords = np.zeros((len(batch_index), 3))
+        lattices = np.zeros((len(structures), 3, 3))
+        pbc = np.zeros((len(structures), 3), dtype=int)
+        start = 0
+        for idx, struct in enumerate(structures):
+            cart_coords[start : start + len(struct)] = struct.cart_coords
+            lattices[idx] = struct.lattice.matrix
+            pbc[idx] = struct.pbc
+            start += len(struct)
+        center_indices, points_indices, images, distances = find_points_in_spheres_batch(
+            cart_coords,
+            cart_coords,
+            r=r,
+            pbc=pbc,
+            lattices=lattices,
+            batch_index=batch_index,
+            center_batch_index=batch_index,
+            tol=numerical_tol,
+            n_jobs=n_jobs,
+        )
+        if exclude_self:
+            cond = ~((center_indices == points_indices) & (distances <= numerical_tol))
+            return center_indices[cond], points_indices[cond], images[cond], distances[cond]
+        return center_indices, points_indices, images, distances
+
     def get_symmetric_neighbor_list(
         self,
         r: float,
@@ -2426,6 +2532,8 @@ class IStructure(SiteCollection, MSONable):
         structs = []
 
         if interpolate_lattices:
+            from scipy.linalg import polar
+
             # Interpolate lattice matrices using polar decomposition
             # u is a unitary rotation, p is stretch
             _u, p = polar(np.dot(end_structure.lattice.matrix.T, np.linalg.inv(self.lattice.matrix.T)))
@@ -2901,6 +3009,8 @@ class IStructure(SiteCollection, MSONable):
 
             return Prismatic(self).to_str()
         elif fmt in ("yaml", "yml") or fnmatch(filename, "*.yaml*") or fnmatch(filename, "*.yml*"):
+            from ruamel.yaml import YAML
+
             yaml = YAML()
             str_io = StringIO()
             yaml.dump(self.as_dict(), str_io)
@@ -3004,6 +3114,8 @@ class IStructure(SiteCollection, MSONable):
             dct = json.loads(input_string)
             struct = Structure.from_dict(dct)
         elif fmt_low in ("yaml", "yml"):
+            from ruamel.yaml import YAML
+
             yaml = YAML()
             dct = yaml.load(input_string)
             struct = Structure.from_dict(dct)
@@ -3748,6 +3860,8 @@ class IMolecule(SiteCollection, MSONable):
                     file.write(json_str)
             return json_str
         elif fmt in {"yaml", "yml"} or fnmatch(filename, "*.yaml*") or fnmatch(filename, "*.yml*"):
+            from ruamel.yaml import YAML
+
             yaml = YAML()
             str_io = StringIO()
             yaml.dump(self.as_dict(), str_io)
@@ -3805,6 +3919,8 @@ class IMolecule(SiteCollection, MSONable):
             return cls.from_dict(dct)
 
         elif fmt in {"yaml", "yml"}:
+            from ruamel.yaml import YAML
+
             yaml = YAML()
             dct = yaml.load(input_string)
             return cls.from_dict(dct)
@@ -4284,34 +4400,24 @@ class Structure(IStructure, collections.abc.MutableSequence):
             Structure: post-operation structure
         """
         if fractional:
-            new_latt = np.dot(symm_op.rotation_matrix, self._lattice.matrix)
-            self._lattice = Lattice(new_latt)
-
-            def operate_site(site):
-                return PeriodicSite(
-                    site.species,
-                    symm_op.operate(site.frac_coords),
-                    self._lattice,
-                    properties=site.properties,
-                    skip_checks=True,
-                    label=site.label,
-                )
+            new_frac_coords = symm_op.operate_multi(self.frac_coords.reshape(-1, 3))
+            self._lattice = Lattice(np.dot(symm_op.rotation_matrix, self._lattice.matrix))
         else:
+            new_cart_coords = symm_op.operate_multi(self.cart_coords.reshape(-1, 3))
             self._lattice = Lattice([symm_op.apply_rotation_only(row) for row in self._lattice.matrix])
+            new_frac_coords = self._lattice.get_fractional_coords(new_cart_coords)
 
-            def operate_site(site):
-                new_cart = symm_op.operate(site.coords)
-                new_frac = self._lattice.get_fractional_coords(new_cart)
-                return PeriodicSite(
-                    site.species,
-                    new_frac,
-                    self._lattice,
-                    properties=site.properties,
-                    skip_checks=True,
-                    label=site.label,
-                )
-
-        self.sites = [operate_site(site) for site in self]
+        self.sites = [
+            PeriodicSite(
+                site.species,
+                frac_coords,
+                self._lattice,
+                properties=site.properties,
+                skip_checks=True,
+                label=site.label,
+            )
+            for site, frac_coords in zip(self, new_frac_coords)
+        ]
 
         return self
 
@@ -4380,16 +4486,26 @@ class Structure(IStructure, collections.abc.MutableSequence):
         """
         if not isinstance(indices, collections.abc.Iterable):
             indices = [indices]
+        indices = np.array(list(indices), dtype=int).reshape(-1)
+        if len(np.unique(indices)) != len(indices):
+            # translate repeated sites once per occurrence
+            for idx in indices:
+                self.translate_sites([idx], vector, frac_coords=frac_coords, to_unit_cell=to_unit_cell)
+            return self
+
+        sites = [self._sites[idx] for idx in indices]
+        if frac_coords:
+            f_coords = np.array([site.frac_coords for site in sites]).reshape(-1, 3) + vector
+        else:
+            f_coords = self._lattice.get_fractional_coords(
+                np.array([site.coords for site in sites]).reshape(-1, 3) + vector
+            )
+        if to_unit_cell:
+            pbc = np.array(self.lattice.pbc)
+            f_coords[:, pbc] = np.mod(f_coords[:, pbc], 1)
 
-        for idx in indices:
-            site = self[idx]
-            if frac_coords:
-                f_coords = site.frac_coords + vector
-            else:
-                f_coords = self._lattice.get_fractional_coords(site.coords + vector)
-            if to_unit_cell:
-                f_coords = [np.mod(f, 1) if p else f for p, f in zip(self.lattice.pbc, f_coords)]
-            self[idx].frac_coords = f_coords
+        for site, f_coord in zip(sites, f_coords):
+            site.frac_coords = f_coord
 
         return self
 
@@ -4429,6 +4545,8 @@ class Structure(IStructure, collections.abc.MutableSequence):
 
         theta %= 2 * np.pi
 
+        from scipy.linalg import expm
+
         rm = expm(cross(eye(3), axis / norm(axis)) * theta)
         for idx in indices:
             site = self[idx]
@@ -4510,10 +4628,10 @@ class Structure(IStructure, collections.abc.MutableSequence):
         struct: Structure = self if in_place else self.copy()
         supercell: Structure = struct * scaling_matrix
         if to_unit_cell:
-            for site in supercell:
-                site.to_unit_cell(in_place=True)
+            supercell.translate_sites(range(len(supercell)), [0, 0, 0], to_unit_cell=True)
+        # the supercell sites already belong to the supercell lattice
         struct.sites = supercell.sites
-        struct.lattice = supercell.lattice
+        struct._lattice = supercell.lattice
 
         return struct
 
@@ -4545,6 +4663,9 @@ class Structure(IStructure, collections.abc.MutableSequence):
         Returns:
             Structure: self with merged sites.
         """
+        from scipy.cluster.hierarchy import fcluster, linkage
+        from scipy.spatial.distance import squareform
+
         dist_mat = self.distance_matrix
         np.fill_diagonal(dist_mat, 0)
         clusters = fcluster(linkage(squareform((dist_mat + dist_mat.T) / 2)), tol, "distance")
@@ -4992,6 +5113,8 @@ class Molecule(IMolecule, collections.abc.MutableSequence):
 
         theta %= 2 * np.pi
 
+        from scipy.linalg import expm
+
         rm = expm(cross(eye(3), axis / norm(axis)) * theta)
 
         for idx in indices:
@@ -14,7 +14,7 @@ import collections
 import re
 import warnings
 from collections import defaultdict
-from functools import partial
+from functools import cache, partial
 from numbers import Number
 from typing import TYPE_CHECKING, cast
 
@@ -146,6 +146,33 @@ class UnitError(BaseException):
     """Exception class for unit errors."""
 
 
+def _check_mappings(unit: dict[str, int]) -> dict[str, int]:
+    """Replace a combination of units by the derived unit it defines, if any."""
+    for v in DERIVED_UNITS.values():
+        for k2, v2 in v.items():
+            if all(v2.get(ku, 0) == vu for ku, vu in unit.items()) and all(
+                unit.get(kv2, 0) == vv2 for kv2, vv2 in v2.items()
+            ):
+                return {k2: 1}
+    return unit
+
+
+@cache
+def _parse_unit_str(unit_def: str) -> dict[str, int]:
+    """Parse a unit string such as "kg m^2 s^-1". Results are cached, so callers
+    must copy them before modification.
+    """
+    unit: dict[str, int] = defaultdict(int)
+
+    for match in re.finditer(r"([A-Za-z]+)\s*\^*\s*([\-0-9]*)", unit_def):
+        val = match[2]
+        val = int(val) if val else 1
+        key = match[1]
+        unit[key] += val
+
+    return _check_mappings(unit)
+
+
 class Unit(collections.abc.Mapping):
     """Represent a unit, e.g. "m" for meters, etc. Supports compound units.
     Only integer powers are supported.
@@ -160,28 +187,10 @@ class Unit(collections.abc.Mapping):
                 format uses "^" as the power operator and all units must be
                 space-separated.
         """
-
-        def check_mappings(u):
-            for v in DERIVED_UNITS.values():
-                for k2, v2 in v.items():
-                    if all(v2.get(ku, 0) == vu for ku, vu in u.items()) and all(
-                        u.get(kv2, 0) == vv2 for kv2, vv2 in v2.items()
-                    ):
-                        return {k2: 1}
-            return u
-
         if isinstance(unit_def, str):
-            unit: dict[str, int] = defaultdict(int)
-
-            for match in re.finditer(r"([A-Za-z]+)\s*\^*\s*([\-0-9]*)", unit_def):
-                val = match[2]
-                val = int(val) if val else 1
-                key = match[1]
-                unit[key] += val
+            self._unit = _parse_unit_str(unit_def).copy()
         else:
-            unit = {k: v for k, v in dict(unit_def).items() if v != 0}
-
-        self._unit = check_mappings(unit)
+            self._unit = _check_mappings({k: v for k, v in dict(unit_def).items() if v != 0})
 
     def __mul__(self, other: Self) -> Self:
         new_units: defaultdict = defaultdict(int)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import itertools
 import json
+import os
+import tempfile
 import warnings
-from copy import deepcopy
+from copy import copy
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -17,10 +18,52 @@ from pymatgen.electronic_structure.core import Spin
 from scipy.interpolate import RegularGridInterpolator
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
+    from pymatgen.util.typing import PathLike
     from typing_extensions import Self
 
+# Number of grid points processed at a time by out-of-core volumetric operations
+GRID_CHUNK_SIZE = 2**22
+
+
+def iter_grid_slabs(array: np.ndarray, chunk_size: int = GRID_CHUNK_SIZE) -> Iterator[tuple[slice, ...]]:
+    """Split a 3D grid into slabs of about chunk_size points along its slowest
+    varying axis (the last axis for Fortran-ordered arrays, else the first).
+
+    Iterating over these slabs keeps memory bounded when the grid is a
+    np.memmap, since only one slab is paged in at a time.
+
+    Args:
+        array (np.ndarray): 3D grid.
+        chunk_size (int): Approximate number of points per slab.
+
+    Yields:
+        tuple[slice, ...]: Index selecting one slab of the grid.
+    """
+    axis = 2 if array.flags.f_contiguous and not array.flags.c_contiguous else 0
+    n_slices = array.shape[axis]
+    step = max(1, chunk_size * n_slices // max(array.size, 1))
+    for start in range(0, n_slices, step):
+        idx = [slice(None)] * 3
+        idx[axis] = slice(start, start + step)
+        yield tuple(idx)
+
+
+def empty_grid_like(*arrays: np.ndarray) -> np.ndarray:
+    """Allocate an uninitialized grid with the shape of arrays[0].
+
+    If any of the arrays is a np.memmap, the new grid is memory mapped to an
+    anonymous temporary file (removed once the array is garbage collected) so
+    that results of out-of-core operations are never fully loaded in memory.
+    """
+    shape, order = arrays[0].shape, "F" if arrays[0].flags.f_contiguous else "C"
+    if any(isinstance(arr, np.memmap) for arr in arrays):
+        with tempfile.TemporaryFile() as file:
+            return np.memmap(file, dtype=np.float64, mode="w+", shape=shape, order=order)
+    return np.empty(shape, order=order)
+
 
 class VolumetricData(MSONable):
     """
@@ -62,8 +105,9 @@ class VolumetricData(MSONable):
         self.structure = structure
         self.is_spin_polarized = len(data) >= 2
         self.is_soc = len(data) >= 4
-        # convert data to numpy arrays in case they were jsanitized as lists
-        self.data = {k: np.array(v) for k, v in data.items()}
+        # convert data to numpy arrays in case they were jsanitized as lists,
+        # leaving memory-mapped grids on disk
+        self.data = {k: v if isinstance(v, np.memmap) else np.array(v) for k, v in data.items()}
         self.dim = self.data["total"].shape
         self.data_aug = data_aug or {}
         self.ngridpts = self.dim[0] * self.dim[1] * self.dim[2]
@@ -138,14 +182,24 @@ class VolumetricData(MSONable):
         if list(self.data) != list(other.data):
             raise ValueError("Data have different keys! Maybe one is spin-polarized and the other is not?")
 
-        # To add checks
+        # Work slab by slab so memory-mapped grids are never fully loaded
         data = {}
         for k in self.data:
-            data[k] = self.data[k] + scale_factor * other.data[k]
+            data[k] = empty_grid_like(self.data[k], other.data[k])
+            for slab in iter_grid_slabs(data[k]):
+                data[k][slab] = self.data[k][slab] + scale_factor * other.data[k][slab]
 
-        new = deepcopy(self)
+        # Shallow copy to avoid duplicating the grids of self, which are replaced anyway
+        new = copy(self)
+        new.structure = self.structure.copy()
         new.data = data
         new.data_aug = {}
+        new._spin_data = {}
+        new.interpolator = RegularGridInterpolator(
+            (new.xpoints, new.ypoints, new.zpoints),
+            data["total"],
+            bounds_error=True,
+        )
         return new
 
     def scale(self, factor):
@@ -218,29 +272,42 @@ class VolumetricData(MSONable):
             return data
 
         struct = self.structure
-        a = self.dim
+        dim = np.array(self.dim)
         if ind not in self._distance_matrix or self._distance_matrix[ind]["max_radius"] < radius:
-            coords = []
-            for x, y, z in itertools.product(*(list(range(i)) for i in a)):
-                coords.append([x / a[0], y / a[1], z / a[2]])
-            sites_dist = struct.lattice.get_points_in_sphere(coords, struct[ind].coords, radius)
+            # Only enumerate the grid points (including periodic images) in the
+            # bounding box of the sphere rather than the whole grid
+            frac_center = struct[ind].frac_coords
+            frac_extent = radius * np.array(struct.lattice.reciprocal_lattice_crystallographic.abc)
+            ranges = [
+                np.arange(
+                    np.floor((frac_center[i] - frac_extent[i]) * dim[i]),
+                    np.ceil((frac_center[i] + frac_extent[i]) * dim[i]) + 1,
+                )
+                for i in range(3)
+            ]
+            # Cartesian offset of each grid plane from the site, handled one x plane at a time
+            axis_vecs = [np.outer(ranges[i] / dim[i], struct.lattice.matrix[i]) for i in range(3)]
+            axis_vecs[0] -= struct[ind].coords
+            grid_idx, dists = [], []
+            for x_idx, x_vec in zip(ranges[0], axis_vecs[0]):
+                plane_dists = np.linalg.norm(x_vec + axis_vecs[1][:, None] + axis_vecs[2][None], axis=-1)
+                y_idx, z_idx = np.nonzero(plane_dists <= radius)
+                grid_idx.append(np.column_stack([np.full(len(y_idx), x_idx), ranges[1][y_idx], ranges[2][z_idx]]))
+                dists.append(plane_dists[y_idx, z_idx])
             self._distance_matrix[ind] = {
                 "max_radius": radius,
-                "data": np.array(sites_dist, dtype=object),
+                "data": (np.mod(np.concatenate(grid_idx), dim).astype(int), np.concatenate(dists)),
             }
 
-        data = self._distance_matrix[ind]["data"]
-
-        # Use boolean indexing to find all charges within the desired distance.
-        inds = data[:, 1] <= radius
-        dists = data[inds, 1]
-        data_inds = np.rint(np.mod(list(data[inds, 0]), 1) * np.tile(a, (len(dists), 1))).astype(int)
-        vals = [self.data["diff"][x, y, z] for x, y, z in data_inds]
+        grid_idx, dists = self._distance_matrix[ind]["data"]
+        in_sphere = dists <= radius
+        dists = dists[in_sphere]
+        vals = self.data["diff"][tuple(grid_idx[in_sphere].T)]
 
         hist, edges = np.histogram(dists, bins=nbins, range=[0, radius], weights=vals)
         data = np.zeros((nbins, 2))
         data[:, 0] = edges[1:]
-        data[:, 1] = [sum(hist[0 : i + 1]) / self.ngridpts for i in range(nbins)]
+        data[:, 1] = np.cumsum(hist) / self.ngridpts
         return data
 
     def get_average_along_axis(self, ind):
@@ -256,12 +323,11 @@ class VolumetricData(MSONable):
         """
         total_spin_dens = self.data["total"]
         ng = self.dim
-        if ind == 0:
-            total = np.sum(np.sum(total_spin_dens, axis=1), 1)
-        elif ind == 1:
-            total = np.sum(np.sum(total_spin_dens, axis=0), 1)
-        else:
-            total = np.sum(np.sum(total_spin_dens, axis=0), 0)
+        other_axes = tuple(axis for axis in range(3) if axis != ind)
+        total = np.zeros(ng[ind])
+        # Accumulate slab by slab so memory-mapped grids are never fully loaded
+        for slab in iter_grid_slabs(total_spin_dens):
+            total[slab[ind]] += np.sum(total_spin_dens[slab], axis=other_axes)
         return total / ng[(ind + 1) % 3] / ng[(ind + 2) % 3]
 
     def to_hdf5(self, filename):
@@ -320,6 +386,67 @@ class VolumetricData(MSONable):
             structure = Structure.from_dict(json.loads(file.attrs["structure_json"]))
             return cls(structure, data=data, data_aug=data_aug, **kwargs)
 
+    def to_npy(self, dirname: PathLike) -> None:
+        """Write the VolumetricData to a directory of .npy files that can be
+        loaded memory-mapped with from_npy. This is the preferred format for
+        large grids that should be processed out-of-core. The directory holds:
+
+        VolumetricData.data[key] -> {key}.npy (one file per grid)
+        Everything else -> meta.json (name, structure, data_aug and a map of
+            data keys to .npy files)
+
+        Grids that are already memory mapped to a file in dirname (e.g. when
+        read with Chgcar.from_file(..., npy_dir=dirname)) are flushed instead
+        of being written again.
+
+        Args:
+            dirname (PathLike): Directory to write to. Created if needed.
+        """
+        os.makedirs(dirname, exist_ok=True)
+        files = {}
+        for key, arr in self.data.items():
+            if (
+                isinstance(arr, np.memmap)
+                and arr.filename
+                and os.path.dirname(arr.filename) == os.path.abspath(dirname)
+            ):
+                arr.flush()
+                files[key] = os.path.basename(arr.filename)
+            else:
+                files[key] = f"{key}.npy"
+                np.save(os.path.join(dirname, files[key]), arr)
+
+        meta = {
+            "name": self.name,
+            "structure": self.structure.as_dict(),
+            "data": files,
+            "data_aug": self.data_aug or None,
+        }
+        with open(os.path.join(dirname, "meta.json"), mode="w") as file:
+            json.dump(meta, file)
+
+    @classmethod
+    def from_npy(cls, dirname: PathLike, mmap_mode: str | None = "r", **kwargs) -> Self:
+        """Read VolumetricData written by to_npy.
+
+        Args:
+            dirname (PathLike): Directory written by to_npy.
+            mmap_mode (str | None): Memory-map mode passed to np.load. Defaults
+                to "r" so that the grids stay on disk and are paged in on demand.
+                Use None to load them fully into memory.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            VolumetricData
+        """
+        with open(os.path.join(dirname, "meta.json")) as file:
+            meta = json.load(file)
+        data = {key: np.load(os.path.join(dirname, fname), mmap_mode=mmap_mode) for key, fname in meta["data"].items()}
+        structure = Structure.from_dict(meta["structure"])
+        vol_data = cls(structure, data=data, data_aug=meta["data_aug"], **kwargs)
+        vol_data.name = meta["name"]
+        return vol_data
+
     def to_cube(self, filename, comment: str = ""):
         """Write the total volumetric data to a cube file format, which consists of two comment lines,
         a header section defining the structure IN BOHR, and the data.
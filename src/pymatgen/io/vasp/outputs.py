@@ -11,10 +11,10 @@ import re
 import warnings
 import xml.etree.ElementTree as ET
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from glob import glob
-from io import StringIO
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
@@ -35,6 +35,7 @@ from pymatgen.electronic_structure.bandstructure import (
 from pymatgen.electronic_structure.core import Magmom, Orbital, OrbitalType, Spin
 from pymatgen.electronic_structure.dos import CompleteDos, Dos
 from pymatgen.entries.computed_entries import ComputedEntry, ComputedStructureEntry
+from pymatgen.io.common import GRID_CHUNK_SIZE, iter_grid_slabs
 from pymatgen.io.common import VolumetricData as BaseVolumetricData
 from pymatgen.io.core import ParseError
 from pymatgen.io.vasp.inputs import Incar, Kpoints, Poscar, Potcar
@@ -49,7 +50,7 @@ if TYPE_CHECKING:
     # Avoid name conflict with pymatgen.core.Element
     from xml.etree.ElementTree import Element as XML_Element
 
-    from numpy.typing import NDArray
+    from numpy.typing import DTypeLike, NDArray
     from pymatgen.util.typing import PathLike
     from typing_extensions import Self
 
@@ -134,6 +135,83 @@ def _parse_vasp_array(elem) -> list[list[float]]:
     return [[_vasprun_float(i) for i in v.text.split()] for v in elem]
 
 
+def _parse_vasp_rows(elem: XML_Element, dtype: DTypeLike = np.float64) -> NDArray:
+    """Decode all <r> rows nested anywhere below elem into one 2D array.
+
+    The text of all rows is joined and converted in a single np.fromstring
+    call, which is much faster than converting row by row. Callers reshape
+    the result according to the nesting of the <set> blocks.
+
+    Args:
+        elem (XML_Element): A <set> or <varray> element.
+        dtype (DTypeLike): Float dtype of the returned array.
+
+    Returns:
+        NDArray: Array of shape (n_rows, n_cols).
+    """
+    rows = [row.text or "" for row in elem.iter("r")]
+    n_cols = len(rows[0].split()) if rows else 0
+    with warnings.catch_warnings():
+        # Unparsable values (e.g. ***** float overflow) are handled below
+        warnings.simplefilter("ignore", DeprecationWarning)
+        data = np.fromstring(" ".join(rows), dtype=np.float64, sep=" ")
+    if data.size != len(rows) * n_cols:
+        data = np.array([[_vasprun_float(val) for val in row.split()] for row in rows])
+    return data.reshape(len(rows), n_cols).astype(dtype, copy=False)
+
+
+def _get_float_dtype(option: bool | DTypeLike) -> np.dtype:
+    """Get the dtype selected by a Vasprun parse_* option, which is either
+    True (float64) or a numpy float dtype.
+    """
+    if option is True:
+        return np.dtype(np.float64)
+    dtype = np.dtype(option)
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"Expected True or a float dtype, got {option!r}")
+    return dtype
+
+
+def _read_vasp_grid(file, grid: np.ndarray, block_lines: int = 2**16) -> None:
+    """Read the values of one volumetric grid from an open VASP CHGCAR-like
+    file into a preallocated Fortran-ordered array.
+
+    Lines are decoded in blocks with a single np.fromstring call each, so only
+    one block of text is held in memory at a time.
+
+    Args:
+        file: Text file positioned at the first line of grid values.
+        grid (np.ndarray): Fortran-ordered array (or memmap) to fill.
+        block_lines (int): Number of lines decoded at a time.
+    """
+    flat = grid.reshape(-1, order="F")
+    n_pts = flat.size
+    count = 0
+    lines: list[str] = []
+    n_per_line = 0
+    while count < n_pts:
+        if not n_per_line:
+            lines.append(next(file, ""))
+            n_per_line = len(lines[0].split()) or 1
+        # Usually all lines but the last hold n_per_line values
+        n_lines = min(block_lines, -(-(n_pts - count) // n_per_line)) - len(lines)
+        if n_lines > 0:
+            lines.extend(itertools.islice(file, n_lines))
+        if not any(lines):
+            raise ValueError(f"Volumetric data ended after {count} of {n_pts} values")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            try:
+                values = np.fromstring(" ".join(lines), dtype=np.float64, sep=" ")
+            except DeprecationWarning as exc:
+                raise ValueError(f"Could not parse volumetric data after {count} values") from exc
+        # Like VASP, ignore any values beyond the grid on the last line
+        n_read = min(values.size, n_pts - count)
+        flat[count : count + n_read] = values[:n_read]
+        count += n_read
+        lines = []
+
+
 def _parse_from_incar(filename: PathLike, key: str) -> Any:
     """Helper function to parse a parameter from the INCAR."""
     dirname = os.path.dirname(filename)
@@ -145,6 +223,104 @@ def _parse_from_incar(filename: PathLike, key: str) -> Any:
     return None
 
 
+def _get_calculation_offsets(filename: PathLike, chunk_size: int = 2**24) -> list[tuple[int, int]]:
+    """Find the byte offsets of all complete <calculation> blocks in a vasprun.xml.
+
+    The file is scanned in chunks of raw bytes, so this is much cheaper than
+    parsing the XML and does not hold more than one chunk in memory.
+
+    Args:
+        filename (PathLike): Path to the (possibly compressed) vasprun.xml.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        list[tuple[int, int]]: (start, end) offsets of each block in the
+            decompressed stream, where end is just past "</calculation>".
+            An unterminated final block is not included.
+    """
+    open_tag, close_tag = b"<calculation>", b"</calculation>"
+    starts: list[int] = []
+    ends: list[int] = []
+    overlap = len(close_tag) - 1
+    with zopen(filename, mode="rb") as file:
+        pos = 0
+        tail = b""
+        while chunk := file.read(chunk_size):
+            buffer = tail + chunk
+            buffer_start = pos - len(tail)
+            for tag, found, shift in ((open_tag, starts, 0), (close_tag, ends, len(close_tag))):
+                idx = buffer.find(tag)
+                while idx != -1:
+                    # Matches lying entirely within the tail were found in the previous chunk
+                    if idx + len(tag) > len(tail):
+                        found.append(buffer_start + idx + shift)
+                    idx = buffer.find(tag, idx + 1)
+            pos += len(chunk)
+            tail = buffer[-overlap:]
+
+    return list(zip(starts, ends))
+
+
+class _LazyIonicSteps(Sequence):
+    """Read-only sequence of Vasprun ionic steps, each decoded from its
+    <calculation> block in vasprun.xml only when accessed.
+    """
+
+    def __init__(
+        self,
+        filename: PathLike,
+        offsets: list[tuple[int, int]],
+        parse_step: Callable[[XML_Element], dict],
+    ) -> None:
+        """
+        Args:
+            filename (PathLike): Path to the vasprun.xml.
+            offsets (list[tuple[int, int]]): (start, end) byte offsets of the
+                <calculation> block of each ionic step.
+            parse_step (Callable): Function converting a <calculation>
+                element into an ionic step dict.
+        """
+        self.filename = filename
+        self.offsets = offsets
+        self.parse_step = parse_step
+        # Most properties (final_energy, converged...) hit the last step repeatedly
+        self._cached: tuple[int, dict] | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(self._iter_steps(range(len(self))[idx]))
+
+        idx = range(len(self))[idx]
+        if self._cached is None or self._cached[0] != idx:
+            self._cached = (idx, next(self._iter_steps([idx])))
+        return self._cached[1]
+
+    def __iter__(self):
+        return self._iter_steps(range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.filename!r}, n_steps={len(self)})"
+
+    def _iter_steps(self, indices: Iterable[int]):
+        with zopen(self.filename, mode="rb") as file:
+            for idx in indices:
+                start, end = self.offsets[idx]
+                file.seek(start)
+                yield self.parse_step(ET.fromstring(file.read(end - start)))
+
+
+# Vasprun attributes whose parsing is deferred when lazy=True, keyed by
+# the parse option that enables them
+_DEFERRED_SECTION_ATTRS: dict[str, tuple[str, ...]] = {
+    "parse_dos": ("efermi", "tdos", "idos", "pdos", "dos_has_errors"),
+    "parse_eigen": ("eigenvalues",),
+    "parse_projected_eigen": ("projected_eigenvalues", "projected_magnetisation"),
+}
+
+
 def _vasprun_float(flt: float | str) -> float:
     """
     Large numbers are often represented as ********* in the vasprun.
@@ -191,6 +367,7 @@ class Vasprun(MSONable):
     Attributes:
         ionic_steps (list): All ionic steps in the run as a list of {"structure": structure at end of run,
             "electronic_steps": {All electronic step data in vasprun file}, "stresses": stress matrix}.
+            With lazy=True, this is a read-only sequence decoding each step from the file on access.
         tdos (Dos): Total dos calculated at the end of run.
         idos (Dos): Integrated dos calculated at the end of run.
         pdos (list): List of list of PDos objects. Access as pdos[atomindex][orbitalindex].
@@ -244,13 +421,14 @@ class Vasprun(MSONable):
         filename: PathLike,
         ionic_step_skip: int | None = None,
         ionic_step_offset: int = 0,
-        parse_dos: bool = True,
+        parse_dos: bool | DTypeLike = True,
         parse_eigen: bool = True,
-        parse_projected_eigen: bool = False,
+        parse_projected_eigen: bool | DTypeLike = False,
         parse_potcar_file: PathLike | bool = True,
         occu_tol: float = 1e-8,
         separate_spins: bool = False,
         exception_on_bad_xml: bool = True,
+        lazy: bool = False,
     ) -> None:
         """
         Args:
@@ -271,14 +449,18 @@ class Vasprun(MSONable):
                 varying numbers of steps.
             parse_dos (bool): Whether to parse the dos. Defaults to True. Set
                 to False to shave off significant time from the parsing if you
-                are not interested in getting those data.
+                are not interested in getting those data. Can also be a numpy
+                float dtype (e.g. np.float32) to store the densities with that
+                precision.
             parse_eigen (bool): Whether to parse the eigenvalues. Defaults to
                 True. Set to False to shave off significant time from the
                 parsing if you are not interested in getting those data.
             parse_projected_eigen (bool): Whether to parse the projected
                 eigenvalues and magnetization. Defaults to False. Set to True to obtain
                 projected eigenvalues and magnetization. **Note that this can take an
-                extreme amount of time and memory.** So use this wisely.
+                extreme amount of time and memory.** So use this wisely. Can also
+                be a numpy float dtype, e.g. np.float32 to halve the memory used by
+                the projected eigenvalue arrays.
             parse_potcar_file (PathLike/bool): Whether to parse the potcar file to read
                 the potcar hashes for the potcar_spec attribute. Defaults to True,
                 where no hashes will be determined and the potcar_spec dictionaries
@@ -297,6 +479,16 @@ class Vasprun(MSONable):
                 proper vasprun.xml are parsed. You can set to False if you want
                 partial results (e.g., if you are monitoring a calculation during a
                 run), but use the results with care. A warning is issued.
+            lazy (bool): Whether to defer decoding the bulk of the file until it is
+                needed. Defaults to False. If True, the byte offsets of each
+                <calculation> block are recorded in a first pass and only the
+                header, trailer and final ionic step are parsed up front.
+                ionic_steps then becomes a read-only sequence that decodes each
+                step on access, and the DOS, eigenvalues and projected eigenvalues
+                (if enabled by parse_dos, parse_eigen and parse_projected_eigen)
+                are decoded on first access. Peak memory then no longer grows with
+                the number of ionic steps, which is useful for long MD runs.
+                ML_LMLFF and LCHIMAG runs are always parsed eagerly.
         """
         self.filename = filename
         self.ionic_step_skip = ionic_step_skip
@@ -305,7 +497,48 @@ class Vasprun(MSONable):
         self.separate_spins = separate_spins
         self.exception_on_bad_xml = exception_on_bad_xml
 
-        with zopen(filename, mode="rt") as file:
+        # Check the dtypes before parsing, since errors while parsing the DOS
+        # only set dos_has_errors
+        for option in (parse_dos, parse_projected_eigen):
+            if option:
+                _get_float_dtype(option)
+
+        if lazy:
+            self._parse_lazy(
+                parse_dos=parse_dos,
+                parse_eigen=parse_eigen,
+                parse_projected_eigen=parse_projected_eigen,
+            )
+        else:
+            self._parse_file(
+                parse_dos=parse_dos,
+                parse_eigen=parse_eigen,
+                parse_projected_eigen=parse_projected_eigen,
+            )
+
+        if parse_potcar_file:
+            self.update_potcar_spec(parse_potcar_file)
+            self.update_charge_from_potcar(parse_potcar_file)
+
+        if self.incar.get("ALGO") not in {"CHI", "BSE"} and not self.converged and self.parameters.get("IBRION") != 0:
+            msg = f"{filename} is an unconverged VASP run.\n"
+            msg += f"Electronic convergence reached: {self.converged_electronic}.\n"
+            msg += f"Ionic convergence reached: {self.converged_ionic}."
+            warnings.warn(msg, UnconvergedVASPWarning)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when normal attribute lookup fails, i.e. for sections
+        # whose decoding was deferred by lazy=True
+        deferred = self.__dict__.get("_deferred_sections")
+        if deferred is not None and (name in deferred["attrs"] or name == "kpoints_opt_props"):
+            self._load_deferred_sections()
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _parse_file(self, parse_dos: bool, parse_eigen: bool, parse_projected_eigen: bool) -> None:
+        """Parse the whole file, honoring ionic_step_skip and ionic_step_offset."""
+        ionic_step_skip, ionic_step_offset = self.ionic_step_skip, self.ionic_step_offset
+        with zopen(self.filename, mode="rt") as file:
             if ionic_step_skip or ionic_step_offset:
                 # Remove parts of the xml file and parse the string
                 content: str = file.read()
@@ -337,15 +570,74 @@ class Vasprun(MSONable):
                 )
                 self.nionic_steps = len(self.ionic_steps)
 
-            if parse_potcar_file:
-                self.update_potcar_spec(parse_potcar_file)
-                self.update_charge_from_potcar(parse_potcar_file)
+    def _parse_lazy(self, parse_dos: bool, parse_eigen: bool, parse_projected_eigen: bool) -> None:
+        """Index the <calculation> blocks and parse only the header, trailer and
+        final ionic step. Everything else is decoded on access.
+        """
+        blocks = _get_calculation_offsets(self.filename)
+        if not blocks:
+            self._parse_file(parse_dos, parse_eigen, parse_projected_eigen)
+            return
+
+        # Parse preamble + final <calculation> + trailer, skipping the heavy sections
+        with zopen(self.filename, mode="rb") as file:
+            preamble = file.read(blocks[0][0])
+            file.seek(blocks[-1][0])
+            skeleton = preamble + file.read()
+        self._parse(BytesIO(skeleton), parse_dos=False, parse_eigen=False, parse_projected_eigen=False)
+        del preamble, skeleton
+
+        if self.incar.get("ML_LMLFF") or self.parameters.get("LCHIMAG", False):
+            # md_data and chemical shielding steps do not map one-to-one onto <calculation> blocks
+            self._parse_file(parse_dos, parse_eigen, parse_projected_eigen)
+            return
+
+        self.nionic_steps = len(blocks)
+        self.ionic_steps = _LazyIonicSteps(
+            self.filename,
+            blocks[self.ionic_step_offset :: int(self.ionic_step_skip or 1)],
+            self._parse_ionic_step,
+        )
 
-        if self.incar.get("ALGO") not in {"CHI", "BSE"} and not self.converged and self.parameters.get("IBRION") != 0:
-            msg = f"{filename} is an unconverged VASP run.\n"
-            msg += f"Electronic convergence reached: {self.converged_electronic}.\n"
-            msg += f"Ionic convergence reached: {self.converged_ionic}."
-            warnings.warn(msg, UnconvergedVASPWarning)
+        flags = {
+            "parse_dos": parse_dos,
+            "parse_eigen": parse_eigen,
+            "parse_projected_eigen": parse_projected_eigen,
+        }
+        if any(flags.values()):
+            attrs = {attr for key, enabled in flags.items() if enabled for attr in _DEFERRED_SECTION_ATTRS[key]}
+            self._deferred_sections = {
+                "offsets": blocks[-1],
+                "flags": flags,
+                "attrs": attrs,
+                "kpoints_opt_props": self.__dict__.pop("kpoints_opt_props"),
+            }
+            for attr in attrs:
+                self.__dict__.pop(attr, None)
+
+    def _load_deferred_sections(self) -> None:
+        """Decode the DOS and (projected) eigenvalues deferred by lazy=True."""
+        deferred = self.__dict__.pop("_deferred_sections")
+        self.kpoints_opt_props = deferred["kpoints_opt_props"]
+        for attr in ("efermi", "eigenvalues", "projected_eigenvalues", "projected_magnetisation"):
+            if attr in deferred["attrs"]:
+                setattr(self, attr, None)
+
+        start, end = deferred["offsets"]
+        with zopen(self.filename, mode="rb") as file:
+            file.seek(start)
+            stream = BytesIO(file.read(end - start))
+
+        in_kpoints_opt = False
+        for event, elem in ET.iterparse(stream, events=["start", "end"]):
+            tag = elem.tag
+            if event == "start":
+                if tag in ("eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+                    in_kpoints_opt = True
+            elif tag in ("dos", "eigenvalues", "projected", "eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+                if tag in ("eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+                    in_kpoints_opt = False
+                self._parse_electronic_section(elem, in_kpoints_opt, **deferred["flags"])
 
     def _parse(
         self,
@@ -419,50 +711,16 @@ class Vasprun(MSONable):
                         else:
                             ionic_steps.extend(self._parse_chemical_shielding(elem))
 
-                    elif parse_dos and tag == "dos":
-                        if elem.get("comment") == "kpoints_opt":
-                            kpoints_opt_props = self.kpoints_opt_props = self.kpoints_opt_props or KpointOptProps()
-                            try:
-                                kpoints_opt_props.tdos, kpoints_opt_props.idos, kpoints_opt_props.pdos = (
-                                    self._parse_dos(elem)
-                                )
-                                kpoints_opt_props.efermi = kpoints_opt_props.tdos.efermi
-                                kpoints_opt_props.dos_has_errors = False
-                            except Exception:
-                                kpoints_opt_props.dos_has_errors = True
-                        else:
-                            try:
-                                self.tdos, self.idos, self.pdos = self._parse_dos(elem)
-                                self.efermi = self.tdos.efermi
-                                self.dos_has_errors = False
-                            except Exception:
-                                self.dos_has_errors = True
-
-                    elif parse_eigen and tag == "eigenvalues" and not in_kpoints_opt:
-                        self.eigenvalues = self._parse_eigen(elem)
-
-                    elif parse_projected_eigen and tag == "projected" and not in_kpoints_opt:
-                        self.projected_eigenvalues, self.projected_magnetisation = self._parse_projected_eigen(elem)
-
-                    elif tag in ("eigenvalues_kpoints_opt", "projected_kpoints_opt"):
-                        in_kpoints_opt = False
-                        if self.kpoints_opt_props is None:
-                            self.kpoints_opt_props = KpointOptProps()
-                        if parse_eigen:
-                            # projected_kpoints_opt includes occupation information whereas
-                            # eigenvalues_kpoints_opt doesn't.
-                            self.kpoints_opt_props.eigenvalues = self._parse_eigen(elem.find("eigenvalues"))
-                        if tag == "eigenvalues_kpoints_opt":
-                            (
-                                self.kpoints_opt_props.kpoints,
-                                self.kpoints_opt_props.actual_kpoints,
-                                self.kpoints_opt_props.actual_kpoints_weights,
-                            ) = self._parse_kpoints(elem.find("kpoints"))
-                        elif parse_projected_eigen:  # and tag == "projected_kpoints_opt": (implied)
-                            (
-                                self.kpoints_opt_props.projected_eigenvalues,
-                                self.kpoints_opt_props.projected_magnetisation,
-                            ) = self._parse_projected_eigen(elem)
+                    elif tag in ("dos", "eigenvalues", "projected", "eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+                        if tag in ("eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+                            in_kpoints_opt = False
+                        self._parse_electronic_section(
+                            elem,
+                            in_kpoints_opt,
+                            parse_dos=parse_dos,
+                            parse_eigen=parse_eigen,
+                            parse_projected_eigen=parse_projected_eigen,
+                        )
 
                     elif tag == "dielectricfunction":
                         if (
@@ -1302,7 +1560,7 @@ class Vasprun(MSONable):
 
         try:
             vout = {
-                "ionic_steps": self.ionic_steps,
+                "ionic_steps": list(self.ionic_steps),
                 "final_energy": self.final_energy,
                 "final_energy_per_atom": self.final_energy / n_sites,
                 "crystal": self.final_structure.as_dict(),
@@ -1310,7 +1568,7 @@ class Vasprun(MSONable):
             }
         except (ArithmeticError, TypeError):
             vout = {
-                "ionic_steps": self.ionic_steps,
+                "ionic_steps": list(self.ionic_steps),
                 "final_energy": self.final_energy,
                 "final_energy_per_atom": None,
                 "crystal": self.final_structure.as_dict(),
@@ -1553,8 +1811,73 @@ class Vasprun(MSONable):
         elem.clear()
         return ion_step
 
+    def _parse_electronic_section(
+        self,
+        elem: XML_Element,
+        in_kpoints_opt: bool,
+        parse_dos: bool | DTypeLike,
+        parse_eigen: bool,
+        parse_projected_eigen: bool | DTypeLike,
+    ) -> None:
+        """Parse a <dos>, <eigenvalues>, <projected> or KPOINTS_OPT block of
+        the final ionic step into the corresponding attributes.
+        """
+        tag = elem.tag
+        if tag == "dos":
+            if not parse_dos:
+                elem.clear()
+            elif elem.get("comment") == "kpoints_opt":
+                kpoints_opt_props = self.kpoints_opt_props = self.kpoints_opt_props or KpointOptProps()
+                try:
+                    kpoints_opt_props.tdos, kpoints_opt_props.idos, kpoints_opt_props.pdos = self._parse_dos(
+                        elem, _get_float_dtype(parse_dos)
+                    )
+                    kpoints_opt_props.efermi = kpoints_opt_props.tdos.efermi
+                    kpoints_opt_props.dos_has_errors = False
+                except Exception:
+                    kpoints_opt_props.dos_has_errors = True
+            else:
+                try:
+                    self.tdos, self.idos, self.pdos = self._parse_dos(elem, _get_float_dtype(parse_dos))
+                    self.efermi = self.tdos.efermi
+                    self.dos_has_errors = False
+                except Exception:
+                    self.dos_has_errors = True
+
+        elif tag in ("eigenvalues", "projected"):
+            # Blocks nested in KPOINTS_OPT data are parsed with their parent
+            if in_kpoints_opt:
+                return
+            if tag == "eigenvalues" and parse_eigen:
+                self.eigenvalues = self._parse_eigen(elem)
+            elif tag == "projected" and parse_projected_eigen:
+                self.projected_eigenvalues, self.projected_magnetisation = self._parse_projected_eigen(
+                    elem, _get_float_dtype(parse_projected_eigen)
+                )
+            else:
+                elem.clear()
+
+        elif tag in ("eigenvalues_kpoints_opt", "projected_kpoints_opt"):
+            if self.kpoints_opt_props is None:
+                self.kpoints_opt_props = KpointOptProps()
+            if parse_eigen:
+                # projected_kpoints_opt includes occupation information whereas
+                # eigenvalues_kpoints_opt doesn't.
+                self.kpoints_opt_props.eigenvalues = self._parse_eigen(elem.find("eigenvalues"))
+            if tag == "eigenvalues_kpoints_opt":
+                (
+                    self.kpoints_opt_props.kpoints,
+                    self.kpoints_opt_props.actual_kpoints,
+                    self.kpoints_opt_props.actual_kpoints_weights,
+                ) = self._parse_kpoints(elem.find("kpoints"))
+            elif parse_projected_eigen:  # and tag == "projected_kpoints_opt": (implied)
+                (
+                    self.kpoints_opt_props.projected_eigenvalues,
+                    self.kpoints_opt_props.projected_magnetisation,
+                ) = self._parse_projected_eigen(elem, _get_float_dtype(parse_projected_eigen))
+
     @staticmethod
-    def _parse_dos(elem: XML_Element) -> tuple[Dos, Dos, list[dict]]:
+    def _parse_dos(elem: XML_Element, dtype: DTypeLike = np.float64) -> tuple[Dos, Dos, list[dict]]:
         """Parse density of states (DOS)."""
         efermi = float(elem.find("i").text)  # type: ignore[union-attr, arg-type]
         energies = None
@@ -1562,7 +1885,7 @@ class Vasprun(MSONable):
         idensities = {}
 
         for s in elem.find("total").find("array").find("set").findall("set"):  # type: ignore[union-attr]
-            data = np.array(_parse_vasp_array(s))
+            data = _parse_vasp_rows(s, dtype)
             energies = data[:, 0]
             spin = Spin.up if s.attrib["comment"] == "spin 1" else Spin.down
             tdensities[spin] = data[:, 1]
@@ -1574,16 +1897,17 @@ class Vasprun(MSONable):
             orbs = [ss.text for ss in partial.find("array").findall("field")]  # type: ignore[union-attr]
             orbs.pop(0)
             lm = any("x" in s for s in orbs if s is not None)
-            for s in partial.find("array").find("set").findall("set"):  # type: ignore[union-attr]
+            ion_sets = partial.find("array").find("set").findall("set")  # type: ignore[union-attr]
+            spins = [Spin.up if ss.attrib["comment"] == "spin 1" else Spin.down for ss in ion_sets[0].findall("set")]
+            # Decode all ions and spins at once, shape (n_ions, n_spins, n_energies, n_cols)
+            data = _parse_vasp_rows(partial.find("array").find("set"), dtype)  # type: ignore[union-attr, arg-type]
+            data = data.reshape(len(ion_sets), len(spins), -1, data.shape[-1])
+            for ion_data in data:
                 pdos: dict[Orbital | OrbitalType, dict[Spin, np.ndarray]] = defaultdict(dict)
-
-                for ss in s.findall("set"):
-                    spin = Spin.up if ss.attrib["comment"] == "spin 1" else Spin.down
-                    data = np.array(_parse_vasp_array(ss))
-                    _n_row, n_col = data.shape
-                    for col_idx in range(1, n_col):
+                for spin, spin_data in zip(spins, ion_data):
+                    for col_idx in range(1, spin_data.shape[1]):
                         orb = Orbital(col_idx - 1) if lm else OrbitalType(col_idx - 1)
-                        pdos[orb][spin] = data[:, col_idx]  # type: ignore[index]
+                        pdos[orb][spin] = spin_data[:, col_idx]  # type: ignore[index]
                 pdoss.append(pdos)
         elem.clear()
         return Dos(efermi, energies, tdensities), Dos(efermi, energies, idensities), pdoss
@@ -1591,40 +1915,44 @@ class Vasprun(MSONable):
     @staticmethod
     def _parse_eigen(elem: XML_Element) -> dict[Spin, NDArray]:
         """Parse eigenvalues."""
-        eigenvalues: dict[Spin, np.ndarray] = defaultdict(list)
+        eigenvalues: dict[Spin, np.ndarray] = {}
         for s in elem.find("array").find("set").findall("set"):  # type: ignore[union-attr]
             spin = Spin.up if s.attrib["comment"] == "spin 1" else Spin.down
-            for ss in s.findall("set"):
-                eigenvalues[spin].append(_parse_vasp_array(ss))
-        eigenvalues = {spin: np.array(v) for spin, v in eigenvalues.items()}
+            # One <set> of (eigenvalue, occupation) rows per k-point
+            data = _parse_vasp_rows(s)
+            eigenvalues[spin] = data.reshape(len(s), -1, data.shape[-1])
         elem.clear()
         return eigenvalues
 
     @staticmethod
-    def _parse_projected_eigen(elem: XML_Element) -> tuple[dict[Spin, NDArray], NDArray | None]:
-        """Parse projected eigenvalues."""
+    def _parse_projected_eigen(
+        elem: XML_Element, dtype: DTypeLike = np.float64
+    ) -> tuple[dict[Spin, NDArray], NDArray | None]:
+        """Parse projected eigenvalues.
+
+        Each spin channel is decoded in one go into a preallocated
+        (n_spins, n_kpoints, n_bands, n_ions, n_orbitals) array, and the
+        returned arrays are views into it.
+        """
         root = elem.find("array").find("set")  # type: ignore[union-attr]
-        _proj_eigen: dict[int, np.ndarray] = defaultdict(list)
-        for s in root.findall("set"):  # type: ignore[union-attr]
-            spin: int = int(re.match(r"spin(\d+)", s.attrib["comment"])[1])  # type: ignore[index]
+        spin_sets = root.findall("set")  # type: ignore[union-attr]
+        first_band = spin_sets[0][0][0]
+        n_kpts, n_bands, n_ions = len(spin_sets[0]), len(spin_sets[0][0]), len(first_band)
+        n_orbs = len(first_band[0].text.split())  # type: ignore[union-attr]
 
-            # Force spin to be +1 or -1
-            for ss in s.findall("set"):
-                dk = []
-                for sss in ss.findall("set"):
-                    db = _parse_vasp_array(sss)
-                    dk.append(db)
-                _proj_eigen[spin].append(dk)
-        _proj_eigen = {spin: np.array(v) for spin, v in _proj_eigen.items()}
+        proj = np.empty((len(spin_sets), n_kpts, n_bands, n_ions, n_orbs), dtype=dtype)
+        for s in spin_sets:
+            spin: int = int(re.match(r"spin(\d+)", s.attrib["comment"])[1])  # type: ignore[index]
+            proj[spin - 1] = _parse_vasp_rows(s).reshape(proj.shape[1:])
 
-        if len(_proj_eigen) > 2:
+        if len(spin_sets) > 2:
             # non-collinear magentism (also spin-orbit coupling) enabled, last three
             # "spin channels" are the projected magnetization of the orbitals in the
             # x, y, and z Cartesian coordinates
-            proj_mag = np.stack([_proj_eigen.pop(i) for i in range(2, 5)], axis=-1)  # type: ignore[call-overload]
-            proj_eigen: dict[Spin, np.ndarray] = {Spin.up: _proj_eigen[1]}
+            proj_mag = np.moveaxis(proj[1:4], 0, -1)
+            proj_eigen: dict[Spin, np.ndarray] = {Spin.up: proj[0]}
         else:
-            proj_eigen = {Spin.up if k == 1 else Spin.down: v for k, v in _proj_eigen.items()}
+            proj_eigen = {Spin.up if idx == 0 else Spin.down: proj[idx] for idx in range(len(spin_sets))}
             proj_mag = None
 
         elem.clear()
@@ -3461,67 +3789,63 @@ class VolumetricData(BaseVolumetricData):
     """
 
     @staticmethod
-    def parse_file(filename: PathLike) -> tuple[Poscar, dict, dict]:
+    def parse_file(filename: PathLike, npy_dir: PathLike | None = None) -> tuple[Poscar, dict, dict]:
         """
         Parse a generic volumetric data file in the VASP like format.
         Used by subclasses for parsing files.
 
+        The grids are decoded in blocks of lines rather than value by value.
+        If npy_dir is given, they are streamed straight into .npy files in
+        that directory and returned as memory maps, so that peak memory does
+        not depend on the grid size.
+
         Args:
             filename (PathLike): Path of file to parse.
+            npy_dir (PathLike): Directory to write the grids to as .npy files.
+                Defaults to None, i.e. the grids are held in memory.
 
         Returns:
             tuple[Poscar, dict, dict]: Poscar object, data dict, data_aug dict
         """
+        if npy_dir is not None:
+            os.makedirs(npy_dir, exist_ok=True)
+
+        def new_grid(name: str) -> np.ndarray:
+            # Fortran order, since VASP outputs x as the fastest index, followed by y then z
+            if npy_dir is None:
+                return np.empty(dim, order="F")
+            return np.lib.format.open_memmap(
+                os.path.join(npy_dir, f"{name}.npy"), mode="w+", shape=tuple(dim), fortran_order=True
+            )
+
         poscar_read = False
         poscar_string: list[str] = []
-        dataset: np.ndarray = np.zeros((1, 1, 1))
         all_dataset: list[np.ndarray] = []
         # for holding any strings in input that are not Poscar
         # or VolumetricData (typically augmentation charges)
         all_dataset_aug: dict[int, list[str]] = {}
         dim: list[int] = []
         dimline = ""
-        read_dataset = False
-        ngrid_pts = 0
-        data_count = 0
         poscar = None
         with zopen(filename, mode="rt") as file:
             for line in file:
                 original_line = line
                 line = line.strip()
-                if read_dataset:
-                    for tok in line.split():
-                        if data_count < ngrid_pts:
-                            # This complicated procedure is necessary because
-                            # VASP outputs x as the fastest index, followed by y
-                            # then z.
-                            no_x = data_count // dim[0]
-                            dataset[data_count % dim[0], no_x % dim[1], no_x // dim[1]] = float(tok)
-                            data_count += 1
-                    if data_count >= ngrid_pts:
-                        read_dataset = False
-                        data_count = 0
-                        all_dataset.append(dataset)
-
-                elif not poscar_read:
+                if not poscar_read:
                     if line != "" or len(poscar_string) == 0:
                         poscar_string.append(line)
                     elif line == "":
                         poscar = Poscar.from_str("\n".join(poscar_string))
                         poscar_read = True
 
-                elif not dim:
-                    dim = [int(i) for i in line.split()]
-                    ngrid_pts = dim[0] * dim[1] * dim[2]
-                    dimline = line
-                    read_dataset = True
-                    dataset = np.zeros(dim)
-
-                elif line == dimline:
+                elif not dim or line == dimline:
                     # when line == dimline, expect volumetric data to follow
-                    # so set read_dataset to True
-                    read_dataset = True
-                    dataset = np.zeros(dim)
+                    if not dim:
+                        dim = [int(i) for i in line.split()]
+                        dimline = line
+                    dataset = new_grid(f"grid{len(all_dataset)}")
+                    _read_vasp_grid(file, dataset)
+                    all_dataset.append(dataset)
 
                 else:
                     # store any extra lines that were not part of the
@@ -3553,12 +3877,12 @@ class VolumetricData(BaseVolumetricData):
                 # TODO: re-examine this, and also similar behavior in
                 # Magmom - @mkhorton
                 # TODO: does CHGCAR change with different SAXIS?
-                diff_xyz = np.array([data["diff_x"], data["diff_y"], data["diff_z"]])
-                diff_xyz = diff_xyz.reshape((3, dim[0] * dim[1] * dim[2]))
                 ref_direction = np.array([1.01, 1.02, 1.03])
-                ref_sign = np.sign(np.dot(ref_direction, diff_xyz))
-                diff = np.multiply(np.linalg.norm(diff_xyz, axis=0), ref_sign)
-                data["diff"] = diff.reshape((dim[0], dim[1], dim[2]))
+                data["diff"] = new_grid("diff")
+                for slab in iter_grid_slabs(data["diff"]):
+                    diff_xyz = np.array([data["diff_x"][slab], data["diff_y"][slab], data["diff_z"][slab]])
+                    ref_sign = np.sign(np.tensordot(ref_direction, diff_xyz, axes=1))
+                    data["diff"][slab] = np.multiply(np.linalg.norm(diff_xyz, axis=0), ref_sign)
 
             elif len(all_dataset) == 2:
                 data = {"total": all_dataset[0], "diff": all_dataset[1]}
@@ -3601,19 +3925,19 @@ class VolumetricData(BaseVolumetricData):
             return f"-.{flt_str[1]}{flt_str[3:13]}E{int(flt_str[14:]) + 1:+03}"
 
         def write_spin(data_type: str) -> None:
-            lines = []
-            count = 0
             file.write(f"   {dim[0]}   {dim[1]}   {dim[2]}\n")
-            for k, j, i in itertools.product(list(range(dim[2])), list(range(dim[1])), list(range(dim[0]))):
-                lines.append(format_fortran_float(self.data[data_type][i, j, k]))
-                count += 1
-                if count % 5 == 0:
-                    file.write(" " + "".join(lines) + "\n")
-                    lines = []
-                else:
-                    lines.append(" ")
-            if count % 5 != 0:
-                file.write(" " + "".join(lines) + " \n")
+            # Write in slabs along z (the slowest index in VASP files) to bound
+            # memory for memory-mapped grids, 5 values per line
+            grid = self.data[data_type]
+            values: list[str] = []
+            n_z = max(1, GRID_CHUNK_SIZE // (dim[0] * dim[1]))
+            for z_start in range(0, dim[2], n_z):
+                values += map(format_fortran_float, grid[:, :, z_start : z_start + n_z].ravel(order="F").tolist())
+                n_full = len(values) - len(values) % 5
+                file.write("".join(f" {' '.join(values[idx : idx + 5])}\n" for idx in range(0, n_full, 5)))
+                values = values[n_full:]
+            if values:
+                file.write(f" {' '.join(values)}  \n")
 
             data = self.data_aug.get(data_type, [])
             if isinstance(data, Iterable):
@@ -3653,27 +3977,36 @@ class VolumetricData(BaseVolumetricData):
 class Locpot(VolumetricData):
     """LOCPOT file reader."""
 
-    def __init__(self, poscar: Poscar, data: np.ndarray, **kwargs) -> None:
+    def __init__(self, poscar: Poscar | Structure, data: np.ndarray, **kwargs) -> None:
         """
         Args:
-            poscar (Poscar): Poscar object containing structure.
+            poscar (Poscar | Structure): Object containing structure.
             data (np.ndarray): Actual data.
         """
+        if isinstance(poscar, Structure):
+            poscar = Poscar(poscar)
         super().__init__(poscar.structure, data, **kwargs)
         self.name = poscar.comment
 
     @classmethod
-    def from_file(cls, filename: PathLike, **kwargs) -> Self:
+    def from_file(cls, filename: PathLike, npy_dir: PathLike | None = None, **kwargs) -> Self:
         """Read a LOCPOT file.
 
         Args:
             filename (PathLike): Path to LOCPOT file.
+            npy_dir (PathLike): If given, stream the grid into this directory
+                as a memory-mapped .npy sidecar instead of loading it in memory.
+                Later loads can then use Locpot.from_npy(npy_dir).
+            **kwargs: Passed to the constructor.
 
         Returns:
             Locpot
         """
-        poscar, data, _data_aug = VolumetricData.parse_file(filename)
-        return cls(poscar, data, **kwargs)
+        poscar, data, _data_aug = VolumetricData.parse_file(filename, npy_dir=npy_dir)
+        locpot = cls(poscar, data, **kwargs)
+        if npy_dir is not None:
+            locpot.to_npy(npy_dir)
+        return locpot
 
 
 class Chgcar(VolumetricData):
@@ -3707,17 +4040,23 @@ class Chgcar(VolumetricData):
         self._distance_matrix: dict = {}
 
     @classmethod
-    def from_file(cls, filename: str) -> Self:
+    def from_file(cls, filename: str, npy_dir: PathLike | None = None) -> Self:
         """Read a CHGCAR file.
 
         Args:
             filename (str): Path to CHGCAR file.
+            npy_dir (PathLike): If given, stream the grids into this directory
+                as memory-mapped .npy sidecars instead of loading them in memory.
+                Later loads can then use Chgcar.from_npy(npy_dir).
 
         Returns:
             Chgcar
         """
-        poscar, data, data_aug = VolumetricData.parse_file(filename)
-        return cls(poscar, data, data_aug=data_aug)
+        poscar, data, data_aug = VolumetricData.parse_file(filename, npy_dir=npy_dir)
+        chgcar = cls(poscar, data, data_aug=data_aug)
+        if npy_dir is not None:
+            chgcar.to_npy(npy_dir)
+        return chgcar
 
     @property
     def net_magnetization(self) -> float | None:
@@ -0,0 +1,287 @@
+# cython: language_level=3
+# cython: initializedcheck=False
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: nonecheck=False
+# cython: cdivision=True
+# distutils: language = c
+
+"""
+Branch and bound search for the lowest energy manipulations of an Ewald
+matrix. This is the inner loop of pymatgen.analysis.ewald.EwaldMinimizer.
+
+The energy of a set of site scalings s is E(s) = s^T M s. Applying the
+manipulations with fraction f to a set S of unscaled sites, with d_i = f_i - 1,
+changes the energy by
+    sum_{i in S} d_i (2 v_i + d_i M_ii) + sum_{i != j in S} d_i d_j M_ij
+where v = M s. Since every d_i <= 0, each pair term is bounded from below by
+d_max^2 M_ij if M_ij < 0 and by d_min^2 M_ij otherwise. Bounding the pair terms
+of each site by the sum of its smallest possible pair terms, and then relaxing
+the requirement that a site is only used by one manipulation, gives a valid
+lower bound that is computed in O(n) per manipulation. The search is therefore
+exact unless stopped early.
+"""
+
+# isort: dont-add-imports
+
+import time
+
+import numpy as np
+
+cimport numpy as np
+from libc.math cimport INFINITY
+
+np.import_array()
+
+
+cdef double _sum_smallest(double[::1] values, long n, long k):
+    """Sum of the k smallest of the first n values. Reorders values."""
+    cdef long left = 0, right = n - 1, i, j
+    cdef double pivot, tmp, total = 0
+    if k <= 0:
+        return 0
+    if k < n:
+        # Quickselect so that values[:k] holds the k smallest values
+        while left < right:
+            pivot = values[(left + right) // 2]
+            i = left
+            j = right
+            while i <= j:
+                while values[i] < pivot:
+                    i += 1
+                while values[j] > pivot:
+                    j -= 1
+                if i <= j:
+                    tmp = values[i]
+                    values[i] = values[j]
+                    values[j] = tmp
+                    i += 1
+                    j -= 1
+            if k - 1 <= j:
+                right = j
+            elif k - 1 >= i:
+                left = i
+            else:
+                break
+    for i in range(k):
+        total += values[i]
+    return total
+
+
+cdef class BranchAndBound:
+    """Depth-first branch and bound search keeping the num_to_return lowest
+    energy orderings found.
+    """
+
+    cdef:
+        long n, n_manipulations, n_results, num_to_return, n_nodes
+        double threshold, deadline
+        bint stop_when_full, stopped
+        object callback
+        double[:, ::1] matrix, pair_bounds, v_stack
+        double[::1] deltas, shared_bound, buffer, result_energies
+        long[::1] counts, assigned
+        unsigned char[:, ::1] available
+        long[:, ::1] results
+
+    def __init__(
+        self,
+        const double[:, ::1] matrix,
+        const double[::1] fractions,
+        long num_to_return,
+        double[::1] shared_bound,
+        double deadline,
+        bint stop_when_full,
+        object callback,
+    ):
+        """
+        Args:
+            matrix: (n, n) symmetric Ewald matrix of the sites that can be
+                manipulated.
+            fractions: (n_manipulations,) multiplication fraction of each
+                manipulation, all <= 1.
+            num_to_return: Number of lowest energy orderings to keep.
+            shared_bound: (1,) energy above which orderings are discarded,
+                lowered by the search once num_to_return orderings are found.
+                Searches running in parallel share it to prune each other.
+            deadline: time.time() after which the search stops, 0 for none.
+            stop_when_full: Stop once num_to_return orderings are found.
+            callback: Called as callback(energy, assignment) whenever an
+                ordering enters the lowest num_to_return found, or None.
+        """
+        cdef long i, n = matrix.shape[0]
+        cdef double d_min = INFINITY, d_max = 0, d
+        if not np.all(np.asarray(fractions) <= 1):
+            # The lower bounds assume that no manipulation increases the energy
+            raise ValueError("multiplication fractions must be <= 1")
+        self.n = n
+        self.n_manipulations = fractions.shape[0]
+        self.matrix = np.array(matrix, dtype=np.float64)
+        self.deltas = np.asarray(fractions, dtype=np.float64) - 1
+        for i in range(self.n_manipulations):
+            d = -self.deltas[i]
+            d_min = min(d_min, d)
+            d_max = max(d_max, d)
+        if self.n_manipulations == 0:
+            d_min = 0
+
+        # pair_bounds[i, r] is a lower bound on the pair terms between site i
+        # and any r other sites
+        pair_terms = np.where(np.asarray(self.matrix) < 0, d_max**2, d_min**2) * np.asarray(self.matrix)
+        np.fill_diagonal(pair_terms, np.inf)
+        pair_terms.sort(axis=1)
+        pair_bounds = np.zeros((n, n), dtype=np.float64)
+        if n > 1:
+            np.cumsum(pair_terms[:, : n - 1], axis=1, out=pair_bounds[:, 1:])
+        self.pair_bounds = pair_bounds
+
+        self.num_to_return = num_to_return
+        self.n_results = 0
+        self.result_energies = np.full(num_to_return, np.inf)
+        self.results = np.full((num_to_return, n), -1, dtype=np.int_)
+        self.threshold = INFINITY
+        self.shared_bound = shared_bound
+        self.deadline = deadline
+        self.stop_when_full = stop_when_full
+        self.stopped = False
+        self.callback = callback
+        self.n_nodes = 0
+        self.buffer = np.empty(max(n, 1), dtype=np.float64)
+
+    def run(
+        self,
+        const double[::1] row_sums,
+        double energy,
+        long[::1] counts,
+        unsigned char[:, ::1] available,
+        long[::1] assigned,
+    ):
+        """Search the orderings reachable from a partially manipulated state.
+
+        Args:
+            row_sums: (n,) row sums of the matrix with the current site scalings.
+            energy: Current sum of the matrix.
+            counts: (n_manipulations,) number of sites each manipulation
+                still has to be applied to.
+            available: (n_manipulations, n) whether each manipulation may be
+                applied to each site.
+            assigned: (n,) index of the manipulation applied to each site,
+                -1 if none.
+
+        Returns:
+            bool: Whether the search was completed rather than stopped early.
+        """
+        self.counts = np.array(counts, dtype=np.int_)
+        self.available = np.array(available, dtype=np.uint8)
+        self.assigned = np.array(assigned, dtype=np.int_)
+        self.v_stack = np.empty((np.sum(self.counts) + 1, self.n), dtype=np.float64)
+        self.v_stack[0, :] = row_sums
+        self._search(0, energy)
+        return not self.stopped
+
+    @property
+    def energies(self):
+        """Energies of the orderings found, lowest first."""
+        return np.array(self.result_energies[: self.n_results])
+
+    @property
+    def assignments(self):
+        """(n_orderings, n) index of the manipulation applied to each site."""
+        return np.array(self.results[: self.n_results])
+
+    cdef double _get_threshold(self):
+        return min(self.threshold, self.shared_bound[0])
+
+    cdef double _lower_bound(self, double[::1] v):
+        cdef long m, i, n_left = 0, n_candidates
+        cdef double delta, total = 0, pair_bound
+        for m in range(self.n_manipulations):
+            n_left += self.counts[m]
+        if n_left > self.n:
+            return INFINITY
+        for m in range(self.n_manipulations):
+            if self.counts[m] == 0:
+                continue
+            delta = self.deltas[m]
+            n_candidates = 0
+            for i in range(self.n):
+                if self.available[m, i] and self.assigned[i] < 0:
+                    pair_bound = self.pair_bounds[i, n_left - 1]
+                    self.buffer[n_candidates] = delta * (2 * v[i] + delta * self.matrix[i, i]) + pair_bound
+                    n_candidates += 1
+            if n_candidates < self.counts[m]:
+                return INFINITY
+            total += _sum_smallest(self.buffer, n_candidates, self.counts[m])
+        return total
+
+    cdef void _add_result(self, double energy):
+        cdef long pos
+        cdef double[::1] energies = self.result_energies
+        if self.n_results == self.num_to_return:
+            if energy >= energies[self.n_results - 1]:
+                return
+            pos = self.n_results - 1
+        else:
+            pos = self.n_results
+            self.n_results += 1
+        # Insertion into the sorted results
+        while pos > 0 and energies[pos - 1] > energy:
+            energies[pos] = energies[pos - 1]
+            self.results[pos, :] = self.results[pos - 1, :]
+            pos -= 1
+        energies[pos] = energy
+        self.results[pos, :] = self.assigned
+        if self.n_results == self.num_to_return:
+            self.threshold = energies[self.n_results - 1]
+            if self.threshold < self.shared_bound[0]:
+                self.shared_bound[0] = self.threshold
+            if self.stop_when_full:
+                self.stopped = True
+        if self.callback is not None:
+            self.callback(energy, np.array(self.assigned))
+
+    cdef void _search(self, long level, double energy):
+        cdef long m = 0, i, j, best = -1
+        cdef double delta, cost, bound, best_cost = INFINITY
+        cdef double[::1] v = self.v_stack[level]
+        cdef double[::1] v_next
+
+        if self.stopped:
+            return
+        self.n_nodes += 1
+        if self.deadline > 0 and self.n_nodes % 1024 == 0 and time.time() > self.deadline:
+            self.stopped = True
+            return
+
+        while m < self.n_manipulations and self.counts[m] == 0:
+            m += 1
+        if m == self.n_manipulations:
+            if energy < self._get_threshold():
+                self._add_result(energy)
+            return
+
+        bound = self._lower_bound(v)
+        if bound == INFINITY or energy + bound > self._get_threshold():
+            return
+
+        # Branch on the site where the manipulation lowers the energy the most
+        delta = self.deltas[m]
+        for i in range(self.n):
+            if self.available[m, i] and self.assigned[i] < 0:
+                cost = delta * (2 * v[i] + delta * self.matrix[i, i])
+                if cost < best_cost:
+                    best_cost = cost
+                    best = i
+
+        v_next = self.v_stack[level + 1]
+        for j in range(self.n):
+            v_next[j] = v[j] + delta * self.matrix[j, best]
+        self.assigned[best] = m
+        self.counts[m] -= 1
+        self._search(level + 1, energy + best_cost)
+        self.assigned[best] = -1
+        self.counts[m] += 1
+
+        self.available[m, best] = 0
+        self._search(level, energy)
+        self.available[m, best] = 1
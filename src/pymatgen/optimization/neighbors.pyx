@@ -13,32 +13,62 @@
 # written based on Python division so using cdivision may result in missing neighbors
 # in some off cases. See https://github.com/materialsproject/pymatgen/issues/2226
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 cimport numpy as np
+from cpython.pycapsule cimport PyCapsule_Destructor, PyCapsule_GetPointer, PyCapsule_New
 from libc.math cimport ceil, floor, pi, sqrt
 from libc.stdlib cimport free, malloc, realloc
 from libc.string cimport memset
 
+np.import_array()
 
-cdef void *safe_malloc(size_t size) except? NULL:
-    """Raise memory error if malloc fails"""
-    if size == 0:
-        return NULL
-    cdef void *ptr = malloc(size)
-    if ptr == NULL:
-        raise MemoryError(f"Memory allocation of {size} bytes failed!")
-    return ptr
+cdef struct NeighborBuffer:
+    # Growable output buffer shared by all the structures handled by one thread
+    long *index_1
+    long *index_2
+    double *offsets
+    double *distances
+    long count
+    long capacity
 
 
-cdef void *safe_realloc(void *ptr_orig, size_t size) except? NULL:
-    """Raise memory error if realloc fails"""
-    if size == 0:
-        return NULL
-    cdef void *ptr = realloc(ptr_orig, size)
-    if ptr == NULL:
-        raise MemoryError(f"Realloc memory of {size} bytes failed!")
-    return ptr
+cdef class NeighborListBuffer:
+    """Output memory of the neighbor search that is kept between calls.
+
+    By default every call allocates the memory holding the neighbor pairs and
+    hands it over to the returned arrays. Passing the same NeighborListBuffer to
+    repeated calls of find_points_in_spheres or find_points_in_spheres_batch
+    instead reuses the memory grown by earlier calls, and the pairs are copied
+    to the returned arrays. This avoids the allocations when computing many
+    small neighbor lists. A buffer must not be used by concurrent calls.
+    """
+
+    cdef:
+        NeighborBuffer *buffers
+        long n_buffers
+
+    def __dealloc__(self):
+        cdef long i
+        for i in range(self.n_buffers):
+            free_buffer(&self.buffers[i])
+        free(self.buffers)
+
+    @property
+    def capacity(self):
+        """Number of neighbor pairs each of the thread buffers can hold."""
+        return [self.buffers[i].capacity for i in range(self.n_buffers)]
+
+    cdef int reserve(self, long n_buffers) except -1:
+        """Make sure there is one buffer for each of n_buffers threads."""
+        if n_buffers <= self.n_buffers:
+            return 0
+        self.buffers = <NeighborBuffer*> safe_realloc(self.buffers, n_buffers * sizeof(NeighborBuffer))
+        memset(&self.buffers[self.n_buffers], 0, (n_buffers - self.n_buffers) * sizeof(NeighborBuffer))
+        self.n_buffers = n_buffers
+        return 0
 
 
 def find_points_in_spheres(
@@ -48,7 +78,8 @@ def find_points_in_spheres(
         const long[::1] pbc,
         const double[:, ::1] lattice,
         const double tol=1e-8,
-        const double min_r=1.0):
+        const double min_r=1.0,
+        NeighborListBuffer buffer=None):
     """For each point in `center_coords`, get all the neighboring points in `all_coords`
     that are within the cutoff radius `r`. All the coordinates should be Cartesian.
 
@@ -64,457 +95,506 @@ def find_points_in_spheres(
             directly. If the cutoff is less than this value, the algorithm
             will calculate neighbor list using min_r as cutoff and discard
             those that have larger distances.
+        buffer: (NeighborListBuffer) output memory to reuse, see NeighborListBuffer.
     Returns:
         index1 (n, ), index2 (n, ), offset_vectors (n, 3), distances (n, ).
         index1 of center_coords, and index2 of all_coords that form the neighbor pair
         offset_vectors are the periodic image offsets for the all_coords.
     """
+    cdef:
+        NeighborBuffer local_buffer
+        NeighborBuffer *out = get_output_buffer(buffer, 0, &local_buffer)
+    try:
+        with nogil:
+            find_points_in_spheres_c(
+                &all_coords[0, 0] if all_coords.shape[0] > 0 else NULL,
+                all_coords.shape[0],
+                &center_coords[0, 0] if center_coords.shape[0] > 0 else NULL,
+                center_coords.shape[0],
+                r, &pbc[0], &lattice[0, 0], tol, min_r, 0, 0, out,
+            )
+        return copy_to_arrays(out) if buffer is not None else buffer_to_arrays(out)
+    finally:
+        free_buffer(&local_buffer)
+
+
+def find_points_in_spheres_batch(
+        const double[:, ::1] all_coords,
+        const double[:, ::1] center_coords,
+        const double r,
+        const long[:, ::1] pbc,
+        const double[:, :, ::1] lattices,
+        batch_index,
+        center_batch_index,
+        const double tol=1e-8,
+        const double min_r=1.0,
+        int n_jobs=1,
+        NeighborListBuffer buffer=None):
+    """Batched version of `find_points_in_spheres` for many independent structures
+    whose points are stacked into single arrays. The neighbor search of each structure
+    runs without the GIL, and the structures can be spread over n_jobs threads.
+
+    Args:
+        all_coords: (np.ndarray[double, dim=2]) all available points of all structures.
+        center_coords: (np.ndarray[double, dim=2]) all centering points of all structures.
+        r: (float) cutoff radius
+        pbc: (np.ndarray[long, dim=2]) periodic boundaries of each structure, shape (m, 3)
+        lattices: (np.ndarray[double, dim=3]) lattice matrices of each structure,
+            shape (m, 3, 3)
+        batch_index: (np.ndarray[long, dim=1]) structure index of each point in
+            all_coords. Must be sorted.
+        center_batch_index: (np.ndarray[long, dim=1]) structure index of each point in
+            center_coords. Must be sorted.
+        tol: (float) numerical tolerance
+        min_r: (float) minimal cutoff to calculate the neighbor list directly.
+        n_jobs: (int) number of threads to use.
+        buffer: (NeighborListBuffer) output memory to reuse, see NeighborListBuffer.
+    Returns:
+        index1 (n, ), index2 (n, ), offset_vectors (n, 3), distances (n, ).
+        index1 of center_coords, and index2 of all_coords that form the neighbor pair,
+        both indexing the stacked arrays. The pairs are ordered by structure, and within
+        a structure in the same order as `find_points_in_spheres`.
+    """
+    n_structures = lattices.shape[0]
+    if pbc.shape[0] != n_structures:
+        raise ValueError("pbc and lattices must have the same length.")
+    all_ptr = _get_batch_pointers(batch_index, all_coords.shape[0], n_structures)
+    center_ptr = _get_batch_pointers(center_batch_index, center_coords.shape[0], n_structures)
+
+    n_jobs = max(1, min(n_jobs, n_structures))
+    bounds = np.linspace(0, n_structures, n_jobs + 1).astype(int)
+    if buffer is not None:
+        # Allocated before starting the threads, which each use their own buffer
+        buffer.reserve(n_jobs)
+    args = (all_coords, center_coords, r, pbc, lattices, all_ptr, center_ptr, tol, min_r, buffer)
+    if n_jobs == 1:
+        return _find_points_in_spheres_range(*args, 0, 0, n_structures)
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(_find_points_in_spheres_range, *args, job, start, stop)
+            for job, (start, stop) in enumerate(zip(bounds[:n_jobs], bounds[1:]))
+        ]
+        results = [future.result() for future in futures]
+    return tuple(np.concatenate(arrays) for arrays in zip(*results))
+
+
+def _get_batch_pointers(batch_index, long n_points, long n_structures):
+    """Convert a sorted per-point structure index into the start of each structure."""
+    batch_index = np.asarray(batch_index)
+    if batch_index.shape != (n_points,):
+        raise ValueError(f"Expected a batch index of shape ({n_points},), got {batch_index.shape}.")
+    if n_points > 0 and (
+        np.any(np.diff(batch_index) < 0) or batch_index.min() < 0 or batch_index.max() >= n_structures
+    ):
+        raise ValueError(f"The batch index must be sorted and within [0, {n_structures}).")
+    return np.searchsorted(batch_index, np.arange(n_structures + 1), side="left").astype(np.int_)
+
+
+def _find_points_in_spheres_range(
+        const double[:, ::1] all_coords,
+        const double[:, ::1] center_coords,
+        const double r,
+        const long[:, ::1] pbc,
+        const double[:, :, ::1] lattices,
+        const long[::1] all_ptr,
+        const long[::1] center_ptr,
+        const double tol,
+        const double min_r,
+        NeighborListBuffer buffer,
+        long job,
+        long start,
+        long stop):
+    """Neighbor search of the structures start to stop of a batch, collected in
+    one buffer, the job-th one of buffer if given.
+    """
+    cdef:
+        long i
+        NeighborBuffer local_buffer
+        NeighborBuffer *out = get_output_buffer(buffer, job, &local_buffer)
+    try:
+        with nogil:
+            for i in range(start, stop):
+                if all_ptr[i + 1] == all_ptr[i] or center_ptr[i + 1] == center_ptr[i]:
+                    continue
+                find_points_in_spheres_c(
+                    &all_coords[all_ptr[i], 0],
+                    all_ptr[i + 1] - all_ptr[i],
+                    &center_coords[center_ptr[i], 0],
+                    center_ptr[i + 1] - center_ptr[i],
+                    r, &pbc[i, 0], &lattices[i, 0, 0], tol, min_r,
+                    center_ptr[i], all_ptr[i], out,
+                )
+        return copy_to_arrays(out) if buffer is not None else buffer_to_arrays(out)
+    finally:
+        free_buffer(&local_buffer)
+
+
+cdef NeighborBuffer *get_output_buffer(
+        NeighborListBuffer buffer, long job, NeighborBuffer *local_buffer) except NULL:
+    """Get the emptied job-th buffer of buffer, or local_buffer if buffer is None.
+    local_buffer is zeroed either way, so that it can always be freed.
+    """
+    memset(local_buffer, 0, sizeof(NeighborBuffer))
+    if buffer is None:
+        return local_buffer
+    buffer.reserve(job + 1)
+    buffer.buffers[job].count = 0
+    return &buffer.buffers[job]
+
+
+cdef tuple empty_arrays():
+    return (np.array([], dtype=int), np.array([], dtype=int),
+        np.array([[], [], []], dtype=float).T, np.array([], dtype=float))
+
+
+cdef tuple copy_to_arrays(NeighborBuffer *buffer):
+    """Copy the content of a buffer to new numpy arrays, keeping the buffer for reuse."""
+    cdef np.npy_intp[2] shape = [buffer.count, 3]
+    if buffer.count == 0:
+        return empty_arrays()
+    return (
+        np.PyArray_SimpleNewFromData(1, shape, np.NPY_LONG, buffer.index_1).copy(),
+        np.PyArray_SimpleNewFromData(1, shape, np.NPY_LONG, buffer.index_2).copy(),
+        np.PyArray_SimpleNewFromData(2, shape, np.NPY_DOUBLE, buffer.offsets).copy(),
+        np.PyArray_SimpleNewFromData(1, shape, np.NPY_DOUBLE, buffer.distances).copy(),
+    )
+
+
+cdef tuple buffer_to_arrays(NeighborBuffer *buffer):
+    """Hand over the content of a buffer to numpy arrays without copying it. The
+    buffer is left empty.
+    """
+    cdef:
+        long count = buffer.count
+        tuple arrays
+    if count == 0:
+        return empty_arrays()
+    # resize to the actual size
+    buffer.index_1 = <long*> safe_realloc(buffer.index_1, count * sizeof(long))
+    buffer.index_2 = <long*> safe_realloc(buffer.index_2, count * sizeof(long))
+    buffer.offsets = <double*> safe_realloc(buffer.offsets, 3 * count * sizeof(double))
+    buffer.distances = <double*> safe_realloc(buffer.distances, count * sizeof(double))
+    arrays = (
+        owned_array(buffer.index_1, 1, count, np.NPY_LONG),
+        owned_array(buffer.index_2, 1, count, np.NPY_LONG),
+        owned_array(buffer.offsets, 2, count, np.NPY_DOUBLE),
+        owned_array(buffer.distances, 1, count, np.NPY_DOUBLE),
+    )
+    memset(buffer, 0, sizeof(NeighborBuffer))
+    return arrays
+
+
+cdef void free_capsule(object capsule) noexcept:
+    free(PyCapsule_GetPointer(capsule, NULL))
+
+
+cdef np.ndarray owned_array(void *data, int ndim, long count, int typenum):
+    """Wrap malloc'ed data of count rows (of 3 columns if ndim is 2) in a numpy array
+    that frees it when garbage collected.
+    """
+    cdef:
+        np.npy_intp[2] shape = [count, 3]
+        np.ndarray array = np.PyArray_SimpleNewFromData(ndim, shape, typenum, data)
+    np.set_array_base(array, PyCapsule_New(data, NULL, <PyCapsule_Destructor> free_capsule))
+    return array
+
+
+cdef void free_buffer(NeighborBuffer *buffer) noexcept nogil:
+    free(buffer.index_1)
+    free(buffer.index_2)
+    free(buffer.offsets)
+    free(buffer.distances)
+    memset(buffer, 0, sizeof(NeighborBuffer))
+
+
+cdef int reserve_buffer(NeighborBuffer *buffer, long size) except -1 nogil:
+    """Make sure the buffer can hold size pairs, doubling its capacity as needed.
+    I found it 3x faster to do so compared to using vectors in cpp.
+    """
+    cdef long capacity = buffer.capacity if buffer.capacity > 0 else 10000
+    if size <= buffer.capacity:
+        return 0
+    while capacity < size:
+        capacity += capacity
+    buffer.index_1 = <long*> safe_realloc(buffer.index_1, capacity * sizeof(long))
+    buffer.index_2 = <long*> safe_realloc(buffer.index_2, capacity * sizeof(long))
+    buffer.offsets = <double*> safe_realloc(buffer.offsets, 3 * capacity * sizeof(double))
+    buffer.distances = <double*> safe_realloc(buffer.distances, capacity * sizeof(double))
+    buffer.capacity = capacity
+    return 0
+
+
+cdef void *safe_malloc(size_t size) except? NULL nogil:
+    """Raise memory error if malloc fails"""
+    if size == 0:
+        size = 1
+    cdef void *ptr = malloc(size)
+    if ptr == NULL:
+        with gil:
+            raise MemoryError(f"Memory allocation of {size} bytes failed!")
+    return ptr
+
+
+cdef void *safe_realloc(void *ptr_orig, size_t size) except? NULL nogil:
+    """Raise memory error if realloc fails"""
+    if size == 0:
+        size = 1
+    cdef void *ptr = realloc(ptr_orig, size)
+    if ptr == NULL:
+        with gil:
+            raise MemoryError(f"Realloc memory of {size} bytes failed!")
+    return ptr
+
+
+cdef int find_points_in_spheres_c(
+        const double *all_coords,
+        long n_total,
+        const double *center_coords,
+        long n_center,
+        double r,
+        const long *pbc,
+        const double *lattice,
+        double tol,
+        double min_r,
+        long center_shift,
+        long point_shift,
+        NeighborBuffer *out) except -1 nogil:
+    """Append the neighbor pairs of the points of a single structure to `out`.
+    center_shift and point_shift are added to the center and point indices.
+    All the arrays are C-contiguous, with 3 columns for the coordinates and a 3x3
+    lattice matrix.
+    """
+    cdef long start, i, j
+
+    if n_total == 0 or n_center == 0:
+        return 0
+
     if r < min_r:
-        findex1, findex2, foffset_vectors, fdistances = find_points_in_spheres(
-            all_coords=all_coords, center_coords=center_coords,
-            r=min_r + tol, pbc=pbc, lattice=lattice, tol=tol, min_r=min_r)
-        mask = fdistances <= r
-        return findex1[mask], findex2[mask], foffset_vectors[mask], fdistances[
-            mask]
+        start = out.count
+        find_points_in_spheres_c(
+            all_coords, n_total, center_coords, n_center, min_r + tol, pbc, lattice,
+            tol, min_r, center_shift, point_shift, out)
+        j = start
+        for i in range(start, out.count):
+            if out.distances[i] <= r:
+                out.index_1[j] = out.index_1[i]
+                out.index_2[j] = out.index_2[i]
+                out.offsets[3*j] = out.offsets[3*i]
+                out.offsets[3*j + 1] = out.offsets[3*i + 1]
+                out.offsets[3*j + 2] = out.offsets[3*i + 2]
+                out.distances[j] = out.distances[i]
+                j += 1
+        out.count = j
+        return 0
 
     cdef:
-        int i, j, k, l, m
+        long k, l, m, n
         double[3] maxr
         # valid boundary, that is the minimum in center_coords - r
         double[3] valid_min
         double[3] valid_max
         double ledge
 
-        int n_center = center_coords.shape[0]
-        int n_total = all_coords.shape[0]
-        long nlattice = 1
-
         long[3] max_bounds = [1, 1, 1]
         long[3] min_bounds = [0, 0, 0]
-        double [:, ::1] frac_coords =  <double[:n_center, :3]> safe_malloc(
-            n_center * 3 * sizeof(double)
-        )
-        double[:, ::1] all_fcoords = <double[:n_total, :3]> safe_malloc(
-            n_total * 3 * sizeof(double)
-        )
-        double[:, ::1] coords_in_cell = <double[:n_total, :3]> safe_malloc(
-            n_total * 3 * sizeof(double)
-        )
-        double[:, ::1] offset_correction = <double[:n_total, :3]> safe_malloc(
-            n_total * 3 * sizeof(double)
-        )
-        double[3][3] inv_lattice_arr
-        double[:, ::1] inv_lattice = inv_lattice_arr
-        double[3][3] reciprocal_lattice_arr = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
-        double[:, ::1] reciprocal_lattice = reciprocal_lattice_arr
-
-        int count = 0
-        int n_atoms = n_total
-        double *offsets_p_temp = <double*> safe_malloc(n_atoms * 3 * sizeof(double))
-        double *expanded_coords_p_temp = <double*> safe_malloc(
-            n_atoms * 3 * sizeof(double)
-        )
-        long *indices_p_temp = <long*> safe_malloc(n_atoms * sizeof(long))
+        double[9] inv_lattice
+        double[9] reciprocal_lattice
+
+        long count = 0
+        long n_atoms = n_total
         double coord_temp[3]
         long ncube[3]
-
-        long[:, ::1] center_indices3 = <long[:n_center, :3]> safe_malloc(
-            n_center*3*sizeof(long)
-        )
-        long[::1] center_indices1 = <long[:n_center]> safe_malloc(n_center*sizeof(long))
-
-        int malloc_chunk = 10000  # size of memory chunks to re-allocate dynamically
-        int failed_malloc = 0  # flag for failed reallocation within loops
-        long *index_1 = <long*> safe_malloc(malloc_chunk*sizeof(long))
-        long *index_2 = <long*> safe_malloc(malloc_chunk*sizeof(long))
-        double *offset_final = <double*> safe_malloc(3*malloc_chunk*sizeof(double))
-        double *distances = <double*> safe_malloc(malloc_chunk*sizeof(double))
+        long cube3[3]
+        long nb_cubes
         long cube_index_temp
         long link_index
+        long point_index
         double d_temp2
         double r2 = r * r
 
+        double *frac_coords = NULL
+        double *all_fcoords = NULL
+        double *coords_in_cell = NULL
+        double *offset_correction = NULL
+        double *offsets = NULL
+        double *expanded_coords = NULL
+        long *indices = NULL
+        long *all_indices1 = NULL
+        long *head = NULL
+        long *atom_indices = NULL
+
     if r < 0.1:
         ledge = 0.1
     else:
         ledge = r
-    max_and_min(center_coords, valid_max, valid_min)
+    max_and_min(center_coords, n_center, valid_max, valid_min)
     for i in range(3):
         valid_max[i] = valid_max[i] + r + tol
         valid_min[i] = valid_min[i] - r - tol
 
-    # Process pbc
-    get_frac_coords(lattice, inv_lattice, all_coords, offset_correction)
-    for i in range(n_total):
-        for j in range(3):
-            if pbc[j]:
-                # only wrap atoms when this dimension is PBC
-                all_fcoords[i, j] = offset_correction[i, j] % 1
-                offset_correction[i, j] = offset_correction[i, j] - all_fcoords[i, j]
-            else:
-                all_fcoords[i, j] = offset_correction[i, j]
-                offset_correction[i, j] = 0
-
-    # compute the reciprocal lattice in place
-    get_reciprocal_lattice(lattice, reciprocal_lattice)
-    get_max_r(reciprocal_lattice, maxr, r)
-
-    # Get fractional coordinates of center points in place
-    get_frac_coords(lattice, inv_lattice, center_coords, frac_coords)
-    get_bounds(frac_coords, maxr, &pbc[0], max_bounds, min_bounds)
-
-    for i in range(3):
-        nlattice *= (max_bounds[i] - min_bounds[i])
-    matmul(all_fcoords, lattice, coords_in_cell)
-
-    # Get translated images, coordinates and indices
-    for i in range(min_bounds[0], max_bounds[0]):
-        for j in range(min_bounds[1], max_bounds[1]):
-            for k in range(min_bounds[2], max_bounds[2]):
-                for l in range(n_total):
-                    for m in range(3):
-                        coord_temp[m] = <double>i * lattice[0, m] + \
-                                        <double>j * lattice[1, m] + \
-                                        <double>k * lattice[2, m] + \
-                                        coords_in_cell[l, m]
-                    if (
-                            (coord_temp[0] > valid_min[0]) &
-                            (coord_temp[0] < valid_max[0]) &
-                            (coord_temp[1] > valid_min[1]) &
-                            (coord_temp[1] < valid_max[1]) &
-                            (coord_temp[2] > valid_min[2]) &
-                            (coord_temp[2] < valid_max[2])
-                    ):
-                        offsets_p_temp[3*count] = i
-                        offsets_p_temp[3*count+1] = j
-                        offsets_p_temp[3*count+2] = k
-                        indices_p_temp[count] = l
-                        expanded_coords_p_temp[3*count] = coord_temp[0]
-                        expanded_coords_p_temp[3*count+1] = coord_temp[1]
-                        expanded_coords_p_temp[3*count+2] = coord_temp[2]
-                        count += 1
-                        if count >= n_atoms:  # exceeding current memory
-                            n_atoms += n_atoms
-                            offsets_p_temp = <double*> realloc(
-                                offsets_p_temp, n_atoms * 3 * sizeof(double)
-                            )
-                            expanded_coords_p_temp = <double*> realloc(
-                                expanded_coords_p_temp, n_atoms * 3 * sizeof(double)
-                            )
-                            indices_p_temp = <long*> realloc(
-                                indices_p_temp, n_atoms * sizeof(long)
-                            )
+    try:
+        frac_coords = <double*> safe_malloc(n_center * 3 * sizeof(double))
+        all_fcoords = <double*> safe_malloc(n_total * 3 * sizeof(double))
+        coords_in_cell = <double*> safe_malloc(n_total * 3 * sizeof(double))
+        offset_correction = <double*> safe_malloc(n_total * 3 * sizeof(double))
+        offsets = <double*> safe_malloc(n_atoms * 3 * sizeof(double))
+        expanded_coords = <double*> safe_malloc(n_atoms * 3 * sizeof(double))
+        indices = <long*> safe_malloc(n_atoms * sizeof(long))
+
+        # Process pbc
+        matrix_inv(lattice, inv_lattice)
+        matmul(all_coords, n_total, inv_lattice, offset_correction)
+        for i in range(n_total):
+            for j in range(3):
+                if pbc[j]:
+                    # only wrap atoms when this dimension is PBC
+                    all_fcoords[3*i + j] = offset_correction[3*i + j] % 1
+                    offset_correction[3*i + j] = offset_correction[3*i + j] - all_fcoords[3*i + j]
+                else:
+                    all_fcoords[3*i + j] = offset_correction[3*i + j]
+                    offset_correction[3*i + j] = 0
+
+        # compute the reciprocal lattice in place
+        get_reciprocal_lattice(lattice, reciprocal_lattice)
+        get_max_r(reciprocal_lattice, maxr, r)
+
+        # Get fractional coordinates of center points in place
+        matmul(center_coords, n_center, inv_lattice, frac_coords)
+        get_bounds(frac_coords, n_center, maxr, pbc, max_bounds, min_bounds)
+
+        matmul(all_fcoords, n_total, lattice, coords_in_cell)
+
+        # Get translated images, coordinates and indices
+        for i in range(min_bounds[0], max_bounds[0]):
+            for j in range(min_bounds[1], max_bounds[1]):
+                for k in range(min_bounds[2], max_bounds[2]):
+                    for l in range(n_total):
+                        for m in range(3):
+                            coord_temp[m] = <double>i * lattice[m] + \
+                                            <double>j * lattice[3 + m] + \
+                                            <double>k * lattice[6 + m] + \
+                                            coords_in_cell[3*l + m]
                         if (
-                                offset_final is NULL or
-                                expanded_coords_p_temp is NULL or
-                                indices_p_temp is NULL
+                                (coord_temp[0] > valid_min[0]) &
+                                (coord_temp[0] < valid_max[0]) &
+                                (coord_temp[1] > valid_min[1]) &
+                                (coord_temp[1] < valid_max[1]) &
+                                (coord_temp[2] > valid_min[2]) &
+                                (coord_temp[2] < valid_max[2])
                         ):
-                            failed_malloc = 1
-                            break
-                else:
-                    continue
-                break
-            else:
-                continue
-            break
-        else:
-            continue
-        break
-
-    if failed_malloc:
-        raise MemoryError("A realloc of memory of failed!")
-    else:
-        failed_malloc = 0
-
-    # if no valid neighbors were found return empty
-    if count == 0:
-        free(&frac_coords[0, 0])
-        free(&all_fcoords[0, 0])
-        free(&coords_in_cell[0, 0])
-        free(&offset_correction[0, 0])
-        free(&center_indices1[0])
-        free(&center_indices3[0, 0])
-
-        free(offsets_p_temp)
-        free(expanded_coords_p_temp)
-        free(indices_p_temp)
-
-        free(index_1)
-        free(index_2)
-        free(offset_final)
-        free(distances)
-
-        return (np.array([], dtype=int), np.array([], dtype=int),
-            np.array([[], [], []], dtype=float).T, np.array([], dtype=float))
-
-    n_atoms = count
-    cdef:
-        # Delete those beyond (min_center_coords - r, max_center_coords + r)
-        double *offsets_p = <double*> safe_realloc(
-            offsets_p_temp, count * 3 * sizeof(double)
-        )
-        double *expanded_coords_p = <double*> safe_realloc(
-            expanded_coords_p_temp, count * 3 * sizeof(double)
-        )
-        long *indices_p = <long*> safe_realloc(
-            indices_p_temp, count * sizeof(long)
-        )
-
-        double[:, ::1] offsets = <double[:count, :3]> offsets_p
-        double[:, ::1] expanded_coords = <double[:count, :3]> expanded_coords_p
-        long[::1] indices = <long[:count]> indices_p
+                            offsets[3*count] = i
+                            offsets[3*count+1] = j
+                            offsets[3*count+2] = k
+                            indices[count] = l
+                            expanded_coords[3*count] = coord_temp[0]
+                            expanded_coords[3*count+1] = coord_temp[1]
+                            expanded_coords[3*count+2] = coord_temp[2]
+                            count += 1
+                            if count >= n_atoms:  # exceeding current memory
+                                n_atoms += n_atoms
+                                offsets = <double*> safe_realloc(
+                                    offsets, n_atoms * 3 * sizeof(double)
+                                )
+                                expanded_coords = <double*> safe_realloc(
+                                    expanded_coords, n_atoms * 3 * sizeof(double)
+                                )
+                                indices = <long*> safe_realloc(
+                                    indices, n_atoms * sizeof(long)
+                                )
+
+        # if no valid neighbors were found return empty
+        if count == 0:
+            return 0
 
         # Construct linked cell list
-        long[:, ::1] all_indices3 = <long[:n_atoms, :3]> safe_malloc(
-            n_atoms * 3 * sizeof(long)
-        )
-        long[::1] all_indices1 = <long[:n_atoms]> safe_malloc(
-            n_atoms * sizeof(long)
-        )
-
-    for i in range(3):
-        ncube[i] = <long>(ceil((valid_max[i] - valid_min[i]) / ledge))
-
-    compute_cube_index(expanded_coords, valid_min, ledge, all_indices3)
-    three_to_one(all_indices3, ncube[1], ncube[2], all_indices1)
-
-    cdef:
-        long nb_cubes = ncube[0] * ncube[1] * ncube[2]
-        long *head = <long*> safe_malloc(nb_cubes*sizeof(long))
-        long *atom_indices = <long*> safe_malloc(n_atoms*sizeof(long))
-        long[:, ::1] neighbor_map = <long[:nb_cubes, :27]> safe_malloc(
-            nb_cubes * 27 * sizeof(long)
-        )
-
-    memset(<void*>head, -1, nb_cubes*sizeof(long))
-    memset(<void*>atom_indices, -1, n_atoms*sizeof(long))
-
-    get_cube_neighbors(ncube, neighbor_map)
-    for i in range(n_atoms):
-        atom_indices[i] = head[all_indices1[i]]
-        head[all_indices1[i]] = i
-
-    # Get center atoms' cube indices
-    compute_cube_index(center_coords, valid_min, ledge, center_indices3)
-    three_to_one(center_indices3, ncube[1], ncube[2], center_indices1)
-
-    count = 0
-    for i in range(n_center):
-        for j in range(27):
-            if neighbor_map[center_indices1[i], j] == -1:
-                continue
-            cube_index_temp = neighbor_map[center_indices1[i], j]
-            link_index = head[cube_index_temp]
-            while link_index != -1:
-                d_temp2 = distance2(expanded_coords, center_coords, link_index, i, 3)
-                if d_temp2 < r2 + tol:
-                    index_1[count] = i
-                    index_2[count] = indices[link_index]
-                    offset_final[3*count] = offsets[link_index, 0] - offset_correction[indices[link_index], 0]
-                    offset_final[3*count + 1] = offsets[link_index, 1] - offset_correction[indices[link_index], 1]
-                    offset_final[3*count + 2] = offsets[link_index, 2] - offset_correction[indices[link_index], 2]
-                    distances[count] = sqrt(d_temp2)
-
-                    count += 1
-                    # increasing the memory size by allocating incrementally
-                    # malloc_chunk more memory locations, I found it 3x faster to do so
-                    # compared to using vectors in cpp
-                    if count >= malloc_chunk:
-                        malloc_chunk += malloc_chunk  # double the size
-                        index_1 = <long*> realloc(index_1, malloc_chunk * sizeof(long))
-                        index_2 = <long*> realloc(index_2, malloc_chunk*sizeof(long))
-                        offset_final = <double*> realloc(
-                            offset_final, 3*malloc_chunk*sizeof(double)
-                        )
-                        distances = <double*> realloc(
-                            distances, malloc_chunk*sizeof(double)
+        n_atoms = count
+        for i in range(3):
+            ncube[i] = <long>(ceil((valid_max[i] - valid_min[i]) / ledge))
+        nb_cubes = ncube[0] * ncube[1] * ncube[2]
+
+        all_indices1 = <long*> safe_malloc(n_atoms * sizeof(long))
+        head = <long*> safe_malloc(nb_cubes * sizeof(long))
+        atom_indices = <long*> safe_malloc(n_atoms * sizeof(long))
+        memset(<void*>head, -1, nb_cubes * sizeof(long))
+        memset(<void*>atom_indices, -1, n_atoms * sizeof(long))
+
+        for i in range(n_atoms):
+            compute_cube_index(&expanded_coords[3*i], valid_min, ledge, cube3)
+            all_indices1[i] = cube3[0] * ncube[1] * ncube[2] + cube3[1] * ncube[2] + cube3[2]
+        for i in range(n_atoms):
+            atom_indices[i] = head[all_indices1[i]]
+            head[all_indices1[i]] = i
+
+        for i in range(n_center):
+            # Get center atom's cube index and loop over the neighboring cubes
+            compute_cube_index(&center_coords[3*i], valid_min, ledge, cube3)
+            for j in range(-1, 2):
+                if cube3[0] + j < 0 or cube3[0] + j >= ncube[0]:
+                    continue
+                for k in range(-1, 2):
+                    if cube3[1] + k < 0 or cube3[1] + k >= ncube[1]:
+                        continue
+                    for l in range(-1, 2):
+                        if cube3[2] + l < 0 or cube3[2] + l >= ncube[2]:
+                            continue
+                        cube_index_temp = (
+                            (cube3[0] + j) * ncube[1] * ncube[2] + (cube3[1] + k) * ncube[2] + cube3[2] + l
                         )
-                        if (
-                                index_1 is NULL or index_2 is NULL or
-                                offset_final is NULL or distances is NULL
-                        ):
-                            failed_malloc = 1
-                            break
-                link_index = atom_indices[link_index]
-            else:
-                continue
-            break
-        else:
-            continue
-        break
-
-    if failed_malloc:
-        raise MemoryError("A realloc of memory of failed!")
-    else:
-        failed_malloc = 0
+                        link_index = head[cube_index_temp]
+                        while link_index != -1:
+                            d_temp2 = distance2(&expanded_coords[3*link_index], &center_coords[3*i])
+                            if d_temp2 < r2 + tol:
+                                if out.count >= out.capacity:
+                                    reserve_buffer(out, out.count + 1)
+                                n = out.count
+                                point_index = indices[link_index]
+                                out.index_1[n] = i + center_shift
+                                out.index_2[n] = point_index + point_shift
+                                out.offsets[3*n] = offsets[3*link_index] - offset_correction[3*point_index]
+                                out.offsets[3*n + 1] = (
+                                    offsets[3*link_index + 1] - offset_correction[3*point_index + 1]
+                                )
+                                out.offsets[3*n + 2] = (
+                                    offsets[3*link_index + 2] - offset_correction[3*point_index + 2]
+                                )
+                                out.distances[n] = sqrt(d_temp2)
+                                out.count += 1
+                            link_index = atom_indices[link_index]
+    finally:
+        # free allocated memories
+        free(frac_coords)
+        free(all_fcoords)
+        free(coords_in_cell)
+        free(offset_correction)
+        free(offsets)
+        free(expanded_coords)
+        free(indices)
+        free(all_indices1)
+        free(head)
+        free(atom_indices)
+    return 0
 
-    if count == 0:
-        py_index_1 = np.array([], dtype=int)
-        py_index_2 = np.array([], dtype=int)
-        py_offsets = np.array([[], [], []], dtype=float).T
-        py_distances = np.array([], dtype=float)
-    else:
-        # resize to the actual size
-        index_1 = <long*>safe_realloc(index_1, count * sizeof(long))
-        index_2 = <long*>safe_realloc(index_2, count*sizeof(long))
-        offset_final = <double*>safe_realloc(offset_final, 3*count*sizeof(double))
-        distances = <double*>safe_realloc(distances, count*sizeof(double))
-
-        # convert to python objects
-        py_index_1 = np.array(<long[:count]>index_1)
-        py_index_2 = np.array(<long[:count]>index_2)
-        py_offsets = np.array(<double[:count, :3]>offset_final)
-        py_distances = np.array(<double[:count]>distances)
-
-    # free allocated memories
-    free(index_1)
-    free(index_2)
-    free(offset_final)
-    free(distances)
-    free(offsets_p)
-    free(expanded_coords_p)
-    free(indices_p)
-    free(head)
-    free(atom_indices)
-
-    free(&offset_correction[0, 0])
-    free(&frac_coords[0, 0])
-    free(&all_fcoords[0, 0])
-    free(&coords_in_cell[0, 0])
-    free(&center_indices1[0])
-    free(&center_indices3[0, 0])
-    free(&neighbor_map[0, 0])
-
-    free(&all_indices3[0, 0])
-    free(&all_indices1[0])
-
-    return py_index_1, py_index_2, py_offsets, py_distances
-
-
-cdef void get_cube_neighbors(long[3] ncube, long[:, ::1] neighbor_map):
-    """
-    Get {cube_index: cube_neighbor_indices} map
-    """
-    cdef:
-        int i, j, k
-        int count = 0
-        long ncubes = ncube[0] * ncube[1] * ncube[2]
-        long[::1] counts = <long[:ncubes]> safe_malloc(ncubes * sizeof(long))
-        long[:, ::1] cube_indices_3d = <long[:ncubes, :3]> safe_malloc(
-            ncubes*3*sizeof(long)
-        )
-        long[::1] cube_indices_1d = <long[:ncubes]> safe_malloc(ncubes*sizeof(long))
-
-        # creating the memviews of c-arrays once substantially improves speed
-        # but for some reason it makes the runtime scaling with the number of
-        # atoms worse
-        long[1][3] index3_arr
-        long[:, ::1] index3 = index3_arr
-        long[1] index1_arr
-        long[::1] index1 = index1_arr
-
-        int n = 1
-        long ntotal = (2 * n + 1) * (2 * n + 1) * (2 * n + 1)
-        long[:, ::1] ovectors
-        long *ovectors_p = <long *> safe_malloc(ntotal * 3 * sizeof(long))
-        int n_ovectors = compute_offset_vectors(ovectors_p, n)
-
-    # now resize to the actual size
-    ovectors_p = <long *> safe_realloc(ovectors_p, n_ovectors * 3 * sizeof(long))
-    ovectors = <long[:n_ovectors, :3]>ovectors_p
-
-    memset(<void*>&neighbor_map[0, 0], -1, neighbor_map.shape[0] * 27 * sizeof(long))
-
-    for i in range(ncubes):
-        counts[i] = 0
-
-    for i in range(ncube[0]):
-        for j in range(ncube[1]):
-            for k in range(ncube[2]):
-                cube_indices_3d[count, 0] = i
-                cube_indices_3d[count, 1] = j
-                cube_indices_3d[count, 2] = k
-                count += 1
-
-    three_to_one(cube_indices_3d, ncube[1], ncube[2], cube_indices_1d)
-
-    for i in range(ncubes):
-        for j in range(27):
-            index3[0, 0] = ovectors[j, 0] + cube_indices_3d[i, 0]
-            index3[0, 1] = ovectors[j, 1] + cube_indices_3d[i, 1]
-            index3[0, 2] = ovectors[j, 2] + cube_indices_3d[i, 2]
-            if (
-                    (index3[0, 0] < ncube[0]) &
-                    (index3[0, 0] >= 0) &
-                    (index3[0, 1] < ncube[1]) &
-                    (index3[0, 1] >= 0) &
-                    (index3[0, 2] < ncube[2]) &
-                    (index3[0, 2] >= 0)
-            ):
-                three_to_one(index3, ncube[1], ncube[2], index1)
-                neighbor_map[i, counts[i]] = index1[0]
-                counts[i] += 1
-
-    free(&cube_indices_3d[0, 0])
-    free(&cube_indices_1d[0])
-    free(&counts[0])
-    free(ovectors_p)
-
-
-cdef int compute_offset_vectors(long* ovectors, long n) nogil:
-    cdef:
-        int i, j, k, ind
-        int count = 0
-        double center[8][3] # center vertices coords
-        double offset[8][3]  # offsetted vertices
-
-    for i in range(2):
-        for j in range(2):
-            for k in range(2):
-                ind = i * 4 + j * 2 + k
-                center[ind][0] = i - 0.5
-                center[ind][1] = j - 0.5
-                center[ind][2] = k - 0.5
-
-    for i in range(-n, n + 1):
-        for j in range(-n, n + 1):
-            for k in range(-n, n + 1):
-                offset_cube(center, i, j, k, offset)
-                if distance_vertices(center, offset, n):
-                    ovectors[3*count] = i
-                    ovectors[3*count + 1] = j
-                    ovectors[3*count + 2] = k
-                    count += 1
-
-    return count
-
-
-cdef double distance2(
-        const double[:, ::1] m1,
-        const double[:, ::1] m2,
-        long index1,
-        long index2,
-        long size
-    ) nogil:
-    """Faster way to compute the distance squared by not using slice but providing indices
-    in each matrix
-    """
+
+cdef inline double distance2(const double *x, const double *y) noexcept nogil:
+    """Faster way to compute the distance squared of two 3d points"""
     cdef:
         int i
         double s = 0
 
-    for i in range(size):
-        s += (m1[index1, i] - m2[index2, i]) * (m1[index1, i] - m2[index2, i])
+    for i in range(3):
+        s += (x[i] - y[i]) * (x[i] - y[i])
     return s
 
 
 cdef void get_bounds(
-        const double[:, ::1] frac_coords,
+        const double *frac_coords,
+        long n,
         const double[3] maxr,
-        const long[3] pbc,
+        const long *pbc,
         long[3] max_bounds,
         long[3] min_bounds
-    ) nogil:
+    ) noexcept nogil:
     """
     Given the fractional coordinates and the number of repeation needed in each
     direction, maxr, compute the translational bounds in each dimension
@@ -524,7 +604,7 @@ cdef void get_bounds(
         double[3] max_fcoords
         double[3] min_fcoords
 
-    max_and_min(frac_coords, max_fcoords, min_fcoords)
+    max_and_min(frac_coords, n, max_fcoords, min_fcoords)
 
     for i in range(3):
         min_bounds[i] = 0
@@ -535,39 +615,23 @@ cdef void get_bounds(
             min_bounds[i] = <long>(floor(min_fcoords[i] - maxr[i] - 1e-8))
             max_bounds[i] = <long>(ceil(max_fcoords[i] + maxr[i] + 1e-8))
 
-cdef void get_frac_coords(
-        const double[:, ::1] lattice,
-        double[:, ::1] inv_lattice,
-        const double[:, ::1] cart_coords,
-        double[:, ::1] frac_coords
-    ) nogil:
-    """
-    Compute the fractional coordinates
-    """
-    matrix_inv(lattice, inv_lattice)
-    matmul(cart_coords, inv_lattice, frac_coords)
-
-cdef void matmul(
-        const double[:, ::1] m1,
-        const double[:, ::1] m2,
-        double [:, ::1] out
-    ) nogil:
+
+cdef void matmul(const double *m1, long n, const double *m2, double *out) noexcept nogil:
     """
-    Matrix multiplication
+    Matrix multiplication of a (n, 3) matrix with a 3x3 matrix
     """
-    cdef:
-        int i, j, k
-        int m = m1.shape[0], n = m1.shape[1], l = m2.shape[1]
+    cdef long i, j, k
+
+    for i in range(n):
+        for j in range(3):
+            out[3*i + j] = 0
+            for k in range(3):
+                out[3*i + j] += m1[3*i + k] * m2[3*k + j]
 
-    for i in range(m):
-        for j in range(l):
-            out[i, j] = 0
-            for k in range(n):
-                out[i, j] += m1[i, k] * m2[k, j]
 
-cdef void matrix_inv(const double[:, ::1] matrix, double[:, ::1] inv) nogil:
+cdef void matrix_inv(const double *matrix, double *inv) noexcept nogil:
     """
-    Matrix inversion
+    3x3 matrix inversion
     """
     cdef:
         int i, j
@@ -575,24 +639,28 @@ cdef void matrix_inv(const double[:, ::1] matrix, double[:, ::1] inv) nogil:
 
     for i in range(3):
         for j in range(3):
-            inv[i, j] = (matrix[(j+1)%3, (i+1)%3] * matrix[(j+2)%3, (i+2)%3] -
-                matrix[(j+2)%3, (i+1)%3] * matrix[(j+1)%3, (i+2)%3]) / det
+            inv[3*i + j] = (
+                matrix[3*((j+1)%3) + (i+1)%3] * matrix[3*((j+2)%3) + (i+2)%3] -
+                matrix[3*((j+2)%3) + (i+1)%3] * matrix[3*((j+1)%3) + (i+2)%3]
+            ) / det
+
 
-cdef double matrix_det(const double[:, ::1] matrix) nogil:
+cdef double matrix_det(const double *matrix) noexcept nogil:
     """
-    Matrix determinant
+    3x3 matrix determinant
     """
     return (
-        matrix[0, 0] * (matrix[1, 1] * matrix[2, 2] - matrix[1, 2] * matrix[2, 1]) +
-        matrix[0, 1] * (matrix[1, 2] * matrix[2, 0] - matrix[1, 0] * matrix[2, 2]) +
-        matrix[0, 2] * (matrix[1, 0] * matrix[2, 1] - matrix[1, 1] * matrix[2, 0])
+        matrix[0] * (matrix[4] * matrix[8] - matrix[5] * matrix[7]) +
+        matrix[1] * (matrix[5] * matrix[6] - matrix[3] * matrix[8]) +
+        matrix[2] * (matrix[3] * matrix[7] - matrix[4] * matrix[6])
     )
 
+
 cdef void get_max_r(
-        const double[:, ::1] reciprocal_lattice,
+        const double *reciprocal_lattice,
         double[3] maxr,
         double r
-    ) nogil:
+    ) noexcept nogil:
     """
     Get maximum repetition in each directions
     """
@@ -600,45 +668,31 @@ cdef void get_max_r(
         int i
         double recp_len
 
-    for i in range(3):  # is it ever not 3x3 for our cases?
-        recp_len = norm(reciprocal_lattice[i, :])
+    for i in range(3):
+        recp_len = sqrt(inner(&reciprocal_lattice[3*i], &reciprocal_lattice[3*i]))
         maxr[i] = ceil((r + 0.15) * recp_len / (2 * pi))
 
+
 cdef void get_reciprocal_lattice(
-        const double[:, ::1] lattice,
-        double[:, ::1] reciprocal_lattice
-    ) nogil:
+        const double *lattice,
+        double *reciprocal_lattice
+    ) noexcept nogil:
     """
     Compute the reciprocal lattice
     """
-    cdef int i
-    for i in range(3):
-        recip_component(
-            lattice[i, :], lattice[(i+1)%3, :],
-            lattice[(i+2)%3, :],
-            reciprocal_lattice[i, :]
-        )
-
-cdef void recip_component(
-        const double[::1] a1,
-        const double[::1] a2,
-        const double[::1] a3,
-        double[::1] out
-    ) nogil:
-    """
-    Compute the reciprocal lattice vector
-    """
     cdef:
-        int i
+        int i, j
         double prod
         double ai_cross_aj[3]
 
-    cross(&a2[0], &a3[0], ai_cross_aj)  # need to pass address of memviews
-    prod = inner(&a1[0], ai_cross_aj)
     for i in range(3):
-        out[i] = 2 * pi * ai_cross_aj[i] / prod
+        cross(&lattice[3*((i+1)%3)], &lattice[3*((i+2)%3)], ai_cross_aj)
+        prod = inner(&lattice[3*i], ai_cross_aj)
+        for j in range(3):
+            reciprocal_lattice[3*i + j] = 2 * pi * ai_cross_aj[j] / prod
+
 
-cdef double inner(const double[3] x, const double[3] y) nogil:
+cdef double inner(const double *x, const double *y) noexcept nogil:
     """
     Compute inner product of 3d vectors
     """
@@ -650,7 +704,8 @@ cdef double inner(const double[3] x, const double[3] y) nogil:
         sum += x[i] * y[i]
     return sum
 
-cdef void cross(const double[3] x, const double[3] y, double[3] out) nogil:
+
+cdef void cross(const double *x, const double *y, double *out) noexcept nogil:
     """
     Cross product of vector x and y, output in out
     """
@@ -658,96 +713,37 @@ cdef void cross(const double[3] x, const double[3] y, double[3] out) nogil:
     out[1] = x[2] * y[0] - x[0] * y[2]
     out[2] = x[0] * y[1] - x[1] * y[0]
 
-cdef double norm(const double[::1] vec) nogil:
-    """
-    Vector norm
-    """
-    cdef:
-        int i
-        int n = vec.shape[0]
-        double sum = 0
-
-    for i in range(n):
-        sum += vec[i] * vec[i]
-    return sqrt(sum)
 
 cdef void max_and_min(
-        const double[:, ::1] coords,
+        const double *coords,
+        long n,
         double[3] max_coords,
         double[3] min_coords
-    ) nogil:
+    ) noexcept nogil:
     """
-    Compute the min and max of coords
+    Compute the min and max of (n, 3) coords
     """
-    cdef:
-        int i, j
-        int M = coords.shape[0]
-        int N = coords.shape[1]
-
-    for i in range(N):
-        max_coords[i] = coords[0, i]
-        min_coords[i] = coords[0, i]
-    for i in range(M):
-        for j in range(N):
-            if coords[i, j] >= max_coords[j]:
-                max_coords[j] = coords[i, j]
-            if coords[i, j] <= min_coords[j]:
-                min_coords[j] = coords[i, j]
-
-cdef void compute_cube_index(
-        const double[:, ::1] coords,
-        const double[3] global_min,
-        double radius, long[:, ::1] return_indices
-    ) nogil:
-    cdef int i, j
-    for i in range(coords.shape[0]):
-        for j in range(coords.shape[1]):
-            return_indices[i, j] = <long>(
-                floor((coords[i, j] - global_min[j] + 1e-8) / radius)
-            )
-
-
-cdef void three_to_one(
-        const long[:, ::1] label3d, long ny, long nz, long[::1] label1d
-    ) nogil:
-    """
-    3D vector representation to 1D
-    """
-    cdef:
-        int i
-        int n = label3d.shape[0]
+    cdef long i, j
 
+    for j in range(3):
+        max_coords[j] = coords[j]
+        min_coords[j] = coords[j]
     for i in range(n):
-        label1d[i] = label3d[i, 0] * ny * nz + label3d[i, 1] * nz + label3d[i, 2]
-
-
-cdef bint distance_vertices(
-        const double[8][3] center, const double[8][3] off, double r
-    ) nogil:
-    cdef:
-        int i, j
-        double d2
-        double r2 = r * r
+        for j in range(3):
+            if coords[3*i + j] >= max_coords[j]:
+                max_coords[j] = coords[3*i + j]
+            if coords[3*i + j] <= min_coords[j]:
+                min_coords[j] = coords[3*i + j]
 
-    for i in range(8):
-        for j in range(8):
-            d2 = (center[i][0] - off[j][0]) * (center[i][0] - off[j][0]) + \
-                 (center[i][1] - off[j][1]) * (center[i][1] - off[j][1]) + \
-                 (center[i][2] - off[j][2]) * (center[i][2] - off[j][2])
-            if d2 <= r2:
-                return 1
-    return 0
 
-cdef void offset_cube(
-        const double[8][3] center,
-        long n, long m, long l,
-        const double[8][3] (&offsetted)
-    ) nogil:
-    cdef int i, j, k
-    for i in range(2):
-        for j in range(2):
-            for k in range(2):
-                ind = i * 4 + j * 2 + k
-                offsetted[ind][0] = center[ind][0] + n
-                offsetted[ind][1] = center[ind][1] + m
-                offsetted[ind][2] = center[ind][2] + l
+cdef void compute_cube_index(
+        const double *coords,
+        const double[3] global_min,
+        double radius,
+        long[3] return_indices
+    ) noexcept nogil:
+    cdef int j
+    for j in range(3):
+        return_indices[j] = <long>(
+            floor((coords[j] - global_min[j] + 1e-8) / radius)
+        )
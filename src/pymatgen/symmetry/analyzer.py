@@ -14,30 +14,38 @@ import copy
 import itertools
 import logging
 import math
+import os
+import pickle
+import sqlite3
 import warnings
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
 from fractions import Fraction
-from functools import lru_cache
+from hashlib import blake2b
 from math import cos, sin
+from multiprocessing import Pool
 from typing import TYPE_CHECKING
 
 import numpy as np
 import scipy.cluster
 import spglib
+from pymatgen.core import SETTINGS
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.operations import SymmOp
 from pymatgen.core.structure import Molecule, PeriodicSite, Structure
 from pymatgen.symmetry.structure import SymmetrizedStructure
-from pymatgen.util.coord import find_in_coord_list, pbc_diff
+from pymatgen.util.coord import pbc_diff
 from pymatgen.util.due import Doi, due
+from scipy.spatial import KDTree
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Any, Literal
 
     from pymatgen.core import Element, Species
     from pymatgen.core.sites import Site
     from pymatgen.symmetry.groups import CrystalSystem
+    from pymatgen.util.typing import PathLike
 
     LatticeType = Literal["cubic", "hexagonal", "monoclinic", "orthorhombic", "rhombohedral", "tetragonal", "triclinic"]
 
@@ -57,15 +65,213 @@ class SymmetryUndetermined(ValueError):
     """
 
 
-@lru_cache(maxsize=32)
+class SymmetryDatasetCache:
+    """A bounded cache of spglib symmetry datasets shared by all SpacegroupAnalyzers,
+    with an optional sqlite database to share the datasets between processes and
+    sessions.
+
+    Datasets are keyed by a hash of the spglib cell (lattice, fractional coordinates,
+    atom types and magnetic moments, rounded to 12 decimals), symprec, angle_tolerance
+    and the spglib version, so equal structures share a dataset even if they are
+    different objects. The cached datasets must not be modified. The database stores
+    pickled datasets, so it should only be shared between trusted users.
+    """
+
+    def __init__(self, maxsize: int = 1024, db_path: PathLike | None = None) -> None:
+        """
+        Args:
+            maxsize (int): Maximum number of datasets kept in memory, the least
+                recently used being discarded first. Defaults to 1024.
+            db_path (PathLike): Path of a sqlite database to store the datasets in,
+                created if it does not exist. Defaults to None for no database.
+        """
+        self.maxsize = maxsize
+        self.db_path = db_path
+        self._datasets: OrderedDict[str, Any] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_pid: int | None = None
+
+    @staticmethod
+    def get_key(cell: tuple, symprec: float | None, angle_tolerance: float) -> str:
+        """Get the key of the dataset of a spglib cell.
+
+        Args:
+            cell (tuple): spglib cell, i.e. the lattice, fractional coordinates,
+                atom types and optionally the magnetic moments.
+            symprec (float): Tolerance for symmetry finding.
+            angle_tolerance (float): Angle tolerance for symmetry finding.
+
+        Returns:
+            str: Hex digest identifying the dataset.
+        """
+        hasher = blake2b(digest_size=20)
+        hasher.update(f"{spglib.__version__} {symprec!r} {angle_tolerance!r}".encode())
+        for array in cell:
+            # Adding 0 turns -0.0 into 0.0
+            array = np.round(np.asarray(array, dtype=float), 12) + 0.0
+            hasher.update(str(array.shape).encode())
+            hasher.update(array.tobytes())
+        return hasher.hexdigest()
+
+    def get_dataset(self, cell: tuple, symprec: float | None, angle_tolerance: float) -> Any:
+        """Get the spglib symmetry dataset of a cell, from the cache if possible.
+
+        Args:
+            cell (tuple): spglib cell, i.e. the lattice, fractional coordinates,
+                atom types and optionally the magnetic moments.
+            symprec (float): Tolerance for symmetry finding.
+            angle_tolerance (float): Angle tolerance for symmetry finding.
+
+        Raises:
+            SymmetryUndetermined: If spglib fails to determine the symmetry.
+
+        Returns:
+            The spglib symmetry dataset.
+        """
+        key = self.get_key(cell, symprec, angle_tolerance)
+        dataset = self._datasets.pop(key, None)
+        if dataset is None and self.db_path is not None:
+            row = self._get_db().execute("SELECT dataset FROM datasets WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                dataset = pickle.loads(row[0])
+        if dataset is None:
+            dataset = spglib.get_symmetry_dataset(cell, symprec=symprec, angle_tolerance=angle_tolerance)
+            if dataset is None:
+                raise SymmetryUndetermined
+            if self.db_path is not None:
+                with self._get_db() as db:
+                    db.execute("INSERT OR IGNORE INTO datasets VALUES (?, ?)", (key, pickle.dumps(dataset)))
+
+        if self.maxsize > 0:
+            self._datasets[key] = dataset
+            while len(self._datasets) > self.maxsize:
+                self._datasets.popitem(last=False)
+        return dataset
+
+    def _get_db(self) -> sqlite3.Connection:
+        """Get the connection to the database of this process."""
+        # Connections cannot be shared with forked processes
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, timeout=60)  # type: ignore[arg-type]
+            self._db_pid = os.getpid()
+            self._db.execute("PRAGMA journal_mode=WAL")
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS datasets (key TEXT PRIMARY KEY, dataset BLOB)")
+        return self._db
+
+    def clear(self) -> None:
+        """Remove all datasets from the memory cache and the database."""
+        self._datasets.clear()
+        if self.db_path is not None:
+            with self._get_db() as db:
+                db.execute("DELETE FROM datasets")
+
+    def __len__(self) -> int:
+        """Number of datasets in memory."""
+        return len(self._datasets)
+
+
+_dataset_cache = SymmetryDatasetCache(db_path=SETTINGS.get("PMG_SYMMETRY_CACHE_DB"))
+
+
+def get_symmetry_dataset_cache() -> SymmetryDatasetCache:
+    """Get the cache of symmetry datasets used by SpacegroupAnalyzer."""
+    return _dataset_cache
+
+
+def set_symmetry_dataset_cache(maxsize: int = 1024, db_path: PathLike | None = None) -> SymmetryDatasetCache:
+    """Replace the cache of symmetry datasets used by SpacegroupAnalyzer. The default
+    cache uses the database given by the PMG_SYMMETRY_CACHE_DB setting, if any,
+    which also applies to new worker processes.
+
+    Args:
+        maxsize (int): Maximum number of datasets kept in memory. Defaults to 1024.
+        db_path (PathLike): Path of a sqlite database to store the datasets in.
+            Defaults to None for no database.
+
+    Returns:
+        SymmetryDatasetCache: The new cache.
+    """
+    global _dataset_cache  # noqa: PLW0603
+    _dataset_cache = SymmetryDatasetCache(maxsize=maxsize, db_path=db_path)
+    return _dataset_cache
+
+
 def _get_symmetry_dataset(cell, symprec, angle_tolerance):
     """Simple wrapper to cache results of spglib.get_symmetry_dataset since this call is
     expensive.
     """
-    dataset = spglib.get_symmetry_dataset(cell, symprec=symprec, angle_tolerance=angle_tolerance)
-    if dataset is None:
-        raise SymmetryUndetermined
-    return dataset
+    return _dataset_cache.get_dataset(cell, symprec, angle_tolerance)
+
+
+def _get_spglib_cell(structure: Structure) -> tuple[tuple[Any, ...], list[Element | Species]]:
+    """Get the spglib cell of a structure, with the magnetic moments if any site has
+    one, and the species of each atom type of the cell.
+    """
+    unique_species: list[Element | Species] = []
+    zs = []
+    magmoms = []
+    for species, group in itertools.groupby(structure, key=lambda s: s.species):
+        if species in unique_species:
+            ind = unique_species.index(species)
+            zs.extend([ind + 1] * len(tuple(group)))
+        else:
+            unique_species.append(species)
+            zs.extend([len(unique_species)] * len(tuple(group)))
+
+    has_explicit_magmoms = "magmom" in structure.site_properties or any(
+        getattr(specie, "spin", None) is not None for specie in structure.types_of_species
+    )
+
+    for site in structure:
+        if hasattr(site, "magmom"):
+            magmoms.append(site.magmom)
+        elif site.is_ordered and getattr(site.specie, "spin", None) is not None:
+            magmoms.append(site.specie.spin)
+        elif has_explicit_magmoms:  # if any site has a magmom, all sites must have magmoms
+            magmoms.append(0)
+
+    if len(magmoms) > 0:
+        cell: tuple[Any, ...] = (
+            tuple(map(tuple, structure.lattice.matrix.tolist())),
+            tuple(map(tuple, structure.frac_coords.tolist())),
+            tuple(zs),
+            tuple(map(tuple, magmoms) if isinstance(magmoms[0], Sequence) else magmoms),
+        )
+    else:  # if no magmoms given do not add to cell
+        cell = (
+            tuple(map(tuple, structure.lattice.matrix.tolist())),
+            tuple(map(tuple, structure.frac_coords.tolist())),
+            tuple(zs),
+        )
+
+    return cell, unique_species
+
+
+def _analyze_cell(task: tuple) -> dict[str, Any]:
+    """Find the space group of a spglib cell for SpacegroupAnalyzer.analyze_many."""
+    idx, cell, structure, symprec, angle_tolerance, primitive, conventional = task
+    row: dict[str, Any] = {"index": idx, "number": None, "international": None, "hall": None, "wyckoffs": None}
+    if primitive:
+        row["primitive"] = None
+    if conventional:
+        row["conventional"] = None
+    try:
+        dataset = _get_symmetry_dataset(cell, symprec, angle_tolerance)
+    except SymmetryUndetermined:
+        return row
+
+    row["number"] = int(dataset["number"])
+    row["international"] = dataset["international"]
+    row["hall"] = dataset["hall"]
+    row["wyckoffs"] = list(dataset["wyckoffs"])
+    if structure is not None:
+        spga = SpacegroupAnalyzer(structure, symprec=symprec, angle_tolerance=angle_tolerance)
+        if primitive:
+            row["primitive"] = spga.get_primitive_standard_structure()
+        if conventional:
+            row["conventional"] = spga.get_conventional_standard_structure()
+    return row
 
 
 class SpacegroupAnalyzer:
@@ -91,47 +297,58 @@ class SpacegroupAnalyzer:
         self._angle_tol = angle_tolerance
         self._structure = structure
         self._site_props = structure.site_properties
-        unique_species: list[Element | Species] = []
-        zs = []
-        magmoms = []
-        for species, group in itertools.groupby(structure, key=lambda s: s.species):
-            if species in unique_species:
-                ind = unique_species.index(species)
-                zs.extend([ind + 1] * len(tuple(group)))
-            else:
-                unique_species.append(species)
-                zs.extend([len(unique_species)] * len(tuple(group)))
+        self._cell, self._unique_species = _get_spglib_cell(structure)
+        self._numbers = list(self._cell[2])
 
-        has_explicit_magmoms = "magmom" in structure.site_properties or any(
-            getattr(specie, "spin", None) is not None for specie in structure.types_of_species
-        )
+        self._space_group_data = _get_symmetry_dataset(self._cell, symprec, angle_tolerance)
 
-        for site in structure:
-            if hasattr(site, "magmom"):
-                magmoms.append(site.magmom)
-            elif site.is_ordered and getattr(site.specie, "spin", None) is not None:
-                magmoms.append(site.specie.spin)
-            elif has_explicit_magmoms:  # if any site has a magmom, all sites must have magmoms
-                magmoms.append(0)
-
-        self._unique_species = unique_species
-        self._numbers = zs
-
-        if len(magmoms) > 0:
-            self._cell: tuple[Any, ...] = (
-                tuple(map(tuple, structure.lattice.matrix.tolist())),
-                tuple(map(tuple, structure.frac_coords.tolist())),
-                tuple(zs),
-                tuple(map(tuple, magmoms) if isinstance(magmoms[0], Sequence) else magmoms),
-            )
-        else:  # if no magmoms given do not add to cell
-            self._cell = (
-                tuple(map(tuple, structure.lattice.matrix.tolist())),
-                tuple(map(tuple, structure.frac_coords.tolist())),
-                tuple(zs),
-            )
+    @classmethod
+    def analyze_many(
+        cls,
+        structures: Sequence[Structure],
+        symprec: float | None = 0.01,
+        angle_tolerance: float = 5,
+        n_jobs: int = 1,
+        *,
+        primitive: bool = False,
+        conventional: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Find the space groups of many structures, in parallel if n_jobs > 1.
+
+        The spglib cells of all structures are built once, and only these arrays are
+        sent to the worker processes unless standard structures are requested. The
+        results are yielded as they are completed, in input order if n_jobs is 1, so
+        e.g. pd.DataFrame(SpacegroupAnalyzer.analyze_many(structures, n_jobs=4))
+        gives a table with one row per structure.
 
-        self._space_group_data = _get_symmetry_dataset(self._cell, symprec, angle_tolerance)
+        Args:
+            structures (list[Structure]): Structures to analyze.
+            symprec (float): Tolerance for symmetry finding. Defaults to 0.01.
+            angle_tolerance (float): Angle tolerance for symmetry finding. Defaults to 5 degrees.
+            n_jobs (int): Number of processes to analyze the structures with. Defaults to 1.
+            primitive (bool): Whether to also get the primitive standard structures,
+                see get_primitive_standard_structure. Defaults to False.
+            conventional (bool): Whether to also get the conventional standard structures,
+                see get_conventional_standard_structure. Defaults to False.
+
+        Yields:
+            dict: With the "index" of the structure in structures, the space group
+                "number", "international" and "hall" symbols, the "wyckoffs" letters
+                of the sites and, if requested, the "primitive" and "conventional"
+                structures. The values are None if the symmetry cannot be determined.
+        """
+        tasks = []
+        for idx, structure in enumerate(structures):
+            cell = tuple(np.array(array) for array in _get_spglib_cell(structure)[0])
+            with_structure = structure if primitive or conventional else None
+            tasks.append((idx, cell, with_structure, symprec, angle_tolerance, primitive, conventional))
+
+        if n_jobs > 1 and len(tasks) > 1:
+            with Pool(n_jobs) as pool:
+                yield from pool.imap_unordered(_analyze_cell, tasks, chunksize=max(1, len(tasks) // (4 * n_jobs)))
+        else:
+            for task in tasks:
+                yield _analyze_cell(task)
 
     def get_space_group_symbol(self) -> str:
         """Get the spacegroup symbol (e.g., Pnma) for structure.
@@ -357,7 +574,9 @@ class SpacegroupAnalyzer:
             Refined structure.
         """
         # Atomic positions have to be specified by scaled positions for spglib.
-        lattice, scaled_positions, numbers = spglib.refine_cell(self._cell, self._symprec, self._angle_tol)
+        # The standardized cell of the dataset is the one spglib.refine_cell returns
+        dataset = self._space_group_data
+        lattice, scaled_positions, numbers = dataset["std_lattice"], dataset["std_positions"], dataset["std_types"]
         species = [self._unique_species[i - 1] for i in numbers]
         if keep_site_properties:
             site_properties = {}
@@ -978,6 +1197,16 @@ class PointGroupAnalyzer:
         self.tol = tolerance
         self.eig_tol = eigen_tolerance
         self.mat_tol = matrix_tolerance
+
+        # Operations are validated by mapping all sites at once and looking up their
+        # images in a KD-tree of the sites
+        coords = self._coords = self.centered_mol.cart_coords
+        self._tree = KDTree(coords)
+        species_ids: dict = {}
+        self._species_ids = np.array([species_ids.setdefault(site.species, len(species_ids)) for site in mol])
+        # Sites far from the center are the least likely to be mapped onto a site by
+        # an invalid operation, so they are checked first
+        self._probe_indices = np.argsort(-np.linalg.norm(coords, axis=1), kind="stable")[:8]
         self._analyze()
         if self.sch_symbol in ["C1v", "C1h"]:
             self.sch_symbol = "Cs"
@@ -1140,25 +1369,49 @@ class PointGroupAnalyzer:
             mirror_type = "h"
         else:
             # Iterate through all pairs of atoms to find mirror
-            for s1, s2 in itertools.combinations(self.centered_mol, 2):
-                if s1.species == s2.species:
-                    normal = s1.coords - s2.coords
-                    if np.dot(normal, axis) < self.tol:
-                        op = SymmOp.reflection(normal)
-                        if self.is_valid_op(op):
-                            self.symmops.append(op)
-                            if len(self.rot_sym) > 1:
-                                mirror_type = "d"
-                                for v, _ in self.rot_sym:
-                                    if np.linalg.norm(v - axis) >= self.tol and np.dot(v, normal) < self.tol:
-                                        mirror_type = "v"
-                                        break
-                            else:
+            for normal in self._get_mirror_normals(axis):
+                op = SymmOp.reflection(normal)
+                if self.is_valid_op(op):
+                    self.symmops.append(op)
+                    if len(self.rot_sym) > 1:
+                        mirror_type = "d"
+                        for v, _ in self.rot_sym:
+                            if np.linalg.norm(v - axis) >= self.tol and np.dot(v, normal) < self.tol:
                                 mirror_type = "v"
-                            break
+                                break
+                    else:
+                        mirror_type = "v"
+                    break
 
         return mirror_type
 
+    def _get_mirror_normals(self, axis):
+        """Yield the normals of the candidate mirrors exchanging a pair of atoms of the
+        same species, for _find_mirror.
+
+        The pairs are taken in the same order as in itertools.combinations. Normals
+        that were already yielded are skipped, as are those whose mirror does not map
+        the probe sites onto sites, since such a mirror cannot be a valid operation.
+        """
+        coords = self._coords
+        probe_coords = coords[self._probe_indices]
+        tested = set()
+        for idx in range(len(coords) - 1):
+            others = np.arange(idx + 1, len(coords))
+            normals = coords[idx] - coords[others]
+            is_candidate = (self._species_ids[others] == self._species_ids[idx]) & (np.dot(normals, axis) < self.tol)
+            normals = [normal for normal in normals[is_candidate] if _get_axis_key(normal) not in tested]
+            if not normals:
+                continue
+            tested.update(map(_get_axis_key, normals))
+
+            # Reflect the probe sites in all the candidate mirrors at once, and only
+            # yield the mirrors that map them onto sites
+            units = np.array(normals) / np.linalg.norm(normals, axis=1)[:, None]
+            reflected = probe_coords - 2 * np.dot(units, probe_coords.T)[:, :, None] * units[:, None, :]
+            mapped = self._maps_onto_sites(self._probe_indices, reflected).all(axis=1)
+            yield from (normal for normal, is_mapped in zip(normals, mapped) if is_mapped)
+
     def _get_smallest_set_not_on_axis(self, axis):
         """Get the smallest list of atoms with the same species and distance from
         origin AND does not lie on the specified axis.
@@ -1205,9 +1458,11 @@ class PointGroupAnalyzer:
         For handling symmetric top molecules.
         """
         min_set = self._get_smallest_set_not_on_axis(axis)
+        tested = set()
         for s1, s2 in itertools.combinations(min_set, 2):
             test_axis = np.cross(s1.coords - s2.coords, axis)
-            if np.linalg.norm(test_axis) > self.tol:
+            if np.linalg.norm(test_axis) > self.tol and _get_axis_key(test_axis) not in tested:
+                tested.add(_get_axis_key(test_axis))
                 op = SymmOp.from_axis_angle_and_translation(test_axis, 180)
                 r2present = self.is_valid_op(op)
                 if r2present:
@@ -1262,11 +1517,14 @@ class PointGroupAnalyzer:
         _origin_site, dist_el_sites = cluster_sites(self.centered_mol, self.tol)
         test_set = min(dist_el_sites.values(), key=len)
         coords = [s.coords for s in test_set]
+        # Many triples of atoms give the same axes, which are only tested once
+        tested: set[tuple] = set()
         for c1, c2, c3 in itertools.combinations(coords, 3):
             for cc1, cc2 in itertools.combinations([c1, c2, c3], 2):
                 if not rot_present[2]:
                     test_axis = cc1 + cc2
-                    if np.linalg.norm(test_axis) > self.tol:
+                    if np.linalg.norm(test_axis) > self.tol and (2, *_get_axis_key(test_axis)) not in tested:
+                        tested.add((2, *_get_axis_key(test_axis)))
                         op = SymmOp.from_axis_angle_and_translation(test_axis, 180)
                         rot_present[2] = self.is_valid_op(op)
                         if rot_present[2]:
@@ -1274,7 +1532,8 @@ class PointGroupAnalyzer:
                             self.rot_sym.append((test_axis, 2))
 
             test_axis = np.cross(c2 - c1, c3 - c1)
-            if np.linalg.norm(test_axis) > self.tol:
+            if np.linalg.norm(test_axis) > self.tol and (3, *_get_axis_key(test_axis)) not in tested:
+                tested.add((3, *_get_axis_key(test_axis)))
                 for r in (3, 4, 5):
                     if not rot_present[r]:
                         op = SymmOp.from_axis_angle_and_translation(test_axis, 360 / r)
@@ -1319,14 +1578,31 @@ class PointGroupAnalyzer:
         Returns:
             bool: Whether SymmOp is valid for Molecule.
         """
-        coords = self.centered_mol.cart_coords
-        for site in self.centered_mol:
-            coord = symm_op.operate(site.coords)
-            ind = find_in_coord_list(coords, coord, self.tol)
-            if not (len(ind) == 1 and self.centered_mol[ind[0]].species == site.species):
+        for indices in (self._probe_indices, np.arange(len(self._coords))):
+            if not np.all(self._maps_onto_sites(indices, symm_op.operate_multi(self._coords[indices]))):
                 return False
         return True
 
+    def _maps_onto_sites(self, indices: np.ndarray, new_coords: np.ndarray) -> np.ndarray:
+        """Check whether each image of the sites is within tol of exactly one site of
+        the same species.
+
+        Args:
+            indices (np.ndarray): (n,) indices of the sites.
+            new_coords (np.ndarray): (..., n, 3) images of the sites.
+
+        Returns:
+            np.ndarray: (..., n) bools.
+        """
+        dists, images = self._tree.query(new_coords, k=[1, 2], p=np.inf, distance_upper_bound=self.tol)
+        # Missing neighbors have index len(sites), but these fail the distance check anyway
+        images = np.minimum(images[..., 0], len(self._coords) - 1)
+        return (
+            (dists[..., 0] < self.tol)
+            & (dists[..., 1] >= self.tol)
+            & (self._species_ids[images] == self._species_ids[indices])
+        )
+
     def _get_eq_sets(self):
         """Calculate the dictionary for mapping equivalent atoms onto each other.
 
@@ -1350,11 +1626,17 @@ class PointGroupAnalyzer:
 
         for index in get_clustered_indices():
             sites = self.centered_mol.cart_coords[index]
-            for i, reference in zip(index, sites):
-                for op in symm_ops:
-                    rotated = np.dot(op, sites.T).T
-                    matched_indices = find_in_coord_list(rotated, reference, self.tol)
-                    matched_indices = {dict(enumerate(index))[i] for i in matched_indices}
+            # matches[k][m] are the positions in index of the sites that symm_ops[k]
+            # maps onto site index[m], found for all sites at once
+            matches = [
+                KDTree(np.dot(op, sites.T).T).query_ball_point(
+                    sites, np.nextafter(self.tol, 0), p=np.inf, return_sorted=True
+                )
+                for op in symm_ops
+            ]
+            for pos, i in enumerate(index):
+                for op, op_matches in zip(symm_ops, matches):
+                    matched_indices = {index[j] for j in op_matches[pos]}
                     eq_sets[i] |= matched_indices
 
                     if i not in operations:
@@ -1512,6 +1794,11 @@ def iterative_symmetrize(mol, max_n=10, tolerance=0.3, epsilon=1e-2):
     return eq
 
 
+def _get_axis_key(axis: np.ndarray) -> tuple[float, ...]:
+    """Get the rounded unit vector along an axis, to find axes that were already tested."""
+    return tuple(np.round(axis / np.linalg.norm(axis), 6).tolist())
+
+
 def cluster_sites(mol: Molecule, tol: float, give_only_index: bool = False) -> tuple[Site | None, dict]:
     """Cluster sites based on distance and species type.
 
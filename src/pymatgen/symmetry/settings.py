@@ -10,8 +10,6 @@ import numpy as np
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.operations import MagSymmOp, SymmOp
 from pymatgen.util.string import transformation_to_string
-from sympy import Matrix
-from sympy.parsing.sympy_parser import parse_expr
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -117,6 +115,9 @@ class JonesFaithfulTransformation:
 
             # requires round-trip to sympy to evaluate
             # (alternatively, `numexpr` looks like a nice solution but requires an additional dependency)
+            from sympy import Matrix
+            from sympy.parsing.sympy_parser import parse_expr
+
             basis_change = [
                 parse_expr(string).subs({"a": Matrix(a), "b": Matrix(b), "c": Matrix(c)}) for string in basis_change
             ]
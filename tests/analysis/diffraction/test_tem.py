@@ -232,6 +232,14 @@ class TestTEMCalculator(PymatgenTest):
         # see https://www.doitpoms.ac.uk/tlplib/diffraction-patterns/printall.php
         assert_allclose([1, 0], positions[(-1, 0, 0)], atol=1)
 
+        # Every position is the vector addition of the positions of the first two points
+        structure = self.get_structure("LiFePO4")
+        positions = tem_calc.get_positions(structure, tem_calc.generate_points(-3, 3))
+        p1, p2 = list(positions)[1:3]
+        for plane, position in positions.items():
+            coeffs = tem_calc.get_plot_coeffs(p1, p2, plane)
+            assert_allclose(position, coeffs[0] * positions[p1] + coeffs[1] * positions[p2], atol=1e-10)
+
     def test_tem_dots(self):
         # All dependencies in TEM_dots method are tested. Only make sure each object created is
         # the class desired.
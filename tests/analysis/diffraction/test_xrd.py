@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from numpy.testing import assert_allclose
 from pymatgen.analysis.diffraction.xrd import XRDCalculator
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.structure import Structure
@@ -92,3 +93,38 @@ class TestXRDCalculator(PymatgenTest):
         assert xrd.x[0] == approx(40.294828554672264)
         assert xrd.y[0] == approx(2377745.2296686019)
         assert xrd.d_hkls[0] == approx(2.2382050944897789)
+
+    def test_get_pattern_disordered(self):
+        struct = self.get_structure("CsCl")
+        struct.replace_species({"Cs": {"Cs": 0.5, "Rb": 0.5}})
+        xrd = XRDCalculator().get_pattern(struct)
+        ordered = XRDCalculator().get_pattern(self.get_structure("CsCl"))
+        assert_allclose(xrd.x, ordered.x)
+        assert xrd.hkls == ordered.hkls
+        # Rb scatters less than Cs, weakening the (100) peak relative to (110)
+        assert xrd.y[0] < ordered.y[0]
+
+        struct.replace_species({"Cl": "Og"})
+        with pytest.raises(ValueError, match="no scattering coefficients for Og"):
+            XRDCalculator().get_pattern(struct)
+
+    def test_get_patterns(self):
+        structs = [self.get_structure(name) for name in ("CsCl", "LiFePO4", "Graphite")]
+        xrd_calc = XRDCalculator()
+        two_thetas, intensities = xrd_calc.get_patterns(structs, two_theta_range=(10, 90), step=0.05)
+        assert two_thetas.shape == (1601,)
+        assert two_thetas[[0, -1]] == approx([10, 90])
+        assert intensities.shape == (3, 1601)
+        assert intensities.max(axis=1) == approx([100, 100, 100])
+
+        for struct, pattern in zip(structs, intensities):
+            xrd = xrd_calc.get_pattern(struct, two_theta_range=(10, 90))
+            assert two_thetas[pattern.argmax()] == approx(xrd.x[xrd.y.argmax()], abs=0.025)
+
+        _, intensities_mp = xrd_calc.get_patterns(structs, two_theta_range=(10, 90), step=0.05, n_jobs=2)
+        assert_allclose(intensities_mp, intensities)
+
+        _, unscaled = xrd_calc.get_patterns(structs[:1], two_theta_range=(10, 90), step=0.05, scaled=False)
+        assert unscaled.sum() == approx(
+            xrd_calc.get_pattern(structs[0], scaled=False, two_theta_range=(10, 90)).y.sum()
+        )
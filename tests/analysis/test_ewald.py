@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import itertools
+import weakref
 from unittest import TestCase
 
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose
 from pymatgen.analysis.ewald import EwaldMinimizer, EwaldSummation
 from pymatgen.core.structure import Structure
+from pymatgen.optimization.ewald_minimizer import BranchAndBound
 from pymatgen.util.testing import VASP_IN_DIR
 from pytest import approx
 
@@ -78,6 +82,41 @@ class TestEwaldSummation(TestCase):
         assert dct["recip_space_cut"] == ham._gmax
         assert ham.as_dict() == EwaldSummation.from_dict(dct).as_dict()
 
+    def test_compute_energies(self):
+        ham = EwaldSummation(self.struct)
+        charges = np.array(ham._oxi_states)
+        assert ham.compute_energies(charges) == approx(np.sum(ham.total_energy_matrix))
+        assert ham.compute_energies(charges) == approx(ham.total_energy - ham._charged_cell_energy)
+
+        removed = [0, 5, 9]
+        partial = charges.copy()
+        partial[removed] = 0
+        energies = ham.compute_energies([charges, partial])
+        assert energies.shape == (2,)
+        assert energies[1] == approx(ham.compute_partial_energy(removed))
+
+        sub_struct = self.struct.copy()
+        sub_struct.remove_sites(removed)
+        assert ham.compute_sub_structure(sub_struct) == approx(energies[1])
+
+        # the interactions are computed once per EwaldSummation and freed with it
+        assert ham._get_interaction_matrices() is ham._get_interaction_matrices()
+        ham2 = EwaldSummation(self.struct)
+        assert_allclose(ham2.interaction_matrix, ham.interaction_matrix)
+        recip = weakref.ref(ham2._get_interaction_matrices()[0])
+        del ham2
+        assert recip() is None
+
+    def test_compute_energy_change(self):
+        ham = EwaldSummation(self.struct)
+        charges = np.array(ham._oxi_states)
+        # swap the charges of an Fe2+ and a P5+ site, and remove an O2-
+        indices = [0, 4, 20]
+        new_charges = charges.copy()
+        new_charges[indices] = [5, 2, 0]
+        energy_change = ham.compute_energy_change(charges, indices, new_charges[indices])
+        assert energy_change == approx(ham.compute_energies(new_charges) - ham.compute_energies(charges))
+
 
 class TestEwaldMinimizer(TestCase):
     def test_init(self):
@@ -104,6 +143,62 @@ class TestEwaldMinimizer(TestCase):
         assert e_min.minimized_sum == approx(111.63, abs=1e-3), "Returned wrong minimum value"
         assert len(e_min.best_m_list) == 6, "Returned wrong number of permutations"
 
+    def test_search(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.normal(size=(12, 12))
+        # Both manipulations compete for the same sites
+        m_list = [[0.5, 3, list(range(10)), "a"], [0, 2, list(range(4, 12)), "b"]]
+
+        energies = []
+        for a_sites in itertools.combinations(range(10), 3):
+            for b_sites in itertools.combinations(set(range(4, 12)) - set(a_sites), 2):
+                scales = np.ones(12)
+                scales[list(a_sites)] = 0.5
+                scales[list(b_sites)] = 0
+                energies.append(scales @ matrix @ scales)
+        energies.sort()
+
+        streamed = []
+        e_min = EwaldMinimizer(matrix, m_list, 20, callback=lambda matrix_sum, _: streamed.append(matrix_sum))
+        assert e_min.completed
+        assert_allclose([output[0] for output in e_min.output_lists], energies[:20])
+        assert len(streamed) >= 20
+        assert min(streamed) == approx(e_min.minimized_sum)
+        for matrix_sum, output_m_list in e_min.output_lists:
+            scales = np.ones(12)
+            for idx, species in output_m_list:
+                scales[idx] = 0.5 if species == "a" else 0
+            assert scales @ matrix @ scales == approx(matrix_sum)
+
+        e_min_parallel = EwaldMinimizer(matrix, m_list, 20, n_jobs=2)
+        assert_allclose([output[0] for output in e_min_parallel.output_lists], energies[:20])
+
+        e_min_best_first = EwaldMinimizer(matrix, m_list, 2, algo=EwaldMinimizer.ALGO_BEST_FIRST)
+        assert len(e_min_best_first.output_lists) == 2
+        assert not e_min_best_first.completed
+
+        e_min_no_time = EwaldMinimizer(matrix, m_list, 20, time_limit=0)
+        assert e_min_no_time.minimized_sum > energies[0] - 1e-8
+
+        with pytest.raises(ValueError, match="multiplication fractions must be <= 1"):
+            EwaldMinimizer(matrix, [[1.5, 3, list(range(10)), "a"]], 20)
+        with pytest.raises(ValueError, match="multiplication fractions must be <= 1"):
+            BranchAndBound(matrix, np.array([0.5, 1.5]), 20, np.full(1, np.inf), 0, False, None)
+        with pytest.raises(RuntimeError, match="No ordering satisfies the manipulations"):
+            EwaldMinimizer(matrix, [[0.5, 13, list(range(12)), "a"]], 20)
+
+    def test_deprecated_methods(self):
+        matrix = np.arange(16, dtype=float).reshape(4, 4)
+        e_min = EwaldMinimizer(matrix, [[0.5, 2, [0, 1, 2], "a"]], 2)
+        with pytest.warns(FutureWarning, match="add_m_list is deprecated"):
+            e_min.add_m_list(-1, [[0, "a"]])
+        assert e_min.output_lists[0] == [-1, [[0, "a"]]]
+        assert len(e_min.output_lists) == 2
+        with pytest.warns(FutureWarning, match="best_case is deprecated"):
+            assert e_min.best_case(matrix, [[0.5, 2, [0, 1, 2], "a"]], {0, 1, 2, 3}) <= e_min.minimized_sum
+        with pytest.warns(FutureWarning, match="get_next_index is deprecated"):
+            assert EwaldMinimizer.get_next_index(matrix, [0.5, 2, [0, 1, 2], "a"], {0, 1, 2}) == 2
+
     def test_site(self):
         """Test that uses an uncharged structure."""
         filepath = f"{VASP_IN_DIR}/POSCAR"
@@ -8,9 +8,17 @@ from unittest import TestCase
 
 import networkx as nx
 import networkx.algorithms.isomorphism as iso
+import numpy as np
 import pytest
 from monty.serialization import loadfn
-from pymatgen.analysis.graphs import MoleculeGraph, MolGraphSplitError, PeriodicSite, StructureGraph
+from pymatgen.analysis.graphs import (
+    GraphHashIndex,
+    MoleculeGraph,
+    MolGraphSplitError,
+    PeriodicSite,
+    SparseStructureGraph,
+    StructureGraph,
+)
 from pymatgen.analysis.local_env import (
     CovalentBondNN,
     CutOffDictNN,
@@ -484,6 +492,77 @@ from    to  to_image
         assert list(sg.graph.edges)[-2:] == [(1, 3, 0), (1, 2, 0)]
 
 
+class TestSparseStructureGraph(PymatgenTest):
+    def setUp(self):
+        stdout_file = f"{TEST_FILES_DIR}/command_line/critic2/MoS2_critic2_stdout.txt"
+        with open(stdout_file) as txt_file:
+            reference_stdout = txt_file.read()
+        self.structure = Structure.from_file(f"{TEST_FILES_DIR}/command_line/critic2/MoS2.cif")
+        c2o = Critic2Analysis(self.structure, reference_stdout)
+        self.mos2_sg = c2o.structure_graph(include_critical_points=False)
+        self.mos2_sparse = SparseStructureGraph.from_structure_graph(self.mos2_sg)
+
+        structure = Structure(Lattice.tetragonal(5, 50), ["H"], [[0, 0, 0]])
+        self.square_sparse = SparseStructureGraph(structure, [[0, 0, 1, 0, 0], [0, 0, -1, 0, 0], [0, 0, 0, 1, 0]])
+
+    def test_init(self):
+        # reversed and duplicate edges are only stored once
+        assert self.square_sparse.edges.tolist() == [[0, 0, 1, 0, 0], [0, 0, 0, 1, 0]]
+        # as in StructureGraph, edges from a site to its own images are not counted
+        assert self.square_sparse.get_coordination_of_site(0) == 2
+
+        with pytest.warns(UserWarning, match="Tried to create a bond to itself"):
+            sparse = SparseStructureGraph(self.square_sparse.structure, [[0, 0, 0, 0, 0]])
+        assert len(sparse.edges) == 0
+
+    def test_to_from_structure_graph(self):
+        assert len(self.mos2_sparse.edges) == self.mos2_sg.graph.number_of_edges()
+        assert self.mos2_sparse.edge_weight_name == "bond_length"
+        assert self.mos2_sparse.to_structure_graph() == self.mos2_sg
+
+        sparse = SparseStructureGraph.from_local_env_strategy(self.structure, MinimumDistanceNN())
+        assert sparse.weights is None
+        assert sparse.to_structure_graph() == self.mos2_sg
+
+    def test_get_connected_sites(self):
+        for idx in range(len(self.structure)):
+            assert self.mos2_sparse.get_coordination_of_site(idx) == self.mos2_sg.get_coordination_of_site(idx)
+            connected_sites = self.mos2_sparse.get_connected_sites(idx, jimage=(1, 0, 0))
+            expected = self.mos2_sg.get_connected_sites(idx, jimage=(1, 0, 0))
+            assert len(connected_sites) == len(expected)
+            for site, expected_site in zip(connected_sites, expected):
+                assert site.index == expected_site.index
+                assert site.jimage == expected_site.jimage
+                assert site.site == expected_site.site
+                assert site.weight == approx(expected_site.weight)
+                assert site.dist == approx(expected_site.dist)
+
+    def test_mul(self):
+        mos2_sparse_mul = self.mos2_sparse * (3, 3, 1)
+        assert mos2_sparse_mul.to_structure_graph() == self.mos2_sg * (3, 3, 1)
+        for idx in mos2_sparse_mul.structure.indices_from_symbol("Mo"):
+            assert mos2_sparse_mul.get_coordination_of_site(idx) == 6
+
+        # the images of the edges keep the bond lengths of the original graph
+        assert mos2_sparse_mul.weights == approx(np.full(len(mos2_sparse_mul.edges), 2.41693), abs=1e-4)
+        for site in mos2_sparse_mul.get_connected_sites(0):
+            assert site.dist == approx(site.weight)
+
+        square_sparse_mul = self.square_sparse * (2, 1, 1)
+        assert sorted(square_sparse_mul.edges.tolist()) == [
+            [0, 0, 0, 1, 0],
+            [0, 1, -1, 0, 0],
+            [0, 1, 0, 0, 0],
+            [1, 1, 0, 1, 0],
+        ]
+
+    def test_as_from_dict(self):
+        dct = self.mos2_sparse.as_dict()
+        sparse = SparseStructureGraph.from_dict(dct)
+        assert sparse.as_dict() == dct
+        assert sparse.to_structure_graph() == self.mos2_sg
+
+
 class TestMoleculeGraph(TestCase):
     def setUp(self):
         cyclohexene_xyz = f"{TEST_DIR}/cyclohexene.xyz"
@@ -898,3 +977,117 @@ class TestMoleculeGraph(TestCase):
         assert list(sg.graph.edges) == [(0, 1, 0), (0, 2, 0), (0, 3, 0), (1, 4, 0), (1, 5, 0)]
         sg.sort()
         assert list(sg.graph.edges) == [(4, 5, 0), (0, 4, 0), (1, 4, 0), (2, 5, 0), (3, 5, 0)]
+
+
+class TestGraphHashIndex(TestCase):
+    def setUp(self):
+        pc = Molecule.from_file(f"{TEST_DIR}/PC.xyz")
+        pc_edges = [
+            [5, 10],
+            [5, 12],
+            [5, 11],
+            [5, 3],
+            [3, 7],
+            [3, 4],
+            [3, 0],
+            [4, 8],
+            [4, 9],
+            [4, 1],
+            [6, 1],
+            [6, 0],
+            [6, 2],
+        ]
+        pc_graph = MoleculeGraph.from_edges(pc, {(edge[0], edge[1]): None for edge in pc_edges})
+        self.fragments = [frag for frags in pc_graph.build_unique_fragments().values() for frag in frags]
+
+        # same fragments with the sites in reverse order
+        self.reversed_fragments = []
+        for frag in self.fragments:
+            reversed_frag = copy.deepcopy(frag)
+            order = {tuple(site.coords): -idx for idx, site in enumerate(frag.molecule)}
+            reversed_frag.sort(key=lambda site, order=order: order[tuple(site.coords)])
+            self.reversed_fragments.append(reversed_frag)
+
+    def test_insert_query(self):
+        index = GraphHashIndex(self.fragments)
+        assert len(index) == len(self.fragments) == 295
+        assert index.insert(self.fragments[10]) == 10
+        assert index.query_many(self.reversed_fragments) == list(range(295))
+        assert index.insert_many(self.reversed_fragments) == list(range(295))
+        assert len(index) == 295
+        assert self.reversed_fragments[3] in index
+        assert index.get_hash(self.reversed_fragments[3]) == index.hashes[3]
+
+        # the index keeps the first of each set of equivalent graphs
+        index = GraphHashIndex(self.reversed_fragments[:5] + self.fragments, n_jobs=2)
+        assert len(index) == 295
+        assert index.graphs[:5] == self.reversed_fragments[:5]
+        assert index.query(self.fragments[5]) == 5
+
+        index = GraphHashIndex(self.fragments[:10])
+        assert index.query_many(self.fragments[5:15], n_jobs=2) == [5, 6, 7, 8, 9, None, None, None, None, None]
+
+    def test_structure_graphs(self):
+        structure = Structure.from_file(f"{TEST_FILES_DIR}/command_line/critic2/MoS2.cif")
+        mos2_sg = StructureGraph.from_local_env_strategy(structure, MinimumDistanceNN())
+        index = GraphHashIndex([mos2_sg, mos2_sg * (2, 1, 1)])
+        assert len(index) == 2
+
+        # equivalent up to the order of the sites and their periodic images
+        shifted = structure.copy()
+        shifted.translate_sites([0], [1, 0, 0], to_unit_cell=False)
+        shifted = Structure.from_sites(shifted[::-1])
+        assert index.query(StructureGraph.from_local_env_strategy(shifted, MinimumDistanceNN())) == 0
+
+        # a molecule graph is never equivalent to a structure graph
+        assert self.fragments[0] not in index
+        assert index.insert(self.fragments[0]) == 2
+
+    def test_structure_graph_images(self):
+        # same quotient graph, but a 3D network and a layer
+        structure = Structure(Lattice.cubic(3), ["Po"], [[0, 0, 0]])
+        cubic = StructureGraph.from_edges(
+            structure, {(0, 0, (0, 0, 0), image): None for image in [(1, 0, 0), (0, 1, 0), (0, 0, 1)]}
+        )
+        layer = StructureGraph.from_edges(
+            structure, {(0, 0, (0, 0, 0), image): None for image in [(1, 0, 0), (0, 1, 0), (1, 1, 0)]}
+        )
+        assert cubic != layer
+        index = GraphHashIndex([cubic])
+        assert index.get_hash(cubic) != index.get_hash(layer)
+        assert index.query(layer) is None
+        assert index.insert(layer) == 1
+
+        # a chain along a is distinct from a chain along a + b, but not from
+        # the same chain with the origin of a site shifted
+        structure = Structure(Lattice.cubic(3), ["Po", "Po"], [[0, 0, 0], [0.5, 0, 0]])
+        chain = StructureGraph.from_edges(
+            structure, {(0, 1, (0, 0, 0), (0, 0, 0)): None, (1, 0, (0, 0, 0), (1, 0, 0)): None}
+        )
+        zigzag = StructureGraph.from_edges(
+            structure, {(0, 1, (0, 0, 0), (0, 0, 0)): None, (1, 0, (0, 0, 0), (1, 1, 0)): None}
+        )
+        shifted_chain = StructureGraph.from_edges(
+            structure, {(0, 1, (0, 0, 0), (0, 1, 0)): None, (1, 0, (0, 0, 0), (1, -1, 0)): None}
+        )
+        index = GraphHashIndex([chain])
+        assert index.query(zigzag) is None
+        assert index.query(shifted_chain) == 0
+
+    def test_as_from_dict(self):
+        index = GraphHashIndex(self.fragments[:20])
+        new_index = GraphHashIndex.from_dict(index.as_dict())
+        assert new_index.hashes == index.hashes
+        assert new_index.graphs == index.graphs
+        assert new_index.query_many(self.reversed_fragments[15:25]) == [
+            15,
+            16,
+            17,
+            18,
+            19,
+            None,
+            None,
+            None,
+            None,
+            None,
+        ]
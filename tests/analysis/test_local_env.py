@@ -6,7 +6,7 @@ from typing import get_args
 
 import numpy as np
 import pytest
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_array_equal
 from pymatgen.analysis.graphs import MoleculeGraph, StructureGraph
 from pymatgen.analysis.local_env import (
     BrunnerNNReal,
@@ -28,6 +28,7 @@ from pymatgen.analysis.local_env import (
     ValenceIonicRadiusEvaluator,
     VoronoiNN,
     get_neighbors_of_site_with_index,
+    get_voronoi_tessellation,
     metal_edge_extender,
     on_disorder_options,
     oxygen_edge_extender,
@@ -193,6 +194,37 @@ class TestVoronoiNN(PymatgenTest):
 
             assert_allclose(all_weights, by_one_weights)
 
+    def test_voronoi_tessellation(self):
+        tessellation = get_voronoi_tessellation(self.struct, 13)
+        assert_array_equal(tessellation.points[tessellation.root_points, 0], range(len(self.struct)))
+        assert not tessellation.points[tessellation.root_points, 1:].any()
+        assert_allclose(tessellation.coords[tessellation.root_points], self.struct.cart_coords)
+        assert not tessellation.coords.flags.writeable
+
+        # Structures with the same lattice and positions share the tessellation
+        assert get_voronoi_tessellation(self.struct.copy(), 13) is tessellation
+        assert get_voronoi_tessellation(self.struct, 10) is not tessellation
+
+        # A single site is tessellated with its neighbors only, which gives the same polyhedron
+        subset = get_voronoi_tessellation(self.struct, 13, indices=[3])
+        assert get_voronoi_tessellation(self.struct, 13, indices=[3]) is not subset
+        assert len(subset.points) < len(tessellation.points)
+        assert subset.root_points[3] >= 0
+        assert_array_equal(subset.points[subset.root_points[3]], [3, 0, 0, 0])
+
+        self.nn.cutoff = 11
+        all_sites = self.nn.get_all_voronoi_polyhedra(self.struct)
+        by_one = self.nn.get_voronoi_polyhedra(self.struct, 3)
+
+        def get_facets(polyhedron):
+            return sorted(
+                (info["site"].index, info["site"].image, round(info["solid_angle"], 6)) for info in polyhedron
+            )
+
+        assert get_facets(by_one.values()) == get_facets(all_sites[3].values())
+        for nn_info in by_one.values():
+            assert nn_info["site"].is_periodic_image(self.struct[nn_info["site"].index])
+
     def test_Cs2O(self):
         """A problematic structure in the Materials Project."""
         struct = Structure(
@@ -1215,6 +1247,32 @@ class TestCrystalNN(PymatgenTest):
 
         assert_allclose(expected_array, cn_array, 2)
 
+    def test_get_all_nn_info(self):
+        def nn_keys(nn_info):
+            return sorted((entry["site_index"], tuple(map(int, entry["image"])), entry["weight"]) for entry in nn_info)
+
+        struct = self.lifepo4.copy()
+        struct.translate_sites([0, 5], [1.2, -0.3, 2])
+        for cnn in (CrystalNN(), CrystalNN(weighted_cn=True, cation_anion=True)):
+            all_nn_info = cnn.get_all_nn_info(struct)
+            assert len(all_nn_info) == len(struct)
+            for idx, nn_info in enumerate(all_nn_info):
+                assert nn_keys(nn_info) == nn_keys(cnn.get_nn_info(struct, idx))
+                for entry in nn_info:
+                    assert entry["site"].index == entry["site_index"]
+                    assert entry["site"].is_periodic_image(struct[entry["site_index"]])
+                    assert entry["site"].nn_distance == approx(
+                        np.linalg.norm(entry["site"].coords - struct[idx].coords)
+                    )
+
+        all_nn_data = CrystalNN(fingerprint_length=30).get_all_nn_data(self.lifepo4)
+        assert all(len(nn_data.cn_weights) == 30 for nn_data in all_nn_data)
+
+        cnn = CrystalNN()
+        he_all_nn_info = cnn.get_all_nn_info_many([self.lifepo4, self.he_bcc], n_jobs=2)
+        assert [len(nn_info) for nn_info in he_all_nn_info[0]] == 8 * [6] + 20 * [4]
+        assert he_all_nn_info[1] == [[]]
+
     def test_fixed_length(self):
         cnn = CrystalNN(fingerprint_length=30)
         nn_data = cnn.get_nn_data(self.lifepo4, 0)
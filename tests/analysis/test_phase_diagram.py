@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import collections
+import copy
+import pickle
 import unittest
 import unittest.mock
 from numbers import Number
@@ -31,6 +33,7 @@ from pymatgen.entries.computed_entries import ComputedEntry
 from pymatgen.entries.entry_tools import EntrySet
 from pymatgen.util.testing import TEST_FILES_DIR, PymatgenTest
 from pytest import approx
+from scipy.spatial import QhullError
 
 TEST_DIR = f"{TEST_FILES_DIR}/analysis"
 
@@ -286,6 +289,74 @@ class TestPhaseDiagram(PymatgenTest):
             " LiFeO2, Li, Li2O, LiO, Li5FeO4, Li2FeO3, O"
         )
 
+    def test_add_entries(self):
+        entries = list(self.entries)
+        new_entries = [
+            PDEntry("Li3FeO4", -45),
+            PDEntry("LiFe2O3", -38),
+            PDEntry("LiFeO2", -25.5),
+            PDEntry("Fe2O3", -34),
+        ]
+        pd = PhaseDiagram(entries)
+        pd.add_entries(new_entries[:2])
+        # the incremental qhull is dropped when pickling or copying and rebuilt by the next add_entries
+        pd = copy.deepcopy(pickle.loads(pickle.dumps(pd)))
+        pd.add_entries(new_entries[2:])
+        expected = PhaseDiagram(entries + new_entries)
+        assert pd.stable_entries == expected.stable_entries
+        assert pickle.loads(pickle.dumps(pd)).stable_entries == expected.stable_entries
+        assert copy.deepcopy(pd).stable_entries == expected.stable_entries
+        assert {*new_entries[:3:2]} <= pd.stable_entries
+        assert pd.unstable_entries == expected.unstable_entries
+        assert len(pd.facets) == len(expected.facets)
+        for entry in entries + new_entries:
+            assert pd.get_e_above_hull(entry) == approx(expected.get_e_above_hull(entry))
+
+        # qhull errors in the incremental update fall back to a full recomputation
+        rebuilt_pd = PhaseDiagram(entries)
+        rebuilt_pd.add_entries(new_entries[:2])
+        with unittest.mock.patch.object(rebuilt_pd._qhull, "add_points", side_effect=QhullError("QH6347")):
+            rebuilt_pd.add_entries(new_entries[2:])
+        assert rebuilt_pd._qhull is None
+        assert rebuilt_pd.stable_entries == expected.stable_entries
+        rebuilt_pd.add_entries([PDEntry("Li5FeO4", -55)])
+        expected_entries = [*entries, *new_entries, PDEntry("Li5FeO4", -55)]
+        assert rebuilt_pd.stable_entries == PhaseDiagram(expected_entries).stable_entries
+
+        # a lower elemental reference triggers a full recomputation
+        pd.add_entries([PDEntry("Li", -2)])
+        assert len(pd.stable_entries) == len(PhaseDiagram([*entries, *new_entries, PDEntry("Li", -2)]).stable_entries)
+
+        with pytest.raises(ValueError, match="has elements not in the phase diagram"):
+            pd.add_entries([PDEntry("LiMnO2", -10)])
+
+    def test_get_batch_decomp_and_hull_energy_per_atom(self):
+        comps = [entry.composition for entry in self.pd.all_entries] + [Composition("Li3Fe2O5")]
+        decomp_indices, decomp_amounts, hull_energies = self.pd.get_batch_decomp_and_hull_energy_per_atom(comps)
+        assert decomp_indices.shape == decomp_amounts.shape == (len(comps), 3)
+        for comp, indices, amounts, hull_energy in zip(comps, decomp_indices, decomp_amounts, hull_energies):
+            decomp, expected = self.pd.get_decomp_and_hull_energy_per_atom(comp)
+            assert hull_energy == approx(expected)
+            assert {self.pd.qhull_entries[idx]: amt for idx, amt in zip(indices, amounts) if amt} == approx(decomp)
+
+        coords = np.array([self.pd.pd_coords(comp) for comp in comps[:5]] + [[0.9, 0.9]])
+        *_, hull_energies_from_coords = self.pd.get_batch_decomp_and_hull_energy_per_atom(coords)
+        assert_allclose(hull_energies_from_coords[:5], hull_energies[:5])
+        assert np.isnan(hull_energies_from_coords[5])
+
+    def test_get_batch_e_above_hull(self):
+        entries = self.pd.all_entries
+        assert_allclose(
+            self.pd.get_batch_e_above_hull(entries), [self.pd.get_e_above_hull(e) for e in entries], atol=1e-12
+        )
+
+        entries = [*entries[:5], PDEntry("Li2O", -100)]
+        with pytest.raises(ValueError, match="No valid decomposition found for PDEntry : Li2 O1"):
+            self.pd.get_batch_e_above_hull(entries)
+        e_above_hull = self.pd.get_batch_e_above_hull(entries, on_error="ignore")
+        assert np.isnan(e_above_hull[5])
+        assert self.pd.get_batch_e_above_hull(entries, allow_negative=True)[5] < 0
+
     def test_get_e_above_hull(self):
         for entry in self.pd.all_entries:
             for entry in self.pd.stable_entries:
@@ -771,6 +842,14 @@ class TestPatchedPhaseDiagram(TestCase):
             assert decomp_pd == decomp_ppd
             assert np.isclose(e_above_hull_pd, e_above_hull_ppd)
 
+    def test_get_batch_e_above_hull(self):
+        entries = [entry for entry in self.entries if entry is not self.no_patch_entry]
+        e_above_hull = self.ppd.get_batch_e_above_hull(entries)
+        assert_allclose(e_above_hull, [self.pd.get_e_above_hull(entry) for entry in entries], atol=1e-10)
+
+        # novel compositions are not stitched across patches
+        assert np.isnan(self.ppd.get_batch_e_above_hull(self.novel_entries, on_error="ignore")).all()
+
     def test_repr(self):
         assert repr(self.ppd) == str(self.ppd) == "PatchedPhaseDiagram covering 15 sub-spaces"
 
@@ -783,6 +862,47 @@ class TestPatchedPhaseDiagram(TestCase):
         # test round-trip dict serialization
         assert PatchedPhaseDiagram.from_dict(ppd_dict).as_dict() == ppd_dict
 
+    def test_from_dict_computed_data(self):
+        ppd_dict = self.ppd.as_dict()
+        with unittest.mock.patch("pymatgen.analysis.phase_diagram.ConvexHull") as mock_hull:
+            ppd = PatchedPhaseDiagram.from_dict(ppd_dict)
+        mock_hull.assert_not_called()
+        assert ppd.spaces == self.ppd.spaces
+        assert ppd.stable_entries == self.ppd.stable_entries
+        for entry in self.pd.all_entries:
+            assert ppd.get_e_above_hull(entry) == approx(self.ppd.get_e_above_hull(entry))
+
+    def test_n_jobs(self):
+        ppd = PatchedPhaseDiagram(entries=self.entries, n_jobs=2)
+        assert ppd.spaces == self.ppd.spaces
+        assert ppd.stable_entries == self.ppd.stable_entries
+        # the patches are built on the original entries, not on copies
+        entry_ids = {id(entry) for entry in self.entries}
+        assert all(id(entry) in entry_ids for pd in ppd.pds.values() for entry in pd.all_entries)
+        ppd = PatchedPhaseDiagram.from_dict(ppd.as_dict())
+        assert ppd.spaces == self.ppd.spaces
+        assert ppd.stable_entries == self.ppd.stable_entries
+
+    def test_add_entries(self):
+        new_entries = [PDEntry("VPO4", -60), PDEntry("V2C", -30), PDEntry("CHO", -40), PDEntry("HVCPO2", -200)]
+        self.ppd.add_entries(new_entries[:3])
+        expected = PatchedPhaseDiagram([*self.entries, *new_entries[:3]])
+        assert self.ppd.spaces == expected.spaces
+        assert self.ppd.stable_entries == expected.stable_entries
+        assert {*new_entries[:3]} <= self.ppd.stable_entries
+        ppd = pickle.loads(pickle.dumps(self.ppd))
+        assert ppd.stable_entries == expected.stable_entries
+        ppd.add_entries(new_entries[3:])
+        assert ppd.stable_entries == PatchedPhaseDiagram([*self.entries, *new_entries]).stable_entries
+
+        # an entry outside every patch replaces the patches of its subspaces
+        self.ppd.add_entries(new_entries[3:])
+        expected = PatchedPhaseDiagram([*self.entries, *new_entries])
+        assert len(self.ppd.spaces) == 1
+        assert self.ppd.stable_entries == expected.stable_entries
+        for entry in [*self.entries, *new_entries]:
+            assert self.ppd.get_e_above_hull(entry) == approx(expected.get_e_above_hull(entry))
+
     def test_get_pd_for_entry(self):
         for entry in self.ppd.all_entries:
             if entry == self.no_patch_entry:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import json
 
 import numpy as np
@@ -316,6 +317,49 @@ class TestStructureMatcher(PymatgenTest):
         out = sm.group_structures(self.struct_list, anonymous=True)
         assert list(map(len, out)) == [4, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1]
 
+    def test_group_structures_prefilter(self):
+        sm = StructureMatcher()
+        expected = [[id(struct) for struct in group] for group in sm.group_structures(self.struct_list)]
+        for kwargs in ({"prefilter": True}, {"prefilter": ["lattice"], "n_jobs": 2}):
+            out = sm.group_structures(self.struct_list, **kwargs)
+            assert [[id(struct) for struct in group] for group in out] == expected
+
+        # strained copies close to the tolerances are grouped as without prefiltering
+        rng = np.random.default_rng(0)
+        strained = []
+        for struct in self.struct_list[:4]:
+            for _ in range(5):
+                strain = np.eye(3) + rng.normal(0, 0.1, (3, 3))
+                strained.append(Structure(Lattice(struct.lattice.matrix @ strain), struct.species, struct.frac_coords))
+        for scale in (True, False):
+            sm = StructureMatcher(scale=scale)
+            expected = [[id(struct) for struct in group] for group in sm.group_structures(strained)]
+            out = sm.group_structures(strained, prefilter=True)
+            assert [[id(struct) for struct in group] for group in out] == expected
+
+        out = sm.group_structures(self.struct_list, anonymous=True, prefilter=True)
+        assert list(map(len, out)) == [4, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1]
+
+        with pytest.raises(ValueError, match="Unknown prefilter invariants"):
+            sm.group_structures(self.struct_list, prefilter=["volume"])
+
+    def test_get_rms_dist_matrix(self):
+        sm = StructureMatcher()
+        structures = [*self.struct_list[:4], *self.oxi_structs]
+        matrix = sm.get_rms_dist_matrix(structures)
+        assert matrix.shape == (6, 6)
+        for idx, jdx in itertools.combinations_with_replacement(range(6), 2):
+            expected = sm.get_rms_dist(structures[idx], structures[jdx])
+            if expected is None:
+                assert matrix[idx, jdx] is None
+            else:
+                assert_allclose(matrix[idx, jdx], expected)
+            assert matrix[jdx, idx] == matrix[idx, jdx]
+        assert matrix[0, 4] is None
+
+        dists = sm.get_rms_dist_matrix(structures, n_jobs=2, sparse=True)
+        assert set(dists) == {(idx, jdx) for idx, jdx in zip(*np.triu_indices(6)) if matrix[idx, jdx] is not None}
+
     def test_mix(self):
         structures = list(map(self.get_structure, ["Li2O", "Li2O2", "LiFePO4"]))
         structures += [Structure.from_file(f"{VASP_IN_DIR}/{fname}") for fname in ["POSCAR_Li2O", "POSCAR_LiFePO4"]]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import json
+import shutil
+import time
+
+import pytest
 from pymatgen.apps.borg.hive import VaspToComputedEntryDrone
-from pymatgen.apps.borg.queen import BorgQueen
+from pymatgen.apps.borg.queen import BorgQueen, order_assimilation
 from pymatgen.util.testing import TEST_FILES_DIR
 from pytest import approx
 
@@ -12,6 +17,17 @@ __date__ = "Mar 18, 2012"
 TEST_DIR = f"{TEST_FILES_DIR}/apps/borg"
 
 
+class FailingDrone(VaspToComputedEntryDrone):
+    """Drone raising on paths containing "bad" and hanging on paths containing "slow"."""
+
+    def assimilate(self, path):
+        if "bad" in path:
+            raise ValueError("cannot assimilate")
+        if "slow" in path:
+            time.sleep(10)
+        return super().assimilate(path)
+
+
 class TestBorgQueen:
     def test_get_data(self):
         """Test get data from vasprun.xml.xe.gz file."""
@@ -26,3 +42,47 @@ class TestBorgQueen:
         queen = BorgQueen(drone)
         queen.load_data(f"{TEST_DIR}/assimilated.json")
         assert len(queen.get_data()) == 1
+
+    def test_parallel_assimilate_checkpoint(self, tmp_path):
+        for dirname in ("run1", "run2"):
+            (tmp_path / "root" / dirname).mkdir(parents=True)
+            shutil.copy(f"{TEST_DIR}/vasprun.xml.xe.gz", tmp_path / "root" / dirname)
+        checkpoint = f"{tmp_path}/checkpoint.jsonl"
+
+        queen = BorgQueen(VaspToComputedEntryDrone(), number_of_drones=2)
+        queen.parallel_assimilate(f"{tmp_path}/root", checkpoint=checkpoint)
+        assert len(queen.get_data()) == 2
+        with open(checkpoint) as file:
+            records = [json.loads(line) for line in file]
+        assert sorted(record["path"] for record in records) == [f"{tmp_path}/root/run{idx}" for idx in (1, 2)]
+
+        # a resumed run reads back completed paths without assimilating them again
+        queen = BorgQueen(FailingDrone(), number_of_drones=2)
+        (tmp_path / "root" / "run3").mkdir()
+        shutil.copy(f"{TEST_DIR}/vasprun.xml.xe.gz", tmp_path / "root" / "run3")
+        assert len(list(queen.iter_assimilate(f"{tmp_path}/root", checkpoint=checkpoint))) == 1
+        queen.parallel_assimilate(f"{tmp_path}/root", checkpoint=checkpoint)
+        assert len(queen.get_data()) == 3
+        assert all(entry.energy == approx(0.5559329, 1e-6) for entry in queen.get_data())
+
+    def test_iter_assimilate_failures(self, tmp_path):
+        for dirname in ("good", "bad", "slow"):
+            (tmp_path / dirname).mkdir()
+            shutil.copy(f"{TEST_DIR}/vasprun.xml.xe.gz", tmp_path / dirname)
+        checkpoint = f"{tmp_path}/checkpoint.jsonl"
+
+        queen = BorgQueen(FailingDrone())
+        data = list(queen.iter_assimilate(str(tmp_path), checkpoint=checkpoint, timeout=0.5))
+        assert len(data) == 1
+        with open(checkpoint) as file:
+            errors = {json.loads(line)["path"].rsplit("/", 1)[-1]: json.loads(line)["error"] for line in file}
+        assert errors["good"] is None
+        assert errors["bad"] == "ValueError: cannot assimilate"
+        assert errors["slow"].startswith("TimeoutError")
+
+    def test_order_assimilation(self):
+        data, status = [], {"count": 0, "total": 1}
+        with pytest.warns(FutureWarning, match="parallel_assimilate"):
+            order_assimilation((TEST_DIR, VaspToComputedEntryDrone(), data, status))
+        assert len(data) == 1
+        assert status["count"] == 1
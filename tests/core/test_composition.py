@@ -391,6 +391,13 @@ class TestComposition(PymatgenTest):
             assert correct_wt_frac[el] == approx(self.comps[0].get_wt_fraction(el)), "Wrong computed weight fraction"
         assert self.comps[0].get_wt_fraction(Element("S")) == 0, "Wrong computed weight fractions"
 
+    def test_get_property_array(self):
+        comp = self.comps[0]
+        assert_allclose(comp.get_property_array("X"), [el.X for el in comp.elements])
+        assert_allclose(comp.get_property_array("atomic_mass"), [el.atomic_mass for el in comp.elements])
+        comp = Composition({"Fe2+": 1, "Fe3+": 2, "O2-": 4})
+        assert_allclose(comp.get_property_array("ionic_radius"), [0.92, 0.785, 1.26])
+
     def test_from_dict(self):
         sym_dict = {"Fe": 6, "O": 8}
         assert Composition.from_dict(sym_dict).reduced_formula == "Fe3O4", "Creation form sym_amount dictionary failed!"
@@ -471,6 +478,27 @@ class TestComposition(PymatgenTest):
     def test_div(self):
         assert (self.comps[0] / 4).formula == "Li0.75 Fe0.5 P0.75 O3"
 
+    def test_arithmetic_mixed_species(self):
+        # amounts of a species and the element it belongs to are kept separate
+        comp = Composition({"Fe2+": 1, "Fe": 1, "O": 2})
+        assert comp + {} == comp
+        assert comp + Composition("Fe") == Composition({"Fe2+": 1, "Fe": 2, "O": 2})
+        assert comp * 2 == Composition({"Fe2+": 2, "Fe": 2, "O": 4})
+        assert (comp - Composition("Fe")).elements == [Species("Fe2+"), Element("O")]
+        assert comp.almost_equals(Composition({"Fe2+": 1.01, "Fe": 1, "O": 2}))
+        assert not comp.almost_equals(Composition({"Fe": 2, "O": 2}))
+
+    def test_cached_properties(self):
+        comp = Composition("Li3Fe2(PO4)3")
+        assert Composition._parse_formula("Li3Fe2(PO4)3") is Composition._parse_formula("Li3Fe2(PO4)3")
+        assert comp.reduced_formula is comp.reduced_formula
+        assert comp.reduced_composition is comp.reduced_composition
+        assert comp.fractional_composition is comp.fractional_composition
+        assert hash(comp) == hash(Composition("Li6Fe4P6O24"))
+        # results are not shared between compositions parsed from the same formula
+        assert Composition("Li3Fe2(PO4)3") is not comp
+        assert Composition("Li3Fe2(PO4)3").reduced_composition is not comp.reduced_composition
+
     def test_equals(self):
         # generate randomized compositions for robustness (tests might pass for specific elements
         # but fail for others)
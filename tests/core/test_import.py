@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Upper bound in seconds on the cumulative time to import pymatgen.core as reported by
+# python -X importtime. Generous to account for slow CI runners.
+IMPORT_TIME_BUDGET = 1.5
+
+# Heavy dependencies that must only be imported by the code using them
+LAZY_MODULES = (
+    "ase",
+    "networkx",
+    "pandas",
+    "pymatgen.io.cif",
+    "pymatgen.symmetry.maggroups",
+    "scipy.spatial",
+    "spglib",
+    "sympy",
+)
+
+
+def _import_pymatgen_core(*flags: str) -> subprocess.CompletedProcess:
+    code = "import sys, pymatgen.core; print(*sorted(sys.modules))"
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True)
+
+
+def test_lazy_imports():
+    imported = set(_import_pymatgen_core().stdout.split())
+    assert imported.isdisjoint(LAZY_MODULES), f"{sorted(imported & set(LAZY_MODULES))} imported eagerly"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows process startup is too slow and variable")
+def test_import_time():
+    # stderr lines are "import time: self [us] | cumulative | imported package"
+    stderr = _import_pymatgen_core("-X", "importtime").stderr
+    cumulative_us = next(
+        int(line.split("|")[1]) for line in stderr.splitlines() if line.split("|")[-1].strip() == "pymatgen.core"
+    )
+    assert cumulative_us / 1e6 < IMPORT_TIME_BUDGET
@@ -272,6 +272,8 @@ class TestLattice(PymatgenTest):
 
         lattice = Lattice.orthorhombic(9, 9, 5)
         assert len(list(lattice.find_all_mappings(lattice))) == 16
+        lattice_points = lattice.get_points_in_sphere([[0, 0, 0]], [0, 0, 0], 20, zip_results=False)[0]
+        assert len(list(lattice.find_all_mappings(lattice, lattice_points=lattice_points))) == 16
 
         # catch the singular matrix error
         lattice = Lattice.from_parameters(1, 1, 1, 10, 10, 10)
@@ -9,7 +9,7 @@ from enum import Enum
 import numpy as np
 import pytest
 from pymatgen.core import DummySpecies, Element, Species, get_el_sp
-from pymatgen.core.periodic_table import ElementBase, ElementType
+from pymatgen.core.periodic_table import ElementBase, ElementType, property_array
 from pymatgen.core.units import Ha_to_eV
 from pymatgen.io.core import ParseError
 from pymatgen.util.testing import PymatgenTest
@@ -625,6 +625,20 @@ def test_get_el_sp():
         get_el_sp(None)
 
 
+def test_property_array():
+    electronegativities = property_array("X")
+    assert electronegativities.shape == (119,)
+    assert not electronegativities.flags.writeable
+    assert property_array("X") is electronegativities
+    assert np.isnan(electronegativities[0])
+    for el in (Element.H, Element.Fe, Element.He, Element.Og):
+        assert electronegativities[el.Z] == approx(el.X, nan_ok=True)
+    assert property_array("atomic_radius")[26] == approx(1.4)
+
+    with pytest.raises(AttributeError, match="Element has no attribute foo"):
+        property_array("foo")
+
+
 def test_element_type():
     assert isinstance(ElementType.actinoid, Enum)
     assert isinstance(ElementType.metalloid, Enum)
@@ -14,6 +14,7 @@ from monty.json import MontyDecoder, MontyEncoder
 from numpy.testing import assert_allclose, assert_array_equal
 from pymatgen.core import SETTINGS, Composition, Element, Lattice, Species
 from pymatgen.core.operations import SymmOp
+from pymatgen.core.sites import PeriodicSite
 from pymatgen.core.structure import (
     IMolecule,
     IStructure,
@@ -311,6 +312,16 @@ class TestIStructure(PymatgenTest):
         assert self.propertied_structure[0].magmom == 5
         assert self.propertied_structure[1].magmom == -5
 
+    def test_get_property_array(self):
+        assert_allclose(self.V2O3.get_property_array("X"), [site.specie.X for site in self.V2O3])
+        assert_allclose(self.V2O3.get_property_array("atomic_mass"), [site.specie.atomic_mass for site in self.V2O3])
+
+        species = [{"Fe2+": 0.5, "Fe3+": 0.5}, "O2-", {"Fe2+": 0.5}]
+        struct = IStructure(self.lattice, species, [[0, 0, 0], [0.75, 0.5, 0.75], [0.5, 0.5, 0.5]])
+        fe2_radius, fe3_radius = Species("Fe", 2).ionic_radius, Species("Fe", 3).ionic_radius
+        assert_allclose(struct.get_property_array("ionic_radius"), [(fe2_radius + fe3_radius) / 2, 1.26, fe2_radius])
+        assert_allclose(struct.get_property_array("X"), [Element.Fe.X, Element.O.X, Element.Fe.X])
+
     def test_properties_dict(self):
         assert self.propertied_structure.properties == {"test_property": "test"}
 
@@ -677,6 +688,23 @@ Direct
             assert_allclose(cy_indices2, py_indices2)
             assert len(cy_offsets) == len(py_offsets)
 
+    def test_get_batch_neighbor_list(self):
+        structures = [self.struct, self.get_structure("LiFePO4"), self.get_structure("Graphite")]
+        structures[2].perturb(0.01)
+        indices = np.cumsum([0] + [len(struct) for struct in structures])
+        for n_jobs in (1, 2):
+            batch = IStructure.get_batch_neighbor_list(structures, 3, n_jobs=n_jobs)
+            assert len(batch[0]) == sum(len(struct.get_neighbor_list(3)[0]) for struct in structures)
+            for idx, struct in enumerate(structures):
+                in_struct = (batch[0] >= indices[idx]) & (batch[0] < indices[idx + 1])
+                center_indices, points_indices, offsets, distances = struct.get_neighbor_list(3)
+                assert_array_equal(batch[0][in_struct] - indices[idx], center_indices)
+                assert_array_equal(batch[1][in_struct] - indices[idx], points_indices)
+                assert_array_equal(batch[2][in_struct], offsets)
+                assert_array_equal(batch[3][in_struct], distances)
+
+        assert [len(arr) for arr in IStructure.get_batch_neighbor_list([], 3)] == [0, 0, 0, 0]
+
     # @skipIf(not os.getenv("CI"), reason="Only run this in CI tests")
     # def test_get_all_neighbors_crosscheck_old(self):
     #     for i in range(100):
@@ -1346,6 +1374,44 @@ class TestStructure(PymatgenTest):
         assert len(self.struct) == orig_len
         assert len(supercell) == 2 * orig_len
 
+    def test_site_arrays(self):
+        struct = self.struct.copy()
+        struct.make_supercell([2, 1, 1])
+        frac_coords = struct.frac_coords
+        frac_coords[0] = 0.9
+        assert_allclose(struct.frac_coords, [site.frac_coords for site in struct])
+
+        # arrays follow sites modified directly, including in place
+        struct[0].frac_coords[0] = 0.25
+        assert struct.frac_coords[0][0] == approx(0.25)
+        assert struct.distance_matrix[0, 1] == approx(struct[0].distance(struct[1]))
+        struct.sites[3] = PeriodicSite("Si", [0.3, 0.2, 0.1], struct.lattice)
+        assert_allclose(struct.frac_coords[3], [0.3, 0.2, 0.1])
+        struct[1].frac_coords = [0.1, 0.2, 0.3]
+        struct[2].x = 1.5
+        for _ in range(2):
+            assert_allclose(struct.frac_coords, [site.frac_coords for site in struct])
+            assert_allclose(struct.cart_coords, [site.coords for site in struct])
+        assert_allclose(struct.frac_coords[1], [0.1, 0.2, 0.3])
+        assert struct.cart_coords[2][0] == approx(1.5)
+
+        struct[0] = "Fe"
+        assert struct.atomic_numbers == (26, 14, 14, 14)
+        struct.sort(reverse=True)
+        assert struct.atomic_numbers == (14, 14, 14, 26)
+        struct.insert(0, "O", [0.5, 0.5, 0.5])
+        del struct[1]
+        assert struct.atomic_numbers == (8, 14, 14, 26)
+        assert_allclose(struct.frac_coords[0], [0.5, 0.5, 0.5])
+
+        struct.translate_sites([0, 1], [0.1, 0.2, 0.3])
+        struct.translate_sites([], [0.1, 0.2, 0.3], frac_coords=False)
+        struct.apply_operation(SymmOp.from_axis_angle_and_translation([0, 0, 1], 30), fractional=False)
+        struct.lattice = struct.lattice.scale(2 * struct.volume)
+        assert_allclose(struct.frac_coords, [site.frac_coords for site in struct])
+        assert_allclose(struct.cart_coords, [site.coords for site in struct])
+        assert_allclose(struct.distance_matrix, Structure.from_sites(struct).distance_matrix)
+
     def test_make_supercell_labeled(self):
         struct = self.labeled_structure.copy()
         struct.make_supercell([1, 1, 2])
@@ -311,6 +311,36 @@ class TestVasprun(PymatgenTest):
         assert entry.entry_id.startswith("vasprun")
         assert entry.parameters["run_type"] == "PBEO or other Hybrid Functional"
 
+    def test_lazy(self):
+        filepath = f"{VASP_OUT_DIR}/vasprun.xml.gz"
+        vasp_run = Vasprun(filepath, parse_potcar_file=False)
+        vasp_run_lazy = Vasprun(filepath, parse_potcar_file=False, lazy=True)
+        assert "eigenvalues" not in vasp_run_lazy.__dict__
+        assert vasp_run_lazy.nionic_steps == vasp_run.nionic_steps == 29
+        assert len(vasp_run_lazy.ionic_steps) == 29
+        assert vasp_run_lazy.final_energy == approx(vasp_run.final_energy)
+        assert vasp_run_lazy.structures == vasp_run.structures
+        assert vasp_run_lazy.ionic_steps[3]["electronic_steps"] == vasp_run.ionic_steps[3]["electronic_steps"]
+        assert vasp_run_lazy.ionic_steps[-2:][0]["forces"] == vasp_run.ionic_steps[-2]["forces"]
+        with pytest.raises(IndexError):
+            vasp_run_lazy.ionic_steps[29]
+
+        # DOS and eigenvalues are decoded on first access
+        assert vasp_run_lazy.efermi == approx(vasp_run.efermi)
+        assert vasp_run_lazy.tdos.densities[Spin.up] == approx(vasp_run.tdos.densities[Spin.up])
+        assert_allclose(vasp_run_lazy.eigenvalues[Spin.up], vasp_run.eigenvalues[Spin.up])
+        assert vasp_run_lazy.projected_eigenvalues is None
+        assert vasp_run_lazy.as_dict()["output"]["ionic_steps"] == vasp_run.as_dict()["output"]["ionic_steps"]
+
+        vasp_run_skip = Vasprun(filepath, 3, 6, parse_potcar_file=False, lazy=True)
+        assert vasp_run_skip.nionic_steps == 29
+        assert len(vasp_run_skip.ionic_steps) == 8
+        assert vasp_run_skip.structures[0] == vasp_run.structures[6]
+
+        vasp_run_kpts_opt = Vasprun(kpts_opt_vrun_path, parse_potcar_file=False, parse_projected_eigen=True, lazy=True)
+        assert vasp_run_kpts_opt.kpoints_opt_props.eigenvalues[Spin.up].shape == (100, 24, 2)
+        assert vasp_run_kpts_opt.projected_eigenvalues[Spin.up].shape == (10, 24, 8, 9)
+
     def test_unconverged(self):
         filepath = f"{VASP_OUT_DIR}/vasprun.unconverged.xml.gz"
         with pytest.warns(
@@ -572,6 +602,23 @@ class TestVasprun(PymatgenTest):
         assert vasp_run.projected_magnetisation.shape == (76, 240, 4, 9, 3)
         assert vasp_run.projected_magnetisation[0, 0, 0, 0, 0] == approx(-0.0712)
 
+    def test_float32_storage(self):
+        filepath = f"{VASP_OUT_DIR}/vasprun.lvel.Si2H.xml.gz"
+        vasp_run = Vasprun(filepath, parse_projected_eigen=True, parse_potcar_file=False)
+        vasp_run_32 = Vasprun(filepath, parse_projected_eigen=np.float32, parse_dos=np.float32, parse_potcar_file=False)
+        assert vasp_run_32.projected_eigenvalues[Spin.up].dtype == np.float32
+        assert vasp_run_32.projected_magnetisation.dtype == np.float32
+        assert vasp_run_32.tdos.densities[Spin.up].dtype == np.float32
+        assert_allclose(vasp_run_32.projected_eigenvalues[Spin.up], vasp_run.projected_eigenvalues[Spin.up], atol=1e-6)
+        assert_allclose(vasp_run_32.projected_magnetisation, vasp_run.projected_magnetisation, atol=1e-6)
+
+        with pytest.raises(ValueError, match="Expected True or a float dtype"):
+            Vasprun(filepath, parse_projected_eigen=np.int32, parse_potcar_file=False)
+        with pytest.raises(ValueError, match="Expected True or a float dtype"):
+            Vasprun(filepath, parse_dos=np.int32, parse_potcar_file=False)
+        with pytest.raises(ValueError, match="Expected True or a float dtype"):
+            Vasprun(filepath, parse_dos="int64", parse_potcar_file=False, lazy=True)
+
     def test_smart_efermi(self):
         # branch 1 - E_fermi does not cross a band
         vrun = Vasprun(f"{VASP_OUT_DIR}/vasprun.LiF.xml.gz")
@@ -1449,6 +1496,29 @@ class TestLocpot(PymatgenTest):
         l2 = Locpot(poscar=poscar, data=data, data_aug=None)
         assert l2.data_aug == {}
 
+    def test_npy(self):
+        filepath = f"{VASP_OUT_DIR}/LOCPOT.gz"
+        locpot = Locpot.from_file(filepath)
+        locpot.to_npy(f"{self.tmp_path}/npy")
+
+        locpot_mmap = Locpot.from_npy(f"{self.tmp_path}/npy")
+        assert isinstance(locpot_mmap.data["total"], np.memmap)
+        assert locpot_mmap.name == locpot.name
+        assert locpot_mmap.structure == locpot.structure
+        assert_allclose(locpot_mmap.data["total"], locpot.data["total"])
+        assert sum(locpot_mmap.get_average_along_axis(0)) == approx(-217.05226954)
+
+        locpot_streamed = Locpot.from_file(filepath, npy_dir=f"{self.tmp_path}/streamed")
+        assert isinstance(locpot_streamed.data["total"], np.memmap)
+        assert_allclose(locpot_streamed.data["total"], locpot.data["total"])
+        locpot_diff = locpot_streamed - Locpot.from_npy(f"{self.tmp_path}/streamed")
+        assert_allclose(locpot_diff.data["total"], 0)
+
+        locpot_streamed.write_file(f"{self.tmp_path}/LOCPOT")
+        locpot.write_file(f"{self.tmp_path}/LOCPOT_ref")
+        with open(f"{self.tmp_path}/LOCPOT") as file, open(f"{self.tmp_path}/LOCPOT_ref") as file_ref:
+            assert file.read() == file_ref.read()
+
 
 class TestChgcar(PymatgenTest):
     @classmethod
@@ -1525,6 +1595,24 @@ class TestChgcar(PymatgenTest):
         chgcar2 = Chgcar.from_hdf5(out_path)
         assert_allclose(chgcar2.data["total"], chgcar.data["total"])
 
+    def test_npy(self):
+        chgcar = Chgcar.from_file(f"{VASP_OUT_DIR}/CHGCAR.NiO_SOC.gz", npy_dir=f"{self.tmp_path}/npy")
+        assert isinstance(chgcar.data["total"], np.memmap)
+        assert_allclose(chgcar.data["diff"], self.chgcar_NiO_soc.data["diff"])
+
+        chgcar2 = Chgcar.from_npy(f"{self.tmp_path}/npy")
+        assert set(chgcar2.data) == {"total", "diff", "diff_x", "diff_y", "diff_z"}
+        assert isinstance(chgcar2.data["diff_z"], np.memmap)
+        assert_allclose(chgcar2.data["diff_z"], self.chgcar_NiO_soc.data["diff_z"])
+        assert chgcar2.data_aug == self.chgcar_NiO_soc.data_aug
+        assert_allclose(chgcar2.get_average_along_axis(2), self.chgcar_NiO_soc.get_average_along_axis(2))
+        assert chgcar2.get_integrated_diff(0, 2, 3) == approx(self.chgcar_NiO_soc.get_integrated_diff(0, 2, 3))
+
+        # Arithmetic on memory-mapped grids stays out-of-core
+        chgcar_sum = chgcar2 + chgcar2
+        assert isinstance(chgcar_sum.data["total"], np.memmap)
+        assert_allclose(chgcar_sum.data["total"], self.chgcar_NiO_soc.data["total"] * 2)
+
     def test_spin_data(self):
         for v in self.chgcar_spin.spin_data.values():
             assert v.shape == (48, 48, 48)
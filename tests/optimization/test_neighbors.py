@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
 from pymatgen.core.lattice import Lattice
-from pymatgen.optimization.neighbors import find_points_in_spheres
+from pymatgen.optimization.neighbors import (
+    NeighborListBuffer,
+    find_points_in_spheres,
+    find_points_in_spheres_batch,
+)
 from pymatgen.util.testing import PymatgenTest
 
 
@@ -60,3 +66,63 @@ class TestNeighbors(PymatgenTest):
             lattice=np.array(lattice.matrix),
         )
         assert len(nns[0]) == 4
+
+    def test_points_in_spheres_batch(self):
+        rng = np.random.default_rng(42)
+        lattices = np.array([getattr(self, name).matrix for name in self.families])
+        pbc = np.array([[1, 1, 1], [1, 1, 0], [0, 0, 0], [1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=int)
+        n_points = [5, 0, 3, 8, 1, 4]
+        batch_index = np.repeat(np.arange(len(lattices)), n_points)
+        all_coords = rng.uniform(0, 1, (len(batch_index), 3))
+        all_coords = np.einsum("ij,ijk->ik", all_coords, lattices[batch_index])
+
+        for n_jobs in (1, 3):
+            index1, index2, offsets, distances = find_points_in_spheres_batch(
+                all_coords,
+                all_coords,
+                r=12,
+                pbc=pbc,
+                lattices=lattices,
+                batch_index=batch_index,
+                center_batch_index=batch_index,
+                n_jobs=n_jobs,
+            )
+            assert_array_equal(batch_index[index1], batch_index[index2])
+            start = 0
+            for idx, n_point in enumerate(n_points):
+                coords = all_coords[start : start + n_point]
+                in_batch = batch_index[index1] == idx
+                expected = find_points_in_spheres(coords, coords, r=12, pbc=pbc[idx], lattice=lattices[idx])
+                assert_array_equal(index1[in_batch] - start, expected[0])
+                assert_array_equal(index2[in_batch] - start, expected[1])
+                assert_array_equal(offsets[in_batch], expected[2])
+                assert_array_equal(distances[in_batch], expected[3])
+                start += n_point
+
+        with pytest.raises(ValueError, match="must be sorted"):
+            find_points_in_spheres_batch(
+                all_coords, all_coords, 12, pbc, lattices, batch_index[::-1].copy(), batch_index
+            )
+
+    def test_neighbor_list_buffer(self):
+        rng = np.random.default_rng(0)
+        lattices = np.array([getattr(self, name).matrix for name in self.families])
+        pbc = np.ones((len(lattices), 3), dtype=int)
+        batch_index = np.repeat(np.arange(len(lattices)), 20)
+        all_coords = np.einsum("ij,ijk->ik", rng.uniform(0, 1, (len(batch_index), 3)), lattices[batch_index])
+        args = (all_coords, all_coords, 12, pbc, lattices, batch_index, batch_index)
+
+        buffer = NeighborListBuffer()
+        for n_jobs in (1, 3, 2):
+            expected = find_points_in_spheres_batch(*args, n_jobs=n_jobs)
+            results = find_points_in_spheres_batch(*args, n_jobs=n_jobs, buffer=buffer)
+            # the next call reuses the memory, but the arrays returned are copies
+            find_points_in_spheres(all_coords[:20], all_coords[:20], 2, pbc[0], lattices[0], buffer=buffer)
+            for array, expected_array in zip(results, expected):
+                assert_array_equal(array, expected_array)
+        assert len(buffer.capacity) == 3
+        assert min(buffer.capacity) > 0
+
+        points, centers = np.zeros((1, 3)), np.full((1, 3), 5.0)
+        empty = find_points_in_spheres(points, centers, 1, np.zeros(3, dtype=int), lattices[0], buffer=buffer)
+        assert [array.shape for array in empty] == [(0,), (0,), (0, 3), (0,)]
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import itertools
 from unittest import TestCase
 
 import numpy as np
 import pytest
+import spglib
 from numpy.testing import assert_allclose
-from pymatgen.core import Lattice, Molecule, PeriodicSite, Site, Species, Structure
+from pymatgen.core import Lattice, Molecule, PeriodicSite, Site, Species, Structure, SymmOp
 from pymatgen.io.vasp.outputs import Vasprun
 from pymatgen.symmetry.analyzer import (
     PointGroupAnalyzer,
     SpacegroupAnalyzer,
+    SymmetryDatasetCache,
     SymmetryUndetermined,
     cluster_sites,
+    get_symmetry_dataset_cache,
     iterative_symmetrize,
+    set_symmetry_dataset_cache,
 )
 from pymatgen.symmetry.structure import SymmetrizedStructure
 from pymatgen.util.testing import TEST_FILES_DIR, VASP_IN_DIR, VASP_OUT_DIR, PymatgenTest
@@ -125,6 +130,39 @@ class TestSpacegroupAnalyzer(PymatgenTest):
         ds = self.sg.get_symmetry_dataset()
         assert ds["international"] == "Pnma"
 
+    def test_analyze_many(self):
+        structures = [self.structure, self.get_structure("Si"), self.disordered_structure]
+        rows = list(SpacegroupAnalyzer.analyze_many(structures, symprec=0.001))
+        assert [row["index"] for row in rows] == [0, 1, 2]
+        for row, struct in zip(rows, structures):
+            spga = SpacegroupAnalyzer(struct, 0.001)
+            assert row["number"] == spga.get_space_group_number()
+            assert row["international"] == spga.get_space_group_symbol()
+            assert row["hall"] == spga.get_hall()
+            assert row["wyckoffs"] == list(spga.get_symmetry_dataset()["wyckoffs"])
+            assert "primitive" not in row
+
+        rows = sorted(
+            SpacegroupAnalyzer.analyze_many(structures[:2], n_jobs=2, primitive=True, conventional=True),
+            key=lambda row: row["index"],
+        )
+        for row, struct in zip(rows, structures):
+            spga = SpacegroupAnalyzer(struct)
+            assert row["primitive"] == spga.get_primitive_standard_structure()
+            assert row["conventional"] == spga.get_conventional_standard_structure()
+
+        # atoms on top of each other
+        struct = Structure(Lattice.cubic(5), ["Si", "Si"], [[0, 0, 0], [0, 0, 0.001]])
+        (row,) = SpacegroupAnalyzer.analyze_many([struct], symprec=0.1, primitive=True)
+        assert row == {
+            "index": 0,
+            "number": None,
+            "international": None,
+            "hall": None,
+            "wyckoffs": None,
+            "primitive": None,
+        }
+
     def test_init_cell(self):
         # see https://github.com/materialsproject/pymatgen/pull/3179
         li2o = Structure.from_file(f"{TEST_FILES_DIR}/cif/Li2O.cif")
@@ -378,6 +416,59 @@ class TestSpacegroupAnalyzer(PymatgenTest):
             SpacegroupAnalyzer(struct, 0.1)
 
 
+class TestSymmetryDatasetCache(PymatgenTest):
+    def setUp(self):
+        self.structure = Structure.from_file(f"{VASP_IN_DIR}/POSCAR")
+        self.cell = SpacegroupAnalyzer(self.structure)._cell
+
+    def test_get_dataset(self):
+        cache = SymmetryDatasetCache(maxsize=2)
+        dataset = cache.get_dataset(self.cell, 0.01, 5)
+        assert dataset["international"] == "Pnma"
+        # equal cells share the dataset
+        cell = SpacegroupAnalyzer(self.structure.copy())._cell
+        assert cache.get_dataset(cell, 0.01, 5) is dataset
+        assert cache.get_key(cell, 0.01, 5) == cache.get_key(self.cell, 0.01, 5)
+        assert cache.get_key(self.cell, 0.1, 5) != cache.get_key(self.cell, 0.01, 5)
+
+        # the least recently used dataset is discarded
+        cache.get_dataset(self.cell, 0.1, 5)
+        cache.get_dataset(self.cell, 0.01, 5)
+        cache.get_dataset(self.cell, 0.2, 5)
+        assert len(cache) == 2
+        assert cache.get_dataset(self.cell, 0.01, 5) is dataset
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.get_dataset(self.cell, 0.01, 5) is not dataset
+
+    def test_db(self):
+        db_path = f"{self.tmp_path}/symmetry.db"
+        dataset = SymmetryDatasetCache(db_path=db_path).get_dataset(self.cell, 0.01, 5)
+        cache = SymmetryDatasetCache(maxsize=0, db_path=db_path)
+        loaded = cache.get_dataset(self.cell, 0.01, 5)
+        assert len(cache) == 0
+        assert loaded["international"] == dataset["international"]
+        assert_allclose(loaded["std_lattice"], dataset["std_lattice"])
+        cache.clear()
+        assert SymmetryDatasetCache(maxsize=0, db_path=db_path).get_dataset(self.cell, 0.01, 5) is not None
+
+    def test_set_symmetry_dataset_cache(self):
+        default_cache = get_symmetry_dataset_cache()
+        try:
+            cache = set_symmetry_dataset_cache(maxsize=4)
+            assert get_symmetry_dataset_cache() is cache
+            spga = SpacegroupAnalyzer(self.structure)
+            assert len(cache) == 1
+            assert spga.get_symmetry_dataset() is SpacegroupAnalyzer(self.structure.copy()).get_symmetry_dataset()
+            # the refined structure is the standardized cell of the cached dataset
+            lattice, _, numbers = spglib.refine_cell(spga._cell, 0.01, 5)
+            refined = spga.get_refined_structure()
+            assert_allclose(refined.lattice.matrix, lattice)
+            assert len(refined) == len(numbers)
+        finally:
+            set_symmetry_dataset_cache(maxsize=default_cache.maxsize, db_path=default_cache.db_path)
+
+
 class TestSpacegroup(TestCase):
     def setUp(self):
         self.structure = Structure.from_file(f"{VASP_IN_DIR}/POSCAR")
@@ -601,6 +692,54 @@ class TestPointGroupAnalyzer(PymatgenTest):
         pa3 = PointGroupAnalyzer(eq["sym_mol"], tolerance=0.1)
         assert pa3.get_pointgroup().sch_symbol == "Ci"
 
+    def test_large_cluster(self):
+        # fcc nanoparticle of 321 atoms
+        lattice_points = np.array(list(itertools.product(range(-4, 5), repeat=3)))
+        basis = np.array([[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]])
+        coords = (lattice_points[:, None, :] + basis).reshape(-1, 3) * 4.08
+        coords = coords[np.linalg.norm(coords, axis=1) < 11]
+        cluster = Molecule(["Au"] * len(coords), coords)
+        pg_analyzer = PointGroupAnalyzer(cluster)
+        assert pg_analyzer.sch_symbol == "Oh"
+        assert len(pg_analyzer.get_pointgroup()) == 48
+
+        eq_sets = pg_analyzer.get_equivalent_atoms()["eq_sets"]
+        assert sum(map(len, eq_sets.values())) == len(cluster)
+        assert sorted({len(eq_set) for eq_set in eq_sets.values()}) == [1, 6, 8, 12, 24, 48]
+
+        rng = np.random.default_rng(0)
+        dist_cluster = Molecule(cluster.species, cluster.cart_coords + rng.normal(0, 0.02, (len(cluster), 3)))
+        symmetrized = PointGroupAnalyzer(dist_cluster).symmetrize_molecule()
+        assert len(symmetrized["sym_mol"]) == len(cluster)
+        assert {len(eq_set) for eq_set in symmetrized["eq_sets"].values()} == {len(v) for v in eq_sets.values()}
+
+        # the two halves of the cluster are exchanged by a mirror, but only if they have the same species
+        species = ["Au" if z > 0 else "Ag" for z in cluster.cart_coords[:, 2]]
+        assert not PointGroupAnalyzer(Molecule(species, cluster.cart_coords)).is_valid_op(SymmOp.reflection([0, 0, 1]))
+        assert pg_analyzer.is_valid_op(SymmOp.reflection([0, 0, 1]))
+        assert not pg_analyzer.is_valid_op(SymmOp.from_axis_angle_and_translation([0, 0, 1], 60))
+
+    def test_mirror_search_order(self):
+        # perturbed fcc cluster where several pairs of sites give valid mirrors
+        coords = np.array([p for p in itertools.product(range(-2, 3), repeat=3) if sum(p) % 2 == 0]) * 1.805
+        coords = coords[np.argsort(np.linalg.norm(coords, axis=1), kind="stable")][:43]
+        rng = np.random.default_rng(0)
+        pg_analyzer = PointGroupAnalyzer(Molecule(["Cu"] * 43, coords + rng.normal(0, 0.05, coords.shape)))
+        # the first valid mirror is that of the first pair of sites giving one
+        for axis, _ in pg_analyzer.rot_sym:
+            expected = next(
+                site1.coords - site2.coords
+                for site1, site2 in itertools.combinations(pg_analyzer.centered_mol, 2)
+                if np.dot(site1.coords - site2.coords, axis) < pg_analyzer.tol
+                and pg_analyzer.is_valid_op(SymmOp.reflection(site1.coords - site2.coords))
+            )
+            normal = next(
+                normal
+                for normal in pg_analyzer._get_mirror_normals(axis)
+                if pg_analyzer.is_valid_op(SymmOp.reflection(normal))
+            )
+            assert_allclose(normal, expected)
+
     def test_get_kpoint_weights(self):
         for name in ("SrTiO3", "LiFePO4", "Graphite"):
             struct = PymatgenTest.get_structure(name)